@@ -17,6 +17,8 @@ from createbatchlib.constants import (
 )
 from createbatchlib.optimization import RecordProcessor
 from createbatchlib.media_preparation import prepare_media_file, split_into_batches
+from createbatchlib.staging import create_stager
+from createbatchlib.exif_batch_writer import ExifBatchWriter
 from createbatchlib.progress_tracker import UnifiedProgressTracker
 from createbatchlib.filtering import filter_editorial_for_bank
 
@@ -60,6 +62,17 @@ def parse_arguments():
         action='store_true',
         help="Skip files that already exist in output folder (faster when re-running)"
     )
+    parser.add_argument(
+        "--stage-links",
+        action='store_true',
+        help="Copy and tag each source file once, then hardlink/reflink it into the bank folders "
+             "(falls back to copying where the filesystem cannot link)"
+    )
+    parser.add_argument(
+        "--exif-per-file",
+        action='store_true',
+        help="Write EXIF metadata right after each copy instead of in bulk (slower)"
+    )
     return parser.parse_args()
 
 
@@ -108,6 +121,8 @@ def main():
 
     all_processed: List[str] = []
     error_count = 0
+    stager = create_stager(args.output_folder, exif_tool_path) if args.stage_links else None
+    exif_writer = None if args.exif_per_file else ExifBatchWriter(exif_tool_path)
 
     try:
         # Process each bank with unified progress tracking
@@ -150,7 +165,9 @@ def main():
                             skip_existing=args.skip_existing,
                             bank=bank,
                             include_alternative_formats=args.include_alternative_formats,
-                            batch_number=batch_num
+                            batch_number=batch_num,
+                            stager=stager,
+                            exif_writer=exif_writer
                         )
                         processed.extend(paths)
                         progress_tracker.update_progress(1)  # Track by record, not files
@@ -175,6 +192,17 @@ def main():
 
     finally:
         progress_tracker.finish_all()
+        if exif_writer is not None:
+            # Also runs after an error so copies never stay without metadata
+            exif_writer.flush()
+            if exif_writer.failed:
+                failed = set(exif_writer.failed)
+                all_processed = [path for path in all_processed if path not in failed]
+                error_count += len(failed)
+            logging.info(f"EXIF: {exif_writer.summary()}")
+        if stager is not None:
+            stager.cleanup()
+            logging.info(f"Staging: {stager.summary()}")
 
     # Final summary
     if all_processed or error_count > 0:
@@ -84,4 +84,14 @@ BANKS_NO_EDITORIAL = {
 # Banks not listed here have no batch size limit
 PHOTOBANK_BATCH_SIZE_LIMITS = {
     'GettyImages': 100,
-}
\ No newline at end of file
+}
+
+# Staging folder (inside the output folder) used by --stage-links
+# Each source file is prepared there once and linked into the bank folders
+STAGING_FOLDER_NAME = ".staging"
+
+# Bulk EXIF writing (see createbatchlib/exif_batch_writer.py)
+# Files sharing the same metadata are written by one ExifTool command of at most this many files
+EXIF_BATCH_MAX_FILES = 50
+# Queued files that trigger a write, bounding how many copies wait without metadata
+EXIF_BATCH_MAX_PENDING = 500
@@ -0,0 +1,101 @@
+"""
+Bulk EXIF metadata writing for batch creation.
+
+prepare_media_file used to run one ExifTool command per prepared copy. The
+writer queues those jobs instead and writes them in groups: copies that share
+the same metadata (the same record placed into several banks or batches) are
+written by a single ExifTool command, and all commands go through the shared
+persistent ExifTool process.
+
+Failures are reported per file, so one bad file never aborts the batch.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+from shared.exif_handler import update_exif_metadata_many
+from createbatchlib.constants import EXIF_BATCH_MAX_FILES, EXIF_BATCH_MAX_PENDING
+
+
+class ExifBatchWriter:
+    """Collects EXIF update jobs and writes them in bulk."""
+
+    def __init__(self, exif_tool_path: str, max_files_per_command: int = EXIF_BATCH_MAX_FILES,
+                 max_pending: int = EXIF_BATCH_MAX_PENDING):
+        """
+        Args:
+            exif_tool_path: Path to the ExifTool executable
+            max_files_per_command: Maximum number of files passed to one ExifTool command
+            max_pending: Queued files that trigger an automatic flush (0 = only explicit flushes)
+        """
+        self.exif_tool_path = exif_tool_path
+        self.max_files_per_command = max(1, max_files_per_command)
+        self.max_pending = max_pending
+        self._jobs: Dict[Tuple, List[str]] = {}
+        self._metadata: Dict[Tuple, Dict[str, str]] = {}
+        self._pending = 0
+        self.failed: Dict[str, str] = {}
+        self.files_written = 0
+        self.commands_run = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of queued files not yet written."""
+        return self._pending
+
+    def add(self, file_path: str, metadata: Dict[str, str]) -> None:
+        """
+        Queue a metadata update for ``file_path``.
+
+        Args:
+            file_path: Prepared copy to update
+            metadata: Metadata as for update_exif_metadata
+        """
+        key = tuple(sorted(metadata.items()))
+        if key not in self._jobs:
+            self._jobs[key] = []
+            self._metadata[key] = dict(metadata)
+        self._jobs[key].append(file_path)
+        self._pending += 1
+
+        if self.max_pending and self._pending >= self.max_pending:
+            self.flush()
+
+    def flush(self) -> Dict[str, str]:
+        """
+        Write all queued jobs.
+
+        Returns:
+            Dict mapping files that failed in this flush to their error message
+        """
+        if not self._pending:
+            return {}
+
+        jobs, metadata = self._jobs, self._metadata
+        self._jobs, self._metadata, self._pending = {}, {}, 0
+        logging.info(f"Writing EXIF metadata for {sum(len(paths) for paths in jobs.values())} files "
+                     f"({len(jobs)} metadata sets)")
+
+        errors: Dict[str, str] = {}
+        for key, paths in jobs.items():
+            for start in range(0, len(paths), self.max_files_per_command):
+                chunk = paths[start:start + self.max_files_per_command]
+                try:
+                    chunk_errors = update_exif_metadata_many(chunk, metadata[key], self.exif_tool_path)
+                except Exception as e:
+                    chunk_errors = {path: str(e) for path in chunk}
+                self.commands_run += 1
+                self.files_written += len(chunk) - len(chunk_errors)
+                errors.update(chunk_errors)
+
+        for path, message in errors.items():
+            logging.error(f"Failed to write EXIF metadata to {path}: {message}")
+        self.failed.update(errors)
+        return errors
+
+    def summary(self) -> str:
+        """One-line report of files written, commands used and failures."""
+        return (
+            f"{self.files_written} files written with {self.commands_run} ExifTool commands, "
+            f"{len(self.failed)} failed"
+        )
@@ -9,6 +9,8 @@ from createbatchlib.constants import (
     STATUS_FIELD_KEYWORD, PREPARED_STATUS_VALUE,
     PHOTOBANK_SUPPORTED_FORMATS, FORMAT_SUBDIRS, ALTERNATIVE_EDIT_TAGS
 )
+from createbatchlib.staging import MediaStager
+from createbatchlib.exif_batch_writer import ExifBatchWriter
 
 
 def split_into_batches(records: List[Dict[str, str]], batch_size: int) -> List[List[Dict[str, str]]]:
@@ -47,7 +49,9 @@ def prepare_media_file(
     skip_existing: bool = False,
     bank: str = None,
     include_alternative_formats: bool = False,
-    batch_number: Optional[int] = None
+    batch_number: Optional[int] = None,
+    stager: Optional[MediaStager] = None,
+    exif_writer: Optional[ExifBatchWriter] = None
 ) -> List[str]:
     """
     Copy a media file into output_folder/<photobank>/<format>/ and update its EXIF metadata.
@@ -55,6 +59,10 @@ def prepare_media_file(
     If include_alternative_formats is True, also copy alternative format versions (PNG, TIFF, RAW).
     If batch_number is specified, files are copied to output_folder/<photobank>/batch_XXX/<format>/.
     If skip_existing is True, files that already exist in destination are skipped (faster re-runs).
+    If a stager is given, each source file is copied and tagged once and placed into the
+    destinations as reflinks/hardlinks where the filesystem supports them.
+    If an exif_writer is given, metadata updates are queued on it instead of being written
+    immediately; failures are then reported by exif_writer.flush().
 
     Returns a list of paths where the file was copied.
     """
@@ -132,8 +140,14 @@ def prepare_media_file(
 
                 try:
                     # Default behavior: always overwrite (skip logic handled above)
-                    copy_file(file_path, dest, overwrite=True)
-                    update_exif_metadata(dest, metadata, exif_tool_path)
+                    if stager is not None:
+                        stager.place(file_path, dest, metadata)
+                    else:
+                        copy_file(file_path, dest, overwrite=True)
+                        if exif_writer is not None:
+                            exif_writer.add(dest, metadata)
+                        else:
+                            update_exif_metadata(dest, metadata, exif_tool_path)
                     processed_paths.append(dest)
                     logging.debug("Prepared media file for %s: %s", bank_name, dest)
                 except Exception as e:
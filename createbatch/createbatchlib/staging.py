@@ -0,0 +1,179 @@
+"""
+Copy-once staging of prepared media files.
+
+Without staging, every bank gets its own physical copy of a source file and
+ExifTool rewrites each copy with the same metadata. The stager instead copies
+each source file once into a staging folder, writes its metadata there, and
+places the per-bank/per-batch files as reflinks (copy-on-write clones) or
+hardlinks of that staged file. A real copy is only made when the filesystem
+supports neither, or when a bank needs different metadata (then a separate
+staged file is created for that metadata).
+
+Filesystem capabilities are detected at runtime per pair of devices, so a
+failing link type is only attempted once.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+from shared.exif_handler import update_exif_metadata
+from shared.file_operations import copy_file, ensure_directory
+from createbatchlib.constants import STAGING_FOLDER_NAME
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux FICLONE ioctl (btrfs, XFS with reflink=1, bcachefs, ...)
+FICLONE = 0x40049409
+
+METHOD_REFLINK = "reflink"
+METHOD_HARDLINK = "hardlink"
+METHOD_COPY = "copy"
+
+# Errors meaning "this filesystem (pair) cannot do it", as opposed to a real I/O failure
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EINVAL, errno.ENOTTY, errno.EACCES,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL), getattr(errno, "ENOTSUP", errno.EINVAL),
+    getattr(errno, "EMLINK", errno.EINVAL),
+}
+
+
+def reflink_file(src: str, dest: str) -> None:
+    """
+    Create ``dest`` as a copy-on-write clone of ``src``.
+
+    Raises:
+        OSError: When the platform or filesystem does not support reflinks
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    with open(src, "rb") as source, open(dest, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.remove(dest)
+            raise
+    shutil.copystat(src, dest)
+
+
+class MediaStager:
+    """Materializes each source file once and links it into the bank folders."""
+
+    def __init__(self, staging_folder: str, exif_tool_path: str):
+        """
+        Args:
+            staging_folder: Folder for staged files; must be on the same filesystem as the output
+            exif_tool_path: Path to the ExifTool executable
+        """
+        self.staging_folder = staging_folder
+        self.exif_tool_path = exif_tool_path
+        self._staged: Dict[Tuple, str] = {}
+        self._failed: Dict[Tuple, Exception] = {}
+        self._next_id = 0
+        self._capabilities: Dict[Tuple[int, int], Dict[str, bool]] = {}
+        self.counts = {METHOD_REFLINK: 0, METHOD_HARDLINK: 0, METHOD_COPY: 0}
+        self.staged_files = 0
+        self.staged_bytes = 0
+        self.linked_bytes = 0
+        ensure_directory(staging_folder)
+
+    def place(self, src: str, dest: str, metadata: Dict[str, str]) -> str:
+        """
+        Put a copy of ``src`` with ``metadata`` written into it at ``dest``.
+
+        Args:
+            src: Source media file
+            dest: Destination path in the bank folder (overwritten if it exists)
+            metadata: Metadata for update_exif_metadata
+
+        Returns:
+            The method used: "reflink", "hardlink" or "copy"
+        """
+        staged = self._stage(src, metadata)
+        method = self._link(staged, dest)
+        self.counts[method] += 1
+        if method != METHOD_COPY:
+            self.linked_bytes += os.path.getsize(staged)
+        logging.debug("Placed %s at %s (%s)", staged, dest, method)
+        return method
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes not written compared to one full copy per destination (negative if nothing could be linked)."""
+        return self.linked_bytes - self.staged_bytes
+
+    def cleanup(self) -> None:
+        """Remove the staging folder; placed files keep their data."""
+        shutil.rmtree(self.staging_folder, ignore_errors=True)
+        self._staged.clear()
+        self._failed.clear()
+
+    def summary(self) -> str:
+        """One-line report of link methods and bytes saved."""
+        return (
+            f"{self.staged_files} files staged, "
+            f"{self.counts[METHOD_REFLINK]} reflinked, {self.counts[METHOD_HARDLINK]} hardlinked, "
+            f"{self.counts[METHOD_COPY]} copied, {self.bytes_saved / (1024 * 1024):.1f} MB saved"
+        )
+
+    def _stage(self, src: str, metadata: Dict[str, str]) -> str:
+        key = (os.path.abspath(src), tuple(sorted(metadata.items())))
+        if key in self._failed:
+            raise self._failed[key]
+        if key in self._staged:
+            return self._staged[key]
+
+        # One subfolder per staged variant keeps the original filename for the bank copies
+        self._next_id += 1
+        staged = os.path.join(self.staging_folder, str(self._next_id), os.path.basename(src))
+        try:
+            copy_file(src, staged, overwrite=True)
+            update_exif_metadata(staged, metadata, self.exif_tool_path)
+        except Exception as e:
+            self._failed[key] = e
+            raise
+        self._staged[key] = staged
+        self.staged_files += 1
+        self.staged_bytes += os.path.getsize(staged)
+        return staged
+
+    def _link(self, staged: str, dest: str) -> str:
+        ensure_directory(os.path.dirname(dest))
+        capabilities = self._capabilities.setdefault(self._device_pair(staged, dest), {})
+        temp_dest = f"{dest}.staging"
+
+        for method, link in ((METHOD_REFLINK, reflink_file), (METHOD_HARDLINK, os.link)):
+            if capabilities.get(method) is False:
+                continue
+            try:
+                if os.path.lexists(temp_dest):
+                    os.remove(temp_dest)
+                link(staged, temp_dest)
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                if method not in capabilities:
+                    logging.info("%s not supported for %s: %s", method, os.path.dirname(dest), e)
+                capabilities[method] = False
+                continue
+            capabilities[method] = True
+            os.replace(temp_dest, dest)
+            return method
+
+        copy_file(staged, dest, overwrite=True)
+        return METHOD_COPY
+
+    @staticmethod
+    def _device_pair(staged: str, dest: str) -> Tuple[int, int]:
+        return os.stat(staged).st_dev, os.stat(os.path.dirname(dest)).st_dev
+
+
+def create_stager(output_folder: str, exif_tool_path: str, staging_folder: Optional[str] = None) -> MediaStager:
+    """Create a stager whose staging folder lives inside ``output_folder`` (same filesystem)."""
+    return MediaStager(staging_folder or os.path.join(output_folder, STAGING_FOLDER_NAME), exif_tool_path)
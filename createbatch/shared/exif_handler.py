@@ -2,26 +2,24 @@ import logging
 import subprocess
 import os
 import shutil
-from typing import Dict
+from typing import Dict, List
 
-def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: str = None) -> None:
+from shared.exiftool_worker import run_exiftool
+
+def find_exiftool(tool_path: str = None) -> str:
     """
-    Update metadata for a given media file using the ExifTool command-line tool across platforms.
-    Ensures that creation date, title, description, and keywords are set correctly.
+    Locate the ExifTool executable.
 
     Args:
-        file_path: Path to the media file to update.
-        metadata: Dict with keys:
-            - 'datetimeoriginal': original creation date/time (string)
-            - 'title': title/caption
-            - 'description': description text
-            - 'keywords': comma-separated keywords
         tool_path: Optional path to ExifTool executable or directory containing it.
                    If None or not found, will attempt to locate ExifTool in system PATH.
-    """
-    logging.debug("Preparing to update EXIF metadata for %s with %s", file_path, metadata)
 
-    # Determine ExifTool executable
+    Returns:
+        Path to the executable
+
+    Raises:
+        RuntimeError: If ExifTool cannot be found
+    """
     exe = None
     # If provided a directory, look inside
     if tool_path and os.path.isdir(tool_path):
@@ -37,11 +35,13 @@ def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: st
         exe = shutil.which('exiftool')
     if not exe:
         raise RuntimeError('ExifTool executable not found. Please install ExifTool or provide its path.')
+    return exe
 
-    logging.debug("Using ExifTool executable at %s", exe)
 
+def build_update_args(metadata: Dict[str, str]) -> List[str]:
+    """Build the ExifTool arguments that write ``metadata`` (without target files)."""
     # Base arguments: overwrite original, set file creation from original timestamp, and keyword separator
-    args = [exe, '-overwrite_original', '-FileCreateDate<DateTimeOriginal', '-sep', ',']
+    args = ['-overwrite_original', '-FileCreateDate<DateTimeOriginal', '-sep', ',']
 
     # Map metadata keys to ExifTool tags
     tag_map = {
@@ -55,12 +55,37 @@ def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: st
         value = metadata.get(key)
         if value:
             args.append(f"{tag}={value}")
+    return args
+
+
+def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: str = None) -> None:
+    """
+    Update metadata for a given media file using the ExifTool command-line tool across platforms.
+    Ensures that creation date, title, description, and keywords are set correctly.
+
+    Args:
+        file_path: Path to the media file to update.
+        metadata: Dict with keys:
+            - 'datetimeoriginal': original creation date/time (string)
+            - 'title': title/caption
+            - 'description': description text
+            - 'keywords': comma-separated keywords
+        tool_path: Optional path to ExifTool executable or directory containing it.
+                   If None or not found, will attempt to locate ExifTool in system PATH.
+    """
+    logging.debug("Preparing to update EXIF metadata for %s with %s", file_path, metadata)
+
+    exe = find_exiftool(tool_path)
+    logging.debug("Using ExifTool executable at %s", exe)
+
+    args = build_update_args(metadata)
 
     # Add target file
     args.append(file_path)
 
     try:
-        result = subprocess.run(args, capture_output=True, text=True, check=True)
+        # Persistent worker when available, one-off process otherwise
+        result = run_exiftool(exe, args)
         logging.debug("ExifTool stdout: %s", result.stdout.strip())
         logging.debug("EXIF metadata updated successfully for %s", file_path)
     except subprocess.CalledProcessError as e:
@@ -70,3 +95,42 @@ def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: st
             file_path, e.returncode, stderr
         )
         raise
+
+
+def update_exif_metadata_many(file_paths: List[str], metadata: Dict[str, str],
+                              tool_path: str = None) -> Dict[str, str]:
+    """
+    Write the same metadata into several files with a single ExifTool command.
+
+    When ExifTool reports a failure, the files are written again one by one so
+    the error can be attributed to the file that caused it.
+
+    Args:
+        file_paths: Files to update
+        metadata: Metadata as for update_exif_metadata
+        tool_path: Optional path to ExifTool executable or directory containing it
+
+    Returns:
+        Dict mapping each failed file path to its error message (empty on success)
+    """
+    if not file_paths:
+        return {}
+
+    exe = find_exiftool(tool_path)
+    args = build_update_args(metadata) + list(file_paths)
+    try:
+        result = run_exiftool(exe, args)
+        logging.debug("ExifTool stdout: %s", result.stdout.strip())
+        return {}
+    except subprocess.CalledProcessError as e:
+        if len(file_paths) == 1:
+            return {file_paths[0]: (e.stderr or '').strip() or f"ExifTool exited with {e.returncode}"}
+        logging.debug("ExifTool failed for a group of %d files, retrying one by one", len(file_paths))
+
+    errors = {}
+    for file_path in file_paths:
+        try:
+            update_exif_metadata(file_path, metadata, exe)
+        except Exception as e:
+            errors[file_path] = (getattr(e, 'stderr', None) or str(e)).strip()
+    return errors
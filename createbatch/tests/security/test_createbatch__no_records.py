@@ -26,6 +26,8 @@ def test_main_exits_when_no_records(monkeypatch):
         photo_csv="X:/photo.csv",
         output_folder="X:/out",
         skip_existing=False,
+        stage_links=False,
+        exif_per_file=False,
         log_dir="X:/logs",
         debug=False,
         include_edited=False,
@@ -70,6 +70,8 @@ def make_args(tmp_path, **overrides):
         photo_csv=str(tmp_path / "input.csv"),
         output_folder=str(tmp_path / "out"),
         skip_existing=False,
+        stage_links=False,
+        exif_per_file=False,
         log_dir=str(tmp_path / "logs"),
         debug=False,
         include_edited=False,
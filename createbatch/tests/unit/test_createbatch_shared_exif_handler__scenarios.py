@@ -132,3 +132,31 @@ def test_update_exif_metadata__subprocess_error_raised(monkeypatch):
 
     with pytest.raises(exif_handler.subprocess.CalledProcessError):
         exif_handler.update_exif_metadata("C:/media/file.jpg", {}, tool_path="C:/tools/exiftool.exe")
+
+
+def test_update_exif_metadata_many__one_command_for_all_files(monkeypatch):
+    monkeypatch.setattr(exif_handler, "find_exiftool", lambda _p: "exiftool")
+    calls = []
+    monkeypatch.setattr(exif_handler, "run_exiftool",
+                        lambda exe, args: calls.append(args) or type("Result", (), {"stdout": ""}))
+
+    errors = exif_handler.update_exif_metadata_many(["a.jpg", "b.jpg"], {"title": "T"}, "exiftool")
+
+    assert errors == {}
+    assert len(calls) == 1
+    assert calls[0][-3:] == ["-Title=T", "a.jpg", "b.jpg"]
+
+
+def test_update_exif_metadata_many__isolates_failing_file(monkeypatch):
+    monkeypatch.setattr(exif_handler, "find_exiftool", lambda _p: "exiftool")
+
+    def fake_run(exe, args):
+        if "b.jpg" in args:
+            raise exif_handler.subprocess.CalledProcessError(1, args, stderr="Error: Not a valid JPG - b.jpg\n")
+        return type("Result", (), {"stdout": ""})
+
+    monkeypatch.setattr(exif_handler, "run_exiftool", fake_run)
+
+    errors = exif_handler.update_exif_metadata_many(["a.jpg", "b.jpg", "c.jpg"], {"title": "T"}, "exiftool")
+
+    assert errors == {"b.jpg": "Error: Not a valid JPG - b.jpg"}
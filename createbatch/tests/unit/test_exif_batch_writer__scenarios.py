@@ -0,0 +1,81 @@
+"""
+Unit tests for createbatchlib/exif_batch_writer.py.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+createbatch_root = project_root / "createbatch"
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(createbatch_root))
+
+import createbatchlib.exif_batch_writer as writer_module
+
+
+def _record_calls(monkeypatch, failing=()):
+    calls = []
+
+    def fake_many(paths, metadata, _tool):
+        calls.append((list(paths), metadata["title"]))
+        return {path: "Error: broken file" for path in paths if path in failing}
+
+    monkeypatch.setattr(writer_module, "update_exif_metadata_many", fake_many)
+    return calls
+
+
+def test_exif_batch_writer__groups_files_with_same_metadata(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    writer = writer_module.ExifBatchWriter("exiftool", max_files_per_command=2, max_pending=0)
+
+    for bank in ("A", "B", "C"):
+        writer.add(f"{bank}/one.jpg", {"title": "One"})
+    writer.add("A/two.jpg", {"title": "Two"})
+
+    assert calls == []
+    assert writer.pending == 4
+    assert writer.flush() == {}
+
+    assert calls == [(["A/one.jpg", "B/one.jpg"], "One"), (["C/one.jpg"], "One"), (["A/two.jpg"], "Two")]
+    assert writer.pending == 0
+    assert writer.summary() == "4 files written with 3 ExifTool commands, 0 failed"
+
+
+def test_exif_batch_writer__reports_failures_per_file(monkeypatch):
+    _record_calls(monkeypatch, failing={"B/bad.jpg"})
+    writer = writer_module.ExifBatchWriter("exiftool", max_pending=0)
+
+    writer.add("A/bad.jpg", {"title": "Bad"})
+    writer.add("B/bad.jpg", {"title": "Bad"})
+    writer.add("A/good.jpg", {"title": "Good"})
+
+    assert writer.flush() == {"B/bad.jpg": "Error: broken file"}
+    assert writer.failed == {"B/bad.jpg": "Error: broken file"}
+    assert writer.files_written == 2
+
+
+def test_exif_batch_writer__exception_fails_only_its_group(monkeypatch):
+    def fake_many(paths, metadata, _tool):
+        if metadata["title"] == "Boom":
+            raise RuntimeError("ExifTool executable not found")
+        return {}
+
+    monkeypatch.setattr(writer_module, "update_exif_metadata_many", fake_many)
+    writer = writer_module.ExifBatchWriter("exiftool", max_pending=0)
+    writer.add("a.jpg", {"title": "Boom"})
+    writer.add("b.jpg", {"title": "Fine"})
+
+    assert writer.flush() == {"a.jpg": "ExifTool executable not found"}
+    assert writer.files_written == 1
+
+
+def test_exif_batch_writer__flushes_when_queue_is_full(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    writer = writer_module.ExifBatchWriter("exiftool", max_pending=2)
+
+    writer.add("a.jpg", {"title": "A"})
+    assert calls == []
+    writer.add("b.jpg", {"title": "B"})
+
+    assert len(calls) == 2
+    assert writer.pending == 0
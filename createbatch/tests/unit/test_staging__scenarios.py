@@ -0,0 +1,109 @@
+"""
+Unit tests for createbatchlib/staging.py.
+"""
+
+import errno
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+createbatch_root = project_root / "createbatch"
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(createbatch_root))
+
+import createbatchlib.media_preparation as media_module
+import createbatchlib.staging as staging
+from createbatchlib import constants
+
+
+def _fake_exif(calls):
+    def fake_update(path, metadata, _tool):
+        calls.append(path)
+        with open(path, "ab") as handle:
+            handle.write(metadata["title"].encode("utf-8"))
+    return fake_update
+
+
+def test_stager__tags_once_and_links_every_destination(tmp_path, monkeypatch):
+    exif_calls = []
+    monkeypatch.setattr(staging, "update_exif_metadata", _fake_exif(exif_calls))
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"x" * 1000)
+    stager = staging.MediaStager(str(tmp_path / "out" / ".staging"), "exiftool")
+
+    destinations = [tmp_path / "out" / bank / "jpg" / "original" / "photo.jpg" for bank in ("A", "B", "C")]
+    methods = [stager.place(str(source), str(dest), {"title": "T"}) for dest in destinations]
+
+    assert len(exif_calls) == 1
+    assert all(dest.read_bytes() == b"x" * 1000 + b"T" for dest in destinations)
+    assert stager.staged_files == 1
+    if set(methods) != {staging.METHOD_COPY}:
+        assert stager.bytes_saved == 2 * 1001
+
+    stager.cleanup()
+    assert not (tmp_path / "out" / ".staging").exists()
+    assert all(dest.read_bytes() == b"x" * 1000 + b"T" for dest in destinations)
+
+
+def test_stager__different_metadata_is_staged_separately(tmp_path, monkeypatch):
+    exif_calls = []
+    monkeypatch.setattr(staging, "update_exif_metadata", _fake_exif(exif_calls))
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"data")
+    stager = staging.MediaStager(str(tmp_path / ".staging"), "exiftool")
+
+    stager.place(str(source), str(tmp_path / "A" / "photo.jpg"), {"title": "one"})
+    stager.place(str(source), str(tmp_path / "B" / "photo.jpg"), {"title": "two"})
+
+    assert len(exif_calls) == 2
+    assert (tmp_path / "A" / "photo.jpg").read_bytes() == b"dataone"
+    assert (tmp_path / "B" / "photo.jpg").read_bytes() == b"datatwo"
+
+
+def test_stager__falls_back_to_copy_and_remembers_capability(tmp_path, monkeypatch):
+    monkeypatch.setattr(staging, "update_exif_metadata", lambda *_a: None)
+    link_attempts = []
+
+    def unsupported(*_a):
+        link_attempts.append(_a)
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(staging, "reflink_file", unsupported)
+    monkeypatch.setattr(staging.os, "link", unsupported)
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"data")
+    stager = staging.MediaStager(str(tmp_path / ".staging"), "exiftool")
+
+    for bank in ("A", "B", "C"):
+        method = stager.place(str(source), str(tmp_path / bank / "photo.jpg"), {"title": "T"})
+        assert method == staging.METHOD_COPY
+
+    assert len(link_attempts) == 2  # one reflink and one hardlink probe
+    assert stager.counts[staging.METHOD_COPY] == 3
+    assert stager.bytes_saved == -4
+    assert os.path.exists(tmp_path / "C" / "photo.jpg")
+
+
+def test_prepare_media_file__uses_stager(tmp_path, monkeypatch):
+    placed = []
+
+    class FakeStager:
+        def place(self, src, dest, metadata):
+            placed.append((src, dest, metadata["title"]))
+
+    monkeypatch.setattr(media_module, "copy_file", lambda *_a, **_k: (_ for _ in ()).throw(AssertionError("copied")))
+    source = tmp_path / "image.jpg"
+    source.write_text("data", encoding="utf-8")
+    record = {
+        "Cesta": str(source),
+        "Název": "Title",
+        "Shutterstock Status": constants.PREPARED_STATUS_VALUE,
+        "Pond5 Status": constants.PREPARED_STATUS_VALUE,
+    }
+
+    result = media_module.prepare_media_file(record, str(tmp_path / "out"), "exiftool", stager=FakeStager())
+
+    assert len(result) == 2
+    assert [p[0] for p in placed] == [str(source), str(source)]
+    assert {p[2] for p in placed} == {"Title"}
@@ -12,6 +12,7 @@ from exportpreparedmedialib.constants import (
     DEFAULT_OUTPUT_DIR,
     DEFAULT_OUTPUT_PREFIX,
     DEFAULT_LOG_DIR,
+    DEFAULT_EXPORT_WORKERS,
     VALID_STATUS
 )
 
@@ -87,6 +88,10 @@ def parse_arguments():
     parser.add_argument("--include-alternative-formats", action="store_true",
                         help="Include alternative formats (PNG, TIFF, RAW) in export (default: only JPG)")
 
+    # Performance options
+    parser.add_argument("--export-workers", type=int, default=DEFAULT_EXPORT_WORKERS,
+                        help=f"Number of bank export files written in parallel (default: {DEFAULT_EXPORT_WORKERS})")
+
     return parser.parse_args()
 
 
@@ -171,7 +176,8 @@ def main():
     # Alternative formats are handled per-bank by expand_item_with_alternative_formats based on bank's supported formats
     export_to_photobanks(filtered_items, enabled_banks, output_paths,
                         filter_func=should_include_item,
-                        include_alternative_formats=args.include_alternative_formats)
+                        include_alternative_formats=args.include_alternative_formats,
+                        max_workers=args.export_workers)
 
     logging.info("Export process completed successfully")
 
@@ -150,4 +150,10 @@ PHOTOBANKS = [
 # Banks not listed here have no batch size limit
 PHOTOBANK_BATCH_SIZE_LIMITS = {
     'GettyImages': 100,
-}
\ No newline at end of file
+}
+
+# Write buffer of an export CSV file; rows reach the disk in blocks of this size
+EXPORT_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Number of bank export files written at the same time
+DEFAULT_EXPORT_WORKERS = 4
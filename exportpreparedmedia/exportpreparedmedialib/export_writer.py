@@ -0,0 +1,75 @@
+"""
+Buffered CSV writer for one photobank export file.
+
+export_mediafile used to reopen the output file in append mode for every
+record. ExportFileWriter keeps the file open for the whole batch instead and
+lets a large write buffer send the rows to disk in big blocks.
+
+The bytes written are the same as with the per-record append path: the bank
+header line uses the platform line ending (as text mode did), the rows use
+csv.DictWriter with QUOTE_ALL and "\\r\\n", and without a bank header the
+column names are written before the first row of an empty file.
+"""
+
+import csv
+import logging
+import os
+from typing import Dict, List, Optional
+
+from exportpreparedmedialib.constants import EXPORT_WRITE_BUFFER_SIZE
+
+
+class ExportFileWriter:
+    """Single open, buffered CSV writer for one output file."""
+
+    def __init__(self, output_file: str, fieldnames: List[str], delimiter: str = ',',
+                 header: Optional[str] = None, buffer_size: int = EXPORT_WRITE_BUFFER_SIZE):
+        """
+        Args:
+            output_file: Path to the output CSV file
+            fieldnames: Column names in the order of the bank's column map
+            delimiter: Field delimiter of the bank
+            header: Bank header line; the file is truncated and starts with it.
+                Without a header the file is appended to, as before.
+            buffer_size: Bytes collected before a write to disk
+        """
+        self.output_file = output_file
+        self.rows_written = 0
+
+        if header:
+            self._file = open(output_file, 'w', encoding='utf-8', newline='', buffering=buffer_size)
+            # Text mode used to translate '\n' into the platform line ending
+            self._file.write((header + '\n').replace('\n', os.linesep))
+            self._write_fieldnames = False
+        else:
+            self._write_fieldnames = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+            self._file = open(output_file, 'a', encoding='utf-8', newline='', buffering=buffer_size)
+
+        self._writer = csv.DictWriter(
+            self._file,
+            fieldnames=fieldnames,
+            delimiter=delimiter,
+            quotechar='"',
+            quoting=csv.QUOTE_ALL  # Force quoting for all fields
+        )
+
+    def __enter__(self) -> "ExportFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_row(self, csv_record: Dict[str, str]) -> None:
+        """Queue one row; it reaches the disk when the buffer fills or on close."""
+        if self._write_fieldnames:
+            self._writer.writeheader()
+            self._write_fieldnames = False
+            logging.debug(f"Wrote CSV header for empty file: {self.output_file}")
+        self._writer.writerow(csv_record)
+        self.rows_written += 1
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the file."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+            logging.debug(f"Closed {self.output_file} after {self.rows_written} rows")
@@ -1,20 +1,38 @@
 ﻿import os
-import csv
 import logging
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from shared.file_operations import save_csv
+from shared.file_operations import save_csv, load_csv
 from shared.csv_sanitizer import sanitize_field
 from exportpreparedmedialib.column_maps import get_column_map
-from exportpreparedmedialib.banks_logic import should_skip_editorial, extract_media_properties
-
-from exportpreparedmedialib.constants import PHOTOBANK_SUPPORTED_FORMATS, PHOTOBANK_BATCH_SIZE_LIMITS, PHOTOBANK_EXPORT_FORMATS, FORMAT_SUBDIRS
-
-
-
-def expand_item_with_alternative_formats(item: Dict[str, str], bank: str, include_alternatives: bool = False) -> List[Dict[str, str]]:
+from exportpreparedmedialib.banks_logic import (
+    should_skip_editorial,
+    extract_media_properties,
+    load_category_map,
+    load_pond_prices
+)
+from exportpreparedmedialib.export_writer import ExportFileWriter
+from exportpreparedmedialib.fs_probe import FileSystemProbe
+
+from exportpreparedmedialib.constants import (
+    PHOTOBANK_SUPPORTED_FORMATS,
+    PHOTOBANK_BATCH_SIZE_LIMITS,
+    PHOTOBANK_EXPORT_FORMATS,
+    FORMAT_SUBDIRS,
+    DEFAULT_ADOBE_CATEGORY_PATH,
+    DEFAULT_DREAMSTIME_CATEGORY_PATH,
+    DEFAULT_POND_PRICES_PATH,
+    DEFAULT_PHOTOBANK_EXPORT_FORMATS_PATH,
+    DEFAULT_EXPORT_WORKERS
+)
+
+
+
+def expand_item_with_alternative_formats(item: Dict[str, str], bank: str, include_alternatives: bool = False,
+                                         probe: Optional[FileSystemProbe] = None) -> List[Dict[str, str]]:
     """
     Expand single item with alternative format versions for given photobank.
 
@@ -22,14 +40,16 @@ def expand_item_with_alternative_formats(item: Dict[str, str], bank: str, includ
         item: Original item from CSV
         bank: Photobank name to check supported formats
         include_alternatives: Whether to search for alternative formats
+        probe: Directory snapshot of the export run (avoids one filesystem call per candidate path)
 
     Returns:
         List of items (original + alternative formats that exist and are supported)
     """
     items = []
+    exists = probe.exists if probe is not None else os.path.exists
 
     source_file = item.get('Cesta', '')
-    if not source_file or not os.path.exists(source_file):
+    if not source_file or not exists(source_file):
         return items
 
     source_path = Path(source_file)
@@ -86,7 +106,7 @@ def expand_item_with_alternative_formats(item: Dict[str, str], bank: str, includ
 
         alternative_file = Path(*alternative_parts)
 
-        if alternative_file.exists():
+        if exists(str(alternative_file)):
             # Create copy of original item with updated path
             alt_item = item.copy()
             alt_item['Cesta'] = str(alternative_file)
@@ -113,7 +133,6 @@ def load_photobank_headers(headers_file: str) -> Dict[str, Dict[str, str]]:
         logging.debug(f"File exists: {os.path.exists(headers_file)}")
 
         # Použij sdílenou funkci load_csv pro načtení CSV
-        from shared.file_operations import load_csv
         rows = load_csv(headers_file)
 
         for row in rows:
@@ -153,7 +172,8 @@ def load_photobank_headers(headers_file: str) -> Dict[str, Dict[str, str]]:
         logging.debug(f"Exception details: {str(e)}", exc_info=True)
     return formats
 
-def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export_formats: Dict[str, Dict[str, str]]) -> bool:
+def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export_formats: Dict[str, Dict[str, str]],
+                     writer: Optional[ExportFileWriter] = None) -> bool:
     """
     Exportuje záznam do výstupního souboru pro danou banku.
 
@@ -162,29 +182,33 @@ def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export
         record: Rozšířený záznam s vlastnostmi média
         output_file: Cesta k výstupnímu souboru
         export_formats: Slovník formátů exportu
+        writer: Otevřený zapisovač výstupního souboru; bez něj se soubor otevře pro každý záznam
 
     Returns:
         True, pokud byl záznam úspěšně exportován, jinak False
     """
     try:
-        logging.debug(f"Exporting record to {bank}, output file: {output_file}")
-        logging.debug(f"Complete record object: {json.dumps(record, indent=2)}")
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug:
+            logging.debug(f"Exporting record to {bank}, output file: {output_file}")
+            logging.debug(f"Complete record object: {json.dumps(record, indent=2)}")
 
         # Získání mapy sloupců pro danou banku
         column_map = get_column_map(bank)
 
-        # Vytvoření kopie mapy sloupců bez funkcí pro logování
-        log_column_map = []
-        for col in column_map:
-            log_col = {}
-            for k, v in col.items():
-                if k != 'transform':
-                    log_col[k] = v
-                else:
-                    log_col[k] = "<function>"  # Nahrazení funkce textem
-            log_column_map.append(log_col)
+        if debug:
+            # Vytvoření kopie mapy sloupců bez funkcí pro logování
+            log_column_map = []
+            for col in column_map:
+                log_col = {}
+                for k, v in col.items():
+                    if k != 'transform':
+                        log_col[k] = v
+                    else:
+                        log_col[k] = "<function>"  # Nahrazení funkce textem
+                log_column_map.append(log_col)
 
-        logging.debug(f"Column map for {bank}:\n{json.dumps(log_column_map, indent=2)}")
+            logging.debug(f"Column map for {bank}:\n{json.dumps(log_column_map, indent=2)}")
 
         # Kontrola, zda má záznam všechny potřebné hodnoty
         required_sources = [col['source'] for col in column_map if 'source' in col and 'value' not in col]
@@ -195,6 +219,14 @@ def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export
             logging.warning(f"Skipping record: {record.get('filename', 'unknown')}")
             return False
 
+        csv_record = build_csv_record(column_map, record, debug)
+
+        if writer is not None:
+            writer.write_row(csv_record)
+            if debug:
+                logging.debug(f"Successfully exported to {bank}: {record.get('filename', '')}")
+            return True
+
         # Získání oddělovače pro danou banku
         bank_format = export_formats.get(bank, {})
         delimiter = bank_format.get('delimiter', ',')
@@ -205,66 +237,13 @@ def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export
         else:
             logging.debug(f"Using delimiter for {bank}: '{delimiter}'")
 
-        # Vytvoření záznamu podle mapy sloupců
-        csv_record = {}
-        for col in column_map:
-            target_field = col['target']
-
-            # Získání hodnoty ze záznamu nebo pevné hodnoty
-            if "value" in col:
-                value = col["value"]
-                logging.debug(f"Using fixed value for {target_field}: '{value}'")
-            else:
-                source = col["source"]
-                value = record.get(source, "")
-                logging.debug(f"Using value from record for {target_field} (source: {source}): '{value}'")
-
-            # Případná transformace hodnoty
-            if "transform" in col and callable(col["transform"]):
-                try:
-                    old_value = value
-                    value = col["transform"](value)
-                    logging.debug(f"Transformed value for {target_field}: '{old_value}' -> '{value}'")
-                except Exception as e:
-                    logging.warning(f"Transform failed for {target_field}: {e}")
-                    value = ""
-
-            # Sanitize value to prevent CSV injection attacks
-            value = sanitize_field(value)
-
-            csv_record[target_field] = value
-
-        # Zápis do souboru pomocí csv.DictWriter (QUOTE_ALL pro bezpečnost)
+        # Zápis do souboru (QUOTE_ALL pro bezpečnost), hlavička se zapíše do prázdného souboru
         logging.debug(f"Writing record to file: {output_file}")
-
-        # Check if file exists and has content (defensive programming)
-        file_exists = os.path.exists(output_file)
-        file_is_empty = not file_exists or os.path.getsize(output_file) == 0
-
-        logging.debug(f"File exists before write: {file_exists}, is empty: {file_is_empty}")
-
-        # Get fieldnames from column map
         fieldnames = [col['target'] for col in column_map]
-
-        # Open in append mode, but write header if file is empty
-        with open(output_file, 'a', encoding='utf-8', newline='') as csvfile:
-            writer = csv.DictWriter(
-                csvfile,
-                fieldnames=fieldnames,
-                delimiter=delimiter,
-                quotechar='"',
-                quoting=csv.QUOTE_ALL  # Force quoting for all fields
-            )
-
-            # Write header if file is empty (defensive check)
-            if file_is_empty:
-                writer.writeheader()
-                logging.debug(f"Wrote CSV header for empty file: {output_file}")
-
-            writer.writerow(csv_record)
+        with ExportFileWriter(output_file, fieldnames, delimiter, buffer_size=-1) as single_writer:
+            single_writer.write_row(csv_record)
 
         logging.debug(f"Successfully exported to {bank}: {record.get('filename', '')}")
-        logging.debug(f"File exists after write: {os.path.exists(output_file)}")
         logging.debug(f"File size after write: {os.path.getsize(output_file)} bytes")
 
         return True
@@ -273,31 +252,74 @@ def export_mediafile(bank: str, record: Dict[str, str], output_file: str, export
         logging.debug(f"Exception details: {str(e)}", exc_info=True)
         return False
 
+
+def build_csv_record(column_map: List[Dict[str, Any]], record: Dict[str, str], debug: bool = False) -> Dict[str, str]:
+    """
+    Vytvoří řádek výstupního CSV podle mapy sloupců.
+
+    Args:
+        column_map: Mapa sloupců banky
+        record: Rozšířený záznam s vlastnostmi média
+        debug: Zda logovat hodnotu každého sloupce
+
+    Returns:
+        Slovník {cílový sloupec: ošetřená hodnota}
+    """
+    csv_record = {}
+    for col in column_map:
+        target_field = col['target']
+
+        # Získání hodnoty ze záznamu nebo pevné hodnoty
+        if "value" in col:
+            value = col["value"]
+            if debug:
+                logging.debug(f"Using fixed value for {target_field}: '{value}'")
+        else:
+            source = col["source"]
+            value = record.get(source, "")
+            if debug:
+                logging.debug(f"Using value from record for {target_field} (source: {source}): '{value}'")
+
+        # Případná transformace hodnoty
+        if "transform" in col and callable(col["transform"]):
+            try:
+                old_value = value
+                value = col["transform"](value)
+                if debug:
+                    logging.debug(f"Transformed value for {target_field}: '{old_value}' -> '{value}'")
+            except Exception as e:
+                logging.warning(f"Transform failed for {target_field}: {e}")
+                value = ""
+
+        # Sanitize value to prevent CSV injection attacks
+        value = sanitize_field(value)
+
+        csv_record[target_field] = value
+    return csv_record
+
 def export_to_photobanks(items: List[Dict[str, str]], enabled_banks: List[str], output_paths: Dict[str, str],
-                        filter_func=None, include_alternative_formats: bool = False) -> None:
+                        filter_func=None, include_alternative_formats: bool = False,
+                        max_workers: int = DEFAULT_EXPORT_WORKERS, probe: Optional[FileSystemProbe] = None) -> None:
     """
     Exportuje záznamy do výstupních souborů pro aktivované banky.
 
+    Záznamy se projdou jednou pro všechny banky: vlastnosti média se vypočítají
+    pro každý soubor jen jednou a existence souborů se zjišťuje ze snímku adresářů.
+    Výstupní soubory jednotlivých bank se pak zapisují souběžně.
+
     Args:
         items: Seznam původních položek ze vstupního CSV
         enabled_banks: Seznam aktivovaných bank
         output_paths: Slovník cest k výstupním souborům
         filter_func: Volitelná funkce pro filtrování záznamů podle banky
         include_alternative_formats: Zda zahrnout alternativní formáty (PNG, TIF, RAW)
+        max_workers: Počet bank zapisovaných současně
+        probe: Snímek adresářů pro tento běh (nový, pokud není zadán)
     """
     logging.debug(f"Starting export to photobanks. Enabled banks: {enabled_banks}")
     logging.debug(f"Output paths: {json.dumps(output_paths)}")
     logging.debug(f"Number of items to process: {len(items)}")
 
-    # Načtení potřebných dat pro vytváření rozšířených záznamů
-    from exportpreparedmedialib.banks_logic import extract_media_properties, load_category_map, load_pond_prices
-    from exportpreparedmedialib.constants import (
-        DEFAULT_ADOBE_CATEGORY_PATH,
-        DEFAULT_DREAMSTIME_CATEGORY_PATH,
-        DEFAULT_POND_PRICES_PATH,
-        DEFAULT_PHOTOBANK_EXPORT_FORMATS_PATH
-    )
-
     # Načtení formátů exportu
     export_formats = load_photobank_headers(DEFAULT_PHOTOBANK_EXPORT_FORMATS_PATH)
     logging.info(f"Loaded export formats from {DEFAULT_PHOTOBANK_EXPORT_FORMATS_PATH}")
@@ -314,83 +336,148 @@ def export_to_photobanks(items: List[Dict[str, str]], enabled_banks: List[str],
     logging.info(f"Loaded Pond5 prices from {DEFAULT_POND_PRICES_PATH}")
 
     # Log prvních 5 položek pro kontrolu
-    if items:
+    if items and logging.getLogger().isEnabledFor(logging.DEBUG):
         logging.debug("Sample of items to process (first 5):")
         for i, item in enumerate(items[:5]):
             logging.debug(f"Item {i+1}:\n{json.dumps(item, indent=2)}")
 
-    for bank in enabled_banks:
-        output_file = output_paths[bank]
-        logging.debug(f"Processing bank: {bank}, output file: {output_file}")
+    probe = probe or FileSystemProbe()
+    bank_records = collect_bank_records(items, enabled_banks, category_maps, pond_prices,
+                                        filter_func, include_alternative_formats, probe)
+    logging.info(f"Export file lookups: {probe.summary()}")
+
+    workers = max(1, min(max_workers, len(enabled_banks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as executor:
+        futures = {
+            executor.submit(write_bank_export, bank, bank_records[bank], output_paths[bank], export_formats): bank
+            for bank in enabled_banks
+        }
+        for future in as_completed(futures):
+            bank = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Export to {bank} failed: {e}")
+                logging.debug(f"Exception details: {str(e)}", exc_info=True)
+
+
+def collect_bank_records(items: List[Dict[str, str]], enabled_banks: List[str],
+                         category_maps: Dict[str, Dict[str, str]], pond_prices: Dict[str, str],
+                         filter_func=None, include_alternative_formats: bool = False,
+                         probe: Optional[FileSystemProbe] = None) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Rozdělí záznamy do bank v jednom průchodu přes vstupní položky.
+
+    Vlastnosti média (extract_media_properties) se pro každý soubor vypočítají
+    jednou a sdílí je všechny banky, které soubor exportují.
+
+    Args:
+        items: Seznam původních položek ze vstupního CSV
+        enabled_banks: Seznam aktivovaných bank
+        category_maps: Slovník map kategorií
+        pond_prices: Slovník cen Pond5
+        filter_func: Volitelná funkce pro filtrování záznamů podle banky
+        include_alternative_formats: Zda zahrnout alternativní formáty
+        probe: Sdílené kontroly souborového systému
+
+    Returns:
+        Slovník {banka: seznam rozšířených záznamů}
+    """
+    probe = probe or FileSystemProbe()
+    bank_records: Dict[str, List[Dict[str, str]]] = {bank: [] for bank in enabled_banks}
+    included = {bank: 0 for bank in enabled_banks}
+    editorial_filtered = {bank: 0 for bank in enabled_banks}
+    properties_cache: Dict[Tuple[int, str], Dict[str, str]] = {}
+
+    for index, item in enumerate(items):
+        for bank in enabled_banks:
+            # Filtruj položky podle banky, pokud je zadána filtrovací funkce
+            if filter_func and not filter_func(item, bank):
+                continue
+            included[bank] += 1
+
+            # Filter out editorial content for banks that don't support it
+            if should_skip_editorial(item, bank):
+                editorial_filtered[bank] += 1
+                continue
 
-        # Check if bank has batch size limit
-        batch_size_limit = PHOTOBANK_BATCH_SIZE_LIMITS.get(bank, 0)
+            for expanded_item in expand_item_with_alternative_formats(item, bank, include_alternative_formats, probe=probe):
+                key = (index, expanded_item.get('Cesta', ''))
+                record = properties_cache.get(key)
+                if record is None:
+                    record = extract_media_properties(expanded_item, category_maps, pond_prices)
+                    properties_cache[key] = record
+                bank_records[bank].append(record)
 
-        # Filtruj položky podle banky, pokud je zadána filtrovací funkce
-        bank_items = items
+    for bank in enabled_banks:
         if filter_func:
-            bank_items = [item for item in items if filter_func(item, bank)]
-            logging.info(f"Filtered {len(bank_items)}/{len(items)} items for {bank} based on status")
-
-        # Filter out editorial content for banks that don't support it
-        original_count = len(bank_items)
-        bank_items = [item for item in bank_items if not should_skip_editorial(item, bank)]
-        editorial_filtered = original_count - len(bank_items)
-        if editorial_filtered > 0:
-            logging.info(f"Filtered out {editorial_filtered} editorial items for {bank} (does not accept editorial)")
-
-        # Expand to alternative formats and create records
-        all_records = []
-        for item in bank_items:
-            expanded_items = expand_item_with_alternative_formats(item, bank, include_alternative_formats)
-            for expanded_item in expanded_items:
-                record = extract_media_properties(expanded_item, category_maps, pond_prices)
-                all_records.append(record)
-
-        logging.info(f"{bank}: {len(all_records)} total records after format expansion")
-
-        # Split into batches if needed
-        if batch_size_limit > 0 and len(all_records) > batch_size_limit:
-            batches = [all_records[i:i + batch_size_limit] for i in range(0, len(all_records), batch_size_limit)]
-            logging.info(f"{bank} has batch size limit of {batch_size_limit}, splitting into {len(batches)} files")
+            logging.info(f"Filtered {included[bank]}/{len(items)} items for {bank} based on status")
+        if editorial_filtered[bank] > 0:
+            logging.info(f"Filtered out {editorial_filtered[bank]} editorial items for {bank} (does not accept editorial)")
+        logging.info(f"{bank}: {len(bank_records[bank])} total records after format expansion")
+    logging.info(f"Computed media properties for {len(properties_cache)} files shared by {len(enabled_banks)} banks")
+    return bank_records
+
+
+def write_bank_export(bank: str, records: List[Dict[str, str]], output_file: str,
+                      export_formats: Dict[str, Dict[str, str]]) -> int:
+    """
+    Zapíše záznamy jedné banky do výstupního souboru (případně rozděleného do dávek).
+
+    Args:
+        bank: Název banky
+        records: Rozšířené záznamy pro banku
+        output_file: Cesta k výstupnímu souboru
+        export_formats: Slovník formátů exportu
+
+    Returns:
+        Počet exportovaných záznamů
+    """
+    logging.debug(f"Processing bank: {bank}, output file: {output_file}")
+    fieldnames = [col['target'] for col in get_column_map(bank)]
+
+    # Split into batches if needed
+    batch_size_limit = PHOTOBANK_BATCH_SIZE_LIMITS.get(bank, 0)
+    if batch_size_limit > 0 and len(records) > batch_size_limit:
+        batches = [records[i:i + batch_size_limit] for i in range(0, len(records), batch_size_limit)]
+        logging.info(f"{bank} has batch size limit of {batch_size_limit}, splitting into {len(batches)} files")
+    else:
+        batches = [records]
+
+    total_exported = 0
+    for batch_idx, batch_records in enumerate(batches, start=1):
+        # Determine output file path
+        if len(batches) > 1:
+            # Multiple batches: add suffix _1, _2, etc.
+            output_path = Path(output_file)
+            batch_output_file = str(output_path.parent / f"{output_path.stem}_{batch_idx}{output_path.suffix}")
         else:
-            batches = [all_records]
-
-        # Process each batch
-        for batch_idx, batch_records in enumerate(batches, start=1):
-            # Determine output file path
-            if len(batches) > 1:
-                # Multiple batches: add suffix _1, _2, etc.
-                output_path = Path(output_file)
-                batch_output_file = str(output_path.parent / f"{output_path.stem}_{batch_idx}{output_path.suffix}")
-            else:
-                # Single batch: use original filename
-                batch_output_file = output_file
-
-            logging.info(f"Writing batch {batch_idx}/{len(batches)} to {batch_output_file}")
-
-            # Write header
-            try:
-                bank_format = export_formats.get(bank, {})
-                header = bank_format.get('headers', '')
-                delimiter = bank_format.get('delimiter', ',')
-
-                if header:
-                    with open(batch_output_file, 'w', encoding='utf-8') as f:
-                        f.write(header + '\n')
-                    logging.debug(f"Wrote header for {bank} batch {batch_idx}")
-                else:
-                    logging.warning(f"No header defined for {bank}")
-            except Exception as e:
-                logging.error(f"Failed to write header for {bank} batch {batch_idx}: {e}")
-                continue
+            # Single batch: use original filename
+            batch_output_file = output_file
+
+        logging.info(f"Writing batch {batch_idx}/{len(batches)} to {batch_output_file}")
 
-            # Export records in this batch
-            export_count = 0
+        # Open the batch file once; the bank header is written first
+        bank_format = export_formats.get(bank, {})
+        header = bank_format.get('headers', '')
+        delimiter = bank_format.get('delimiter', ',')
+        if not header:
+            logging.warning(f"No header defined for {bank}")
+        try:
+            writer = ExportFileWriter(batch_output_file, fieldnames, delimiter, header=header)
+        except Exception as e:
+            logging.error(f"Failed to write header for {bank} batch {batch_idx}: {e}")
+            continue
+
+        # Export records in this batch
+        export_count = 0
+        with writer:
             for record in batch_records:
-                if export_mediafile(bank, record, batch_output_file, export_formats):
+                if export_mediafile(bank, record, batch_output_file, export_formats, writer=writer):
                     export_count += 1
                     if export_count % 10 == 0:
                         logging.debug(f"Batch {batch_idx}: exported {export_count}/{len(batch_records)} records")
 
-            logging.info(f"Batch {batch_idx}: exported {export_count}/{len(batch_records)} records to {batch_output_file}")
+        logging.info(f"Batch {batch_idx}: exported {export_count}/{len(batch_records)} records to {batch_output_file}")
+        total_exported += export_count
+    return total_exported
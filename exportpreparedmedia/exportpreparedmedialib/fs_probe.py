@@ -0,0 +1,97 @@
+"""
+Cached filesystem lookups for one export run.
+
+Every enabled bank used to probe the same source and alternative-format paths
+again, and each probe is a round trip on network-mounted libraries.
+FileSystemProbe keeps an in-memory snapshot of the directories it has seen
+instead: a directory is listed once, and every later lookup of a file in it
+(the source JPG, its PNG/TIF siblings, other banks asking again) is answered
+from that listing. The calls that really reached the filesystem are counted,
+so the cost of a run can be logged.
+"""
+
+import os
+import threading
+from typing import Dict, FrozenSet, Optional
+
+
+class FileSystemProbe:
+    """Directory snapshot shared by all lookups of one export run."""
+
+    def __init__(self):
+        self._listings: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._exists: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self.filesystem_calls = 0
+        self.lookups = 0
+
+    def exists(self, path: str) -> bool:
+        """
+        Check whether ``path`` exists, using the snapshot of its directory.
+
+        Args:
+            path: File path to check
+
+        Returns:
+            True if the path exists
+        """
+        key = str(path)
+        with self._lock:
+            self.lookups += 1
+            if key in self._exists:
+                return self._exists[key]
+
+        directory, name = os.path.split(key)
+        names = self.listdir(directory or os.curdir) if name else None
+        if names is None:
+            # Unreadable directory (or no file name): ask the filesystem directly
+            result = os.path.exists(key)
+            with self._lock:
+                self.filesystem_calls += 1
+        else:
+            result = os.path.normcase(name) in names
+
+        with self._lock:
+            self._exists[key] = result
+        return result
+
+    def listdir(self, directory: str) -> Optional[FrozenSet[str]]:
+        """
+        Names in ``directory`` (normalized with os.path.normcase), listed once per run.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            The names, an empty set for a missing directory, or None if it cannot be read
+        """
+        key = os.path.normcase(os.path.abspath(directory))
+        with self._lock:
+            if key in self._listings:
+                return self._listings[key]
+
+        try:
+            with os.scandir(key) as entries:
+                names: Optional[FrozenSet[str]] = frozenset(os.path.normcase(entry.name) for entry in entries)
+        except (FileNotFoundError, NotADirectoryError):
+            names = frozenset()
+        except OSError:
+            names = None
+
+        with self._lock:
+            self.filesystem_calls += 1
+            self._listings[key] = names
+        return names
+
+    @property
+    def directories(self) -> int:
+        """Number of directories in the snapshot."""
+        with self._lock:
+            return len(self._listings)
+
+    def summary(self) -> str:
+        """One-line report of lookups and filesystem calls."""
+        return (
+            f"{self.filesystem_calls} filesystem calls for {self.lookups} path lookups "
+            f"({self.directories} directories listed)"
+        )
@@ -34,6 +34,7 @@ def test_main_filters_edited_items(monkeypatch):
         all=False,
         include_edited=False,
         include_alternative_formats=False,
+        export_workers=1,
     )
 
     items = [
@@ -34,6 +34,7 @@ def test_main_rejects_all_with_individual(monkeypatch):
         all=True,
         include_edited=False,
         include_alternative_formats=False,
+        export_workers=1,
     )
 
     called = {"export": False}
@@ -2,6 +2,8 @@
 Unit tests for exportpreparedmedialib/exporters.py.
 """
 
+import csv
+import logging
 import sys
 from pathlib import Path
 
@@ -10,6 +12,8 @@ export_root = project_root / "exportpreparedmedia"
 sys.path.insert(0, str(export_root))
 
 import exportpreparedmedialib.exporters as exporters
+from exportpreparedmedialib.export_writer import ExportFileWriter
+from exportpreparedmedialib.fs_probe import FileSystemProbe
 
 
 def test_expand_item_with_alternative_formats__missing_source(tmp_path):
@@ -72,8 +76,97 @@ def test_export_to_photobanks__batch_split(monkeypatch, tmp_path):
     monkeypatch.setattr(exporters, "load_category_map", lambda *_a, **_k: {})
     monkeypatch.setattr(exporters, "load_pond_prices", lambda *_a, **_k: {})
     monkeypatch.setattr(exporters, "extract_media_properties", lambda *_a, **_k: {"filename": "a.jpg"})
-    monkeypatch.setattr(exporters, "expand_item_with_alternative_formats", lambda item, bank, include_alternatives: [item])
+    monkeypatch.setattr(exporters, "expand_item_with_alternative_formats", lambda item, bank, include_alternatives, **_k: [item])
     monkeypatch.setattr(exporters, "export_mediafile", lambda *_a, **_k: True)
     monkeypatch.setattr(exporters, "PHOTOBANK_BATCH_SIZE_LIMITS", {"X": 1})
 
     exporters.export_to_photobanks(items, ["X"], output_paths, filter_func=None, include_alternative_formats=False)
+
+
+def _append_like_before(path, header, fieldnames, delimiter, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header + "\n")
+    for row in rows:
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=delimiter,
+                                    quotechar='"', quoting=csv.QUOTE_ALL)
+            writer.writerow(row)
+
+
+def test_export_mediafile__writer_output_matches_append_path(monkeypatch, tmp_path):
+    column_map = [{"target": "Name", "source": "a"}, {"target": "Fixed", "value": "v"},
+                  {"target": "Upper", "source": "b", "transform": str.upper}]
+    monkeypatch.setattr(exporters, "get_column_map", lambda _b: column_map)
+    records = [{"a": f"file {i}.jpg", "b": 'say "hi"\tnow' if i % 2 else "ok"} for i in range(50)]
+    formats = {"X": {"delimiter": "\t", "headers": "Name\tFixed\tUpper"}}
+
+    output = tmp_path / "out.csv"
+    with ExportFileWriter(str(output), ["Name", "Fixed", "Upper"], "\t", header="Name\tFixed\tUpper") as writer:
+        for record in records:
+            assert exporters.export_mediafile("X", record, str(output), formats, writer=writer)
+
+    expected = tmp_path / "expected.csv"
+    rows = [exporters.build_csv_record(column_map, record) for record in records]
+    _append_like_before(str(expected), "Name\tFixed\tUpper", ["Name", "Fixed", "Upper"], "\t", rows)
+
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def test_export_mediafile__no_debug_dump_when_debug_off(monkeypatch, tmp_path):
+    monkeypatch.setattr(exporters, "get_column_map", lambda _b: [{"target": "A", "source": "a"}])
+
+    def fail(*_a, **_k):
+        raise AssertionError("json.dumps called with debug logging off")
+
+    monkeypatch.setattr(exporters.json, "dumps", fail)
+    monkeypatch.setattr(logging.getLogger(), "level", logging.INFO)
+
+    output = tmp_path / "out.csv"
+    with ExportFileWriter(str(output), ["A"], ",", header="A") as writer:
+        assert exporters.export_mediafile("X", {"a": "1"}, str(output), {}, writer=writer)
+    assert writer.rows_written == 1
+
+
+def test_collect_bank_records__one_pass_shares_properties(monkeypatch, tmp_path):
+    source = tmp_path / "JPG" / "image.jpg"
+    source.parent.mkdir()
+    source.write_text("x", encoding="utf-8")
+    calls = []
+
+    def fake_properties(item, *_a, **_k):
+        calls.append(item["Cesta"])
+        return {"filename": Path(item["Cesta"]).name}
+
+    monkeypatch.setattr(exporters, "extract_media_properties", fake_properties)
+    probe = FileSystemProbe()
+
+    records = exporters.collect_bank_records(
+        [{"Cesta": str(source), "Soubor": source.name}, {"Cesta": str(tmp_path / "missing.jpg")}],
+        ["ShutterStock", "AdobeStock", "Pond5"], {}, {}, probe=probe)
+
+    assert calls == [str(source)]
+    assert all(len(bank_records) == 1 for bank_records in records.values())
+    assert records["ShutterStock"][0] is records["Pond5"][0]
+    assert probe.filesystem_calls == 2
+    assert probe.lookups == 6
+
+
+def test_export_to_photobanks__writes_every_bank(monkeypatch, tmp_path):
+    items = [{"Cesta": str(tmp_path / f"{name}.jpg"), "name": name} for name in ("a", "b", "c")]
+    output_paths = {bank: str(tmp_path / f"{bank}.csv") for bank in ("X", "Y")}
+
+    monkeypatch.setattr(exporters, "load_photobank_headers",
+                        lambda _p: {"X": {"headers": "Name", "delimiter": ","}, "Y": {"headers": "Name", "delimiter": ";"}})
+    monkeypatch.setattr(exporters, "load_category_map", lambda *_a, **_k: {})
+    monkeypatch.setattr(exporters, "load_pond_prices", lambda *_a, **_k: {})
+    monkeypatch.setattr(exporters, "get_column_map", lambda _b: [{"target": "Name", "source": "filename"}])
+    monkeypatch.setattr(exporters, "extract_media_properties", lambda item, *_a, **_k: {"filename": item["name"]})
+    monkeypatch.setattr(exporters, "expand_item_with_alternative_formats", lambda item, *_a, **_k: [item])
+
+    exporters.export_to_photobanks(items, ["X", "Y"], output_paths,
+                                   filter_func=lambda item, bank: bank == "X" or item["name"] != "b")
+
+    x_lines = Path(output_paths["X"]).read_text(encoding="utf-8").splitlines()
+    y_lines = Path(output_paths["Y"]).read_text(encoding="utf-8").splitlines()
+    assert x_lines == ["Name", '"a"', '"b"', '"c"']
+    assert y_lines == ["Name", '"a"', '"c"']
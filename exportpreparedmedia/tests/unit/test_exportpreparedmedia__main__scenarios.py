@@ -38,6 +38,7 @@ def make_args(tmp_path, **overrides):
         all=False,
         include_edited=False,
         include_alternative_formats=False,
+        export_workers=1,
     )
     defaults.update(overrides)
     return SimpleNamespace(**defaults)
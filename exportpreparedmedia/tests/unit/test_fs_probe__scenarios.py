@@ -0,0 +1,75 @@
+"""
+Unit tests for exportpreparedmedialib/fs_probe.py.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+export_root = project_root / "exportpreparedmedia"
+sys.path.insert(0, str(export_root))
+
+import exportpreparedmedialib.fs_probe as fs_probe
+import exportpreparedmedialib.exporters as exporters
+
+
+def test_exists__answers_siblings_from_one_listing(monkeypatch, tmp_path):
+    for name in ("a.jpg", "b.jpg", "c.png"):
+        (tmp_path / name).write_text("x", encoding="utf-8")
+
+    def probed(_path):
+        raise AssertionError("os.path.exists called")
+
+    monkeypatch.setattr(fs_probe.os.path, "exists", probed)
+    probe = fs_probe.FileSystemProbe()
+
+    assert probe.exists(str(tmp_path / "a.jpg")) is True
+    assert probe.exists(str(tmp_path / "c.png")) is True
+    assert probe.exists(str(tmp_path / "a.png")) is False
+    assert probe.exists(str(tmp_path / "a.jpg")) is True
+
+    assert probe.filesystem_calls == 1
+    assert probe.lookups == 4
+    assert probe.directories == 1
+
+
+def test_exists__missing_directory_is_listed_once(tmp_path):
+    probe = fs_probe.FileSystemProbe()
+
+    assert probe.exists(str(tmp_path / "PNG" / "a.png")) is False
+    assert probe.exists(str(tmp_path / "PNG" / "b.png")) is False
+    assert probe.filesystem_calls == 1
+
+
+def test_exists__unreadable_directory_falls_back(monkeypatch, tmp_path):
+    (tmp_path / "a.jpg").write_text("x", encoding="utf-8")
+
+    def denied(_path):
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(fs_probe.os, "scandir", denied)
+    probe = fs_probe.FileSystemProbe()
+
+    assert probe.exists(str(tmp_path / "a.jpg")) is True
+    assert probe.exists(str(tmp_path / "b.jpg")) is False
+
+
+def test_expand_item__uses_snapshot_for_alternatives(tmp_path):
+    for fmt, ext in (("JPG", ".jpg"), ("PNG", ".png"), ("TIF", ".tif")):
+        folder = tmp_path / fmt / "set"
+        folder.mkdir(parents=True)
+        for index in range(3):
+            (folder / f"image{index}{ext}").write_text("x", encoding="utf-8")
+    probe = fs_probe.FileSystemProbe()
+
+    expanded = []
+    for index in range(3):
+        source = tmp_path / "JPG" / "set" / f"image{index}.jpg"
+        item = {"Cesta": str(source), "Soubor": source.name}
+        expanded += exporters.expand_item_with_alternative_formats(item, "Pond5", True, probe=probe)
+
+    assert len(expanded) == 9
+    assert probe.lookups == 9
+    assert probe.filesystem_calls == 3
+    assert os.path.basename(expanded[1]["Cesta"]) in ("image0.png", "image0.tif")
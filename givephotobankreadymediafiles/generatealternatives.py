@@ -14,9 +14,13 @@ from shared.file_operations import ensure_directory
 from givephotobankreadymediafileslib.constants import (
     DEFAULT_LOG_DIR, IMAGE_EXTENSIONS,
     DEFAULT_ALTERNATIVE_EFFECTS, DEFAULT_ALTERNATIVE_FORMATS,
-    EFFECT_NAME_MAPPING, FORMAT_NAME_MAPPING, ALTERNATIVE_EDIT_TAGS, ALTERNATIVE_FORMATS
+    EFFECT_NAME_MAPPING, FORMAT_NAME_MAPPING, ALTERNATIVE_EDIT_TAGS, ALTERNATIVE_FORMATS,
+    ALTERNATIVE_MAX_WORKERS, ALTERNATIVE_MEMORY_LIMIT_MB,
+    ALTERNATIVE_ENCODING_PROFILES, DEFAULT_ALTERNATIVE_ENCODING_PROFILE, ALTERNATIVE_ENCODING_THREADS
+)
+from givephotobankreadymediafileslib.alternative_generator import (
+    AlternativeGenerator, get_alternative_output_dirs, compare_encoding_profiles
 )
-from givephotobankreadymediafileslib.alternative_generator import AlternativeGenerator, get_alternative_output_dirs
 
 
 def parse_arguments():
@@ -47,6 +51,22 @@ def parse_arguments():
     parser.add_argument("--effects-only", action="store_true",
                         help="Generate only edit effects, no format conversions")
 
+    # Encoding of format conversions
+    available_profiles = ', '.join(ALTERNATIVE_ENCODING_PROFILES)
+    parser.add_argument("--encoding", type=str, default=DEFAULT_ALTERNATIVE_ENCODING_PROFILE,
+                        choices=list(ALTERNATIVE_ENCODING_PROFILES),
+                        help=f"Lossless PNG/TIF encoding profile. Available: {available_profiles} (default: {DEFAULT_ALTERNATIVE_ENCODING_PROFILE})")
+    parser.add_argument("--encoding_threads", type=int, default=ALTERNATIVE_ENCODING_THREADS,
+                        help=f"Threads encoding the format conversions at the same time (default: {ALTERNATIVE_ENCODING_THREADS})")
+    parser.add_argument("--compare_encodings", action="store_true",
+                        help="Only measure encode time and file size of every encoding profile, write nothing")
+
+    # Parallel processing
+    parser.add_argument("--workers", type=int, default=ALTERNATIVE_MAX_WORKERS,
+                        help=f"Worker processes for format and effect jobs, 1 = sequential (default: {ALTERNATIVE_MAX_WORKERS})")
+    parser.add_argument("--memory_limit_mb", type=int, default=ALTERNATIVE_MEMORY_LIMIT_MB,
+                        help=f"Memory budget for running jobs in MB (default: {ALTERNATIVE_MEMORY_LIMIT_MB})")
+
     return parser.parse_args()
 
 
@@ -108,6 +128,22 @@ def validate_file(file_path: str) -> bool:
     return True
 
 
+def print_encoding_comparison(file_path: str, formats: List[str]) -> int:
+    """Print encode time and size of every encoding profile for the file."""
+    if not formats:
+        print("ERROR: No formats to compare.")
+        return 1
+
+    print(f"Encoding profiles for: {os.path.basename(file_path)}")
+    print()
+    measurements = compare_encoding_profiles(file_path, formats)
+    for item in measurements:
+        size_mb = item['size_bytes'] / (1024 * 1024)
+        print(f"  {item['encoding']:<14} {item['format']:<6} {size_mb:>8.1f} MB {item['encode_seconds']:>8.2f}s")
+        logging.info(f"Encoding {item['encoding']} {item['format']}: {size_mb:.1f} MB in {item['encode_seconds']:.2f}s")
+    return 0 if measurements else 1
+
+
 def main():
     """Main function."""
     # Parse arguments
@@ -139,6 +175,9 @@ def main():
         enabled_formats = [] if args.effects_only else mapped_formats
         enabled_effects = [] if args.formats_only else mapped_effects
 
+        if args.compare_encodings:
+            return print_encoding_comparison(args.file, mapped_formats)
+
         if not enabled_formats and not enabled_effects:
             print("ERROR: Nothing to generate. Use --formats-only or --effects-only, or specify formats/effects.")
             return 1
@@ -154,7 +193,11 @@ def main():
         # Initialize generator
         generator = AlternativeGenerator(
             enabled_alternatives=enabled_effects,
-            enabled_formats=enabled_formats
+            enabled_formats=enabled_formats,
+            max_workers=args.workers,
+            memory_limit_mb=args.memory_limit_mb,
+            encoding=args.encoding,
+            encoding_threads=args.encoding_threads
         )
 
         print(f"Processing: {os.path.basename(args.file)}")
@@ -164,7 +207,8 @@ def main():
         print()
 
         # Generate alternatives
-        alternatives = generator.generate_all_versions(args.file, target_dir, edited_dir)
+        with generator:
+            alternatives = generator.generate_all_versions(args.file, target_dir, edited_dir)
 
         if alternatives:
             print(f"Successfully generated {len(alternatives)} alternative versions:")
@@ -179,7 +223,8 @@ def main():
                 for alt in format_conversions:
                     filename = os.path.basename(alt['path'])
                     size_mb = os.path.getsize(alt['path']) / (1024 * 1024)
-                    print(f"  {filename} ({size_mb:.1f} MB) - {alt['description']}")
+                    encode_seconds = alt.get('encode_seconds', 0.0)
+                    print(f"  {filename} ({size_mb:.1f} MB, encoded in {encode_seconds:.2f}s) - {alt['description']}")
                 print()
 
             if edit_effects:
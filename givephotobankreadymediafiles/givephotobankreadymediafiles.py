@@ -9,12 +9,13 @@ import logging
 
 from shared.logging_config import setup_logging
 from shared.file_operations import ensure_directory, read_json
+from shared.media_store import close_media_store, get_media_store, open_media_store
 from shared.config import get_config
 from givephotobankreadymediafileslib.constants import (
     DEFAULT_MEDIA_CSV_PATH, DEFAULT_CATEGORIES_CSV_PATH, DEFAULT_LOG_DIR, 
     DEFAULT_PROCESSED_MEDIA_MAX_COUNT, DEFAULT_INTERVAL,
     DEFAULT_BATCH_MODE, DEFAULT_BATCH_SIZE, DEFAULT_BATCH_WAIT_TIMEOUT,
-    DEFAULT_BATCH_POLL_INTERVAL, BATCH_LOCK_FILE
+    DEFAULT_BATCH_POLL_INTERVAL, BATCH_LOCK_FILE, ALTERNATIVE_MAX_WORKERS
 )
 from givephotobankreadymediafileslib.mediainfo_loader import (
     load_media_records, load_categories
@@ -54,8 +55,12 @@ def parse_arguments():
                         help="Optional wait time for batch completion in seconds (default: 3600, 0 = unlimited)")
     parser.add_argument("--batch_poll_interval", type=int, default=DEFAULT_BATCH_POLL_INTERVAL,
                         help=f"Batch poll interval in seconds (default: {DEFAULT_BATCH_POLL_INTERVAL})")
+    parser.add_argument("--alternative_workers", type=int, default=ALTERNATIVE_MAX_WORKERS,
+                        help=f"Worker processes generating alternative files in batch mode, 1 = sequential (default: {ALTERNATIVE_MAX_WORKERS})")
     parser.add_argument("--check_batch_status", action="store_true",
                         help="Print status of active batches and exit")
+    parser.add_argument("--media_store", type=str, default=None,
+                        help="SQLite media store for per-record updates; the CSV is written once at the end")
 
     return parser.parse_args()
 
@@ -82,6 +87,18 @@ def main():
             print(line)
         return 0
 
+    store = None
+    if args.media_store and os.path.exists(args.media_csv):
+        store = open_media_store(args.media_csv, args.media_store)
+
+    try:
+        return run(args, config)
+    finally:
+        close_media_store(store)
+
+
+def run(args, config) -> int:
+    """Run batch or sequential processing; returns a process exit code."""
     if args.batch_mode:
         lock = BatchLock(BATCH_LOCK_FILE)
         try:
@@ -96,7 +113,8 @@ def main():
                 media_csv=args.media_csv,
                 batch_size=args.batch_size,
                 wait_timeout=args.batch_wait_timeout,
-                poll_interval=args.batch_poll_interval
+                poll_interval=args.batch_poll_interval,
+                alternative_workers=args.alternative_workers
             )
             return 0
         finally:
@@ -144,9 +162,11 @@ def main():
     print(f"Found {len(unprocessed_records)} files to process")
     
     # Process files sequentially with user-specified limits
+    store = get_media_store(args.media_csv)
     stats = process_unmatched_files(unprocessed_records, config=config, 
                                    max_count=args.max_count, interval=args.interval, 
-                                   media_csv=args.media_csv)
+                                   media_csv=args.media_csv,
+                                   media_store=store.db_path if store is not None else None)
     
     # Summary
     total_attempted = stats['processed'] + stats['failed']
@@ -1,9 +1,39 @@
 """
 Alternative versions generator for photobank media files.
 Creates processed variants (B&W, negative, sharpened, misty, blurred) and format conversions.
+
+generate_all_versions decodes the source image once. The format conversions
+are written from that image, and every effect is computed once from it and
+saved for the original and each converted format (the converted files hold
+the same pixels, so re-reading them gave the same input). Time and
+approximate peak memory of each photo are logged and kept in last_run_stats.
+
+With max_workers > 1 the format conversions and the effects run as separate
+jobs in a process pool, for one photo (generate_all_versions) or many
+(generate_many). Each job decodes the source itself and runs the same code as
+the sequential path, so the written files are identical. Edits of a photo are
+started once its format conversions are done, and a job is only started while
+the estimated memory of the running jobs stays within memory_limit_mb.
+
+The misty effect builds its cloud texture at a fraction of the image size
+(blurring full-resolution noise with a 121x121 kernel only leaves the
+low-frequency part anyway), caches it per size and seed, and screen-blends
+the upscaled fog into all channels at once.
+
+Format conversions are written with a lossless encoding profile
+(ALTERNATIVE_ENCODING_PROFILES): uncompressed as before, or PNG/TIFF
+compression that trades encoding time for much smaller files. Encode time and
+output size are logged and returned with each conversion, and
+compare_encoding_profiles measures all profiles on one photo.
 """
-from typing import List, Tuple, Dict, Optional, TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple, Dict, Optional, TYPE_CHECKING
+import functools
 import os
+import tempfile
+import time
+import tracemalloc
 import cv2
 import numpy as np
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter
@@ -14,6 +44,9 @@ from tqdm import tqdm
 from .constants import (
     IMAGE_EXTENSIONS, VIDEO_EXTENSIONS,
     ALTERNATIVE_EDIT_TAGS, ALTERNATIVE_FORMATS,
+    ALTERNATIVE_MAX_WORKERS, ALTERNATIVE_MEMORY_LIMIT_MB, ALTERNATIVE_JOB_MEMORY_FACTORS,
+    ALTERNATIVE_MISTY_FOG_SCALE, ALTERNATIVE_MISTY_SEED,
+    ALTERNATIVE_ENCODING_PROFILES, DEFAULT_ALTERNATIVE_ENCODING_PROFILE, ALTERNATIVE_ENCODING_THREADS,
     ORIGINAL_YES, ORIGINAL_NO
 )
 
@@ -26,7 +59,11 @@ logger = logging.getLogger(__name__)
 class AlternativeGenerator:
     """Generator for alternative versions and format conversions of media files."""
 
-    def __init__(self, enabled_alternatives: Optional[List[str]] = None, enabled_formats: Optional[List[str]] = None):
+    def __init__(self, enabled_alternatives: Optional[List[str]] = None, enabled_formats: Optional[List[str]] = None,
+                 max_workers: int = ALTERNATIVE_MAX_WORKERS, memory_limit_mb: int = ALTERNATIVE_MEMORY_LIMIT_MB,
+                 misty_seed: Optional[int] = ALTERNATIVE_MISTY_SEED,
+                 encoding: str = DEFAULT_ALTERNATIVE_ENCODING_PROFILE,
+                 encoding_threads: int = ALTERNATIVE_ENCODING_THREADS):
         """
         Initialize alternative generator.
 
@@ -37,10 +74,41 @@ class AlternativeGenerator:
             enabled_formats: List of additional formats to generate.
                            If None, generates all available formats.
                            If empty list [], generates no format conversions.
+            max_workers: Worker processes for format and effect jobs (1 = sequential in this process)
+            memory_limit_mb: Budget for the estimated memory of running jobs; one job always runs
+            misty_seed: Seed of the misty cloud texture (None = different fog on every run)
+            encoding: Encoding profile of format conversions (key of ALTERNATIVE_ENCODING_PROFILES)
+            encoding_threads: Threads encoding the formats of a photo at the same time (sequential mode)
+
+        Raises:
+            ValueError: If the encoding profile is unknown
         """
+        if encoding not in ALTERNATIVE_ENCODING_PROFILES:
+            available = ', '.join(ALTERNATIVE_ENCODING_PROFILES)
+            raise ValueError(f"Unknown encoding profile '{encoding}'. Available profiles: {available}")
         self.enabled_alternatives = enabled_alternatives if enabled_alternatives is not None else list(ALTERNATIVE_EDIT_TAGS.keys())
         self.enabled_formats = enabled_formats if enabled_formats is not None else ALTERNATIVE_FORMATS
-        logger.debug(f"Alternative generator initialized - Effects: {self.enabled_alternatives}, Formats: {self.enabled_formats}")
+        self.max_workers = max(1, max_workers)
+        self.memory_limit_mb = memory_limit_mb
+        self.misty_seed = misty_seed
+        self.encoding = encoding
+        self.encoding_threads = max(1, encoding_threads)
+        self.last_run_stats: Dict[str, float] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        logger.debug(f"Alternative generator initialized - Effects: {self.enabled_alternatives}, "
+                     f"Formats: {self.enabled_formats}, Workers: {self.max_workers}, Encoding: {self.encoding}")
+
+    def __enter__(self) -> "AlternativeGenerator":
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool (it is started again when needed)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def generate_all_versions(self, source_file: str, target_dir: str, edited_dir: str) -> List[Dict[str, str]]:
         """
@@ -56,30 +124,228 @@ class AlternativeGenerator:
             [{'type': 'format', 'edit': None, 'path': '/path/to/file.png', 'original': '/source/file.jpg'},
              {'type': 'edit', 'edit': 'bw', 'path': '/path/to/file_bw.jpg', 'original': '/source/file.jpg'}, ...]
         """
+        if not self._is_supported_source(source_file):
+            return []
+
+        if self.max_workers > 1:
+            return self._generate_in_pool([(source_file, target_dir, edited_dir)]).get(source_file, [])
+
+        started = time.perf_counter()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        memory = _ImageMemory()
+
+        try:
+            generated_files = self._generate_from_single_decode(source_file, target_dir, edited_dir, memory)
+            python_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        seconds = time.perf_counter() - started
+        self.last_run_stats = {
+            'seconds': seconds,
+            'decodes': memory.decodes,
+            'files': len(generated_files),
+            'peak_memory_mb': (memory.peak + python_peak) / (1024 * 1024),
+        }
+        logger.info(
+            f"Generated {len(generated_files)} versions of {os.path.basename(source_file)} in {seconds:.2f}s "
+            f"({memory.decodes} decode, peak memory ~{self.last_run_stats['peak_memory_mb']:.0f} MB)"
+        )
+        return generated_files
+
+    def generate_many(self, photos: List[Tuple[str, str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Generate all versions of several photos.
+
+        With max_workers > 1 the jobs of all photos share the worker pool, so
+        one photo's effects run while another's are still being encoded.
+
+        Args:
+            photos: (source_file, target_dir, edited_dir) for each photo
+
+        Returns:
+            Generated files of each source file, as returned by generate_all_versions
+        """
+        if self.max_workers > 1:
+            return self._generate_in_pool([photo for photo in photos if self._is_supported_source(photo[0])])
+
+        started = time.perf_counter()
+        generated: Dict[str, List[Dict[str, str]]] = {}
+        decodes = peak = 0
+        for source_file, target_dir, edited_dir in photos:
+            self.last_run_stats = {}
+            generated[source_file] = self.generate_all_versions(source_file, target_dir, edited_dir)
+            decodes += self.last_run_stats.get('decodes', 0)
+            peak = max(peak, self.last_run_stats.get('peak_memory_mb', 0))
+        self.last_run_stats = {
+            'seconds': time.perf_counter() - started,
+            'decodes': decodes,
+            'files': sum(len(files) for files in generated.values()),
+            'peak_memory_mb': peak,
+        }
+        return generated
+
+    @staticmethod
+    def _is_supported_source(source_file: str) -> bool:
+        """Whether alternatives can be generated from the file (logs why not)."""
         if not os.path.exists(source_file):
             logger.error(f"Source file does not exist: {source_file}")
-            return []
+            return False
 
         file_ext = os.path.splitext(source_file)[1].lower()
         if file_ext not in [ext.lower() for ext in IMAGE_EXTENSIONS]:
             logger.warning(f"Unsupported file type for alternatives: {file_ext}")
+            return False
+        return True
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _plan_photo(self, source_file: str, target_dir: str, edited_dir: str) -> Optional["_PhotoPlan"]:
+        """Read the image header and prepare the format jobs of one photo."""
+        try:
+            with Image.open(source_file) as header:
+                # Converted formats and most effects work on RGB pixels
+                image_bytes = header.width * header.height * max(3, len(header.getbands()))
+        except Exception as e:
+            logger.error(f"Failed to decode {source_file}: {e}")
+            return None
+
+        plan = _PhotoPlan(source_file, target_dir, edited_dir, image_bytes)
+        plan.format_jobs = [self._make_job(plan, 'format', fmt) for fmt in self.enabled_formats]
+        plan.format_results = [_NOT_DONE] * len(plan.format_jobs)
+        return plan
+
+    def _make_job(self, plan: "_PhotoPlan", kind: str, name: str) -> "_AlternativeJob":
+        factor = ALTERNATIVE_JOB_MEMORY_FACTORS.get('format' if kind == 'format' else name,
+                                                    max(ALTERNATIVE_JOB_MEMORY_FACTORS.values()))
+        return _AlternativeJob(kind, name, plan.source_file, plan.target_dir, plan.edited_dir,
+                               memory=plan.image_bytes * factor, misty_seed=self.misty_seed,
+                               encoding=self.encoding)
+
+    def _edit_jobs(self, plan: "_PhotoPlan") -> List["_AlternativeJob"]:
+        """Effect jobs of a photo whose format conversions are done."""
+        jobs = []
+        format_paths = [item['path'] for item in plan.format_results if item is not None]
+        for edit_tag in self.enabled_alternatives:
+            if edit_tag not in ALTERNATIVE_EDIT_TAGS:
+                logger.warning(f"Unknown edit tag: {edit_tag}")
+                continue
+            job = self._make_job(plan, 'edit', edit_tag)
+            job.format_paths = format_paths
+            jobs.append(job)
+        return jobs
+
+    def _generate_in_pool(self, photos: List[Tuple[str, str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        """Run the format and effect jobs of the photos in the worker pool."""
+        started = time.perf_counter()
+        generated: Dict[str, List[Dict[str, str]]] = {photo[0]: [] for photo in photos}
+        plans = [plan for plan in (self._plan_photo(*photo) for photo in photos) if plan is not None]
+
+        pending: List[_AlternativeJob] = []
+        for plan in plans:
+            pending.extend(plan.format_jobs or self._edit_jobs(plan))
+        plan_of = {plan.source_file: plan for plan in plans}
+
+        executor = self._get_executor()
+        budget = self.memory_limit_mb * 1024 * 1024
+        running: Dict[Future, _AlternativeJob] = {}
+        in_flight = peak = jobs_done = 0
+        known_tags = [tag for tag in self.enabled_alternatives if tag in ALTERNATIVE_EDIT_TAGS]
+        total_jobs = sum(len(plan.format_jobs) + len(known_tags) for plan in plans)
+
+        with tqdm(total=total_jobs, desc="Creating alternatives", unit="job", leave=True, position=0) as pbar:
+            while pending or running:
+                # Start jobs in order while they fit in the memory budget (and at least one runs)
+                while pending and len(running) < self.max_workers and (
+                        not running or in_flight + pending[0].memory <= budget):
+                    job = pending.pop(0)
+                    running[executor.submit(_run_alternative_job, job)] = job
+                    in_flight += job.memory
+                    peak = max(peak, in_flight)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    in_flight -= job.memory
+                    jobs_done += 1
+                    pbar.update(1)
+                    plan = plan_of[job.source_file]
+                    try:
+                        result, records = future.result()
+                        for record in records:
+                            logger.handle(record)
+                    except Exception as e:
+                        logger.error(f"Failed to generate {job.name} for {job.source_file}: {e}")
+                        result = None if job.kind == 'format' else []
+
+                    if job.kind == 'format':
+                        plan.format_results[plan.format_jobs.index(job)] = result
+                        if all(item is not _NOT_DONE for item in plan.format_results):
+                            pending.extend(self._edit_jobs(plan))
+                    else:
+                        plan.edit_results.extend(
+                            (plan.source_index(item['original']), self.enabled_alternatives.index(job.name), item)
+                            for item in result
+                        )
+
+        for plan in plans:
+            formats = [item for item in plan.format_results if item not in (None, _NOT_DONE)]
+            edits = [item for _, _, item in sorted(plan.edit_results, key=lambda entry: entry[:2])]
+            generated[plan.source_file] = formats + edits
+
+        seconds = time.perf_counter() - started
+        self.last_run_stats = {
+            'seconds': seconds,
+            'decodes': jobs_done,
+            'files': sum(len(files) for files in generated.values()),
+            'peak_memory_mb': peak / (1024 * 1024),
+        }
+        logger.info(
+            f"Generated {self.last_run_stats['files']} versions of {len(photos)} photo(s) in {seconds:.2f}s "
+            f"with {self.max_workers} workers ({jobs_done} jobs, estimated peak memory ~{self.last_run_stats['peak_memory_mb']:.0f} MB)"
+        )
+        return generated
+
+    def _generate_from_single_decode(self, source_file: str, target_dir: str, edited_dir: str,
+                                     memory: "_ImageMemory") -> List[Dict[str, str]]:
+        """Decode the source once and write all format conversions and edit alternatives from it."""
+        try:
+            image = Image.open(source_file)
+            image.load()
+        except Exception as e:
+            logger.error(f"Failed to decode {source_file}: {e}")
             return []
+        memory.decodes += 1
+        memory.hold(image)
+
+        # Converted formats get RGB/RGBA pixels; the same pixels are the input of their edits
+        format_image = image if image.mode in ('RGB', 'RGBA') else image.convert('RGB')
+        if format_image is not image:
+            memory.hold(format_image)
 
         generated_files = []
 
         # 1. Generate format conversions (PNG, TIF) - go to target_dir (only if formats enabled)
         format_files = []
         if self.enabled_formats:
-            format_files = self._generate_format_conversions(source_file, target_dir)
+            format_files = self._generate_format_conversions(source_file, target_dir, image=format_image)
             generated_files.extend(format_files)
 
         # 2. Generate edit alternatives for ALL formats with single progress bar
         if self.enabled_alternatives:
-            # Collect all source files (original + all format conversions)
-            all_source_files = [source_file] + [f['path'] for f in format_files]
+            # Collect all source files (original + all format conversions) with their decoded pixels
+            all_sources = [(source_file, image)] + [(f['path'], format_image) for f in format_files]
 
             # Calculate total number of edit operations
-            total_edits = len(self.enabled_alternatives) * len(all_source_files)
+            total_edits = len(self.enabled_alternatives) * len(all_sources)
 
             # Log before progress bar to separate it
             source_name = os.path.basename(source_file)
@@ -87,9 +353,8 @@ class AlternativeGenerator:
 
             # Single progress bar for all edit alternatives
             with tqdm(total=total_edits, desc="Creating edited versions", unit="effect", leave=True, position=0) as pbar:
-                for source in all_source_files:
-                    alternatives = self._generate_edit_alternatives(source, edited_dir, progress_bar=pbar)
-                    generated_files.extend(alternatives)
+                alternatives = self._generate_fused_edits(all_sources, edited_dir, memory, progress_bar=pbar)
+            generated_files.extend(alternatives)
 
             # Log after progress bar to separate it
             logger.info(f"Finished creating edited versions")
@@ -97,35 +362,117 @@ class AlternativeGenerator:
         logger.debug(f"Generated {len(generated_files)} total alternative versions for {source_file}")
         return generated_files
 
-    def _generate_format_conversions(self, source_file: str, target_dir: str) -> List[Dict[str, str]]:
-        """Generate format conversions (PNG, TIF) of the original file."""
-        generated_files = []
+    def _generate_fused_edits(self, sources: List[Tuple[str, Image.Image]], edited_dir: str,
+                              memory: "_ImageMemory", progress_bar=None) -> List[Dict[str, str]]:
+        """
+        Apply each effect once per distinct decoded image and save it for every source file.
 
-        for new_format in tqdm(self.enabled_formats, desc="Creating format conversions", unit="format", leave=False):
-            try:
-                # Get proper output path with correct directory structure
-                output_path = get_format_conversion_path(source_file, new_format)
-
-                # Ensure output directory exists
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                # Convert format
-                success = self._convert_format(source_file, output_path, new_format)
-                if success:
-                    generated_files.append({
-                        'type': 'format',
-                        'edit': None,
-                        'format': new_format,
-                        'path': output_path,
-                        'original': source_file,
-                        'description': f'Format conversion to {new_format.upper()}'
-                    })
-                    logger.debug(f"Generated format conversion: {output_path}")
+        Only one effect result is kept in memory at a time. The returned list is
+        ordered like per-file generation (all edits of the first source, then the next).
+        """
+        results: Dict[Tuple[int, int], Dict[str, str]] = {}
 
-            except Exception as e:
-                logger.error(f"Failed to generate {new_format} conversion for {source_file}: {e}")
+        for tag_index, edit_tag in enumerate(self.enabled_alternatives):
+            if edit_tag not in ALTERNATIVE_EDIT_TAGS:
+                logger.warning(f"Unknown edit tag: {edit_tag}")
+                if progress_bar:
+                    progress_bar.update(len(sources))
+                continue
 
-        return generated_files
+            effect = getattr(self, f'_effect{edit_tag}', None)
+            edited: Dict[int, Optional[Image.Image]] = {}
+            for source_index, (source_file, source_image) in enumerate(sources):
+                try:
+                    key = id(source_image)
+                    if key not in edited:
+                        edited[key] = self._compute_effect(effect, edit_tag, source_image)
+                        memory.hold(edited[key])
+                    if edited[key] is not None:
+                        alt_file = self._edit_output_path(source_file, edit_tag)
+                        edited[key].save(alt_file, quality=95, optimize=False)
+                        results[(source_index, tag_index)] = {
+                            'type': 'edit',
+                            'edit': edit_tag,
+                            'format': os.path.splitext(alt_file)[1],
+                            'path': alt_file,
+                            'original': source_file,
+                            'description': ALTERNATIVE_EDIT_TAGS[edit_tag]
+                        }
+                        logger.debug(f"Generated {edit_tag} alternative: {alt_file}")
+
+                except Exception as e:
+                    logger.error(f"Failed to generate {edit_tag} alternative for {source_file}: {e}")
+
+                # Update progress bar if provided
+                if progress_bar:
+                    progress_bar.update(1)
+
+            for result in edited.values():
+                memory.release(result)
+
+        return [results[key] for key in sorted(results)]
+
+    @staticmethod
+    def _compute_effect(effect: Optional[Callable[[Image.Image], Image.Image]], edit_tag: str,
+                        image: Image.Image) -> Optional[Image.Image]:
+        """Run one effect; None (logged) when it is missing or fails."""
+        if effect is None:
+            logger.error(f"Processor method _effect{edit_tag} not found")
+            return None
+        try:
+            return effect(image)
+        except Exception as e:
+            logger.error(f"Failed to apply {edit_tag} effect: {e}")
+            return None
+
+    def _generate_format_conversions(self, source_file: str, target_dir: str,
+                                     image: Optional[Image.Image] = None) -> List[Dict[str, str]]:
+        """Generate format conversions (PNG, TIF) of the original file (from ``image`` when already decoded)."""
+        def convert(new_format: str) -> Optional[Dict[str, str]]:
+            return self._generate_format_conversion(source_file, new_format, image)
+
+        threads = min(self.encoding_threads, len(self.enabled_formats))
+        progress = dict(total=len(self.enabled_formats), desc="Creating format conversions", unit="format", leave=False)
+        if threads > 1:
+            # The encoders release the GIL, so the formats are written side by side
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = list(tqdm(executor.map(convert, self.enabled_formats), **progress))
+        else:
+            results = [convert(new_format) for new_format in tqdm(self.enabled_formats, **progress)]
+
+        return [format_info for format_info in results if format_info]
+
+    def _generate_format_conversion(self, source_file: str, new_format: str,
+                                    image: Optional[Image.Image] = None) -> Optional[Dict[str, str]]:
+        """Generate one format conversion; None (logged) when it fails."""
+        try:
+            # Get proper output path with correct directory structure
+            output_path = get_format_conversion_path(source_file, new_format)
+
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+            # Convert format
+            if image is not None:
+                encoded = self._encode_format(image, output_path, new_format)
+            else:
+                with Image.open(source_file) as img:
+                    encoded = self._encode_format(img, output_path, new_format)
+            if encoded:
+                logger.debug(f"Generated format conversion: {output_path}")
+                return {
+                    'type': 'format',
+                    'edit': None,
+                    'format': new_format,
+                    'path': output_path,
+                    'original': source_file,
+                    'description': f'Format conversion to {new_format.upper()}',
+                    **encoded
+                }
+
+        except Exception as e:
+            logger.error(f"Failed to generate {new_format} conversion for {source_file}: {e}")
+        return None
 
     def _generate_edit_alternatives(self, source_file: str, edited_dir: str, progress_bar=None) -> List[Dict[str, str]]:
         """Generate edit alternatives (bw, negative, sharpen, misty, blurred) for a file."""
@@ -165,31 +512,66 @@ class AlternativeGenerator:
     def _convert_format(self, source_path: str, output_path: str, target_format: str) -> bool:
         """Convert file to different format with maximum quality."""
         try:
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
             with Image.open(source_path) as img:
-                # Convert to RGB if needed
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
-
-                if target_format.lower() == '.png':
-                    # PNG with maximum quality
-                    img.save(output_path, 'PNG', optimize=False, compress_level=0)
-                elif target_format.lower() in ['.tif', '.tiff']:
-                    # TIFF uncompressed with maximum quality
-                    img.save(output_path, 'TIFF', compression=None, quality=100)
-                else:
-                    logger.error(f"Unsupported target format: {target_format}")
-                    return False
-
-                return True
+                return self._save_format(img, output_path, target_format)
         except Exception as e:
             logger.error(f"Failed to convert format from {source_path} to {output_path}: {e}")
             return False
 
+    def _save_format(self, img: Image.Image, output_path: str, target_format: str) -> bool:
+        """Save a decoded image in a different format with maximum quality."""
+        return self._encode_format(img, output_path, target_format) is not None
+
+    def _encode_format(self, img: Image.Image, output_path: str, target_format: str) -> Optional[Dict[str, object]]:
+        """
+        Save a decoded image losslessly with the generator's encoding profile.
+
+        Returns:
+            {'encoding', 'encode_seconds', 'size_bytes'} of the written file, or None on failure
+        """
+        try:
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+            # Convert to RGB if needed
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+
+            profile = ALTERNATIVE_ENCODING_PROFILES[self.encoding]
+            started = time.perf_counter()
+            if target_format.lower() == '.png':
+                # PNG, lossless at every compression level
+                img.save(output_path, 'PNG', optimize=False, **profile['.png'])
+            elif target_format.lower() in ['.tif', '.tiff']:
+                # TIFF, uncompressed or with lossless compression
+                img.save(output_path, 'TIFF', **profile['.tif'])
+            else:
+                logger.error(f"Unsupported target format: {target_format}")
+                return None
+            seconds = time.perf_counter() - started
+
+            size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            logger.info(f"Encoded {os.path.basename(output_path)} ({self.encoding}): "
+                        f"{size / (1024 * 1024):.1f} MB in {seconds:.2f}s")
+            return {'encoding': self.encoding, 'encode_seconds': seconds, 'size_bytes': size}
+        except Exception as e:
+            logger.error(f"Failed to convert format to {output_path}: {e}")
+            return None
+
     def _generate_single_edit(self, source_file: str, edited_dir: str, edit_tag: str) -> Optional[str]:
         """Generate single edit alternative."""
+        # Apply the appropriate edit effect
+        processor_method = getattr(self, f'_apply{edit_tag}', None)
+        if not processor_method:
+            logger.error(f"Processor method _apply{edit_tag} not found")
+            return None
+
+        output_path = self._edit_output_path(source_file, edit_tag)
+        success = processor_method(source_file, output_path)
+        return output_path if success else None
+
+    def _edit_output_path(self, source_file: str, edit_tag: str) -> str:
+        """Path of an edited version in the "Upravené foto" tree (its directory is created)."""
         # Create output filename with edit tag
         source_name = os.path.splitext(os.path.basename(source_file))[0]
         source_ext = os.path.splitext(source_file)[1]
@@ -205,111 +587,254 @@ class AlternativeGenerator:
 
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        return output_path
 
-        # Apply the appropriate edit effect
-        processor_method = getattr(self, f'_apply{edit_tag}', None)
-        if not processor_method:
-            logger.error(f"Processor method _apply{edit_tag} not found")
-            return None
-
-        success = processor_method(source_file, output_path)
-        return output_path if success else None
-
-    def _apply_bw(self, source_path: str, output_path: str) -> bool:
-        """Convert image to black and white."""
+    def _apply_effect(self, effect: Callable[[Image.Image], Image.Image], source_path: str,
+                      output_path: str, failure: str) -> bool:
+        """Open a file, apply one effect and save the result."""
         try:
             with Image.open(source_path) as img:
-                # Convert to grayscale using luminance weights
-                bw_img = img.convert('L')
-                # Convert back to RGB to maintain format compatibility
-                bw_rgb = Image.new('RGB', bw_img.size)
-                bw_rgb.paste(bw_img)
-                bw_rgb.save(output_path, quality=95, optimize=False)
+                effect(img).save(output_path, quality=95, optimize=False)
                 return True
         except Exception as e:
-            logger.error(f"Failed to convert to B&W: {e}")
+            logger.error(f"{failure}: {e}")
             return False
 
+    def _apply_bw(self, source_path: str, output_path: str) -> bool:
+        """Convert image to black and white."""
+        return self._apply_effect(self._effect_bw, source_path, output_path, "Failed to convert to B&W")
+
     def _apply_negative(self, source_path: str, output_path: str) -> bool:
         """Convert image to color negative."""
-        try:
-            with Image.open(source_path) as img:
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Invert colors (255 - pixel_value for each channel)
-                negative_img = ImageOps.invert(img)
-                negative_img.save(output_path, quality=95, optimize=False)
-                return True
-        except Exception as e:
-            logger.error(f"Failed to convert to negative: {e}")
-            return False
+        return self._apply_effect(self._effect_negative, source_path, output_path, "Failed to convert to negative")
 
     def _apply_sharpen(self, source_path: str, output_path: str) -> bool:
         """Apply sharpening filter."""
-        try:
-            with Image.open(source_path) as img:
-                # Apply unsharp mask for professional sharpening
-                sharpened = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
-                sharpened.save(output_path, quality=95, optimize=False)
-                return True
-        except Exception as e:
-            logger.error(f"Failed to apply sharpening: {e}")
-            return False
+        return self._apply_effect(self._effect_sharpen, source_path, output_path, "Failed to apply sharpening")
 
     def _apply_misty(self, source_path: str, output_path: str) -> bool:
         """Apply misty/foggy effect using Photoshop-like technique."""
-        try:
-            with Image.open(source_path) as img:
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Convert to numpy array for processing
-                img_array = np.array(img).astype(np.float32)
-                height, width = img_array.shape[:2]
-
-                # Generate cloud-like noise pattern (similar to Photoshop's Clouds filter)
-                np.random.seed(42)  # For reproducible results
-                noise = np.random.rand(height, width) * 255
-
-                # Apply Gaussian blur to create cloud texture
-                noise_blurred = cv2.GaussianBlur(noise, (121, 121), 40)
-
-                # Create fog overlay using Screen blend mode simulation
-                # Screen formula: 1 - (1-base) * (1-overlay)
-                fog_overlay = noise_blurred / 255.0
-
-                # Apply screen blending to each channel with stronger fog intensity
-                for channel in range(3):
-                    base = img_array[:, :, channel] / 255.0
-                    # Screen blend mode with stronger fog effect
-                    result = 1.0 - (1.0 - base) * (1.0 - fog_overlay * 0.8)  # 0.8 for strong vapor/steam effect
-                    img_array[:, :, channel] = result * 255.0
-
-                # Ensure values are in valid range
-                img_array = np.clip(img_array, 0, 255).astype(np.uint8)
-
-                # Convert back to PIL Image and save
-                misty_img = Image.fromarray(img_array)
-                misty_img.save(output_path, quality=95, optimize=False)
-                return True
-        except Exception as e:
-            logger.error(f"Failed to apply misty effect: {e}")
-            return False
+        return self._apply_effect(self._effect_misty, source_path, output_path, "Failed to apply misty effect")
 
     def _apply_blurred(self, source_path: str, output_path: str) -> bool:
         """Apply Gaussian blur effect."""
+        return self._apply_effect(self._effect_blurred, source_path, output_path, "Failed to apply blur")
+
+    def _effect_bw(self, img: Image.Image) -> Image.Image:
+        """Black and white version of a decoded image."""
+        # Convert to grayscale using luminance weights
+        bw_img = img.convert('L')
+        # Convert back to RGB to maintain format compatibility
+        bw_rgb = Image.new('RGB', bw_img.size)
+        bw_rgb.paste(bw_img)
+        return bw_rgb
+
+    def _effect_negative(self, img: Image.Image) -> Image.Image:
+        """Color negative of a decoded image."""
+        # Convert to RGB if needed
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Invert colors (255 - pixel_value for each channel)
+        return ImageOps.invert(img)
+
+    def _effect_sharpen(self, img: Image.Image) -> Image.Image:
+        """Sharpened version of a decoded image."""
+        # Apply unsharp mask for professional sharpening
+        return img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+
+    def _effect_misty(self, img: Image.Image) -> Image.Image:
+        """Misty/foggy version of a decoded image."""
+        # Convert to RGB if needed
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Cloud-like fog layer (similar to Photoshop's Clouds filter), upscaled from the small texture
+        texture = _misty_fog_texture(img.width, img.height, self.misty_seed)
+        fog = cv2.resize(texture, img.size, interpolation=cv2.INTER_LINEAR)
+
+        # Screen blend mode: 1 - (1-base) * (1-overlay), 0.8 for strong vapor/steam effect
+        # In 0..255 units: 255 - (255-base) * (1 - 0.8*fog), for all channels at once
+        keep = 1.0 - fog * 0.8
+        result = np.subtract(255, np.asarray(img), dtype=np.float32)
+        result *= keep[:, :, np.newaxis]
+        np.subtract(255, result, out=result)
+
+        # Ensure values are in valid range and convert back to PIL Image
+        return Image.fromarray(np.clip(result, 0, 255, out=result).astype(np.uint8))
+
+    def _effect_blurred(self, img: Image.Image) -> Image.Image:
+        """Gaussian blur of a decoded image."""
+        # Apply Gaussian blur with radius similar to Photoshop (45px equivalent)
+        return img.filter(ImageFilter.GaussianBlur(radius=15))
+
+
+class _ImageMemory:
+    """Approximate memory held by decoded and edited images during one photo."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.decodes = 0
+
+    @staticmethod
+    def image_bytes(img: Optional[Image.Image]) -> int:
+        if img is None:
+            return 0
+        return img.width * img.height * len(img.getbands())
+
+    def hold(self, img: Optional[Image.Image]) -> None:
+        self.current += self.image_bytes(img)
+        self.peak = max(self.peak, self.current)
+
+    def release(self, img: Optional[Image.Image]) -> None:
+        self.current -= self.image_bytes(img)
+
+
+def _misty_fog_texture(width: int, height: int, seed: Optional[int]) -> np.ndarray:
+    """
+    Small cloud texture (fog density 0..1) for a width x height image.
+
+    Stands in for full-resolution uniform noise blurred with a 121x121 kernel
+    (sigma 40): noise averaged over scale x scale pixels keeps its mean and
+    narrows its spread by 1/scale, and the kernel shrinks by the same factor.
+    Textures of a fixed seed are cached, so every source of a photo shares one.
+    """
+    if seed is not None:
+        return _cached_misty_fog_texture(width, height, seed)
+    return _build_misty_fog_texture(width, height, None)
+
+
+def _build_misty_fog_texture(width: int, height: int, seed: Optional[int]) -> np.ndarray:
+    scale = ALTERNATIVE_MISTY_FOG_SCALE
+    small_width, small_height = -(-width // scale), -(-height // scale)
+    rng = np.random.default_rng(seed)
+    noise = 0.5 + (rng.random((small_height, small_width), dtype=np.float32) - 0.5) / scale
+    kernel = (121 // scale) | 1
+    texture = cv2.GaussianBlur(noise, (kernel, kernel), 40 / scale)
+    texture.setflags(write=False)
+    return texture
+
+
+_cached_misty_fog_texture = functools.lru_cache(maxsize=8)(_build_misty_fog_texture)
+
+
+# Placeholder for a format job that has not finished yet
+_NOT_DONE = object()
+
+
+@dataclass(eq=False)
+class _AlternativeJob:
+    """One format conversion or one effect of a photo, run in a worker process."""
+    kind: str  # 'format' or 'edit'
+    name: str  # Format extension or edit tag
+    source_file: str
+    target_dir: str
+    edited_dir: str
+    format_paths: List[str] = field(default_factory=list)  # Converted files that also get the edit
+    memory: int = 0  # Estimated peak memory in bytes
+    misty_seed: Optional[int] = ALTERNATIVE_MISTY_SEED
+    encoding: str = DEFAULT_ALTERNATIVE_ENCODING_PROFILE
+
+
+@dataclass
+class _PhotoPlan:
+    """Jobs and collected results of one photo in pool mode."""
+    source_file: str
+    target_dir: str
+    edited_dir: str
+    image_bytes: int
+    format_jobs: List[_AlternativeJob] = field(default_factory=list)
+    format_results: List[object] = field(default_factory=list)
+    edit_results: List[Tuple[int, int, Dict[str, str]]] = field(default_factory=list)
+
+    def source_index(self, path: str) -> int:
+        """Position of an edit's source like in sequential mode (original first, then formats)."""
+        formats = [item['path'] for item in self.format_results if isinstance(item, dict)]
+        return 0 if path == self.source_file else 1 + formats.index(path)
+
+
+class _LogCollector(logging.Handler):
+    """Keeps a worker's warnings and errors so the parent process can log them."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Format now; arguments and tracebacks may not be picklable
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+def _run_alternative_job(job: _AlternativeJob) -> Tuple[object, List[logging.LogRecord]]:
+    """
+    Worker process entry point: decode the source and run one job.
+
+    Returns:
+        (format info or None, or the list of edit infos; log records to re-emit)
+    """
+    collector = _LogCollector()
+    propagate = logger.propagate
+    logger.addHandler(collector)
+    logger.propagate = False
+    try:
         try:
-            with Image.open(source_path) as img:
-                # Apply Gaussian blur with radius similar to Photoshop (45px equivalent)
-                blurred = img.filter(ImageFilter.GaussianBlur(radius=15))
-                blurred.save(output_path, quality=95, optimize=False)
-                return True
+            image = Image.open(job.source_file)
+            image.load()
         except Exception as e:
-            logger.error(f"Failed to apply blur: {e}")
-            return False
+            logger.error(f"Failed to decode {job.source_file}: {e}")
+            return (None if job.kind == 'format' else []), collector.records
+
+        format_image = image if image.mode in ('RGB', 'RGBA') else image.convert('RGB')
+        if job.kind == 'format':
+            generator = AlternativeGenerator(enabled_alternatives=[], enabled_formats=[job.name],
+                                             encoding=job.encoding)
+            return generator._generate_format_conversion(job.source_file, job.name, format_image), collector.records
+
+        generator = AlternativeGenerator(enabled_alternatives=[job.name], enabled_formats=[],
+                                         misty_seed=job.misty_seed)
+        sources = [(job.source_file, image)] + [(path, format_image) for path in job.format_paths]
+        return generator._generate_fused_edits(sources, job.edited_dir, _ImageMemory()), collector.records
+    finally:
+        logger.removeHandler(collector)
+        logger.propagate = propagate
+
+
+def compare_encoding_profiles(source_file: str, formats: Optional[List[str]] = None,
+                              profiles: Optional[List[str]] = None) -> List[Dict[str, object]]:
+    """
+    Encode a photo with each profile into a temporary folder and measure it.
+
+    Args:
+        source_file: Image to encode
+        formats: Formats to try (default: ALTERNATIVE_FORMATS)
+        profiles: Profiles to try (default: all ALTERNATIVE_ENCODING_PROFILES)
+
+    Returns:
+        [{'encoding': 'fast', 'format': '.png', 'encode_seconds': 1.5, 'size_bytes': 20500000}, ...];
+        failed encodings are left out
+    """
+    formats = formats if formats is not None else ALTERNATIVE_FORMATS
+    profiles = profiles if profiles is not None else list(ALTERNATIVE_ENCODING_PROFILES)
+
+    with Image.open(source_file) as img:
+        image = img.convert('RGB') if img.mode not in ('RGB', 'RGBA') else img.copy()
+
+    measurements = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for profile in profiles:
+            generator = AlternativeGenerator(enabled_alternatives=[], enabled_formats=formats, encoding=profile)
+            for target_format in formats:
+                output_path = os.path.join(temp_dir, f"{profile}{target_format}")
+                encoded = generator._encode_format(image, output_path, target_format)
+                if encoded:
+                    measurements.append({'format': target_format, **encoded})
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+    return measurements
 
 
 def get_alternative_output_dirs(original_path: str) -> Tuple[str, str]:
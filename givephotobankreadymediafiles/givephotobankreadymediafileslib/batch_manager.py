@@ -18,6 +18,7 @@ from PIL import Image
 from shared.config import get_config
 from shared.ai_module import Message, ContentBlock, create_from_model_key
 from shared.file_operations import load_csv, save_csv_with_backup, read_json, write_json, read_binary
+from shared.media_store import get_media_store
 
 from givephotobankreadymediafileslib.constants import (
     COL_FILE, COL_PATH, COL_TITLE, COL_DESCRIPTION, COL_KEYWORDS, COL_PREP_DATE,
@@ -29,7 +30,8 @@ from givephotobankreadymediafileslib.constants import (
     DEFAULT_ALTERNATIVE_BATCH_SIZE, DEFAULT_ALTERNATIVE_EFFECTS,
     EFFECT_NAME_MAPPING, ORIGINAL_NO, CSV_ALLOWED_EXTENSIONS,
     DEFAULT_DAILY_BATCH_LIMIT, BATCH_COST_LOG, BATCH_IMAGE_MAX_BASE64_BYTES,
-    DEFAULT_BATCH_VISION_SIZE, DEFAULT_CATEGORIES_CSV_PATH
+    DEFAULT_BATCH_VISION_SIZE, DEFAULT_CATEGORIES_CSV_PATH,
+    ALTERNATIVE_MAX_WORKERS
 )
 from givephotobankreadymediafileslib.media_processor import find_unprocessed_records
 from givephotobankreadymediafileslib.mediainfo_loader import load_media_records, load_categories
@@ -450,8 +452,13 @@ def _reject_record(record: Dict[str, str]) -> None:
 def _save_metadata_to_csv(media_csv: str, file_path: str,
                           metadata: Dict[str, object],
                           editorial_fallback: bool) -> bool:
-    records = load_csv(media_csv)
-    record = _find_record_for_path(records, file_path)
+    store = get_media_store(media_csv)
+    if store is not None:
+        records = []
+        record = store.find_by_path(file_path)
+    else:
+        records = load_csv(media_csv)
+        record = _find_record_for_path(records, file_path)
     if not record:
         return False
 
@@ -459,7 +466,10 @@ def _save_metadata_to_csv(media_csv: str, file_path: str,
         metadata["editorial"] = bool(editorial_fallback)
 
     _update_record_with_metadata(record, metadata)
-    save_csv_with_backup(records, media_csv)
+    if store is not None:
+        store.save(record)
+    else:
+        save_csv_with_backup(records, media_csv)
     return True
 
 
@@ -564,21 +574,27 @@ def _process_batch_results(batch_state: BatchState, results: List[Dict[str, obje
 
 def _generate_alternatives_for_file(registry: BatchRegistry, media_csv: str,
                                     original_path: str, original_metadata: Dict[str, object],
-                                    editorial_data: Optional[Dict[str, str]] = None) -> None:
+                                    editorial_data: Optional[Dict[str, str]] = None,
+                                    alternative_files: Optional[List[Dict[str, str]]] = None) -> None:
     normalized = _normalize_path(original_path)
     if registry.data.get("alternatives_generated", {}).get(normalized):
         return
 
-    records = load_csv(media_csv)
-    original_record = _find_record_for_path(records, original_path)
+    store = get_media_store(media_csv)
+    if store is not None:
+        records = []
+        original_record = store.find_by_path(original_path)
+    else:
+        records = load_csv(media_csv)
+        original_record = _find_record_for_path(records, original_path)
     if not original_record:
         logging.warning("Original record not found for alternatives: %s", original_path)
         return
 
-    effects = _get_default_effects()
-    generator = AlternativeGenerator(enabled_alternatives=effects)
-    target_dir, edited_dir = get_alternative_output_dirs(original_path)
-    alternative_files = generator.generate_all_versions(original_path, target_dir, edited_dir)
+    if alternative_files is None:
+        generator = AlternativeGenerator(enabled_alternatives=_get_default_effects())
+        target_dir, edited_dir = get_alternative_output_dirs(original_path)
+        alternative_files = generator.generate_all_versions(original_path, target_dir, edited_dir)
 
     original_keywords = _parse_keywords(original_metadata.get("keywords", []))
     editorial_flag = bool(original_metadata.get("editorial"))
@@ -597,7 +613,10 @@ def _generate_alternatives_for_file(registry: BatchRegistry, media_csv: str,
             continue
 
         alt_filename = os.path.basename(alt_path)
-        existing_record = _find_record_for_path(records, alt_path)
+        if store is not None:
+            existing_record = store.find_by_path(alt_path)
+        else:
+            existing_record = _find_record_for_path(records, alt_path)
         if existing_record is None:
             alt_record = original_record.copy()
         else:
@@ -650,15 +669,19 @@ def _generate_alternatives_for_file(registry: BatchRegistry, media_csv: str,
             if batch_info.get("file_count", 0) >= DEFAULT_ALTERNATIVE_BATCH_SIZE:
                 registry.set_batch_status(batch_id, "ready")
 
-        if existing_record is None:
+        if store is not None:
+            store.save(alt_record)
+        elif existing_record is None:
             records.append(alt_record)
 
-    save_csv_with_backup(records, media_csv)
+    if store is None:
+        save_csv_with_backup(records, media_csv)
     registry.data["alternatives_generated"][normalized] = datetime.utcnow().isoformat()
     registry.save()
 
 
 def _queue_alternatives_from_batch(batch_state: BatchState, registry: BatchRegistry, media_csv: str) -> None:
+    items = []
     for item in batch_state.all_files():
         if item.get("entry_type") and item.get("entry_type") != "original":
             continue
@@ -667,9 +690,33 @@ def _queue_alternatives_from_batch(batch_state: BatchState, registry: BatchRegis
         original_path = item.get("file_path")
         if not original_path:
             continue
+        if registry.data.get("alternatives_generated", {}).get(_normalize_path(original_path)):
+            continue
+        items.append(item)
+    if not items:
+        return
+
+    # Photos without a record are skipped (with a warning) by _generate_alternatives_for_file
+    store = get_media_store(media_csv)
+    records = [] if store is not None else load_csv(media_csv)
+    photos = []
+    for item in items:
+        original_path = item["file_path"]
+        found = store.find_by_path(original_path) if store is not None else _find_record_for_path(records, original_path)
+        if found:
+            photos.append((original_path, *get_alternative_output_dirs(original_path)))
+
+    # The whole batch is generated at once, so its photos share the generator's worker pool
+    workers = registry.data.get("_alternative_workers", ALTERNATIVE_MAX_WORKERS)
+    with AlternativeGenerator(enabled_alternatives=_get_default_effects(), max_workers=workers) as generator:
+        generated = generator.generate_many(photos)
+
+    for item in items:
+        original_path = item["file_path"]
         original_metadata = item.get("result") or {}
         editorial_data = item.get("editorial_data")  # Extract editorial_data from batch entry
-        _generate_alternatives_for_file(registry, media_csv, original_path, original_metadata, editorial_data)
+        _generate_alternatives_for_file(registry, media_csv, original_path, original_metadata, editorial_data,
+                                        generated.get(original_path, []))
 
 
 def _finalize_alternative_batches(registry: BatchRegistry) -> None:
@@ -871,6 +918,13 @@ def _collect_descriptions(registry: BatchRegistry, batch_size: int, media_csv: s
                 if action == "skip":
                     continue
                 if action == "reject":
+                    store = get_media_store(media_csv)
+                    if store is not None:
+                        target_record = store.find_by_path(file_path)
+                        if target_record:
+                            _reject_record(target_record)
+                            store.save(target_record)
+                        continue
                     record_map = load_csv(media_csv)
                     target_record = _find_record_for_path(record_map, file_path)
                     if target_record:
@@ -1239,7 +1293,8 @@ def _retrieve_completed_batches(registry: BatchRegistry, media_csv: str,
 
 
 def run_batch_mode(media_csv: str, batch_size: int, wait_timeout: int,
-                   poll_interval: int = DEFAULT_BATCH_POLL_INTERVAL) -> None:
+                   poll_interval: int = DEFAULT_BATCH_POLL_INTERVAL,
+                   alternative_workers: int = ALTERNATIVE_MAX_WORKERS) -> None:
     """
     Run batch mode orchestration.
 
@@ -1248,6 +1303,7 @@ def run_batch_mode(media_csv: str, batch_size: int, wait_timeout: int,
         batch_size: Files per batch
         wait_timeout: Optional wait after sending (seconds)
         poll_interval: Poll interval for batch status
+        alternative_workers: Worker processes generating alternative files (1 = sequential)
     """
     registry = BatchRegistry()
     registry.cleanup_completed()
@@ -1264,6 +1320,7 @@ def run_batch_mode(media_csv: str, batch_size: int, wait_timeout: int,
 
     # Store categories in registry for access by functions
     registry.data["_categories"] = categories
+    registry.data["_alternative_workers"] = alternative_workers
 
     logging.info("=== BATCH MODE STARTED ===")
     logging.info("Batch mode using model: %s", model_key)
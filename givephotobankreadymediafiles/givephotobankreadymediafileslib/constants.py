@@ -14,6 +14,7 @@ STATUS_ERROR = "chyba"
 IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.dng', '.nef', '.raw', '.cr2', '.arw']
 VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.wmv', '.mkv']
 VECTOR_EXTENSIONS = ['.svg', '.eps', '.ai']
+RAW_EXTENSIONS = ['.dng', '.nef', '.raw', '.cr2', '.arw']  # Shown from their embedded preview
 
 # Metadata constraints
 MAX_TITLE_LENGTH = 80
@@ -68,6 +69,48 @@ ALTERNATIVE_EDIT_TAGS = {
 # Alternative output formats (beyond original JPG)
 ALTERNATIVE_FORMATS = ['.png', '.tif']
 
+# Parallel alternative generation (1 = sequential, in the calling process)
+ALTERNATIVE_MAX_WORKERS = 1
+# Memory budget for images held by running worker jobs (MB)
+ALTERNATIVE_MEMORY_LIMIT_MB = 4096
+# Estimated peak memory of one job, as a multiple of the decoded source image
+ALTERNATIVE_JOB_MEMORY_FACTORS = {
+    "format": 2,
+    "_bw": 3,
+    "_negative": 3,
+    "_sharpen": 3,
+    "_misty": 7,  # float32 image plus the full-size fog layer
+    "_blurred": 3
+}
+
+# Lossless encoding profiles of format conversions: save options per format
+# (profile names are also the --encoding choices of generatealternatives.py)
+ALTERNATIVE_ENCODING_PROFILES = {
+    # Largest files, almost no CPU
+    "uncompressed": {
+        ".png": {"compress_level": 0},
+        ".tif": {"compression": None}
+    },
+    # Roughly a third of the size for little CPU time
+    "fast": {
+        ".png": {"compress_level": 1},
+        ".tif": {"compression": "tiff_lzw", "tiffinfo": {317: 2}}  # 317 = Predictor, 2 = horizontal
+    },
+    # Smallest files, several times slower
+    "compact": {
+        ".png": {"compress_level": 6},
+        ".tif": {"compression": "tiff_adobe_deflate", "tiffinfo": {317: 2}}
+    }
+}
+DEFAULT_ALTERNATIVE_ENCODING_PROFILE = "uncompressed"
+# Threads encoding the format conversions of a photo at the same time (sequential mode)
+ALTERNATIVE_ENCODING_THREADS = 1
+
+# Misty effect: the cloud texture is made at 1/ALTERNATIVE_MISTY_FOG_SCALE of the image size
+ALTERNATIVE_MISTY_FOG_SCALE = 8
+# Seed of the cloud texture (None = different fog on every run)
+ALTERNATIVE_MISTY_SEED = 42
+
 # User-friendly effect names mapping to technical tags
 EFFECT_NAME_MAPPING = {
     "blackwhite": "_bw",
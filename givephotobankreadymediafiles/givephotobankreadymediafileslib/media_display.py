@@ -14,7 +14,9 @@ from PIL import Image, ImageTk
 from typing import Optional
 import cv2  # OpenCV for video capture
 
-from givephotobankreadymediafileslib.media_helper import is_video_file
+from shared.display_cache import DisplayImageCache, RESIZE_DEBOUNCE_MS
+from shared.raw_preview import develop_raw, load_raw_image
+from givephotobankreadymediafileslib.media_helper import is_raw_file, is_video_file
 
 
 class MediaDisplay:
@@ -33,6 +35,10 @@ class MediaDisplay:
         self.current_file_path: Optional[str] = None
         self.current_image: Optional[ImageTk.PhotoImage] = None
         self.original_image_size: Optional[tuple] = None
+        self.display_cache: Optional[DisplayImageCache] = None  # Decoded image and its pre-scaled copies
+        self._resize_job = None  # Pending high-quality resize after window dragging
+        self._last_window_size: Optional[tuple] = None
+        self.exiftool_path: Optional[str] = None  # Located on the first RAW file without rawpy
         self.video_surface = None
         self.video_playing = False
         self.video_paused = False
@@ -71,10 +77,17 @@ class MediaDisplay:
 
             # Store file path
             self.current_file_path = file_path
-
-            # Load original image to get size (use context manager to ensure file is closed)
-            with Image.open(file_path) as image:
-                self.original_image_size = image.size
+            self.display_cache = None
+
+            if is_raw_file(file_path):
+                # Embedded preview; the RAW data is developed only on request (load_full_raw)
+                image = load_raw_image(file_path, tool_path=self._get_exiftool_path())
+            else:
+                # Decode once; resizing works from memory (load() closes the file)
+                image = Image.open(file_path)
+                image.load()
+            self.display_cache = DisplayImageCache(image)
+            self.original_image_size = image.size
 
             # Resize for current display area
             self.resize_image()
@@ -84,10 +97,17 @@ class MediaDisplay:
             if self.media_label:
                 self.media_label.configure(image="", text=f"Error loading image:\n{str(e)}")
 
-    def resize_image(self):
-        """Resize current image to fit display area responsively."""
+    def resize_image(self, fast: bool = False):
+        """
+        Resize current image to fit display area responsively.
+
+        Args:
+            fast: Quick bilinear resize while the window is being dragged
+        """
         if not self.current_file_path or not self.original_image_size or not self.media_label:
             return
+        if self.display_cache is None:
+            return
 
         try:
             # Get current display area size
@@ -95,22 +115,8 @@ class MediaDisplay:
             display_width = max(self.media_label.winfo_width() - 20, 300)
             display_height = max(self.media_label.winfo_height() - 20, 200)
 
-            # Load image again (use context manager to ensure file is closed)
-            with Image.open(self.current_file_path) as image:
-                # Calculate scaling to fit area while maintaining aspect ratio
-                # Never scale above 100% of original size
-                scale_x = min(display_width / image.width, 1.0)
-                scale_y = min(display_height / image.height, 1.0)
-                scale = min(scale_x, scale_y)
-
-                new_width = int(image.width * scale)
-                new_height = int(image.height * scale)
-
-                # Resize image
-                resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                # Convert to PhotoImage
-                self.current_image = ImageTk.PhotoImage(resized)
+            # Served from the nearest pre-scaled level, never from disk
+            self.current_image = ImageTk.PhotoImage(self.display_cache.fit(display_width, display_height, fast))
 
             # Display image
             self.media_label.configure(image=self.current_image, text="")
@@ -118,6 +124,42 @@ class MediaDisplay:
         except Exception as e:
             logging.error(f"Error resizing image: {e}")
 
+    def _get_exiftool_path(self) -> Optional[str]:
+        """ExifTool for RAW previews when rawpy is not installed (looked up once)."""
+        if self.exiftool_path is None:
+            try:
+                from shared.exif_downloader import ensure_exiftool
+                self.exiftool_path = ensure_exiftool()
+            except Exception as e:
+                logging.debug(f"ExifTool not available for RAW previews: {e}")
+                self.exiftool_path = ""
+        return self.exiftool_path or None
+
+    def load_full_raw(self, event=None):
+        """Develop the current RAW file at full resolution in the background and show it."""
+        file_path = self.current_file_path
+        if not file_path or not is_raw_file(file_path):
+            return
+
+        def develop():
+            try:
+                image = develop_raw(file_path)
+            except Exception as e:
+                logging.error(f"Failed to develop RAW file {file_path}: {e}")
+                return
+            self.root.after(0, self._show_developed_raw, file_path, image)
+
+        logging.info(f"Developing RAW file at full resolution: {file_path}")
+        threading.Thread(target=develop, name="raw-develop", daemon=True).start()
+
+    def _show_developed_raw(self, file_path: str, image: Image.Image):
+        """Replace the preview with the developed image (Tk thread)."""
+        if file_path != self.current_file_path:
+            return  # Another file is shown now
+        self.display_cache = DisplayImageCache(image)
+        self.original_image_size = image.size
+        self.resize_image()
+
     def on_window_resize(self, event):
         """
         Handle window resize events.
@@ -127,8 +169,21 @@ class MediaDisplay:
         """
         # Only resize image if it's the main window being resized
         if event.widget == self.root and self.current_file_path and not is_video_file(self.current_file_path):
-            # Delay resize to avoid too many calls
-            self.root.after(100, self.resize_image)
+            window_size = (getattr(event, "width", None), getattr(event, "height", None))
+            if window_size[0] is not None and window_size == self._last_window_size:
+                return  # Window moved, not resized
+            self._last_window_size = window_size
+
+            # Quick resize while dragging, high-quality pass once the events stop
+            self.resize_image(fast=True)
+            if self._resize_job is not None:
+                self.root.after_cancel(self._resize_job)
+            self._resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._finish_resize)
+
+    def _finish_resize(self):
+        """High-quality resize after the last resize event."""
+        self._resize_job = None
+        self.resize_image()
 
     def load_video(self, file_path: str):
         """
@@ -253,6 +308,7 @@ class MediaDisplay:
         self.current_image = None
         self.current_file_path = None
         self.original_image_size = None
+        self.display_cache = None
         if self.media_label:
             self.media_label.configure(image="", text="No media loaded")
         self.stop_video()
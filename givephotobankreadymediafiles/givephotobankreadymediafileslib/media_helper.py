@@ -8,7 +8,7 @@ import logging
 import subprocess
 import time
 from typing import List, Dict, Tuple
-from givephotobankreadymediafileslib.constants import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from givephotobankreadymediafileslib.constants import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, RAW_EXTENSIONS
 
 
 def open_media_file(media_path: str) -> bool:
@@ -43,6 +43,13 @@ def is_video_file(file_path: str) -> bool:
     return ext in VIDEO_EXTENSIONS
 
 
+def is_raw_file(file_path: str) -> bool:
+    """Check if file is a RAW image based on extension."""
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    return ext in RAW_EXTENSIONS
+
+
 def is_image_file(file_path: str) -> bool:
     """Check if file is an image based on extension."""
     _, ext = os.path.splitext(file_path)
@@ -84,13 +91,14 @@ def get_media_type(file_path: str) -> str:
         return "unknown"
 
 
-def process_single_file(file_path: str, media_csv: str = None) -> Tuple[bool, str, str]:
+def process_single_file(file_path: str, media_csv: str = None, media_store: str = None) -> Tuple[bool, str, str]:
     """
     Process a single file using subprocess.
     
     Args:
         file_path: Path to the media file
         media_csv: Path to the media CSV file
+        media_store: Path to the SQLite media store shared with the subprocess
         
     Returns:
         Tuple of (success, file_path, error_message)
@@ -122,6 +130,8 @@ def process_single_file(file_path: str, media_csv: str = None) -> Tuple[bool, st
         if media_csv and os.path.exists(media_csv):
             cmd.extend(['--media_csv', media_csv])
             logging.info(f"Using media CSV: {media_csv}")
+            if media_store:
+                cmd.extend(['--media_store', media_store])
         
         subprocess.run(cmd, check=True)
         logging.info(f"Successfully processed {file_path}")
@@ -137,7 +147,8 @@ def process_single_file(file_path: str, media_csv: str = None) -> Tuple[bool, st
         return False, file_path, error_msg
 
 
-def process_unmatched_files(records: List[Dict[str, str]], config=None, max_count: int = 1, interval: int = 10, media_csv: str = None) -> Dict[str, int]:
+def process_unmatched_files(records: List[Dict[str, str]], config=None, max_count: int = 1, interval: int = 10,
+                            media_csv: str = None, media_store: str = None) -> Dict[str, int]:
     """
     Process media records sequentially with interval between files.
     
@@ -147,6 +158,7 @@ def process_unmatched_files(records: List[Dict[str, str]], config=None, max_coun
         max_count: Maximum number of files to process (default: 1)
         interval: Seconds to wait between processing files (default: 10)
         media_csv: Path to the media CSV file
+        media_store: Path to the SQLite media store (None = update the CSV directly)
         
     Returns:
         Dictionary with processing statistics
@@ -175,7 +187,7 @@ def process_unmatched_files(records: List[Dict[str, str]], config=None, max_coun
             continue
         
         # Process the file
-        success, processed_file, error_msg = process_single_file(file_path, media_csv)
+        success, processed_file, error_msg = process_single_file(file_path, media_csv, media_store)
         
         if success:
             stats['processed'] += 1
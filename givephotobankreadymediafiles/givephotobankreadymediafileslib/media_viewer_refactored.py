@@ -76,6 +76,9 @@ class MediaViewerRefactored:
         # Bind resize event for responsive image display
         self.root.bind('<Configure>', self.media_display.on_window_resize)
 
+        # Ctrl+R develops the current RAW file at full resolution
+        self.root.bind('<Control-r>', self.media_display.load_full_raw)
+
         # Handle window close event (equivalent to Ctrl+C)
         self.root.protocol("WM_DELETE_WINDOW", self.on_window_close)
 
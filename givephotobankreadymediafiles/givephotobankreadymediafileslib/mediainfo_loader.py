@@ -7,6 +7,7 @@ import logging
 from typing import List, Dict
 
 from shared.file_operations import load_csv
+from shared.media_store import get_media_store
 from givephotobankreadymediafileslib.constants import (
     COL_FILE, COL_PATH, COL_ORIGINAL, COL_CREATE_DATE
 )
@@ -66,6 +67,12 @@ def load_media_records(csv_path: str) -> List[Dict[str, str]]:
         List of all media record dictionaries
     """
     logging.info(f"Loading media records from {csv_path}")
+
+    store = get_media_store(csv_path)
+    if store is not None:
+        records = store.load_records()
+        logging.info(f"Loaded {len(records)} media records from store {store.db_path}")
+        return records
     
     if not os.path.exists(csv_path):
         logging.error(f"Media CSV file not found: {csv_path}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Maintain the SQLite media store that mirrors PhotoMedia.csv.
+
+Usage:
+    python givephotobankreadymediafiles/manage_media_store.py export [--output CSV]
+    python givephotobankreadymediafiles/manage_media_store.py import [--input CSV]
+    python givephotobankreadymediafiles/manage_media_store.py stats
+"""
+import os
+import sys
+import argparse
+import logging
+
+from shared.logging_config import setup_logging
+from shared.file_operations import ensure_directory
+from shared.media_store import MediaStore
+from givephotobankreadymediafileslib.constants import DEFAULT_LOG_DIR, DEFAULT_MEDIA_CSV_PATH
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Export, import or inspect the SQLite media store.")
+    parser.add_argument("--media_csv", type=str, default=DEFAULT_MEDIA_CSV_PATH,
+                        help="Path to the PhotoMedia.csv file mirrored by the store")
+    parser.add_argument("--media_store", type=str, default=None,
+                        help="Path to the media store (default: next to the CSV)")
+    parser.add_argument("--log_dir", type=str, default=DEFAULT_LOG_DIR, help="Directory for log files")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Write all records to the CSV (with a backup)")
+    export.add_argument("--output", type=str, default=None, help="Export to this CSV instead of the mirrored one")
+
+    import_parser = subparsers.add_parser("import", help="Load records from a CSV, keeping unexported edits")
+    import_parser.add_argument("--input", type=str, default=None, help="Import this CSV instead of the mirrored one")
+
+    subparsers.add_parser("stats", help="Show record and pending change counts")
+    return parser.parse_args()
+
+
+def main():
+    """Run the selected store command; returns a process exit code."""
+    args = parse_arguments()
+    ensure_directory(args.log_dir)
+    setup_logging(debug=args.debug, log_file=os.path.join(args.log_dir, "manage_media_store.log"))
+
+    with MediaStore(args.media_csv, args.media_store) as store:
+        if args.command == "export":
+            count = store.export_csv(args.output)
+            print(f"Exported {count} records to {args.output or args.media_csv}")
+        elif args.command == "import":
+            count = store.import_csv(args.input)
+            print(f"Imported {count} records, {store.pending_changes} unexported edits kept")
+        else:
+            print(f"{store.db_path}: {len(store)} records, {store.pending_changes} not exported to {args.media_csv}")
+    logging.info(f"Media store command '{args.command}' finished")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
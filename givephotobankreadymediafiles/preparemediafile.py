@@ -10,6 +10,7 @@ import tkinter as tk
 
 from shared.logging_config import setup_logging
 from shared.file_operations import ensure_directory
+from shared.media_store import close_media_store, get_media_store, open_media_store
 from givephotobankreadymediafileslib.constants import DEFAULT_LOG_DIR, DEFAULT_CATEGORIES_CSV_PATH, DEFAULT_MEDIA_CSV_PATH
 from givephotobankreadymediafileslib.media_viewer_refactored import show_media_viewer
 from givephotobankreadymediafileslib.mediainfo_loader import load_categories, load_media_records
@@ -28,6 +29,9 @@ def parse_arguments():
     parser.add_argument("--log_dir", type=str, default=DEFAULT_LOG_DIR,
                         help="Directory for log files")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument("--media_store", type=str, default=None,
+                        help="SQLite media store to update instead of rewriting the CSV "
+                             "(changes are exported to the CSV by the orchestrator)")
 
     return parser.parse_args()
 
@@ -50,6 +54,18 @@ def main():
         logging.error(f"File not found: {args.file}")
         return 1
 
+    store = None
+    if args.media_store and args.media_csv and os.path.exists(args.media_csv):
+        store = open_media_store(args.media_csv, args.media_store)
+
+    try:
+        return _prepare_file(args)
+    finally:
+        close_media_store(store, export=False)
+
+
+def _prepare_file(args) -> int:
+    """Show the metadata editor for ``args.file`` and store the results; returns an exit code."""
     try:
         # Load categories
         categories = load_categories(args.categories_csv)
@@ -61,7 +77,13 @@ def main():
         if args.media_csv and os.path.exists(args.media_csv):
             logging.debug(f"Loading existing records from: {args.media_csv}")
             try:
-                media_records = load_media_records(args.media_csv)
+                store = get_media_store(args.media_csv)
+                if store is not None:
+                    # Keyed lookup instead of scanning every record
+                    record = store.find_by_path(args.file)
+                    media_records = []
+                else:
+                    media_records = load_media_records(args.media_csv)
 
                 # Find record matching this file
                 file_path_normalized = os.path.abspath(args.file).replace('\\', '/')
@@ -119,7 +141,8 @@ def main():
                 return False
 
             try:
-                records = load_csv(args.media_csv)
+                store = get_media_store(args.media_csv)
+                records = [] if store is not None else load_csv(args.media_csv)
                 logging.debug(f"Loaded {len(records)} existing records from CSV")
 
                 file_basename = os.path.basename(args.file)
@@ -128,6 +151,9 @@ def main():
                 existing_record = None
                 record_index = None
 
+                if store is not None:
+                    existing_record = store.find_by_file(file_basename)
+
                 for idx, record in enumerate(records):
                     if record.get(COL_FILE, '') == file_basename:
                         existing_record = record
@@ -135,7 +161,8 @@ def main():
                         break
 
                 # Create new record if not found
-                if existing_record is None:
+                is_new_record = existing_record is None
+                if is_new_record:
                     logging.info(f"Creating new CSV record for {file_basename}")
                     existing_record = {
                         COL_FILE: file_basename,
@@ -199,10 +226,13 @@ def main():
                             record[field_name] = STATUS_PREPARED
                             logging.debug(f"Updated status for {photobank}: {STATUS_UNPROCESSED} -> {STATUS_PREPARED}")
 
-                logging.debug(f"{'Updated' if record_index < len(records) - 1 else 'Created'} record for {file_basename}")
+                logging.debug(f"{'Created' if is_new_record else 'Updated'} record for {file_basename}")
 
                 # Save original metadata to CSV immediately
-                save_csv_with_backup(records, args.media_csv)
+                if store is not None:
+                    store.save(record)
+                else:
+                    save_csv_with_backup(records, args.media_csv)
                 logging.info(f"Saved metadata for {file_basename}")
                 return True
 
@@ -366,12 +396,13 @@ def main():
                     logging.warning("No CSV file for alternatives")
                     return 0
 
-                records = load_csv(args.media_csv)
+                store = get_media_store(args.media_csv)
+                records = [] if store is not None else load_csv(args.media_csv)
                 logging.debug(f"Loaded {len(records)} records for adding alternatives")
 
                 # Find original record
                 file_basename = os.path.basename(args.file)
-                original_record = None
+                original_record = store.find_by_file(file_basename) if store is not None else None
                 for rec in records:
                     if rec.get(COL_FILE, '') == file_basename:
                         original_record = rec
@@ -395,13 +426,17 @@ def main():
 
                     # Find existing record
                     existing_index = None
+                    existing_record = store.find_by_file(alt_filename) if store is not None else None
                     for idx, existing_record in enumerate(records):
                         if existing_record.get(COL_FILE) == alt_filename:
                             existing_index = idx
                             break
 
                     # Create or update
-                    if existing_index is not None:
+                    if existing_record is not None and store is not None:
+                        alt_record = existing_record
+                        logging.debug(f"Updating existing alternative: {alt_filename}")
+                    elif existing_index is not None:
                         alt_record = records[existing_index]
                         logging.debug(f"Updating existing alternative: {alt_filename}")
                     else:
@@ -436,11 +471,14 @@ def main():
                         logging.debug(f"Using fallback title for {alt_filename}")
 
                     # Add if new
-                    if existing_index is None:
+                    if store is not None:
+                        store.save(alt_record)
+                    elif existing_index is None:
                         records.append(alt_record)
 
                 # Save final CSV with alternatives
-                save_csv_with_backup(records, args.media_csv)
+                if store is None:
+                    save_csv_with_backup(records, args.media_csv)
                 logging.info(f"Saved {len(alternative_files)} alternatives")
 
             except Exception as e:
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Union
 
 from shared.exif_downloader import ensure_exiftool
+from shared.exiftool_worker import run_exiftool
 
 def extract_exif_dates(file_path: str, tool_path: str = None) -> List[datetime]:
     """
@@ -35,12 +36,9 @@ def extract_exif_dates(file_path: str, tool_path: str = None) -> List[datetime]:
         "TrackModifyDate"
     ]
     
-    # Build the command to extract these specific tags in JSON format
-    cmd = [tool_path, "-j", "-time:all", file_path]
-    
     try:
-        # Run ExifTool and capture the output
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Run ExifTool (persistent worker when available) and capture JSON output
+        result = run_exiftool(tool_path, ["-j", "-time:all", file_path])
         
         # Parse the JSON output
         exif_data = json.loads(result.stdout)
@@ -100,15 +98,13 @@ def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: st
     if tool_path is None:
         tool_path = ensure_exiftool()
     
-    # Build the command with all metadata tags
-    cmd = [tool_path]
-    for tag, value in metadata.items():
-        cmd.extend([f"-{tag}={value}"])
-    cmd.append(file_path)
+    # Build the arguments with all metadata tags
+    args = [f"-{tag}={value}" for tag, value in metadata.items()]
+    args.append(file_path)
     
     try:
-        # Run ExifTool to update the metadata
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Run ExifTool (persistent worker when available) to update the metadata
+        result = run_exiftool(tool_path, args)
         logging.info(f"Updated EXIF metadata for {file_path}")
         
     except subprocess.CalledProcessError as e:
@@ -0,0 +1,382 @@
+"""
+Indexed SQLite store for the media database.
+
+Keeps a copy of PhotoMedia.csv in a SQLite file so that tools editing single
+records can look them up by path or filename and update them one row at a
+time, instead of re-parsing the whole CSV and rewriting it (plus a full
+backup) after every change.
+
+The CSV stays the interchange format:
+- When the store is opened and the CSV changed since the last import or
+  export (size or mtime differ), the CSV is imported again. Records edited
+  through the store and not yet exported are re-applied on top of it.
+- ``export_csv`` writes all records back to the CSV in their original
+  order and column layout, creating one timestamped backup per export.
+
+Records returned by the store are ``StoredRecord`` dicts that remember their
+row, so ``save`` updates that row; plain dicts (e.g. ``record.copy()``) are
+inserted as new records.
+"""
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from shared.csv_sanitizer import sanitize_records
+from shared.file_operations import copy_file, load_csv
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS records_file ON records (file);
+CREATE INDEX IF NOT EXISTS records_path ON records (path);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Column names of PhotoMedia.csv used as lookup keys
+FILE_COLUMN = "Soubor"
+PATH_COLUMN = "Cesta"
+
+
+def normalize_record_path(path: str) -> str:
+    """Normalize a media path into the key used for path lookups."""
+    if not path:
+        return ""
+    return os.path.normcase(os.path.abspath(path)).replace("\\", "/")
+
+
+def default_store_path(csv_path: str) -> str:
+    """Return the store location used for ``csv_path`` when none is given (next to the CSV)."""
+    return f"{os.path.splitext(csv_path)[0]}.sqlite"
+
+
+class StoredRecord(dict):
+    """A media record that remembers the store row it was read from."""
+
+    def __init__(self, data: Dict[str, str], row_id: Optional[int] = None):
+        super().__init__(data)
+        self.row_id = row_id
+
+
+class MediaStore:
+    """SQLite-backed media database with keyed lookup and per-record updates."""
+
+    def __init__(self, csv_path: str, db_path: Optional[str] = None):
+        """
+        Args:
+            csv_path: PhotoMedia.csv the store mirrors
+            db_path: Location of the SQLite file (defaults to the CSV path with a .sqlite suffix)
+        """
+        self.csv_path = csv_path
+        self.db_path = db_path or default_store_path(csv_path)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logging.debug("Opened media store %s for %s", self.db_path, csv_path)
+
+        self.sync()
+
+    def __enter__(self) -> "MediaStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    @property
+    def fieldnames(self) -> List[str]:
+        """CSV header in its original order."""
+        return json.loads(self._get_info("fieldnames") or "[]")
+
+    @property
+    def pending_changes(self) -> int:
+        """Number of records changed in the store but not yet exported to the CSV."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records WHERE dirty = 1").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Record API
+    # ------------------------------------------------------------------
+
+    def load_records(self) -> List[StoredRecord]:
+        """Return all records in CSV order (same shape as ``load_csv``)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM records ORDER BY id").fetchall()
+        return [StoredRecord(json.loads(data), row_id) for row_id, data in rows]
+
+    def find_by_path(self, path: str) -> Optional[StoredRecord]:
+        """Return the record whose path column points to ``path``, or None."""
+        return self._find_one("path", normalize_record_path(path))
+
+    def find_by_file(self, file_name: str) -> Optional[StoredRecord]:
+        """Return the first record with the given filename column, or None."""
+        return self._find_one("file", file_name)
+
+    def save(self, record: Dict[str, str]) -> StoredRecord:
+        """
+        Insert or update a single record.
+
+        Args:
+            record: A record returned by the store (updated in place) or a new dict (appended)
+
+        Returns:
+            The stored record, carrying its row id
+        """
+        return self.save_many([record])[0]
+
+    def save_many(self, records: Iterable[Dict[str, str]]) -> List[StoredRecord]:
+        """Insert or update several records in one transaction."""
+        saved = []
+        with self._lock:
+            for record in records:
+                saved.append(self._write_record(record))
+            self._conn.commit()
+        return saved
+
+    def replace_all(self, records: List[Dict[str, str]]) -> None:
+        """Replace the whole content of the store (counterpart of ``save_csv_with_backup``)."""
+        fieldnames = list(records[0].keys()) if records else self.fieldnames
+        with self._lock:
+            self._conn.execute("DELETE FROM records")
+            for record in records:
+                self._write_record(dict(record))
+            self._set_info("fieldnames", json.dumps(fieldnames, ensure_ascii=False))
+            self._conn.commit()
+        logging.info("Replaced media store content with %d records", len(records))
+
+    # ------------------------------------------------------------------
+    # CSV interchange
+    # ------------------------------------------------------------------
+
+    def sync(self) -> bool:
+        """
+        Re-import the CSV if it changed since the last import or export.
+
+        Returns:
+            True if the CSV was imported
+        """
+        if not os.path.exists(self.csv_path):
+            return False
+        stat = os.stat(self.csv_path)
+        if self._get_info("csv_state") == _csv_state(stat):
+            logging.debug("Media store %s is up to date with %s", self.db_path, self.csv_path)
+            return False
+        self.import_csv()
+        return True
+
+    def import_csv(self, path: Optional[str] = None) -> int:
+        """
+        Load all records from a CSV, keeping edits that were not exported yet.
+
+        Args:
+            path: CSV to import (defaults to the mirrored CSV)
+
+        Returns:
+            Number of imported records
+        """
+        path = path or self.csv_path
+        records = load_csv(path)
+        with open(path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+            fieldnames = next(csv.reader(csvfile), [])
+
+        with self._lock:
+            pending = [json.loads(data) for (data,) in
+                       self._conn.execute("SELECT data FROM records WHERE dirty = 1 ORDER BY id")]
+            self._conn.execute("DELETE FROM records")
+            self._conn.executemany(
+                "INSERT INTO records (file, path, data, dirty) VALUES (?, ?, ?, 0)",
+                [_row_values(record) for record in records],
+            )
+            for record in pending:
+                self._reapply_pending(record)
+            self._set_info("fieldnames", json.dumps(fieldnames, ensure_ascii=False))
+            if os.path.abspath(path) == os.path.abspath(self.csv_path):
+                self._set_info("csv_state", _csv_state(os.stat(path)))
+            self._conn.commit()
+
+        if pending:
+            logging.warning("Re-applied %d unexported media store edits on top of %s", len(pending), path)
+        logging.info("Imported %d records from %s into media store", len(records), path)
+        return len(records)
+
+    def export_csv(self, path: Optional[str] = None, backup: bool = True) -> int:
+        """
+        Write all records to a CSV in their original order and column layout.
+
+        Args:
+            path: Target CSV (defaults to the mirrored CSV)
+            backup: Create a timestamped backup of the existing CSV first
+
+        Returns:
+            Number of exported records
+        """
+        path = path or self.csv_path
+        records = self.load_records()
+        fieldnames = self.fieldnames
+        for record in records:
+            fieldnames.extend(key for key in record if key not in fieldnames)
+
+        if backup and os.path.exists(path):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = f"{os.path.splitext(path)[0]}_{timestamp}.csv"
+            copy_file(path, backup_path)
+            logging.info("Created backup at: %s", backup_path)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8-sig', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=',', quotechar='"')
+            writer.writeheader()
+            writer.writerows(sanitize_records(records))
+        os.replace(temp_path, path)
+
+        if os.path.abspath(path) == os.path.abspath(self.csv_path):
+            with self._lock:
+                self._conn.execute("UPDATE records SET dirty = 0 WHERE dirty = 1")
+                self._set_info("csv_state", _csv_state(os.stat(path)))
+                self._conn.commit()
+        logging.info("Exported %d records from media store to %s", len(records), path)
+        return len(records)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        logging.debug("Closed media store %s", self.db_path)
+
+    # ------------------------------------------------------------------
+    # Internals (callers hold self._lock where needed)
+    # ------------------------------------------------------------------
+
+    def _find_one(self, column: str, value: str) -> Optional[StoredRecord]:
+        if not value:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, data FROM records WHERE {column} = ? ORDER BY id LIMIT 1", (value,)
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredRecord(json.loads(row[1]), row[0])
+
+    def _write_record(self, record: Dict[str, str]) -> StoredRecord:
+        row_id = getattr(record, "row_id", None)
+        if row_id is not None:
+            self._conn.execute(
+                "UPDATE records SET file = ?, path = ?, data = ?, dirty = 1 WHERE id = ?",
+                (*_row_values(record), row_id),
+            )
+            return record
+        cursor = self._conn.execute(
+            "INSERT INTO records (file, path, data, dirty) VALUES (?, ?, ?, 1)", _row_values(record)
+        )
+        if isinstance(record, StoredRecord):
+            record.row_id = cursor.lastrowid
+            return record
+        return StoredRecord(record, cursor.lastrowid)
+
+    def _reapply_pending(self, record: Dict[str, str]) -> None:
+        file_name, path, data = _row_values(record)
+        row = None
+        if path:
+            row = self._conn.execute("SELECT id FROM records WHERE path = ? ORDER BY id LIMIT 1", (path,)).fetchone()
+        if row is None and file_name:
+            row = self._conn.execute("SELECT id FROM records WHERE file = ? ORDER BY id LIMIT 1", (file_name,)).fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO records (file, path, data, dirty) VALUES (?, ?, ?, 1)",
+                               (file_name, path, data))
+        else:
+            self._conn.execute("UPDATE records SET file = ?, path = ?, data = ?, dirty = 1 WHERE id = ?",
+                               (file_name, path, data, row[0]))
+
+    def _get_info(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO store_info (key, value) VALUES (?, ?)", (key, value))
+
+
+def _row_values(record: Dict[str, str]) -> tuple:
+    return (
+        record.get(FILE_COLUMN) or "",
+        normalize_record_path(record.get(PATH_COLUMN) or ""),
+        json.dumps(record, ensure_ascii=False),
+    )
+
+
+def _csv_state(stat: os.stat_result) -> str:
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+_open_stores: Dict[str, MediaStore] = {}
+
+
+def open_media_store(csv_path: str, db_path: Optional[str] = None) -> Optional[MediaStore]:
+    """
+    Open the store for ``csv_path`` and register it for ``get_media_store``.
+
+    Returns None (plain CSV mode) when the store cannot be opened.
+    """
+    try:
+        store = MediaStore(csv_path, db_path)
+    except (OSError, sqlite3.Error, csv.Error, json.JSONDecodeError) as e:
+        logging.warning("Could not open media store for %s, using the CSV directly: %s", csv_path, e)
+        return None
+    _open_stores[os.path.abspath(csv_path)] = store
+    logging.info("Using media store %s (%d records)", store.db_path, len(store))
+    return store
+
+
+def get_media_store(csv_path: str) -> Optional[MediaStore]:
+    """Return the store registered for ``csv_path``, or None when the CSV is used directly."""
+    if not csv_path:
+        return None
+    return _open_stores.get(os.path.abspath(csv_path))
+
+
+def close_media_store(store: Optional[MediaStore], export: bool = True) -> None:
+    """
+    Unregister ``store``, export pending changes to its CSV and close it.
+
+    Args:
+        store: Store returned by ``open_media_store`` (None is ignored)
+        export: Write pending changes back to the CSV (with one backup)
+    """
+    if store is None:
+        return
+    _open_stores.pop(os.path.abspath(store.csv_path), None)
+    try:
+        pending = store.pending_changes
+        if export and pending:
+            store.export_csv()
+            logging.info("Exported %d changed records to %s", pending, store.csv_path)
+        elif pending:
+            logging.info("%d media store changes not exported yet (%s)", pending, store.db_path)
+    finally:
+        store.close()
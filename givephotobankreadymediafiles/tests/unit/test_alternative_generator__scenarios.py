@@ -106,3 +106,192 @@ def test_get_format_conversion_path__updates_extension():
         "I:/Rozt/Foto/jpg/Abstrakty/DSC0001.JPG", ".png"
     )
     assert path.endswith("Foto/png/Abstrakty/DSC0001.png")
+
+
+def _write_source(tmp_path, mode="RGB"):
+    import numpy as np
+    from PIL import Image
+
+    folder = tmp_path / "Foto" / "jpg" / "Abstrakty"
+    folder.mkdir(parents=True)
+    source = folder / "IMG_0001.jpg"
+    pixels = np.random.default_rng(1).integers(0, 255, (60, 80, 3), dtype=np.uint8)
+    Image.fromarray(pixels).convert(mode).save(source, quality=90)
+    return str(source)
+
+
+def test_generate_all_versions__decodes_source_once(monkeypatch, tmp_path):
+    source = _write_source(tmp_path)
+    opened = []
+    real_open = alternative_generator.Image.open
+    monkeypatch.setattr(alternative_generator.Image, "open", lambda p, *a, **k: opened.append(p) or real_open(p, *a, **k))
+    generator = alternative_generator.AlternativeGenerator(enabled_alternatives=["_bw", "_sharpen"])
+    target_dir, edited_dir = alternative_generator.get_alternative_output_dirs(source)
+
+    generated = generator.generate_all_versions(source, target_dir, edited_dir)
+
+    assert opened == [source]
+    assert [(g["type"], g["edit"], g["format"]) for g in generated] == [
+        ("format", None, ".png"), ("format", None, ".tif"),
+        ("edit", "_bw", ".jpg"), ("edit", "_sharpen", ".jpg"),
+        ("edit", "_bw", ".png"), ("edit", "_sharpen", ".png"),
+        ("edit", "_bw", ".tif"), ("edit", "_sharpen", ".tif"),
+    ]
+    assert generator.last_run_stats["decodes"] == 1
+    assert generator.last_run_stats["peak_memory_mb"] > 0
+
+
+def test_generate_all_versions__same_files_as_per_file_edits(tmp_path):
+    from PIL import Image
+
+    source = _write_source(tmp_path, mode="L")
+    generator = alternative_generator.AlternativeGenerator(enabled_alternatives=["_bw", "_negative", "_blurred"])
+    target_dir, edited_dir = alternative_generator.get_alternative_output_dirs(source)
+    generated = generator.generate_all_versions(source, target_dir, edited_dir)
+
+    for item in generated:
+        if item["type"] != "edit":
+            continue
+        expected_path = str(tmp_path / "expected" / Path(item["path"]).name)
+        (tmp_path / "expected").mkdir(exist_ok=True)
+        assert getattr(generator, f"_apply{item['edit']}")(item["original"], expected_path)
+        with Image.open(item["path"]) as fused, Image.open(expected_path) as per_file:
+            assert fused.mode == per_file.mode
+            assert fused.tobytes() == per_file.tobytes()
+
+
+def test_generate_many__pool_writes_same_files_as_sequential(tmp_path):
+    from PIL import Image
+
+    results = {}
+    for label, workers in (("sequential", 1), ("pool", 2)):
+        source = _write_source(tmp_path / label, mode="L")
+        with alternative_generator.AlternativeGenerator(
+                enabled_alternatives=["_bw", "_misty", "_blurred"], max_workers=workers) as generator:
+            generated = generator.generate_many([(source, *alternative_generator.get_alternative_output_dirs(source))])
+        results[label] = [(g["type"], g["edit"], Path(g["path"]).relative_to(tmp_path / label)) for g in generated[source]]
+        for item in generated[source]:
+            with Image.open(item["path"]) as img:
+                results[label].append(img.tobytes())
+
+    assert results["pool"] == results["sequential"]
+    assert len(results["pool"]) == 2 * (2 + 3 * 3)
+
+
+def test_generate_in_pool__memory_budget_limits_running_jobs(monkeypatch, tmp_path):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    source = _write_source(tmp_path)
+    state = {"running": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_job(job):
+        with lock:
+            state["running"] += 1
+            state["max"] = max(state["max"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+        if job.kind == "format":
+            return {"type": "format", "edit": None, "path": job.name, "original": job.source_file}, []
+        return [], []
+
+    monkeypatch.setattr(alternative_generator, "_run_alternative_job", fake_job)
+
+    for memory_limit_mb, expected in ((0, 1), (1024, 2)):
+        state["max"] = 0
+        generator = alternative_generator.AlternativeGenerator(
+            enabled_alternatives=["_bw", "_sharpen"], max_workers=2, memory_limit_mb=memory_limit_mb)
+        executor = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(generator, "_get_executor", lambda: executor)
+
+        generated = generator.generate_many([(source, str(tmp_path), str(tmp_path))])
+        executor.shutdown()
+
+        assert [g["path"] for g in generated[source]] == [".png", ".tif"]
+        assert state["max"] == expected
+        assert generator.last_run_stats["decodes"] == 4
+
+
+def test_effect_misty__close_to_full_resolution_fog():
+    import cv2
+    import numpy as np
+    from PIL import Image
+
+    pixels = np.random.default_rng(3).integers(0, 255, (300, 400, 3), dtype=np.uint8)
+    generator = alternative_generator.AlternativeGenerator(enabled_alternatives=[], enabled_formats=[])
+
+    misty = np.asarray(generator._effect_misty(Image.fromarray(pixels))).astype(np.float32)
+
+    # Full-resolution noise blurred with the 121x121 kernel, blended channel by channel
+    fog = cv2.GaussianBlur(np.random.default_rng(0).random((300, 400)) * 255, (121, 121), 40) / 255.0
+    reference = 255.0 * (1.0 - (1.0 - pixels / 255.0) * (1.0 - fog[:, :, None] * 0.8))
+    assert misty.shape == reference.shape
+    assert np.abs(misty - reference).mean() < 1.0
+
+
+def test_effect_misty__seed_makes_fog_reproducible(monkeypatch):
+    import numpy as np
+    from PIL import Image
+
+    image = Image.fromarray(np.full((120, 160, 3), 60, dtype=np.uint8))
+    built = []
+    real_build = alternative_generator._build_misty_fog_texture
+    monkeypatch.setattr(alternative_generator, "_build_misty_fog_texture",
+                        lambda *a: built.append(a) or real_build(*a))
+    alternative_generator._cached_misty_fog_texture.cache_clear()
+
+    first = alternative_generator.AlternativeGenerator(misty_seed=7)._effect_misty(image)
+    second = alternative_generator.AlternativeGenerator(misty_seed=7)._effect_misty(image)
+    other = alternative_generator.AlternativeGenerator(misty_seed=8)._effect_misty(image)
+    alternative_generator.AlternativeGenerator(misty_seed=None)._effect_misty(image)
+    alternative_generator.AlternativeGenerator(misty_seed=None)._effect_misty(image)
+
+    assert first.tobytes() == second.tobytes()
+    assert first.tobytes() != other.tobytes()
+    # Seeded textures are built once, unseeded ones every time
+    cache = alternative_generator._cached_misty_fog_texture.cache_info()
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert built == [(160, 120, None), (160, 120, None)]
+
+
+def test_format_conversions__encoding_profiles_are_lossless(tmp_path):
+    import numpy as np
+    from PIL import Image
+
+    source = _write_source(tmp_path)
+    # Smooth content, so that compression has something to remove
+    gradient = np.linspace(0, 255, 80, dtype=np.uint8)[None, :, None].repeat(60, 0).repeat(3, 2)
+    Image.fromarray(gradient).save(source, quality=90)
+    sizes = {}
+    for encoding in ("uncompressed", "compact"):
+        generator = alternative_generator.AlternativeGenerator(
+            enabled_alternatives=[], encoding=encoding, encoding_threads=2)
+        generated = generator._generate_format_conversions(source, str(tmp_path))
+
+        assert [g["format"] for g in generated] == [".png", ".tif"]
+        for item in generated:
+            assert item["encoding"] == encoding and item["encode_seconds"] >= 0
+            assert item["size_bytes"] == Path(item["path"]).stat().st_size
+            sizes[(encoding, item["format"])] = item["size_bytes"]
+            with Image.open(source) as original, Image.open(item["path"]) as converted:
+                assert converted.tobytes() == original.convert("RGB").tobytes()
+
+    assert sizes[("compact", ".png")] < sizes[("uncompressed", ".png")]
+    assert sizes[("compact", ".tif")] < sizes[("uncompressed", ".tif")]
+
+
+def test_encoding_profiles__unknown_profile_and_comparison(tmp_path):
+    import pytest
+
+    with pytest.raises(ValueError, match="Unknown encoding profile"):
+        alternative_generator.AlternativeGenerator(encoding="zip")
+
+    measurements = alternative_generator.compare_encoding_profiles(_write_source(tmp_path))
+
+    assert [(m["encoding"], m["format"]) for m in measurements] == [
+        (profile, fmt) for profile in alternative_generator.ALTERNATIVE_ENCODING_PROFILES for fmt in (".png", ".tif")
+    ]
+    assert all(m["size_bytes"] > 0 for m in measurements)
@@ -216,3 +216,53 @@ def test_save_metadata_to_csv__writes(monkeypatch):
     result = batch_manager._save_metadata_to_csv("media.csv", "C:/file.jpg", {"title": "t"}, False)
     assert result is True
     assert called
+
+
+def test_queue_alternatives_from_batch__generates_batch_together(monkeypatch):
+    items = [
+        {"file_path": "I:/Foto/jpg/A/a.jpg", "status": "saved_to_csv", "result": {"title": "A"}},
+        {"file_path": "I:/Foto/jpg/A/b.jpg", "status": "saved_to_csv"},
+        {"file_path": "I:/Foto/jpg/A/done.jpg", "status": "saved_to_csv"},
+        {"file_path": "I:/Foto/jpg/A/norecord.jpg", "status": "saved_to_csv"},
+        {"file_path": "I:/Foto/jpg/A/alt.jpg", "status": "saved_to_csv", "entry_type": "alternative"},
+    ]
+    batch_state = SimpleNamespace(all_files=lambda: items)
+    registry = SimpleNamespace(data={
+        "_alternative_workers": 3,
+        "alternatives_generated": {batch_manager._normalize_path("I:/Foto/jpg/A/done.jpg"): "2024-01-01"},
+    })
+    records = [{batch_manager.COL_PATH: path} for path in ("I:/Foto/jpg/A/a.jpg", "I:/Foto/jpg/A/b.jpg")]
+    monkeypatch.setattr(batch_manager, "get_media_store", lambda _p: None)
+    monkeypatch.setattr(batch_manager, "load_csv", lambda _p: records)
+    generators = []
+
+    class FakeGenerator:
+        def __init__(self, enabled_alternatives=None, max_workers=1, **_k):
+            self.max_workers = max_workers
+            self.photos = []
+            generators.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_a):
+            return None
+
+        def generate_many(self, photos):
+            self.photos = photos
+            return {photo[0]: [{"type": "edit", "path": photo[0]}] for photo in photos}
+
+    queued = []
+    monkeypatch.setattr(batch_manager, "AlternativeGenerator", FakeGenerator)
+    monkeypatch.setattr(batch_manager, "_generate_alternatives_for_file",
+                        lambda _r, _m, path, _meta, _ed, files: queued.append((path, files)))
+
+    batch_manager._queue_alternatives_from_batch(batch_state, registry, "media.csv")
+
+    assert len(generators) == 1 and generators[0].max_workers == 3
+    assert [photo[0] for photo in generators[0].photos] == ["I:/Foto/jpg/A/a.jpg", "I:/Foto/jpg/A/b.jpg"]
+    assert queued == [
+        ("I:/Foto/jpg/A/a.jpg", [{"type": "edit", "path": "I:/Foto/jpg/A/a.jpg"}]),
+        ("I:/Foto/jpg/A/b.jpg", [{"type": "edit", "path": "I:/Foto/jpg/A/b.jpg"}]),
+        ("I:/Foto/jpg/A/norecord.jpg", []),
+    ]
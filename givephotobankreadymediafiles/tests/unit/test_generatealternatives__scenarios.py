@@ -57,6 +57,11 @@ def test_main__validation_failure(monkeypatch):
         effects="bw",
         formats_only=False,
         effects_only=False,
+        workers=1,
+        memory_limit_mb=4096,
+        encoding="uncompressed",
+        encoding_threads=1,
+        compare_encodings=False,
     )
 
     monkeypatch.setattr(script, "parse_arguments", lambda: args)
@@ -76,6 +81,11 @@ def test_main__nothing_to_generate(monkeypatch):
         effects="",
         formats_only=False,
         effects_only=False,
+        workers=1,
+        memory_limit_mb=4096,
+        encoding="uncompressed",
+        encoding_threads=1,
+        compare_encodings=False,
     )
 
     monkeypatch.setattr(script, "parse_arguments", lambda: args)
@@ -84,3 +94,32 @@ def test_main__nothing_to_generate(monkeypatch):
     monkeypatch.setattr(script, "validate_file", lambda _p: True)
 
     assert script.main() == 1
+
+
+def test_main__compare_encodings_writes_nothing(monkeypatch, capsys):
+    args = SimpleNamespace(
+        file="C:/file.jpg",
+        log_dir="logs",
+        debug=False,
+        formats="png",
+        effects="bw",
+        formats_only=False,
+        effects_only=False,
+        workers=1,
+        memory_limit_mb=4096,
+        encoding="uncompressed",
+        encoding_threads=1,
+        compare_encodings=True,
+    )
+
+    monkeypatch.setattr(script, "parse_arguments", lambda: args)
+    monkeypatch.setattr(script, "ensure_directory", lambda _p: None)
+    monkeypatch.setattr(script, "setup_logging", lambda **_k: None)
+    monkeypatch.setattr(script, "validate_file", lambda _p: True)
+    monkeypatch.setattr(script, "compare_encoding_profiles", lambda _f, formats: [
+        {"encoding": "fast", "format": formats[0], "encode_seconds": 0.5, "size_bytes": 2 * 1024 * 1024}
+    ])
+    monkeypatch.setattr(script, "AlternativeGenerator", None)
+
+    assert script.main() == 0
+    assert "fast" in capsys.readouterr().out
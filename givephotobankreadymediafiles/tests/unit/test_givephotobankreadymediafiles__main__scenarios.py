@@ -27,7 +27,9 @@ def test_main__check_batch_status(monkeypatch):
         batch_size=1,
         batch_wait_timeout=0,
         batch_poll_interval=0,
+        alternative_workers=1,
         check_batch_status=True,
+        media_store=None,
     )
 
     monkeypatch.setattr(main_module, "parse_arguments", lambda: args)
@@ -51,7 +53,9 @@ def test_main__batch_mode_lock_failure(monkeypatch):
         batch_size=1,
         batch_wait_timeout=0,
         batch_poll_interval=0,
+        alternative_workers=1,
         check_batch_status=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(main_module, "parse_arguments", lambda: args)
@@ -82,7 +86,9 @@ def test_main__no_media_records(monkeypatch):
         batch_size=1,
         batch_wait_timeout=0,
         batch_poll_interval=0,
+        alternative_workers=1,
         check_batch_status=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(main_module, "parse_arguments", lambda: args)
@@ -106,7 +112,9 @@ def test_main__no_unprocessed(monkeypatch):
         batch_size=1,
         batch_wait_timeout=0,
         batch_poll_interval=0,
+        alternative_workers=1,
         check_batch_status=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(main_module, "parse_arguments", lambda: args)
@@ -133,7 +141,9 @@ def test_main__process_records(monkeypatch):
         batch_size=1,
         batch_wait_timeout=0,
         batch_poll_interval=0,
+        alternative_workers=1,
         check_batch_status=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(main_module, "parse_arguments", lambda: args)
@@ -212,3 +212,54 @@ def test_update_time_display__updates_progress():
 
     display._update_time_display()
     assert display.video_progress.values[-1] == 50.0
+
+
+def test_load_image__raw_uses_preview_and_cache(monkeypatch):
+    display = media_display.MediaDisplay(DummyRoot())
+    display.media_label = DummyLabel()
+    preview = media_display.Image.new("RGB", (1620, 1080))
+    loaded = []
+    monkeypatch.setattr(media_display, "load_raw_image", lambda p, **_k: loaded.append(p) or preview)
+    monkeypatch.setattr(media_display.ImageTk, "PhotoImage", lambda image: image)
+
+    def no_open(_p):
+        raise AssertionError("RAW file must not be reopened on resize")
+
+    monkeypatch.setattr(media_display.Image, "open", no_open)
+    display._get_exiftool_path = lambda: None
+    display.load_image("C:/IMG_1.NEF")
+    display.resize_image()
+
+    assert loaded == ["C:/IMG_1.NEF"]
+    assert display.original_image_size == (1620, 1080)
+    assert display.current_image.size == (780, 520)
+
+
+def test_on_window_resize__fast_resize_then_debounced_final(monkeypatch):
+    class CancelRoot(DummyRoot):
+        def __init__(self):
+            super().__init__()
+            self.cancelled = []
+
+        def after(self, _ms, func):
+            self.after_calls.append(func)
+            return len(self.after_calls)
+
+        def after_cancel(self, job):
+            self.cancelled.append(job)
+
+    root = CancelRoot()
+    display = media_display.MediaDisplay(root)
+    display.current_file_path = "C:/file.jpg"
+    monkeypatch.setattr(media_display, "is_video_file", lambda _p: False)
+    resizes = []
+    monkeypatch.setattr(display, "resize_image", lambda fast=False: resizes.append(fast))
+
+    for width in (900, 950, 1000):
+        display.on_window_resize(SimpleNamespace(widget=root, width=width, height=700))
+    display.on_window_resize(SimpleNamespace(widget=root, width=1000, height=700))
+
+    assert resizes == [True, True, True]
+    assert root.cancelled == [1, 2]
+    root.after_calls[-1]()
+    assert resizes[-1] is False
@@ -22,6 +22,7 @@ def test_main__missing_file(monkeypatch):
         categories_csv="cats.csv",
         log_dir="logs",
         debug=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(script, "parse_arguments", lambda: args)
@@ -39,6 +40,7 @@ def test_main__no_metadata_saved(monkeypatch):
         categories_csv="cats.csv",
         log_dir="logs",
         debug=False,
+        media_store=None,
     )
 
     monkeypatch.setattr(script, "parse_arguments", lambda: args)
@@ -54,3 +56,36 @@ def test_main__no_metadata_saved(monkeypatch):
     monkeypatch.setattr(script, "show_media_viewer", lambda *_a, **_k: None)
 
     assert script.main() == 0
+
+
+def test_main__store_mode_logs_update_of_existing_record(monkeypatch, caplog):
+    import logging
+
+    args = SimpleNamespace(
+        file="C:/file.jpg",
+        media_csv="media.csv",
+        categories_csv="cats.csv",
+        log_dir="logs",
+        debug=False,
+        media_store=None,
+    )
+    existing = {"Soubor": "file.jpg", "Cesta": "C:/file.jpg", "Bank status": "nezpracováno"}
+    saved = []
+    store = SimpleNamespace(find_by_path=lambda _p: existing, find_by_file=lambda _f: existing,
+                            save=saved.append)
+
+    monkeypatch.setattr(script, "parse_arguments", lambda: args)
+    monkeypatch.setattr(script, "ensure_directory", lambda _p: None)
+    monkeypatch.setattr(script, "setup_logging", lambda **_k: None)
+    monkeypatch.setattr(script.os.path, "exists", lambda path: path in (args.file, args.media_csv))
+    monkeypatch.setattr(script, "load_categories", lambda _p: {})
+    monkeypatch.setattr(script, "get_media_store", lambda _p: store)
+    monkeypatch.setattr(script, "show_media_viewer",
+                        lambda _f, _r, callback, _c: callback({"rejected": True}))
+
+    with caplog.at_level(logging.DEBUG):
+        assert script.main() == 0
+
+    assert saved == [existing]
+    assert "Updated record for file.jpg" in caplog.text
+    assert "Created record" not in caplog.text
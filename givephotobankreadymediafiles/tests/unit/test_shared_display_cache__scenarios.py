@@ -0,0 +1,50 @@
+"""
+Unit tests for shared/display_cache.py.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "givephotobankreadymediafiles"
+sys.path.insert(0, str(package_root))
+
+from shared.display_cache import DisplayImageCache
+
+
+def test_fit__keeps_aspect_ratio_and_never_upscales():
+    cache = DisplayImageCache(Image.new("RGB", (4000, 3000)))
+
+    assert cache.fit(780, 580).size == (773, 580)
+    assert DisplayImageCache(Image.new("RGB", (400, 300))).fit(780, 580).size == (400, 300)
+
+
+def test_fit__uses_nearest_level_at_least_as_large():
+    cache = DisplayImageCache(Image.new("RGB", (4000, 3000)))
+
+    assert cache.level_for((773, 580)).size == (1000, 750)
+    assert cache.levels == 3
+    # Larger target: an existing bigger level serves it, nothing new is built
+    assert cache.level_for((1800, 1350)).size == (2000, 1500)
+    assert cache.levels == 3
+
+
+def test_fit__repeated_size_is_served_from_memory():
+    cache = DisplayImageCache(Image.new("RGB", (4000, 3000)))
+
+    final = cache.fit(780, 580)
+    assert cache.fit(780, 580) is final
+    # A fast request after the high-quality pass reuses it
+    assert cache.fit(780, 580, fast=True) is final
+    fast = cache.fit(700, 500, fast=True)
+    assert cache.fit(700, 500) is not fast
+
+
+def test_fit__mode_without_reduce_support():
+    cache = DisplayImageCache(Image.new("P", (2000, 1000)))
+
+    assert cache.fit(500, 500).size == (500, 250)
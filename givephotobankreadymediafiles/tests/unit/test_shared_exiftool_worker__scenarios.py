@@ -0,0 +1,191 @@
+"""
+Unit tests for givephotobankreadymediafiles/shared/exiftool_worker.py.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "givephotobankreadymediafiles"
+sys.path.insert(0, str(package_root))
+
+import shared.exiftool_worker as exiftool_worker
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake ExifTool relies on a shebang script")
+
+# Minimal ExifTool stand-in: understands -stay_open, -j, -echo4 and tag writes.
+FAKE_EXIFTOOL = r'''
+import json
+import sys
+
+
+def run(args, out, err):
+    status = 0
+    echo = []
+    files = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("-echo4", "-charset", "-sep"):
+            if arg == "-echo4":
+                echo.append(args[i + 1])
+            i += 2
+            continue
+        if not arg.startswith("-"):
+            files.append(arg)
+        i += 1
+    for name in files:
+        if "missing" in name:
+            err.write("Error: File not found - " + name + "\n")
+            status = 1
+    if "-j" in args:
+        rows = [{"SourceFile": f, "CreateDate": "2024:01:02 10:11:12"} for f in files if "missing" not in f]
+        if rows:
+            out.write(json.dumps(rows) + "\n")
+    elif any("=" in a for a in args):
+        out.write("    %d image files updated\n" % len([f for f in files if "missing" not in f]))
+    for text in echo:
+        err.write(text.replace("${status}", str(status)) + "\n")
+    return status
+
+
+if "-stay_open" in sys.argv:
+    pending = []
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        if line == "False" and pending and pending[-1] == "-stay_open":
+            break
+        if line.startswith("-execute"):
+            run(pending, sys.stdout, sys.stderr)
+            sys.stdout.write("{ready" + line[len("-execute"):] + "}\n")
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pending = []
+        else:
+            pending.append(line)
+else:
+    sys.exit(run(sys.argv[1:], sys.stdout, sys.stderr))
+'''
+
+
+@pytest.fixture
+def fake_tool(tmp_path):
+    tool = tmp_path / "exiftool"
+    tool.write_text(f"#!{sys.executable}\n" + FAKE_EXIFTOOL, encoding="utf-8")
+    tool.chmod(0o755)
+    return str(tool)
+
+
+def test_worker__executes_multiple_commands_in_one_process(fake_tool):
+    with exiftool_worker.ExifToolWorker(fake_tool) as worker:
+        pid = worker.process.pid
+        first = worker.execute_json(["C:/a.jpg"])
+        second = worker.execute_json(["C:/b.jpg"])
+        assert worker.process.pid == pid
+        assert worker.commands_executed == 2
+    assert first[0]["SourceFile"] == "C:/a.jpg"
+    assert second[0]["CreateDate"] == "2024:01:02 10:11:12"
+    assert worker.process is None
+
+
+def test_worker__reports_status_and_stderr(fake_tool):
+    with exiftool_worker.ExifToolWorker(fake_tool) as worker:
+        result = worker.execute(["-Title=x", "C:/missing.jpg"])
+        assert result.returncode == 1
+        assert "File not found" in result.stderr
+        with pytest.raises(subprocess.CalledProcessError):
+            worker.execute(["-Title=x", "C:/missing.jpg"], check=True)
+        assert worker.execute(["-Title=x", "C:/ok.jpg"]).returncode == 0
+
+
+def test_worker__rejects_line_breaks(fake_tool):
+    with exiftool_worker.ExifToolWorker(fake_tool) as worker:
+        with pytest.raises(exiftool_worker.ExifToolWorkerError):
+            worker.execute(["-Description=a\nb", "C:/a.jpg"])
+
+
+def test_worker__restarts_after_crash(fake_tool):
+    with exiftool_worker.ExifToolWorker(fake_tool) as worker:
+        worker.process.kill()
+        worker.process.wait()
+        assert worker.execute_json(["C:/a.jpg"])[0]["SourceFile"] == "C:/a.jpg"
+
+
+def test_worker__start_failure_raises(tmp_path):
+    worker = exiftool_worker.ExifToolWorker(str(tmp_path / "missing-exiftool"))
+    with pytest.raises(exiftool_worker.ExifToolWorkerError):
+        worker.start()
+
+
+def test_run_exiftool__uses_shared_worker(fake_tool):
+    try:
+        first = exiftool_worker.run_exiftool(fake_tool, ["-j", "C:/a.jpg"])
+        worker = exiftool_worker.get_shared_worker(fake_tool)
+        exiftool_worker.run_exiftool(fake_tool, ["-j", "C:/b.jpg"])
+        assert worker.commands_executed == 2
+        assert '"C:/a.jpg"' in first.stdout
+    finally:
+        exiftool_worker.shutdown_shared_workers()
+    assert worker.process is None
+
+
+def test_run_exiftool__falls_back_to_subprocess(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_run(cmd, capture_output, text, check):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "[]", "")
+
+    monkeypatch.setattr(exiftool_worker.subprocess, "run", fake_run)
+    tool = str(tmp_path / "missing-exiftool")
+    try:
+        exiftool_worker.run_exiftool(tool, ["-j", "C:/a.jpg"])
+        exiftool_worker.run_exiftool(tool, ["-j", "C:/b.jpg"])
+    finally:
+        exiftool_worker.shutdown_shared_workers()
+    assert calls == [[tool, "-j", "C:/a.jpg"], [tool, "-j", "C:/b.jpg"]]
+
+
+def test_run_exiftool__disabled_persistent_mode(monkeypatch, fake_tool):
+    monkeypatch.setattr(exiftool_worker.subprocess, "run", lambda cmd, **_k: subprocess.CompletedProcess(cmd, 0, "", ""))
+    exiftool_worker.set_persistent_enabled(False)
+    try:
+        assert exiftool_worker.get_shared_worker(fake_tool) is None
+        assert exiftool_worker.run_exiftool(fake_tool, ["-j", "C:/a.jpg"]).args[0] == fake_tool
+    finally:
+        exiftool_worker.set_persistent_enabled(True)
+
+
+def test_pool__spreads_commands_and_keeps_order(fake_tool):
+    from concurrent.futures import ThreadPoolExecutor
+
+    files = [f"C:/img_{i}.jpg" for i in range(12)]
+    with exiftool_worker.ExifToolWorkerPool(fake_tool, size=3) as pool:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda f: pool.execute(["-j", f]).stdout, files))
+        assert pool.commands_executed == 12
+        assert len({worker.process.pid for worker in pool.workers}) == 3
+    assert [f'"{f}"' in out for f, out in zip(files, results)] == [True] * 12
+
+
+def test_start_shared_pool__used_by_run_exiftool(fake_tool):
+    try:
+        pool = exiftool_worker.start_shared_pool(fake_tool, size=2)
+        assert exiftool_worker.get_shared_worker(fake_tool) is pool
+        exiftool_worker.run_exiftool(fake_tool, ["-j", "C:/a.jpg"])
+        assert pool.commands_executed == 1
+    finally:
+        exiftool_worker.shutdown_shared_workers()
+
+
+def test_start_shared_pool__missing_tool_returns_none(tmp_path):
+    try:
+        assert exiftool_worker.start_shared_pool(str(tmp_path / "missing-exiftool"), size=2) is None
+    finally:
+        exiftool_worker.shutdown_shared_workers()
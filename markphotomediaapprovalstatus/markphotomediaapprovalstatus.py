@@ -12,6 +12,7 @@ import logging
 
 from shared.utils import get_log_filename
 from shared.file_operations import ensure_directory, load_csv, save_csv_with_backup
+from shared.media_store import close_media_store, open_media_store
 from shared.logging_config import setup_logging
 
 from markphotomediaapprovalstatuslib.constants import (
@@ -49,6 +50,8 @@ def parse_arguments():
                         help="Enable debug logging")
     parser.add_argument("--include-edited", action="store_true",
                         help="Include edited photos from 'upravené' folders (default: only original photos)")
+    parser.add_argument("--media_store", type=str, default=None,
+                        help="SQLite media store for per-record saves; the CSV is written once at the end")
     return parser.parse_args()
 
 
@@ -65,9 +68,29 @@ def main():
     setup_logging(debug=args.debug, log_file=log_file)
     logging.info("Starting photo media approval status marking process")
 
+    store = None
+    if args.media_store and os.path.exists(args.csv_path):
+        store = open_media_store(args.csv_path, args.media_store)
+
+    try:
+        process_csv(args, store)
+    finally:
+        close_media_store(store)
+
+    logging.info("Photo media approval status marking process completed")
+
+
+def process_csv(args, store=None):
+    """
+    Load the records, filter them and run the approval GUI.
+
+    Args:
+        args: Parsed command line arguments
+        store: Open media store for the CSV, or None to work on the CSV directly
+    """
     # Load CSV data
     try:
-        all_data = load_csv(args.csv_path)
+        all_data = store.load_records() if store is not None else load_csv(args.csv_path)
         logging.info(f"Loaded {len(all_data)} records from {args.csv_path}")
     except Exception as e:
         logging.error(f"Failed to load CSV file: {e}")
@@ -96,8 +119,6 @@ def main():
     else:
         logging.info("No changes were made")
 
-    logging.info("Photo media approval status marking process completed")
-
 
 if __name__ == "__main__":
     main()
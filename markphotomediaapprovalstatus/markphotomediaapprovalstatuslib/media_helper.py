@@ -12,9 +12,11 @@ from markphotomediaapprovalstatuslib.constants import (
 )
 from markphotomediaapprovalstatuslib.status_handler import (
     filter_records_by_bank_status,
+    find_sharpen_for_original,
     update_sharpen_status
 )
 from shared.file_operations import save_csv_with_backup
+from shared.media_store import get_media_store
 
 
 def is_video_file(file_path: str) -> bool:
@@ -66,6 +68,7 @@ def process_approval_records(data: List[Dict[str, str]], filtered_data: List[Dic
         data: Complete CSV data (for modifications)
         filtered_data: Records with STATUS_CHECKED status to process
         csv_path: Path to CSV file for immediate saving after each change
+            (only the changed records are written when a media store is open for it)
 
     Returns:
         True if any changes were made, False otherwise
@@ -76,6 +79,7 @@ def process_approval_records(data: List[Dict[str, str]], filtered_data: List[Dic
 
     changes_made = False
     total_banks = len(BANKS)
+    store = get_media_store(csv_path)
 
     logging.info(f"Starting bank-first iteration across {total_banks} banks")
 
@@ -136,7 +140,13 @@ def process_approval_records(data: List[Dict[str, str]], filtered_data: List[Dic
 
                         # Save immediately after each file
                         try:
-                            save_csv_with_backup(data, csv_path)
+                            if store is not None:
+                                changed = [record]
+                                if sharpen_changed:
+                                    changed.append(find_sharpen_for_original(file_name, data))
+                                store.save_many(changed)
+                            else:
+                                save_csv_with_backup(data, csv_path)
                             logging.info(f"Saved changes after processing {file_name} for {bank}")
                         except Exception as e:
                             logging.error(f"Failed to save changes after processing {file_name}: {e}")
@@ -19,6 +19,7 @@ def make_args(tmp_path, **overrides):
         log_dir=str(tmp_path / "logs"),
         debug=False,
         include_edited=False,
+        media_store=None,
     )
     defaults.update(overrides)
     return SimpleNamespace(**defaults)
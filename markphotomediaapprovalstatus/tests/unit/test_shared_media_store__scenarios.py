@@ -0,0 +1,109 @@
+"""
+Unit tests for markphotomediaapprovalstatus/shared/media_store.py.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "markphotomediaapprovalstatus"
+sys.path.insert(0, str(package_root))
+
+from shared.file_operations import save_csv_with_backup
+from shared.media_store import (
+    MediaStore,
+    close_media_store,
+    get_media_store,
+    open_media_store,
+)
+
+
+def _records(base: Path):
+    return [
+        {"Soubor": "a.jpg", "Cesta": str(base / "a.jpg"), "Název": 'Most, "Karlův"', "Klíčová slova": "most, řeka"},
+        {"Soubor": "b.jpg", "Cesta": str(base / "b.jpg"), "Název": "Hrad", "Klíčová slova": ""},
+    ]
+
+
+def _write_csv(path: Path, records) -> None:
+    path.write_text("", encoding="utf-8")
+    save_csv_with_backup(records, str(path))
+    for backup in path.parent.glob(f"{path.stem}_*.csv"):
+        backup.unlink()
+
+
+def test_media_store__export_is_lossless(tmp_path):
+    csv_path = tmp_path / "PhotoMedia.csv"
+    _write_csv(csv_path, _records(tmp_path))
+    original = csv_path.read_bytes()
+
+    with MediaStore(str(csv_path)) as store:
+        exported = tmp_path / "export.csv"
+        count = store.export_csv(str(exported), backup=False)
+
+    assert count == 2
+    assert exported.read_bytes() == original
+
+
+def test_media_store__lookup_and_per_record_update(tmp_path):
+    csv_path = tmp_path / "PhotoMedia.csv"
+    _write_csv(csv_path, _records(tmp_path))
+
+    with MediaStore(str(csv_path)) as store:
+        record = store.find_by_path(str(tmp_path / "b.jpg"))
+        assert record["Název"] == "Hrad"
+        assert store.find_by_file("a.jpg")["Klíčová slova"] == "most, řeka"
+        assert store.find_by_file("missing.jpg") is None
+
+        record["Název"] = "Hrad v zimě"
+        store.save(record)
+        alternative = dict(record, Soubor="b_bw.jpg", Cesta=str(tmp_path / "b_bw.jpg"))
+        store.save(alternative)
+
+        assert store.pending_changes == 2
+        assert [r["Soubor"] for r in store.load_records()] == ["a.jpg", "b.jpg", "b_bw.jpg"]
+        store.export_csv()
+
+        assert store.pending_changes == 0
+
+    with MediaStore(str(csv_path)) as store:
+        assert store.find_by_file("b.jpg")["Název"] == "Hrad v zimě"
+    assert len(list(tmp_path.glob("PhotoMedia_*.csv"))) == 1
+
+
+def test_media_store__external_csv_change_keeps_pending_edits(tmp_path):
+    csv_path = tmp_path / "PhotoMedia.csv"
+    _write_csv(csv_path, _records(tmp_path))
+
+    with MediaStore(str(csv_path)) as store:
+        record = store.find_by_file("a.jpg")
+        record["Název"] = "Upraveno"
+        store.save(record)
+
+    changed = _records(tmp_path)
+    changed[1]["Název"] = "Změněno jinde"
+    _write_csv(csv_path, changed + [{"Soubor": "c.jpg", "Cesta": str(tmp_path / "c.jpg"),
+                                     "Název": "", "Klíčová slova": ""}])
+    os.utime(csv_path, ns=(1, 1))
+
+    with MediaStore(str(csv_path)) as store:
+        titles = {r["Soubor"]: r["Název"] for r in store.load_records()}
+
+    assert titles == {"a.jpg": "Upraveno", "b.jpg": "Změněno jinde", "c.jpg": ""}
+
+
+def test_open_media_store__registers_and_exports_on_close(tmp_path):
+    csv_path = tmp_path / "PhotoMedia.csv"
+    _write_csv(csv_path, _records(tmp_path))
+
+    store = open_media_store(str(csv_path), str(tmp_path / "store.sqlite"))
+    assert get_media_store(str(csv_path)) is store
+    record = store.find_by_file("a.jpg")
+    record["Název"] = "Nový"
+    store.save(record)
+
+    close_media_store(store)
+
+    assert get_media_store(str(csv_path)) is None
+    assert "Nový" in csv_path.read_text(encoding="utf-8-sig")
@@ -6,6 +6,7 @@ import re
 from shared.utils            import get_log_filename
 from shared.file_operations import ensure_directory, unify_duplicate_files, copy_folder, flatten_folder
 from shared.logging_config  import setup_logging
+from shared.hash_index      import activate_hash_index, deactivate_hash_index
 
 from pullnewmediatounsortedlib.constants import (
     DEFAULT_RAID_DRIVE,
@@ -21,6 +22,7 @@ from pullnewmediatounsortedlib.constants import (
     DEFAULT_TARGET_SCREEN_FOLDER,
     DEFAULT_FINAL_TARGET_FOLDER,
     DEFAULT_LOG_DIR,
+    DEFAULT_HASH_INDEX_PATH,
     SCREENSHOT_MARKERS,
     PREFIXES_TO_NORMALIZE,
 )
@@ -50,6 +52,8 @@ def parse_arguments():
     parser.add_argument("--index_prefix",    type=str, default="PICT", help="Prefix for indexed filenames")
     parser.add_argument("--index_width",     type=int, default=4, help="Width of numeric suffix")
     parser.add_argument("--index_max",       type=int, default=9999, help="Max index number to scan")
+    parser.add_argument("--hash_index",      type=str, default=DEFAULT_HASH_INDEX_PATH,
+                        help="Persistent hash index file (empty string disables it)")
     return parser.parse_args()
 
 
@@ -74,52 +78,58 @@ def main():
     ]
     screen_sources = [args.screens_onedrive, args.screens_dropbox]
 
-    # 0) Unify duplicates before any renaming
-    for folder in sources + screen_sources + [args.target]:
-        unify_duplicate_files(folder, recursive=True)
-
-    # 1) Generic filename replacements (_NIK -> NIK_ by default)
-    for folder in sources + screen_sources + [args.target]:
-        replace_in_filenames(folder, "_NIK", "NIK_", recursive=True)
-
-    # 2) Normalize indexed filenames in target vs final_target
-    for prefix in PREFIXES_TO_NORMALIZE:
-        normalize_indexed_filenames(
-            source_folder=args.target,
-            reference_folder=args.final_target,
-            prefix=prefix,
-            width=args.index_width,
-            max_number=args.index_max,
-        )
-
-    # 3) Normalize indexed filenames in sources vs target
-    for folder in sources + screen_sources:
+    # Reuse hashes of unchanged files from previous runs
+    hash_index = activate_hash_index(args.hash_index)
+
+    try:
+        # 0) Unify duplicates before any renaming
+        for folder in sources + screen_sources + [args.target]:
+            unify_duplicate_files(folder, recursive=True)
+
+        # 1) Generic filename replacements (_NIK -> NIK_ by default)
+        for folder in sources + screen_sources + [args.target]:
+            replace_in_filenames(folder, "_NIK", "NIK_", recursive=True)
+
+        # 2) Normalize indexed filenames in target vs final_target
         for prefix in PREFIXES_TO_NORMALIZE:
             normalize_indexed_filenames(
-                source_folder=folder,
-                reference_folder=args.target,
+                source_folder=args.target,
+                reference_folder=args.final_target,
                 prefix=prefix,
                 width=args.index_width,
                 max_number=args.index_max,
             )
 
-    # 4) Copy media files to target
-    for folder in sources:
-        copy_folder(folder, args.target)
-
-    # 5) Copy screenshot files to target_screen
-    pattern = rf"(?:{'|'.join(re.escape(m) for m in SCREENSHOT_MARKERS)})"
-    for folder in sources + screen_sources:
-        copy_folder(folder, args.target_screen, pattern=pattern)
-
-    # 6) Flatten target folder structure (move all files to root level)
-    logging.info("Flattening target folder structure")
-    flatten_folder(args.target)
-    flatten_folder(args.target_screen)
-
-    # 7) Ensure temporary directory exists
-    temp_dir = os.path.join(args.target, "FotoTemp")
-    ensure_directory(temp_dir)
+        # 3) Normalize indexed filenames in sources vs target
+        for folder in sources + screen_sources:
+            for prefix in PREFIXES_TO_NORMALIZE:
+                normalize_indexed_filenames(
+                    source_folder=folder,
+                    reference_folder=args.target,
+                    prefix=prefix,
+                    width=args.index_width,
+                    max_number=args.index_max,
+                )
+
+        # 4) Copy media files to target
+        for folder in sources:
+            copy_folder(folder, args.target)
+
+        # 5) Copy screenshot files to target_screen
+        pattern = rf"(?:{'|'.join(re.escape(m) for m in SCREENSHOT_MARKERS)})"
+        for folder in sources + screen_sources:
+            copy_folder(folder, args.target_screen, pattern=pattern)
+
+        # 6) Flatten target folder structure (move all files to root level)
+        logging.info("Flattening target folder structure")
+        flatten_folder(args.target)
+        flatten_folder(args.target_screen)
+
+        # 7) Ensure temporary directory exists
+        temp_dir = os.path.join(args.target, "FotoTemp")
+        ensure_directory(temp_dir)
+    finally:
+        deactivate_hash_index(hash_index)
 
     logging.info("Sync process completed successfully")
 
@@ -19,6 +19,9 @@ DEFAULT_FINAL_TARGET_FOLDER  = r"J:/"
 # logování
 DEFAULT_LOG_DIR              = r"H:/Logs"
 
+# perzistentní index hashů (sdílený s removealreadysortedout)
+DEFAULT_HASH_INDEX_PATH      = os.path.expanduser(r"~/.photobanking/hash_index.sqlite")
+
 # konstanty pro detekci screenshotů
 SCREENSHOT_MARKERS = [
     'Sním',  # Česká část slova "Snímek obrazovky"
@@ -3,6 +3,7 @@ import logging
 import os
 from datetime import datetime
 from shared.file_operations import get_hash_map_from_folder, compute_file_hash
+from shared.hash_utils import record_file_move
 from shared.name_utils import extract_numeric_suffix, generate_indexed_filename, find_next_available_number
 from shared.exif_handler import get_best_creation_date
 from shared.exif_downloader import ensure_exiftool
@@ -140,6 +141,7 @@ def normalize_indexed_filenames(
             dst = os.path.join(os.path.dirname(src_path), new_name)
             try:
                 os.rename(src_path, dst)
+                record_file_move(src_path, dst)
                 logging.debug("Renamed %s -> %s", name, new_name)
             except Exception as e:
                 logging.error("Failed to rename %s to %s: %s", src_path, new_name, e)
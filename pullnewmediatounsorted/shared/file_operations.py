@@ -8,7 +8,7 @@ from typing import List, Dict
 from collections import defaultdict
 from tqdm import tqdm
 
-from shared.hash_utils      import compute_file_hash
+from shared.hash_utils      import compute_file_hash, record_file_move
 
 def list_files(folder: str, pattern: str | None = None, recursive: bool = True) -> list[str]:
     """
@@ -237,6 +237,7 @@ def unify_duplicate_files(folder: str, recursive: bool = True) -> None:
                 dst = os.path.join(os.path.dirname(path), canonical_basename)
                 try:
                     os.replace(path, dst)
+                    record_file_move(path, dst)
                     renamed_count += 1
                     logging.debug("Renamed %s -> %s", path, dst)
                 except Exception as e:
@@ -340,6 +341,7 @@ def flatten_folder(folder: str) -> None:
             # Move file to root
             try:
                 shutil.move(file_path, dest_path)
+                record_file_move(file_path, dest_path)
                 existing_names[filename.casefold()] = filename
                 moved_count += 1
                 logging.debug("Moved file to root: %s -> %s", file_path, dest_path)
@@ -32,6 +32,7 @@ def test_main_calls_core_steps(monkeypatch):
         index_prefix="PICT",
         index_width=4,
         index_max=10,
+        hash_index="",
     )
 
     calls = {"unify": 0, "replace": 0, "normalize": 0, "copy": 0, "flatten": 0}
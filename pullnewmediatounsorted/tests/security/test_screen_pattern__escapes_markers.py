@@ -32,6 +32,7 @@ def test_pattern_escapes_markers(monkeypatch):
         index_prefix="PICT",
         index_width=4,
         index_max=10,
+        hash_index="",
     )
 
     marker = "screen(shot)+"
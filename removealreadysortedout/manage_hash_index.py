@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Maintain the persistent hash index shared by pullnewmediatounsorted and removealreadysortedout.
+
+Usage:
+    python removealreadysortedout/manage_hash_index.py rebuild [FOLDER ...]
+    python removealreadysortedout/manage_hash_index.py verify [--folder FOLDER]
+    python removealreadysortedout/manage_hash_index.py prune [--folder FOLDER]
+    python removealreadysortedout/manage_hash_index.py stats
+"""
+import argparse
+import logging
+
+from shared.file_operations import ensure_directory
+from shared.hash_index import HashIndex, rebuild_index, verify_index
+from shared.logging_config import setup_logging
+from shared.utils import get_log_filename
+
+from removealreadysortedoutlib.constants import (
+    DEFAULT_HASH_INDEX_PATH,
+    DEFAULT_LOG_DIR,
+    DEFAULT_TARGET_FOLDER,
+    DEFAULT_UNSORTED_FOLDER,
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser(description="Rebuild, verify or prune the persistent hash index.")
+    parser.add_argument("--hash_index", type=str, default=DEFAULT_HASH_INDEX_PATH,
+                        help="Path to the hash index file")
+    parser.add_argument("--log_dir", type=str, default=DEFAULT_LOG_DIR, help="Directory for log files")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser("rebuild", help="Hash new or changed files and drop stale entries")
+    rebuild.add_argument("folders", nargs="*", default=[DEFAULT_TARGET_FOLDER, DEFAULT_UNSORTED_FOLDER],
+                         help="Folders to index")
+
+    verify = subparsers.add_parser("verify", help="Re-hash indexed files and report mismatches")
+    verify.add_argument("--folder", type=str, default=None, help="Only verify entries under this folder")
+
+    prune = subparsers.add_parser("prune", help="Drop entries for missing or changed files")
+    prune.add_argument("--folder", type=str, default=None, help="Only prune entries under this folder")
+
+    subparsers.add_parser("stats", help="Show the number of indexed files")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the selected index command; returns a process exit code."""
+    args = parse_arguments()
+    ensure_directory(args.log_dir)
+    setup_logging(debug=args.debug, log_file=get_log_filename(args.log_dir))
+
+    with HashIndex(args.hash_index) as index:
+        if args.command == "rebuild":
+            hashed = rebuild_index(index, args.folders)
+            print(f"Indexed {len(index)} files ({hashed} hashed)")
+        elif args.command == "verify":
+            mismatches = verify_index(index, args.folder)
+            for path in mismatches:
+                print(f"Mismatch: {path}")
+            print(f"Verification finished: {len(mismatches)} mismatches")
+            return 1 if mismatches else 0
+        elif args.command == "prune":
+            removed = index.prune(args.folder)
+            print(f"Removed {removed} stale entries, {len(index)} remain")
+        else:
+            print(f"{args.hash_index}: {len(index)} entries")
+    logging.info("Hash index command '%s' finished", args.command)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
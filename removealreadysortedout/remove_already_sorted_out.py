@@ -6,11 +6,13 @@ from tqdm import tqdm
 from shared.utils import get_log_filename
 from shared.file_operations import list_files, ensure_directory, unify_duplicate_files
 from shared.logging_config import setup_logging
+from shared.hash_index import activate_hash_index, deactivate_hash_index
 
 from removealreadysortedoutlib.constants import (
     DEFAULT_UNSORTED_FOLDER,
     DEFAULT_TARGET_FOLDER,
     DEFAULT_LOG_DIR,
+    DEFAULT_HASH_INDEX_PATH,
     PREFIXES_TO_NORMALIZE,
 )
 
@@ -46,6 +48,8 @@ def parse_arguments():
                         help="Width of numeric suffix")
     parser.add_argument("--index_max", type=int, default=9999, 
                         help="Max index number to scan")
+    parser.add_argument("--hash_index", type=str, default=DEFAULT_HASH_INDEX_PATH,
+                        help="Persistent hash index file (empty string disables it)")
     return parser.parse_args()
 
 def main():
@@ -62,51 +66,57 @@ def main():
     logging.info(f"Target folder: {args.target_folder}")
     logging.info(f"Overwrite mode: {args.overwrite}")
     
-    # Remove desktop.ini if it exists
-    remove_desktop_ini(args.unsorted_folder)
+    # Reuse hashes of unchanged files from previous runs
+    hash_index = activate_hash_index(args.hash_index)
     
-    # Step 1: Unify duplicate files in both folders (same as pullnew)
-    logging.info("Step 1: Unifying duplicate files...")
-    unify_duplicate_files(args.unsorted_folder, recursive=True)
-    unify_duplicate_files(args.target_folder, recursive=True)
+    try:
+        # Remove desktop.ini if it exists
+        remove_desktop_ini(args.unsorted_folder)
     
-    # Step 2: Generic filename replacements (_NIK -> NIK_ by default)
-    logging.info("Step 2: Replacing filename patterns...")
-    replace_in_filenames(args.unsorted_folder, "_NIK", "NIK_", recursive=True)
-    replace_in_filenames(args.target_folder, "_NIK", "NIK_", recursive=True)
+        # Step 1: Unify duplicate files in both folders (same as pullnew)
+        logging.info("Step 1: Unifying duplicate files...")
+        unify_duplicate_files(args.unsorted_folder, recursive=True)
+        unify_duplicate_files(args.target_folder, recursive=True)
     
-    # Step 3: Normalize indexed filenames in unsorted vs target
-    logging.info("Step 3: Normalizing indexed filenames...")
-    for prefix in PREFIXES_TO_NORMALIZE:
-        normalize_indexed_filenames(
-            source_folder=args.unsorted_folder,
-            reference_folder=args.target_folder,
-            prefix=prefix,
-            width=args.index_width,
-            max_number=args.index_max,
-        )
+        # Step 2: Generic filename replacements (_NIK -> NIK_ by default)
+        logging.info("Step 2: Replacing filename patterns...")
+        replace_in_filenames(args.unsorted_folder, "_NIK", "NIK_", recursive=True)
+        replace_in_filenames(args.target_folder, "_NIK", "NIK_", recursive=True)
     
-    # Step 4: Get list of files from unsorted folder (after preprocessing)
-    logging.info("Step 4: Listing files in unsorted folder...")
-    unsorted_files = list_files(args.unsorted_folder, recursive=True)
-    logging.info(f"Found {len(unsorted_files)} files in unsorted folder")
+        # Step 3: Normalize indexed filenames in unsorted vs target
+        logging.info("Step 3: Normalizing indexed filenames...")
+        for prefix in PREFIXES_TO_NORMALIZE:
+            normalize_indexed_filenames(
+                source_folder=args.unsorted_folder,
+                reference_folder=args.target_folder,
+                prefix=prefix,
+                width=args.index_width,
+                max_number=args.index_max,
+            )
     
-    # Get map of files in target folder
-    logging.info("Building map of files in target folder...")
-    target_files_map = get_target_files_map(args.target_folder)
-    logging.info(f"Found {len(target_files_map)} unique filenames in target folder")
+        # Step 4: Get list of files from unsorted folder (after preprocessing)
+        logging.info("Step 4: Listing files in unsorted folder...")
+        unsorted_files = list_files(args.unsorted_folder, recursive=True)
+        logging.info(f"Found {len(unsorted_files)} files in unsorted folder")
     
-    # Find duplicates
-    logging.info("Finding duplicates...")
-    duplicates = find_duplicates(unsorted_files, target_files_map)
-    logging.info(f"Found {len(duplicates)} files that exist in both folders")
+        # Get map of files in target folder
+        logging.info("Building map of files in target folder...")
+        target_files_map = get_target_files_map(args.target_folder)
+        logging.info(f"Found {len(target_files_map)} unique filenames in target folder")
     
-    # Process duplicates
-    logging.info("Processing duplicates...")
-    with tqdm(total=len(duplicates), desc="Removing duplicates", unit="files") as pbar:
-        for source_path, target_paths in duplicates.items():
-            handle_duplicate(source_path, target_paths, args.overwrite, log_file)
-            pbar.update(1)
+        # Find duplicates
+        logging.info("Finding duplicates...")
+        duplicates = find_duplicates(unsorted_files, target_files_map)
+        logging.info(f"Found {len(duplicates)} files that exist in both folders")
+    
+        # Process duplicates
+        logging.info("Processing duplicates...")
+        with tqdm(total=len(duplicates), desc="Removing duplicates", unit="files") as pbar:
+            for source_path, target_paths in duplicates.items():
+                handle_duplicate(source_path, target_paths, args.overwrite, log_file)
+                pbar.update(1)
+    finally:
+        deactivate_hash_index(hash_index)
     
     logging.info("RemoveAlreadySortedOut process completed successfully")
 
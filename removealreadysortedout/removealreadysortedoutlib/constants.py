@@ -1,7 +1,12 @@
+import os
+
 DEFAULT_UNSORTED_FOLDER = "I:/Neroztříděno"
 DEFAULT_TARGET_FOLDER = "I:/Roztříděno"
 DEFAULT_LOG_DIR = "H:/Logs"
 
+# Persistent hash index (shared with pullnewmediatounsorted)
+DEFAULT_HASH_INDEX_PATH = os.path.expanduser("~/.photobanking/hash_index.sqlite")
+
 # ExifTool path
 EXIFTOOL_PATH = "F:/Dropbox/exiftool-12.30/exiftool.exe"
 
@@ -0,0 +1,439 @@
+"""
+Persistent ExifTool worker.
+
+Keeps one ``exiftool -stay_open True -@ -`` process alive and feeds it commands
+over stdin, so a run over thousands of files pays the process spawn and Perl
+startup once instead of once per file.
+
+Results are returned as ``subprocess.CompletedProcess`` objects and failures are
+raised as ``subprocess.CalledProcessError`` / ``subprocess.TimeoutExpired`` so
+callers can treat the worker exactly like ``subprocess.run``.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+# Arguments applied to every command executed by the worker. Arguments arrive
+# through a UTF-8 argfile, so file names must be decoded as UTF-8 as well.
+DEFAULT_COMMON_ARGS = ["-charset", "filename=utf8"]
+
+# Seconds to wait for a graceful shutdown before the process is killed.
+SHUTDOWN_TIMEOUT = 5.0
+
+# Number of ExifTool processes in a worker pool when no size is given.
+DEFAULT_POOL_SIZE = 4
+
+_READY_PATTERN = re.compile(r"^\{ready(\d+)\}\s*$")
+_DONE_PATTERN = re.compile(r"^\{done(\d+)\}(.*)$")
+
+
+class ExifToolWorkerError(RuntimeError):
+    """Raised when the persistent ExifTool process cannot be started or used."""
+
+
+class ExifToolWorker:
+    """A single long-lived ExifTool process driven through ``-stay_open``."""
+
+    def __init__(self, tool_path: str, common_args: Optional[Sequence[str]] = None):
+        """
+        Args:
+            tool_path: Path to the ExifTool executable
+            common_args: Arguments appended to every command (defaults to UTF-8 file names)
+        """
+        self.tool_path = tool_path
+        self.common_args = list(DEFAULT_COMMON_ARGS if common_args is None else common_args)
+        self.process: Optional[subprocess.Popen] = None
+        self.commands_executed = 0
+        self._owner_pid: Optional[int] = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._stdout_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def __enter__(self) -> "ExifToolWorker":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def is_running(self) -> bool:
+        """Check whether the ExifTool process is alive and owned by this process."""
+        return (
+            self.process is not None
+            and self.process.poll() is None
+            and self._owner_pid == os.getpid()
+        )
+
+    def start(self) -> None:
+        """Start the ExifTool process if it is not already running."""
+        if self.is_running():
+            return
+
+        cmd = [self.tool_path, "-stay_open", "True", "-@", "-"]
+        if self.common_args:
+            cmd.append("-common_args")
+            cmd.extend(self.common_args)
+
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as e:
+            self.process = None
+            raise ExifToolWorkerError(f"Could not start ExifTool at {self.tool_path}: {e}") from e
+
+        self._owner_pid = os.getpid()
+        self._stdout_lines = queue.Queue()
+        self._stderr_lines = queue.Queue()
+        for stream, target in ((self.process.stdout, self._stdout_lines), (self.process.stderr, self._stderr_lines)):
+            reader = threading.Thread(target=self._pump, args=(stream, target), daemon=True)
+            reader.start()
+
+        logging.debug(f"Started persistent ExifTool worker (pid {self.process.pid}) at {self.tool_path}")
+
+    @staticmethod
+    def _pump(stream, target: "queue.Queue[Optional[str]]") -> None:
+        """Copy lines from a pipe into a queue; ``None`` marks end of stream."""
+        try:
+            for line in stream:
+                target.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            target.put(None)
+
+    def execute(self, args: Sequence[str], timeout: Optional[float] = None,
+                check: bool = False) -> subprocess.CompletedProcess:
+        """
+        Run one ExifTool command in the persistent process.
+
+        Args:
+            args: ExifTool arguments without the executable (e.g. ["-j", "file.jpg"])
+            timeout: Seconds to wait for the command; the process is killed on expiry
+            check: Raise CalledProcessError when ExifTool reports a non-zero status
+
+        Returns:
+            CompletedProcess with stdout, stderr and the ExifTool return status
+        """
+        args = [str(arg) for arg in args]
+        if any("\n" in arg or "\r" in arg for arg in args):
+            raise ExifToolWorkerError("Arguments containing line breaks cannot be sent through -stay_open")
+
+        with self._lock:
+            if not self.is_running():
+                self.start()
+
+            self._sequence += 1
+            sequence = self._sequence
+            payload = args + ["-echo4", f"{{done{sequence}}}${{status}}", f"-execute{sequence}"]
+
+            try:
+                self.process.stdin.write("\n".join(payload) + "\n")
+                self.process.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._kill()
+                raise ExifToolWorkerError(f"Lost connection to ExifTool worker: {e}") from e
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            stdout_lines, _ = self._collect(self._stdout_lines, _READY_PATTERN, sequence, deadline, args, timeout)
+            stderr_lines, status = self._collect(self._stderr_lines, _DONE_PATTERN, sequence, deadline, args, timeout)
+            self.commands_executed += 1
+
+        stdout = "".join(stdout_lines)
+        stderr = "".join(stderr_lines)
+        returncode = self._parse_status(status, stderr)
+        result = subprocess.CompletedProcess([self.tool_path] + args, returncode, stdout, stderr)
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, result.args, output=stdout, stderr=stderr)
+        return result
+
+    def _collect(self, lines: "queue.Queue[Optional[str]]", pattern: "re.Pattern[str]", sequence: int,
+                 deadline: Optional[float], args: List[str], timeout: Optional[float]):
+        """Read lines until the sentinel for ``sequence`` appears."""
+        collected = []
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                self._kill()
+                raise subprocess.TimeoutExpired([self.tool_path] + args, timeout)
+
+            if line is None:
+                self._kill()
+                raise ExifToolWorkerError("ExifTool worker exited unexpectedly")
+
+            match = pattern.match(line)
+            if match and int(match.group(1)) == sequence:
+                extra = match.group(2) if match.lastindex and match.lastindex >= 2 else ""
+                return collected, extra
+            collected.append(line)
+
+    @staticmethod
+    def _parse_status(status: str, stderr: str) -> int:
+        """Use ExifTool's ${status} when available, otherwise infer it from stderr."""
+        status = status.strip()
+        if status.lstrip("-").isdigit():
+            return int(status)
+        return 1 if any(line.startswith("Error") for line in stderr.splitlines()) else 0
+
+    def execute_json(self, args: Sequence[str], timeout: Optional[float] = None) -> List[Dict]:
+        """Run a command with ``-j`` and return the decoded JSON list (empty when nothing matched)."""
+        result = self.execute(["-j"] + list(args), timeout=timeout)
+        output = result.stdout.strip()
+        return json.loads(output) if output else []
+
+    def close(self) -> None:
+        """Ask ExifTool to exit and wait for it; kill it if it does not respond."""
+        with self._lock:
+            if self.process is None:
+                return
+            if self._owner_pid != os.getpid():
+                # Inherited through fork; the parent owns the real process.
+                self.process = None
+                return
+            if self.process.poll() is None:
+                try:
+                    self.process.stdin.write("-stay_open\nFalse\n")
+                    self.process.stdin.flush()
+                    self.process.stdin.close()
+                    self.process.wait(timeout=SHUTDOWN_TIMEOUT)
+                except (OSError, ValueError, subprocess.TimeoutExpired):
+                    self._kill()
+            logging.debug(f"Stopped ExifTool worker after {self.commands_executed} commands")
+            self.process = None
+
+    def _kill(self) -> None:
+        """Terminate the process after a protocol failure; the next call restarts it."""
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+            self.process.wait(timeout=SHUTDOWN_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.process = None
+
+
+class ExifToolWorkerPool:
+    """
+    Several persistent ExifTool processes behind the ``ExifToolWorker.execute`` interface.
+
+    Each call borrows an idle worker, so up to ``size`` commands run at the same
+    time when the pool is driven from multiple threads.
+    """
+
+    def __init__(self, tool_path: str, size: int = DEFAULT_POOL_SIZE,
+                 common_args: Optional[Sequence[str]] = None):
+        """
+        Args:
+            tool_path: Path to the ExifTool executable
+            size: Number of ExifTool processes to keep running
+            common_args: Arguments appended to every command
+        """
+        self.tool_path = tool_path
+        self.size = max(1, int(size))
+        self.workers = [ExifToolWorker(tool_path, common_args) for _ in range(self.size)]
+        self._idle: "queue.Queue[ExifToolWorker]" = queue.Queue()
+
+    def __enter__(self) -> "ExifToolWorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def commands_executed(self) -> int:
+        """Total number of commands executed by all workers."""
+        return sum(worker.commands_executed for worker in self.workers)
+
+    def start(self) -> None:
+        """Start every worker; if one fails, stop the others and re-raise."""
+        try:
+            for worker in self.workers:
+                worker.start()
+        except ExifToolWorkerError:
+            self.close()
+            raise
+
+        self._idle = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+        logging.debug(f"Started ExifTool worker pool with {self.size} processes")
+
+    def execute(self, args: Sequence[str], timeout: Optional[float] = None,
+                check: bool = False) -> subprocess.CompletedProcess:
+        """Run one command on the next idle worker (blocks while all are busy)."""
+        worker = self._idle.get()
+        try:
+            return worker.execute(args, timeout=timeout, check=check)
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        """Stop every worker in the pool."""
+        for worker in self.workers:
+            worker.close()
+
+
+_shared_workers: Dict[str, Union[ExifToolWorker, ExifToolWorkerPool]] = {}
+_unavailable_tools = set()
+_registry_lock = threading.Lock()
+_persistent_enabled = True
+
+
+def set_persistent_enabled(enabled: bool) -> None:
+    """Enable or disable the shared persistent worker (disabled = one spawn per call)."""
+    global _persistent_enabled
+    _persistent_enabled = enabled
+    if not enabled:
+        shutdown_shared_workers()
+
+
+def get_shared_worker(tool_path: str) -> Optional[Union[ExifToolWorker, ExifToolWorkerPool]]:
+    """
+    Return the process-wide worker for ``tool_path``, starting it on first use.
+
+    When a pool was registered with ``start_shared_pool`` the pool is returned instead.
+
+    Returns None when persistent mode is disabled or the worker cannot be started;
+    the failure is remembered so every later call falls back without retrying.
+    """
+    if not _persistent_enabled or not tool_path:
+        return None
+
+    with _registry_lock:
+        if tool_path in _unavailable_tools:
+            return None
+        worker = _shared_workers.get(tool_path)
+        if worker is None:
+            worker = ExifToolWorker(tool_path)
+            try:
+                worker.start()
+            except ExifToolWorkerError as e:
+                logging.debug(f"Persistent ExifTool unavailable, using per-file processes: {e}")
+                _unavailable_tools.add(tool_path)
+                return None
+            _shared_workers[tool_path] = worker
+        return worker
+
+
+def start_shared_pool(tool_path: str, size: int = DEFAULT_POOL_SIZE) -> Optional[ExifToolWorkerPool]:
+    """
+    Replace the shared worker for ``tool_path`` with a pool of ``size`` processes.
+
+    Every later ``run_exiftool`` call for that executable is spread over the pool.
+    Returns None when persistent mode is disabled or the processes cannot be started.
+    """
+    if not _persistent_enabled or not tool_path:
+        return None
+
+    with _registry_lock:
+        previous = _shared_workers.pop(tool_path, None)
+        if previous is not None:
+            previous.close()
+
+        pool = ExifToolWorkerPool(tool_path, size)
+        try:
+            pool.start()
+        except ExifToolWorkerError as e:
+            logging.warning(f"Could not start ExifTool worker pool, using per-file processes: {e}")
+            _unavailable_tools.add(tool_path)
+            return None
+        _shared_workers[tool_path] = pool
+        return pool
+
+
+def shutdown_shared_workers() -> None:
+    """Stop every shared worker. Registered with atexit; safe to call repeatedly."""
+    with _registry_lock:
+        workers = list(_shared_workers.values())
+        _shared_workers.clear()
+        _unavailable_tools.clear()
+    for worker in workers:
+        worker.close()
+
+
+def run_exiftool(tool_path: str, args: Sequence[str], check: bool = True,
+                 timeout: Optional[float] = None, encoding: Optional[str] = None) -> subprocess.CompletedProcess:
+    """
+    Run an ExifTool command, preferring the shared persistent worker.
+
+    Falls back to a one-off ``subprocess.run`` when the worker is disabled,
+    cannot be started, or the arguments cannot be sent through the argfile.
+    ``encoding`` is only used by the fallback (the worker always decodes UTF-8).
+    """
+    worker = get_shared_worker(tool_path)
+    if worker is not None:
+        try:
+            return worker.execute(args, timeout=timeout, check=check)
+        except ExifToolWorkerError as e:
+            logging.debug(f"ExifTool worker failed, retrying with a new process: {e}")
+
+    cmd = [tool_path] + [str(arg) for arg in args]
+    options = {}
+    if timeout is not None:
+        options["timeout"] = timeout
+    if encoding is not None:
+        options["encoding"] = encoding
+        options["errors"] = "replace"
+    return subprocess.run(cmd, capture_output=True, text=True, check=check, **options)
+
+
+def benchmark_exiftool_modes(file_paths: Sequence[str], tool_path: str,
+                             args: Sequence[str] = ("-j", "-time:all")) -> Dict[str, float]:
+    """
+    Compare one process per file against the persistent worker on the same files.
+
+    Args:
+        file_paths: Files to read
+        tool_path: Path to the ExifTool executable
+        args: Arguments used for every file (the file path is appended)
+
+    Returns:
+        Dict with total seconds for each mode, files per second and the speedup factor
+    """
+    started = time.perf_counter()
+    for path in file_paths:
+        subprocess.run([tool_path] + list(args) + [path], capture_output=True, text=True)
+    spawn_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ExifToolWorker(tool_path) as worker:
+        for path in file_paths:
+            worker.execute(list(args) + [path])
+    persistent_seconds = time.perf_counter() - started
+
+    count = len(file_paths)
+    results = {
+        "files": float(count),
+        "spawn_seconds": spawn_seconds,
+        "persistent_seconds": persistent_seconds,
+        "spawn_files_per_second": count / spawn_seconds if spawn_seconds else 0.0,
+        "persistent_files_per_second": count / persistent_seconds if persistent_seconds else 0.0,
+        "speedup": spawn_seconds / persistent_seconds if persistent_seconds else 0.0,
+    }
+    logging.info(
+        f"ExifTool benchmark on {count} files: per-file spawn {spawn_seconds:.2f}s, "
+        f"persistent {persistent_seconds:.2f}s ({results['speedup']:.1f}x)"
+    )
+    return results
+
+
+atexit.register(shutdown_shared_workers)
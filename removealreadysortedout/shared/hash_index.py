@@ -0,0 +1,264 @@
+"""
+Persistent content-hash index.
+
+Stores file hashes in a small SQLite database keyed by path and hash method,
+together with the size and modification time seen when the hash was computed.
+A stored hash is only reused while size and mtime still match, so modified
+files are re-hashed automatically and deleted files are pruned on demand.
+
+Activate an index for ``compute_file_hash`` with ``hash_utils.set_hash_index``.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from shared.hash_utils import XXHASH_AVAILABLE, hash_file_contents, set_hash_index
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT NOT NULL,
+    method TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (path, method)
+)
+"""
+
+
+def normalize_index_path(path: str) -> str:
+    """Normalize a file path into the key used by the index."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+class HashIndex:
+    """SQLite-backed cache of file hashes validated by size and mtime."""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Location of the SQLite index file (created if missing)
+        """
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        logging.debug("Opened hash index %s", db_path)
+
+    def __enter__(self) -> "HashIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+
+    def lookup(self, path: str, method: str, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        Return the stored hash for ``path`` if the file is unchanged since it was hashed.
+
+        Args:
+            path: File path
+            method: Hash method the caller needs
+            stat: Result of os.stat(path) if the caller already has it
+
+        Returns:
+            Hex digest or None when missing or stale
+        """
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+
+        key = normalize_index_path(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, hash FROM file_hashes WHERE path = ? AND method = ?",
+                (key, method),
+            ).fetchone()
+
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            self.hits += 1
+            return row[2]
+
+        self.misses += 1
+        return None
+
+    def store(self, path: str, method: str, file_hash: str, stat: Optional[os.stat_result] = None) -> None:
+        """Record ``file_hash`` for ``path`` together with its current size and mtime."""
+        if stat is None:
+            stat = os.stat(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, method, size, mtime_ns, hash, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_index_path(path), method, stat.st_size, stat.st_mtime_ns, file_hash, time.time()),
+            )
+            self._conn.commit()
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        """Carry entries over after a rename or move (size and mtime are preserved by os.replace)."""
+        old_key = normalize_index_path(old_path)
+        new_key = normalize_index_path(new_path)
+        if old_key == new_key:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM file_hashes WHERE path = ?", (new_key,))
+            self._conn.execute("UPDATE file_hashes SET path = ? WHERE path = ?", (new_key, old_key))
+            self._conn.commit()
+
+    def remove(self, path: str) -> None:
+        """Forget every entry for ``path``."""
+        with self._lock:
+            self._conn.execute("DELETE FROM file_hashes WHERE path = ?", (normalize_index_path(path),))
+            self._conn.commit()
+
+    def entries(self, folder: Optional[str] = None) -> List[Tuple[str, str, int, int, str]]:
+        """Return (path, method, size, mtime_ns, hash) rows, optionally limited to ``folder``."""
+        query = "SELECT path, method, size, mtime_ns, hash FROM file_hashes"
+        params: Tuple = ()
+        if folder:
+            prefix = normalize_index_path(folder).rstrip(os.sep) + os.sep
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def prune(self, folder: Optional[str] = None) -> int:
+        """
+        Drop entries whose file no longer exists or has changed.
+
+        Returns:
+            Number of removed entries
+        """
+        stale = []
+        for path, method, size, mtime_ns, _ in self.entries(folder):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stale.append((path, method))
+                continue
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                stale.append((path, method))
+
+        if stale:
+            with self._lock:
+                self._conn.executemany("DELETE FROM file_hashes WHERE path = ? AND method = ?", stale)
+                self._conn.commit()
+        logging.info("Pruned %d stale entries from hash index %s", len(stale), self.db_path)
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this session."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        logging.debug("Closed hash index %s (hits=%d, misses=%d)", self.db_path, self.hits, self.misses)
+
+
+def activate_hash_index(db_path: Optional[str]) -> Optional[HashIndex]:
+    """
+    Open the index at ``db_path`` and make ``compute_file_hash`` use it.
+
+    Returns None (hashing without an index) when ``db_path`` is empty or the
+    index cannot be opened.
+    """
+    if not db_path:
+        logging.info("Hash index disabled, all files will be hashed")
+        return None
+    try:
+        index = HashIndex(db_path)
+    except (OSError, sqlite3.Error) as e:
+        logging.warning("Could not open hash index %s, hashing without it: %s", db_path, e)
+        return None
+    set_hash_index(index)
+    logging.info("Using hash index %s (%d entries)", db_path, len(index))
+    return index
+
+
+def deactivate_hash_index(index: Optional[HashIndex]) -> None:
+    """Detach ``index`` from ``compute_file_hash``, log its hit rate and close it."""
+    if index is None:
+        return
+    set_hash_index(None)
+    logging.info("Hash index: %d hits, %d files hashed", index.hits, index.misses)
+    index.close()
+
+def rebuild_index(index: HashIndex, folders: Iterable[str], method: str = "xxhash64") -> int:
+    """
+    Hash every file under ``folders`` and store the results, replacing stale entries.
+
+    Returns:
+        Number of files that had to be (re)hashed
+    """
+    if method == "xxhash64" and not XXHASH_AVAILABLE:
+        method = "md5"  # same fallback as compute_file_hash
+
+    paths = []
+    for folder in folders:
+        for root, _, files in os.walk(folder):
+            paths.extend(os.path.join(root, name) for name in files)
+
+    hashed = 0
+    for path in tqdm(paths, desc="Indexing hashes", unit="files"):
+        try:
+            stat = os.stat(path)
+            if index.lookup(path, method, stat) is not None:
+                continue
+            index.store(path, method, hash_file_contents(path, method), stat)
+            hashed += 1
+        except OSError as e:
+            logging.error("Failed to index %s: %s", path, e)
+
+    for folder in folders:
+        index.prune(folder)
+    logging.info("Hash index rebuilt: %d files scanned, %d hashed", len(paths), hashed)
+    return hashed
+
+
+def verify_index(index: HashIndex, folder: Optional[str] = None) -> List[str]:
+    """
+    Re-hash every unchanged indexed file and compare with the stored hash.
+
+    Entries for changed or missing files are skipped (they are stale, not corrupt).
+
+    Returns:
+        Paths whose content no longer matches the stored hash
+    """
+    mismatches = []
+    for path, method, size, mtime_ns, stored_hash in tqdm(index.entries(folder), desc="Verifying hashes", unit="files"):
+        try:
+            stat = os.stat(path)
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                continue
+            if hash_file_contents(path, method) != stored_hash:
+                mismatches.append(path)
+                index.remove(path)
+                logging.warning("Hash index mismatch, entry removed: %s", path)
+        except OSError as e:
+            logging.error("Failed to verify %s: %s", path, e)
+
+    logging.info("Verified hash index: %d mismatches", len(mismatches))
+    return mismatches
@@ -23,6 +23,7 @@ def test_main_calls_expected_steps(monkeypatch):
         index_prefix="PICT",
         index_width=4,
         index_max=10,
+        hash_index="",
     )
 
     calls = {"remove_ini": 0, "unify": 0, "replace": 0, "normalize": 0, "handle": 0}
@@ -23,6 +23,7 @@ def make_args(tmp_path, **overrides):
         index_prefix="PICT",
         index_width=4,
         index_max=10,
+        hash_index="",
     )
     defaults.update(overrides)
     return SimpleNamespace(**defaults)
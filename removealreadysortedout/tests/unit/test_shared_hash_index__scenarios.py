@@ -0,0 +1,109 @@
+"""
+Unit tests for removealreadysortedout/shared/hash_index.py.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "removealreadysortedout"
+sys.path.insert(0, str(package_root))
+
+import shared.hash_index as hash_index
+import shared.hash_utils as hash_utils
+
+
+def _write(path: Path, content: bytes, mtime: int = 1_700_000_000) -> Path:
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_lookup__hit_for_unchanged_file(tmp_path):
+    data = _write(tmp_path / "a.jpg", b"abc")
+    with hash_index.HashIndex(str(tmp_path / "index.sqlite")) as index:
+        index.store(str(data), "md5", "stored")
+        assert index.lookup(str(data), "md5") == "stored"
+        assert index.lookup(str(data), "sha256") is None
+        assert index.hits == 1
+
+
+def test_lookup__stale_after_modification(tmp_path):
+    data = _write(tmp_path / "a.jpg", b"abc")
+    with hash_index.HashIndex(str(tmp_path / "index.sqlite")) as index:
+        index.store(str(data), "md5", "stored")
+        _write(data, b"abcd", mtime=1_700_000_100)
+        assert index.lookup(str(data), "md5") is None
+
+
+def test_index__persists_between_sessions(tmp_path):
+    data = _write(tmp_path / "a.jpg", b"abc")
+    db_path = str(tmp_path / "index.sqlite")
+    with hash_index.HashIndex(db_path) as index:
+        index.store(str(data), "md5", "stored")
+    with hash_index.HashIndex(db_path) as index:
+        assert index.lookup(str(data), "md5") == "stored"
+
+
+def test_rename__keeps_entry(tmp_path):
+    data = _write(tmp_path / "a.jpg", b"abc")
+    with hash_index.HashIndex(str(tmp_path / "index.sqlite")) as index:
+        index.store(str(data), "md5", "stored")
+        renamed = tmp_path / "b.jpg"
+        os.replace(data, renamed)
+        index.rename(str(data), str(renamed))
+        assert index.lookup(str(renamed), "md5") == "stored"
+
+
+def test_compute_file_hash__uses_active_index(tmp_path, monkeypatch):
+    data = _write(tmp_path / "a.jpg", b"abc")
+    reads = []
+    original = hash_utils.hash_file_contents
+    monkeypatch.setattr(hash_utils, "hash_file_contents", lambda p, m: reads.append(p) or original(p, m))
+
+    index = hash_index.activate_hash_index(str(tmp_path / "index.sqlite"))
+    try:
+        first = hash_utils.compute_file_hash(str(data), method="md5")
+        second = hash_utils.compute_file_hash(str(data), method="md5")
+    finally:
+        hash_index.deactivate_hash_index(index)
+
+    assert first == second == original(str(data), "md5")
+    assert len(reads) == 1
+    assert hash_utils.get_hash_index() is None
+
+
+def test_activate_hash_index__empty_path_disables():
+    assert hash_index.activate_hash_index("") is None
+    assert hash_utils.get_hash_index() is None
+
+
+def test_prune__removes_missing_and_changed(tmp_path):
+    kept = _write(tmp_path / "kept.jpg", b"abc")
+    gone = _write(tmp_path / "gone.jpg", b"abc")
+    changed = _write(tmp_path / "changed.jpg", b"abc")
+    with hash_index.HashIndex(str(tmp_path / "index.sqlite")) as index:
+        for path in (kept, gone, changed):
+            index.store(str(path), "md5", "h")
+        gone.unlink()
+        _write(changed, b"abcdef", mtime=1_700_000_100)
+        assert index.prune(str(tmp_path)) == 2
+        assert len(index) == 1
+
+
+def test_rebuild_and_verify(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    first = _write(library / "a.jpg", b"abc")
+    _write(library / "b.jpg", b"def")
+    with hash_index.HashIndex(str(tmp_path / "index.sqlite")) as index:
+        assert hash_index.rebuild_index(index, [str(library)], method="md5") == 2
+        assert hash_index.rebuild_index(index, [str(library)], method="md5") == 0
+        assert hash_index.verify_index(index) == []
+
+        index.store(str(first), "md5", "corrupted")
+        assert hash_index.verify_index(index, str(library)) == [hash_index.normalize_index_path(str(first))]
+        assert index.lookup(str(first), "md5") is None
@@ -0,0 +1,100 @@
+"""
+Resize-aware cache of a displayed image.
+
+The viewers used to reopen the file and run a full-resolution LANCZOS resize
+for every <Configure> event, so dragging the window edge over a large TIFF
+stuttered for seconds. DisplayImageCache keeps the decoded image and a small
+pyramid of halved copies; each resize starts from the smallest level that is
+still at least as large as the target, so the work does not depend on the
+original resolution.
+
+While the window is being dragged the viewers ask for a fast (bilinear)
+resize and, once the events stop, for a final LANCZOS pass.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+# Levels are not halved below this size (longest side in pixels)
+PYRAMID_MIN_SIZE = 256
+
+# Quiet period after the last resize event before the high-quality pass (ms)
+RESIZE_DEBOUNCE_MS = 150
+
+Size = Tuple[int, int]
+
+
+class DisplayImageCache:
+    """Decoded image plus pre-scaled copies for fitting it to the display area."""
+
+    def __init__(self, image: Image.Image, min_level_size: int = PYRAMID_MIN_SIZE):
+        """
+        Args:
+            image: Decoded image at full resolution
+            min_level_size: Smallest longest side of a pyramid level
+        """
+        self.image = image
+        self.min_level_size = min_level_size
+        self._levels: List[Image.Image] = [image]
+        self._pyramid_complete = False
+        self._last: Optional[Tuple[Size, bool, Image.Image]] = None
+
+    @property
+    def size(self) -> Size:
+        return self.image.size
+
+    @property
+    def levels(self) -> int:
+        """Number of levels built so far (the original included)."""
+        return len(self._levels)
+
+    def target_size(self, width: int, height: int) -> Size:
+        """Size of the image fitted into ``width`` x ``height``, never above 100 %."""
+        scale = min(width / self.image.width, height / self.image.height, 1.0)
+        return max(1, int(self.image.width * scale)), max(1, int(self.image.height * scale))
+
+    def level_for(self, size: Size) -> Image.Image:
+        """Smallest pyramid level at least as large as ``size`` (built on demand)."""
+        while not self._pyramid_complete:
+            last = self._levels[-1]
+            half = (last.width // 2, last.height // 2)
+            if half[0] < size[0] or half[1] < size[1] or max(half) < self.min_level_size:
+                break
+            try:
+                self._levels.append(last.reduce(2))
+            except (ValueError, OSError) as e:
+                # Modes reduce() cannot handle are resized from the original
+                logging.debug(f"Cannot build image pyramid ({self.image.mode}): {e}")
+                self._pyramid_complete = True
+
+        for level in reversed(self._levels):
+            if level.width >= size[0] and level.height >= size[1]:
+                return level
+        return self._levels[0]
+
+    def fit(self, width: int, height: int, fast: bool = False) -> Image.Image:
+        """
+        Image fitted into the display area.
+
+        Args:
+            width: Available width in pixels
+            height: Available height in pixels
+            fast: Bilinear resize for interactive dragging instead of LANCZOS
+
+        Returns:
+            The resized image (the same object again for a repeated request)
+        """
+        size = self.target_size(width, height)
+        if self._last is not None and self._last[0] == size and (fast or not self._last[1]):
+            # A high-quality result also serves a fast request of the same size
+            return self._last[2]
+
+        source = self.level_for(size)
+        if source.size == size:
+            resized = source
+        else:
+            resample = Image.Resampling.BILINEAR if fast else Image.Resampling.LANCZOS
+            resized = source.resize(size, resample)
+        self._last = (size, fast, resized)
+        return resized
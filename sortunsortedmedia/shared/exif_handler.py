@@ -6,6 +6,57 @@ from datetime import datetime
 from typing import Dict, List, Optional, Union
 
 from shared.exif_downloader import ensure_exiftool
+from shared.exiftool_worker import run_exiftool
+
+# Date tags considered when looking for the creation date of a file
+EXIF_DATE_TAGS = [
+    "CreateDate", 
+    "DateTimeOriginal", 
+    "FileModifyDate",
+    "FileCreateDate",
+    "ModifyDate",
+    "MediaCreateDate",
+    "MediaModifyDate",
+    "TrackCreateDate",
+    "TrackModifyDate"
+]
+
+def parse_exif_dates(metadata: Dict[str, str]) -> List[datetime]:
+    """
+    Parses the date tags of one file's ExifTool JSON record.
+    
+    Args:
+        metadata: ExifTool JSON record of the file (tag name -> value)
+        
+    Returns:
+        List of datetime objects for every date tag that could be parsed
+    """
+    dates = []
+    for tag in EXIF_DATE_TAGS:
+        if tag in metadata:
+            date_str = metadata[tag]
+            try:
+                # Handle different date formats
+                if ":" in date_str:
+                    # Standard EXIF date format: YYYY:MM:DD HH:MM:SS
+                    if len(date_str) >= 19:  # Full datetime format
+                        dt = datetime.strptime(date_str[:19], "%Y:%m:%d %H:%M:%S")
+                        dates.append(dt)
+                    elif len(date_str) >= 10:  # Date only format
+                        dt = datetime.strptime(date_str[:10], "%Y:%m:%d")
+                        dates.append(dt)
+                else:
+                    # Try other common formats
+                    for fmt in ["%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S", "%d.%m.%Y %H:%M:%S"]:
+                        try:
+                            dt = datetime.strptime(date_str, fmt)
+                            dates.append(dt)
+                            break
+                        except ValueError:
+                            continue
+            except ValueError as e:
+                logging.warning(f"Could not parse date '{date_str}' from tag {tag}: {e}")
+    return dates
 
 def extract_exif_dates(file_path: str, tool_path: str = None) -> List[datetime]:
     """
@@ -22,25 +73,9 @@ def extract_exif_dates(file_path: str, tool_path: str = None) -> List[datetime]:
     if tool_path is None:
         tool_path = ensure_exiftool()
     
-    # Define the date tags we're interested in
-    date_tags = [
-        "CreateDate", 
-        "DateTimeOriginal", 
-        "FileModifyDate",
-        "FileCreateDate",
-        "ModifyDate",
-        "MediaCreateDate",
-        "MediaModifyDate",
-        "TrackCreateDate",
-        "TrackModifyDate"
-    ]
-    
-    # Build the command to extract these specific tags in JSON format
-    cmd = [tool_path, "-j", "-time:all", file_path]
-    
     try:
-        # Run ExifTool and capture the output
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Run ExifTool (persistent worker when available) and capture JSON output
+        result = run_exiftool(tool_path, ["-j", "-time:all", file_path])
         
         # Parse the JSON output
         exif_data = json.loads(result.stdout)
@@ -49,33 +84,7 @@ def extract_exif_dates(file_path: str, tool_path: str = None) -> List[datetime]:
             return []
         
         # Extract all date values
-        dates = []
-        for tag in date_tags:
-            if tag in exif_data[0]:
-                date_str = exif_data[0][tag]
-                try:
-                    # Handle different date formats
-                    if ":" in date_str:
-                        # Standard EXIF date format: YYYY:MM:DD HH:MM:SS
-                        if len(date_str) >= 19:  # Full datetime format
-                            dt = datetime.strptime(date_str[:19], "%Y:%m:%d %H:%M:%S")
-                            dates.append(dt)
-                        elif len(date_str) >= 10:  # Date only format
-                            dt = datetime.strptime(date_str[:10], "%Y:%m:%d")
-                            dates.append(dt)
-                    else:
-                        # Try other common formats
-                        for fmt in ["%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S", "%d.%m.%Y %H:%M:%S"]:
-                            try:
-                                dt = datetime.strptime(date_str, fmt)
-                                dates.append(dt)
-                                break
-                            except ValueError:
-                                continue
-                except ValueError as e:
-                    logging.warning(f"Could not parse date '{date_str}' from tag {tag}: {e}")
-        
-        return dates
+        return parse_exif_dates(exif_data[0])
         
     except subprocess.CalledProcessError as e:
         logging.error(f"Error running ExifTool on {file_path}: {e}")
@@ -100,15 +109,13 @@ def update_exif_metadata(file_path: str, metadata: Dict[str, str], tool_path: st
     if tool_path is None:
         tool_path = ensure_exiftool()
     
-    # Build the command with all metadata tags
-    cmd = [tool_path]
-    for tag, value in metadata.items():
-        cmd.extend([f"-{tag}={value}"])
-    cmd.append(file_path)
+    # Build the arguments with all metadata tags
+    args = [f"-{tag}={value}" for tag, value in metadata.items()]
+    args.append(file_path)
     
     try:
-        # Run ExifTool to update the metadata
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Run ExifTool (persistent worker when available) to update the metadata
+        result = run_exiftool(tool_path, args)
         logging.info(f"Updated EXIF metadata for {file_path}")
         
     except subprocess.CalledProcessError as e:
@@ -132,12 +139,23 @@ def get_best_creation_date(file_path: str, tool_path: str = None) -> Optional[da
         The most relevant datetime or None if no date could be determined
     """
     # Try to get dates from EXIF metadata
-    dates = extract_exif_dates(file_path, tool_path)
+    return choose_creation_date(file_path, extract_exif_dates(file_path, tool_path))
+
+def choose_creation_date(file_path: str, dates: List[datetime]) -> Optional[datetime]:
+    """
+    Picks the creation date from already extracted EXIF dates.
+    Falls back to file system dates when there are none.
     
+    Args:
+        file_path: Path to the file
+        dates: Dates found in the file's EXIF metadata
+        
+    Returns:
+        The most relevant datetime or None if no date could be determined
+    """
     if dates:
         # Sort dates (oldest first) and prioritize them
-        dates.sort()
-        return dates[0]
+        return sorted(dates)[0]
     
     # Fallback to file system dates if no EXIF dates are available
     try:
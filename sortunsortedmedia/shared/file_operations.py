@@ -8,7 +8,7 @@ from typing import List, Dict
 from collections import defaultdict
 from tqdm import tqdm
 
-from shared.hash_utils      import compute_file_hash
+from shared.hash_utils      import compute_file_hash, record_file_move
 
 def list_files(folder: str, pattern: str | None = None, recursive: bool = True) -> list[str]:
     """
@@ -239,6 +239,7 @@ def unify_duplicate_files(folder: str, recursive: bool = True) -> None:
             dst = os.path.join(os.path.dirname(path), canonical_basename)
             try:
                 os.replace(path, dst)
+                record_file_move(path, dst)
                 renamed_count += 1
                 logging.info("Renamed %s -> %s", path, dst)
             except Exception as e:
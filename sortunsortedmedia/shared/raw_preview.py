@@ -0,0 +1,156 @@
+"""
+Display images for RAW files.
+
+Demosaicing a 40-60 MP NEF/CR2 with rawpy.postprocess takes seconds and
+hundreds of MB just to show a screen-sized image. Nearly every camera embeds
+a full-size or screen-size JPEG preview in the RAW file, so viewers show that
+instead and develop the RAW data only when asked to.
+
+The preview is taken from rawpy (extract_thumb) or, without rawpy, from
+ExifTool (-PreviewImage / -JpgFromRaw). When the file has no usable preview
+the RAW data is developed as before.
+"""
+import io
+import logging
+import subprocess
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+try:
+    import rawpy
+    RAWPY_AVAILABLE = True
+except ImportError:
+    RAWPY_AVAILABLE = False
+
+# Previews smaller than this (longest side in pixels) are only thumbnails
+RAW_PREVIEW_MIN_SIZE = 1024
+
+# ExifTool tags holding embedded previews, largest first
+EXIFTOOL_PREVIEW_TAGS = ["JpgFromRaw", "PreviewImage"]
+
+# LibRaw flip values -> PIL transposition
+_FLIP_TRANSPOSE = {
+    3: Image.Transpose.ROTATE_180,
+    5: Image.Transpose.ROTATE_90,
+    6: Image.Transpose.ROTATE_270,
+}
+
+
+def _orient(image: Image.Image, flip: int) -> Image.Image:
+    """Apply the preview's own EXIF orientation, or the RAW file's when it has none."""
+    if image.getexif().get(0x0112, 1) != 1:
+        return ImageOps.exif_transpose(image)
+    transpose = _FLIP_TRANSPOSE.get(flip)
+    return image.transpose(transpose) if transpose is not None else image
+
+
+def _preview_from_rawpy(file_path: str) -> Optional[Image.Image]:
+    with rawpy.imread(file_path) as raw:
+        try:
+            thumb = raw.extract_thumb()
+        except (rawpy.LibRawNoThumbnailError, rawpy.LibRawUnsupportedThumbnailError):
+            return None
+        flip = raw.sizes.flip
+
+    if thumb.format == rawpy.ThumbFormat.JPEG:
+        image = Image.open(io.BytesIO(thumb.data))
+        image.load()
+    else:
+        image = Image.fromarray(thumb.data)
+    return _orient(image, flip)
+
+
+def _preview_from_exiftool(file_path: str, tool_path: str) -> Optional[Image.Image]:
+    for tag in EXIFTOOL_PREVIEW_TAGS:
+        # Binary output cannot go through the text-mode persistent worker
+        result = subprocess.run([tool_path, "-b", f"-{tag}", file_path], capture_output=True, timeout=30)
+        if result.returncode == 0 and result.stdout:
+            image = Image.open(io.BytesIO(result.stdout))
+            image.load()
+            return _orient(image, 0)
+    return None
+
+
+def load_raw_preview(file_path: str, tool_path: Optional[str] = None,
+                     min_size: int = RAW_PREVIEW_MIN_SIZE) -> Optional[Image.Image]:
+    """
+    Load the JPEG preview embedded in a RAW file.
+
+    Args:
+        file_path: Path to the RAW file
+        tool_path: ExifTool executable used when rawpy is not available (None = rawpy only)
+        min_size: Smallest acceptable longest side; smaller previews are ignored
+
+    Returns:
+        The preview, or None when the file has no usable preview
+    """
+    try:
+        if RAWPY_AVAILABLE:
+            image = _preview_from_rawpy(file_path)
+        elif tool_path:
+            image = _preview_from_exiftool(file_path, tool_path)
+        else:
+            return None
+    except Exception as e:
+        logging.debug(f"Cannot read embedded preview of {file_path}: {e}")
+        return None
+
+    if image is None:
+        logging.debug(f"No embedded preview in {file_path}")
+        return None
+    if max(image.size) < min_size:
+        logging.debug(f"Embedded preview of {file_path} is only {image.size}, ignoring it")
+        return None
+    return image
+
+
+def develop_raw(file_path: str) -> Image.Image:
+    """
+    Develop the full-resolution RAW data with rawpy.
+
+    Falls back to whatever PIL can open (usually the small TIFF thumbnail)
+    when rawpy is not available or fails.
+    """
+    if RAWPY_AVAILABLE:
+        try:
+            with rawpy.imread(file_path) as raw:
+                rgb = raw.postprocess(
+                    use_camera_wb=True,
+                    use_auto_wb=False,
+                    output_bps=8,
+                    no_auto_bright=True,
+                    output_color=rawpy.ColorSpace.sRGB
+                )
+            return Image.fromarray(rgb)
+        except Exception as e:
+            logging.warning(f"Failed to develop RAW file {file_path}: {e}, falling back to embedded thumbnail")
+    else:
+        logging.warning("rawpy not available - loading RAW thumbnail only")
+    image = Image.open(file_path)
+    image.load()
+    return image
+
+
+def load_raw_image(file_path: str, full_resolution: bool = False,
+                   tool_path: Optional[str] = None) -> Image.Image:
+    """
+    Load a RAW file for display.
+
+    Args:
+        file_path: Path to the RAW file
+        full_resolution: Develop the RAW data instead of using the embedded preview
+        tool_path: ExifTool executable for previews when rawpy is not available
+
+    Returns:
+        The embedded preview, or the developed image when requested or when there is no preview
+    """
+    if not full_resolution:
+        image = load_raw_preview(file_path, tool_path)
+        if image is not None:
+            logging.info(f"Showing embedded preview of {file_path}: {image.size}")
+            return image
+    logging.info(f"Developing RAW file {file_path}")
+    image = develop_raw(file_path)
+    logging.info(f"RAW file developed: {image.size}")
+    return image
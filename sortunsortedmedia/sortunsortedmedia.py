@@ -13,8 +13,14 @@ from shared.utils import get_log_filename
 from shared.file_operations import ensure_directory
 from shared.logging_config import setup_logging
 
-from sortunsortedmedialib.constants import DEFAULT_UNSORTED_FOLDER, DEFAULT_TARGET_FOLDER, DEFAULT_INTERVAL, DEFAULT_MAX_PARALLEL
+from sortunsortedmedialib.constants import (
+    DEFAULT_UNSORTED_FOLDER, DEFAULT_TARGET_FOLDER, DEFAULT_INTERVAL, DEFAULT_MAX_PARALLEL,
+    DEFAULT_REVIEW_MODE, REVIEW_MODES, REVIEW_MODE_QUEUE, DEFAULT_PREFETCH_DEPTH, DEFAULT_PREFETCH_MEMORY_MB,
+    TARGET_INDEX_CACHE_FOLDER
+)
 from sortunsortedmedialib.media_helper import find_unmatched_media, process_unmatched_files
+from sortunsortedmedialib.review_queue import ReviewQueue
+from sortunsortedmedialib.target_index import enable_index_cache
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -29,6 +35,13 @@ def parse_arguments():
                         help="Interval in seconds to wait between processing files")
     parser.add_argument("--max_parallel", type=int, default=DEFAULT_MAX_PARALLEL,
                         help=f"Maximum number of parallel processes (default: {DEFAULT_MAX_PARALLEL})")
+    parser.add_argument("--review_mode", choices=REVIEW_MODES, default=DEFAULT_REVIEW_MODE,
+                        help="'queue' reviews all files in one viewer window, "
+                             "'process' starts one script process per file (default: %(default)s)")
+    parser.add_argument("--prefetch_depth", type=int, default=DEFAULT_PREFETCH_DEPTH,
+                        help=f"Files prepared in the background ahead of the shown one, 0 disables (default: {DEFAULT_PREFETCH_DEPTH})")
+    parser.add_argument("--prefetch_memory_mb", type=int, default=DEFAULT_PREFETCH_MEMORY_MB,
+                        help=f"Memory for prefetched images in MB (default: {DEFAULT_PREFETCH_MEMORY_MB})")
     parser.add_argument("--debug", action="store_true",
                         help="Enable debug logging")
     return parser.parse_args()
@@ -47,6 +60,7 @@ def main():
     logging.info("Starting unsorted media processing")
     logging.info(f"Unsorted folder: {args.unsorted_folder}")
     logging.info(f"Target folder: {args.target_folder}")
+    enable_index_cache(os.path.join(os.path.dirname(os.path.abspath(__file__)), TARGET_INDEX_CACHE_FOLDER))
 
     # Find unmatched media files
     unmatched_categories = find_unmatched_media(args.unsorted_folder, args.target_folder)
@@ -61,7 +75,17 @@ def main():
         return
 
     print(f"\n=== Found {total_files} unmatched media files ===")
-    
+
+    # In queue mode all categories share one viewer window, reviewed in category order
+    review_queue = None
+    if args.review_mode == REVIEW_MODE_QUEUE:
+        prefetcher = None
+        if args.prefetch_depth > 0:
+            # Imported here: loads the EXIF camera detector and PIL
+            from sortunsortedmedialib.prefetch import MediaPrefetcher
+            prefetcher = MediaPrefetcher(args.target_folder, args.prefetch_depth, args.prefetch_memory_mb)
+        review_queue = ReviewQueue(args.target_folder, prefetcher=prefetcher)
+
     for category in category_order:
         files = unmatched_categories[category]
         if not files:
@@ -72,7 +96,11 @@ def main():
         print(f"\n=== Processing {len(files)} {category_name} ===")
 
 
-        process_unmatched_files(files, args.target_folder, args.interval, args.max_parallel)
+        process_unmatched_files(files, args.target_folder, args.interval, args.max_parallel,
+                                mode=args.review_mode, review_queue=review_queue)
+
+    if review_queue is not None:
+        review_queue.run()
 
     logging.info("Unsorted media processing completed")
     print("\nAll media processing completed!")
@@ -10,18 +10,22 @@ import argparse
 import logging
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 from shared.utils import get_log_filename
 from shared.file_operations import ensure_directory, move_file
 from shared.logging_config import setup_logging
-from shared.exif_handler import get_best_creation_date
+from shared.raw_preview import load_raw_image
 
-from sortunsortedmedialib.constants import DEFAULT_TARGET_FOLDER, TERMINAL_PAUSE_DURATION, RAW_EXTENSIONS
+from sortunsortedmedialib.constants import (
+    DEFAULT_TARGET_FOLDER, TERMINAL_PAUSE_DURATION, RAW_EXTENSIONS, TARGET_INDEX_CACHE_FOLDER
+)
 from sortunsortedmedialib.media_classifier import classify_media_file
+from sortunsortedmedialib.exif_probe import get_best_creation_date, get_exif_probe
 from sortunsortedmedialib.interactive import ask_for_category
 from sortunsortedmedialib.path_builder import build_target_path, build_edited_target_path, ensure_unique_path
 from sortunsortedmedialib.companion_file_finder import find_jpg_equivalent, find_original_file, extract_metadata_from_path
+from sortunsortedmedialib.target_index import enable_index_cache, register_sorted_file
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -38,13 +42,51 @@ def parse_arguments():
                         help="Enable debug logging")
     return parser.parse_args()
 
-def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
+def ask_category_in_viewer(media_path: str, target_folder: str, preloaded_image=None,
+                           camera: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Show the media viewer for one file and wait until the user categorizes it.
+
+    Args:
+        media_path: Path to the media file
+        target_folder: Base target folder
+        preloaded_image: Pre-loaded PIL Image for RAW files
+        camera: Already detected camera (skips detection in the viewer)
+
+    Returns:
+        Tuple of (category, camera) selected by the user (None when not selected)
+    """
+    from sortunsortedmedialib.media_viewer import show_media_viewer
+
+    # Variables to store user selection
+    selected_category = None
+    selected_camera = None
+
+    def completion_callback(cat: str, cam: str):
+        nonlocal selected_category, selected_camera
+        selected_category = cat
+        selected_camera = cam
+
+    # Show GUI with preloaded image (if available)
+    show_media_viewer(media_path, target_folder, completion_callback, preloaded_image=preloaded_image,
+                      camera=camera)
+    return selected_category, selected_camera
+
+
+def process_media_file(media_path: str, target_folder: str,
+                       categorize: Optional[Callable[..., Optional[Tuple[Optional[str], Optional[str]]]]] = None,
+                       prefetched=None) -> Optional[str]:
     """
     Process a single media file and move it to the appropriate location.
 
     Args:
         media_path: Path to the media file
         target_folder: Base target folder
+        categorize: Asks the user for (category, camera), called as
+            categorize(media_path, target_folder, preloaded_image, camera); returning
+            None cancels the file. Defaults to a viewer window for this file only.
+        prefetched: PrefetchedFile prepared in the background (camera, date,
+            decoded image and a found companion file are then not computed again)
 
     Returns:
         The path where the file was moved, or None if processing failed
@@ -60,14 +102,20 @@ def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
         extension = extension.lstrip('.')
 
         # Classify the media file
-        media_type, camera, is_edited, edit_type = classify_media_file(media_path)
+        if prefetched is not None:
+            media_type, camera, is_edited, edit_type = classify_media_file(media_path, camera=prefetched.camera)
+        else:
+            media_type, camera, is_edited, edit_type = classify_media_file(media_path)
 
         if media_type == "Unknown":
             logging.warning(f"Unknown media type for file: {media_path}")
             return None
 
         # Get the creation date
-        creation_date = get_best_creation_date(media_path)
+        if prefetched is not None:
+            creation_date = prefetched.creation_date
+        else:
+            creation_date = get_best_creation_date(media_path)
         if creation_date is None:
             logging.warning(f"Could not determine creation date for {media_path}, using current time")
             creation_date = datetime.now()
@@ -84,7 +132,10 @@ def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
         # Case B: Alternative format (PNG, RAW, TIFF, etc.)
         elif not is_edited and media_type == "Foto":
             logging.debug(f"File is alternative image format ({extension}) - searching for JPG equivalent")
-            jpg_path = find_jpg_equivalent(filename, target_folder)
+            # A prefetched "not found" may predate moving the JPG, so only a hit is trusted
+            jpg_path = prefetched.companion_path if prefetched is not None else None
+            if jpg_path is None:
+                jpg_path = find_jpg_equivalent(filename, target_folder)
 
             if jpg_path:
                 # Found JPG equivalent → skip GUI, use its metadata
@@ -100,7 +151,9 @@ def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
         elif is_edited:
             logging.debug(f"File is edited - searching for original")
             is_video = (media_type == "Video")
-            original_path = find_original_file(filename, target_folder, is_video)
+            original_path = prefetched.companion_path if prefetched is not None else None
+            if original_path is None:
+                original_path = find_original_file(filename, target_folder, is_video)
 
             if original_path:
                 # Found original → skip GUI, use its metadata
@@ -115,44 +168,23 @@ def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
         # Get category and camera
         if needs_categorization:
             # Preload RAW file if needed (BEFORE opening GUI)
-            preloaded_image = None
-            if os.path.splitext(media_path)[1].lower() in RAW_EXTENSIONS:
+            preloaded_image = prefetched.image if prefetched is not None else None
+            if preloaded_image is not None:
+                logging.info(f"Using prefetched image: {preloaded_image.size}")
+            elif os.path.splitext(media_path)[1].lower() in RAW_EXTENSIONS:
                 logging.info(f"Preloading RAW file before GUI: {media_path}")
-                print(f"Loading RAW file (this may take a few seconds)...")
                 try:
-                    import rawpy
-                    from PIL import Image
-                    with rawpy.imread(media_path) as raw:
-                        rgb = raw.postprocess(
-                            use_camera_wb=True,
-                            use_auto_wb=False,
-                            output_bps=8,
-                            no_auto_bright=True,
-                            output_color=rawpy.ColorSpace.sRGB
-                        )
-                        preloaded_image = Image.fromarray(rgb)
-                        logging.info(f"RAW file preloaded successfully: {preloaded_image.size}")
-                        print(f"RAW file loaded, opening GUI...")
-                except ImportError:
-                    logging.warning("rawpy not available - GUI will load thumbnail only")
+                    preloaded_image = load_raw_image(media_path, tool_path=get_exif_probe().tool_path)
                 except Exception as e:
-                    logging.warning(f"Failed to preload RAW: {e}, GUI will load thumbnail")
+                    logging.warning(f"Failed to preload RAW: {e}, GUI will load it")
 
             # Show GUI to get category and camera from user
-            from sortunsortedmedialib.media_viewer import show_media_viewer
-
-            # Variables to store user selection
-            selected_category = None
-            selected_camera = None
-
-            def completion_callback(cat: str, cam: str):
-                nonlocal selected_category, selected_camera
-                selected_category = cat
-                selected_camera = cam
-
-            # Show GUI with preloaded image (if available)
             logging.info(f"Showing GUI for user categorization of {filename}")
-            show_media_viewer(media_path, target_folder, completion_callback, preloaded_image=preloaded_image)
+            selection = (categorize or ask_category_in_viewer)(media_path, target_folder, preloaded_image, camera)
+            if selection is None:
+                logging.info(f"Categorization of {filename} cancelled")
+                return None
+            selected_category, selected_camera = selection
 
             # Use the selected values or defaults
             category = selected_category if selected_category else "Ostatní"
@@ -201,6 +233,8 @@ def process_media_file(media_path: str, target_folder: str) -> Optional[str]:
         # Move the file
         move_file(media_path, unique_target_path)
         logging.info(f"Moved {media_path} to {unique_target_path}")
+        # Later files of this session may be its companions
+        register_sorted_file(unique_target_path, target_folder)
 
         return unique_target_path
 
@@ -221,6 +255,7 @@ def main():
 
     setup_logging(debug=args.debug, log_file=log_file)
     logging.info(f"Starting media file processing: {args.media_file}")
+    enable_index_cache(os.path.join(os.path.dirname(os.path.abspath(__file__)), TARGET_INDEX_CACHE_FOLDER))
 
     # Process the media file
     result_path = process_media_file(args.media_file, args.target_folder)
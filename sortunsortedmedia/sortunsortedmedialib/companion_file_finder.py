@@ -12,12 +12,15 @@ import logging
 from typing import Optional, Dict
 from pathlib import Path
 
+from sortunsortedmedialib.target_index import get_target_index
+
 
 def find_jpg_equivalent(filename: str, target_folder: str) -> Optional[str]:
     """
     Find JPG equivalent for an alternative format image.
 
-    Searches for a JPG file with the same base name in the target folder structure.
+    Searches for a JPG file with the same base name in the target folder structure,
+    using the session's index of the Foto/JPG tree.
 
     Args:
         filename: Original filename (e.g., "IMG_1234.PNG")
@@ -43,15 +46,11 @@ def find_jpg_equivalent(filename: str, target_folder: str) -> Optional[str]:
         logging.debug(f"JPG folder does not exist: {foto_jpg_path}")
         return None
 
-    # Recursively search for JPG with matching base name
-    for root, dirs, files in os.walk(foto_jpg_path):
-        for file in files:
-            file_base_name, file_ext = os.path.splitext(file)
-
-            if file_base_name == base_name and file_ext in jpg_extensions:
-                full_path = os.path.join(root, file)
-                logging.info(f"Found JPG equivalent for {filename}: {full_path}")
-                return full_path
+    # First JPG with matching base name (in the order os.walk would find it)
+    for full_path in get_target_index(target_folder).lookup(foto_jpg_path, base_name):
+        if os.path.splitext(full_path)[1] in jpg_extensions:
+            logging.info(f"Found JPG equivalent for {filename}: {full_path}")
+            return full_path
 
     logging.debug(f"No JPG equivalent found for {filename}")
     return None
@@ -107,27 +106,22 @@ def find_original_file(edited_filename: str, target_folder: str, is_video: bool
         search_root = None
 
     # Search for original file
+    index = get_target_index(target_folder)
     if is_video:
         # Video: search in Video folder
         if os.path.exists(search_root):
-            for root, dirs, files in os.walk(search_root):
-                for file in files:
-                    if os.path.splitext(file)[0] == original_base_name:
-                        full_path = os.path.join(root, file)
-                        logging.info(f"Found original video for {edited_filename}: {full_path}")
-                        return full_path
+            for full_path in index.lookup(search_root, original_base_name):
+                logging.info(f"Found original video for {edited_filename}: {full_path}")
+                return full_path
     else:
         # Photo: search JPG first, then same extension
         for search_path in search_roots:
             if not os.path.exists(search_path):
                 continue
 
-            for root, dirs, files in os.walk(search_path):
-                for file in files:
-                    if os.path.splitext(file)[0] == original_base_name:
-                        full_path = os.path.join(root, file)
-                        logging.info(f"Found original photo for {edited_filename}: {full_path}")
-                        return full_path
+            for full_path in index.lookup(search_path, original_base_name):
+                logging.info(f"Found original photo for {edited_filename}: {full_path}")
+                return full_path
 
     logging.debug(f"No original file found for {edited_filename}")
     return None
@@ -10,12 +10,35 @@ DEFAULT_INTERVAL = 60  # seconds
 DEFAULT_MAX_PARALLEL = 60
 # Maximum number of parallel processes
 
+# How unmatched files are reviewed: "queue" = one viewer window in this process
+# pulling files from a queue, "process" = one script process per file (fallback)
+REVIEW_MODE_QUEUE = "queue"
+REVIEW_MODE_PROCESS = "process"
+REVIEW_MODES = (REVIEW_MODE_QUEUE, REVIEW_MODE_PROCESS)
+DEFAULT_REVIEW_MODE = REVIEW_MODE_QUEUE
+REVIEW_POLL_INTERVAL_MS = 100  # How often the viewer checks for the next queued file
+
+# Background prefetch of the next files in the review queue
+DEFAULT_PREFETCH_DEPTH = 3  # Files prepared ahead of the current one (0 = off)
+DEFAULT_PREFETCH_MEMORY_MB = 512  # Memory for decoded images held ahead
+PREFETCH_WORKERS = 2
+
+# Filename index of the target tree used to find companion files; the listings
+# are cached in this folder (next to the scripts) and revalidated by directory mtimes
+TARGET_INDEX_CACHE_FOLDER = "cache"
+TARGET_INDEX_CACHE_VERSION = 1
+
 # Terminal pause duration after processing a single file (in seconds)
 TERMINAL_PAUSE_DURATION = 300  # 5 minutes = 300 seconds
 
 # ExifTool path
 EXIFTOOL_PATH = "F:/Dropbox/exiftool-12.30/exiftool.exe"
 
+# One ExifTool read per file serves camera detection and the creation date
+EXIF_PROBE_CAMERA_TAGS = ["Make", "Model", "Software", "Encoder", "Creator", "Artist", "Copyright"]
+EXIF_PROBE_TIMEOUT = 10  # seconds
+EXIF_PROBE_CACHE_SIZE = 4096  # Files whose metadata is kept for the session
+
 # Tags indicating edited files
 EDITED_TAGS = {
     "_bw": "Blackwhite",
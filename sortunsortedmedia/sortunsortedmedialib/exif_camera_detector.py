@@ -5,12 +5,10 @@ Provides maximum format support for all media types including RAW, videos, audio
 
 import os
 import re
-import subprocess
-import json
 import logging
-import shutil
-from typing import Optional, Dict, Any
+from typing import Optional
 from shared.exif_downloader import ensure_exiftool
+from sortunsortedmedialib.exif_probe import get_exif_probe
 from sortunsortedmedialib.dji_camera_mapping import get_dji_drone_name, is_dji_camera
 
 
@@ -48,32 +46,10 @@ class EXIFCameraDetector:
             return None
             
         try:
-            # Run EXIFtool to get camera information
-            cmd = [
-                self.exiftool_path,
-                "-j",  # JSON output
-                "-Make",
-                "-Model",
-                "-Software",
-                "-Encoder",  # DJI videos store model here
-                "-Creator",
-                "-Artist",
-                "-Copyright",
-                file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                logging.debug(f"EXIFtool failed for {file_path}: {result.stderr}")
-                return None
-            
-            # Parse JSON output
-            exif_data = json.loads(result.stdout)
-            if not exif_data:
+            # Camera and date tags are read together and cached for the date lookup
+            metadata = get_exif_probe().read(file_path)
+            if not metadata:
                 return None
-                
-            metadata = exif_data[0]  # First (and only) file
 
             # Try to construct camera name from Make and Model
             make = metadata.get("Make", "").strip()
@@ -89,15 +65,9 @@ class EXIFCameraDetector:
             
             return None
             
-        except subprocess.TimeoutExpired:
-            logging.warning(f"EXIFtool timeout for {file_path}")
-            return None
-        except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError, IndexError) as e:
+        except (KeyError, IndexError, AttributeError) as e:
             logging.debug(f"EXIF extraction failed for {file_path}: {e}")
             return None
-        except (OSError, PermissionError, FileNotFoundError) as e:
-            logging.error(f"File system error during EXIF extraction for {file_path}: {e}")
-            return None
         except Exception as e:
             # Log with exception type for better debugging
             logging.error(f"Unexpected {type(e).__name__} in EXIF extraction for {file_path}: {e}", exc_info=True)
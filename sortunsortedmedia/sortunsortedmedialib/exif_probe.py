@@ -0,0 +1,136 @@
+"""
+Single ExifTool read per media file.
+
+Camera detection (EXIFCameraDetector) and the creation date
+(get_best_creation_date) used to run ExifTool separately for every file. The
+probe asks for the camera tags and all date tags in one command and keeps the
+record for the session, so the second consumer is answered from memory.
+
+Records are keyed by path, size and modification time; a file changed during
+the session is read again. Failed reads are not cached.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from shared.exif_downloader import ensure_exiftool
+from shared.exif_handler import choose_creation_date, parse_exif_dates
+from shared.exiftool_worker import run_exiftool
+from sortunsortedmedialib.constants import EXIF_PROBE_CACHE_SIZE, EXIF_PROBE_CAMERA_TAGS, EXIF_PROBE_TIMEOUT
+
+CacheKey = Tuple[str, int, int]
+
+
+class ExifProbe:
+    """Reads camera and date tags of a file in one ExifTool call and caches the record."""
+
+    def __init__(self, tool_path: Optional[str] = None, cache_size: int = EXIF_PROBE_CACHE_SIZE,
+                 timeout: float = EXIF_PROBE_TIMEOUT):
+        """
+        Args:
+            tool_path: Path to the ExifTool executable (None = located on first read)
+            cache_size: Number of file records kept
+            timeout: Seconds to wait for ExifTool
+        """
+        self._tool_path = tool_path
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._cache: "OrderedDict[CacheKey, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+
+    @property
+    def tool_path(self) -> Optional[str]:
+        if self._tool_path is None:
+            try:
+                self._tool_path = ensure_exiftool()
+            except Exception as e:
+                logging.error(f"Failed to get ExifTool path: {e}")
+                self._tool_path = ""  # Do not look again for every file
+        return self._tool_path or None
+
+    def read(self, file_path: str) -> Optional[Dict[str, str]]:
+        """
+        ExifTool record of ``file_path`` with the camera and date tags.
+
+        Returns:
+            Tag name -> value (empty when the file has no metadata), or None if it could not be read
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = (os.path.normcase(os.path.abspath(file_path)), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return record
+
+        record = self._run(file_path)
+        if record is None:
+            return None
+
+        with self._lock:
+            self.reads += 1
+            self._cache[key] = record
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def _run(self, file_path: str) -> Optional[Dict[str, str]]:
+        tool_path = self.tool_path
+        if not tool_path:
+            return None
+
+        args = ["-j"] + [f"-{tag}" for tag in EXIF_PROBE_CAMERA_TAGS] + ["-time:all", file_path]
+        try:
+            result = run_exiftool(tool_path, args, check=False, timeout=self.timeout)
+            if result.returncode != 0:
+                logging.debug(f"EXIFtool failed for {file_path}: {result.stderr}")
+                return None
+            output = result.stdout.strip()
+            exif_data = json.loads(output) if output else []
+            return exif_data[0] if exif_data else {}
+        except subprocess.TimeoutExpired:
+            logging.warning(f"EXIFtool timeout for {file_path}")
+            return None
+        except (json.JSONDecodeError, IndexError, TypeError) as e:
+            logging.debug(f"Cannot parse EXIFtool output for {file_path}: {e}")
+            return None
+        except OSError as e:
+            logging.error(f"File system error during EXIF extraction for {file_path}: {e}")
+            return None
+
+    def creation_date(self, file_path: str) -> Optional[datetime]:
+        """Oldest EXIF date of the file, or its file system date when there is none."""
+        record = self.read(file_path)
+        return choose_creation_date(file_path, parse_exif_dates(record) if record else [])
+
+
+# Session-wide probe shared by camera detection and date lookup
+_probe = ExifProbe()
+
+
+def get_exif_probe() -> ExifProbe:
+    """The probe shared by this session."""
+    return _probe
+
+
+def get_best_creation_date(file_path: str) -> Optional[datetime]:
+    """
+    Creation date of a media file from the session probe.
+
+    Same result as shared.exif_handler.get_best_creation_date, without a second
+    ExifTool call when the camera of the file was already detected.
+    """
+    return _probe.creation_date(file_path)
@@ -5,17 +5,19 @@ Media classifier module for detecting media origins, edits, and extensions.
 import os
 import re
 import logging
+from typing import Optional
 from sortunsortedmedialib.media_helper import is_video_file, is_edited_file
 from sortunsortedmedialib.constants import CAMERA_REGEXES
 from sortunsortedmedialib.exif_camera_detector import combine_regex_and_exif_detection
 
 
-def classify_media_file(file_path: str) -> tuple[str, str, bool, str]:
+def classify_media_file(file_path: str, camera: Optional[str] = None) -> tuple[str, str, bool, str]:
     """
     Classify a media file and return its properties.
     
     Args:
         file_path: Path to the media file
+        camera: Camera already detected for this file (skips regex and EXIF detection)
         
     Returns:
         Tuple of (media_type, camera, is_edited, edit_type)
@@ -34,11 +36,12 @@ def classify_media_file(file_path: str) -> tuple[str, str, bool, str]:
     is_edited = is_edited_file(filename)
     edit_type = "Unknown" if is_edited else ""
     
-    # Camera detection using regex patterns
-    regex_camera = detect_camera_from_filename(name)
-    
-    # Combine regex and EXIF detection
-    camera = combine_regex_and_exif_detection(file_path, regex_camera)
+    if camera is None:
+        # Camera detection using regex patterns
+        regex_camera = detect_camera_from_filename(name)
+
+        # Combine regex and EXIF detection
+        camera = combine_regex_and_exif_detection(file_path, regex_camera)
     
     return media_type, camera, is_edited, edit_type
 
@@ -10,9 +10,12 @@ import subprocess
 import threading
 import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict
+from typing import List, Dict, Optional
 from shared.file_operations import list_files
-from sortunsortedmedialib.constants import EDITED_TAGS, EXTENSION_TYPES, DEFAULT_MAX_PARALLEL
+from sortunsortedmedialib.constants import (
+    EDITED_TAGS, EXTENSION_TYPES, DEFAULT_MAX_PARALLEL, DEFAULT_REVIEW_MODE, REVIEW_MODE_PROCESS
+)
+from sortunsortedmedialib.review_queue import ReviewQueue
 
 
 def open_media_file(media_path: str) -> bool:
@@ -259,7 +262,43 @@ def process_single_file(file_path: str, target_folder: str, file_index: int, tot
         return False, file_path, error_msg
 
 
-def process_unmatched_files(unmatched_files: List[str], target_folder: str, interval: int, max_parallel: int = DEFAULT_MAX_PARALLEL) -> None:
+def process_unmatched_files(unmatched_files: List[str], target_folder: str, interval: int,
+                            max_parallel: int = DEFAULT_MAX_PARALLEL, mode: str = DEFAULT_REVIEW_MODE,
+                            review_queue: Optional[ReviewQueue] = None) -> None:
+    """
+    Review unmatched files in one viewer window (mode "queue") or in one process per file (mode "process").
+
+    In queue mode the files are added to ``review_queue`` when given, so several
+    calls share one window and the caller runs the queue afterwards; otherwise
+    a queue is created and reviewed right away.
+
+    Args:
+        unmatched_files: List of unmatched file paths
+        target_folder: Target folder for sorted media
+        interval: Interval in seconds between process checks and launches (process mode)
+        max_parallel: Maximum number of concurrent processes (process mode)
+        mode: "queue" or "process"
+        review_queue: Shared review queue (queue mode)
+    """
+    if not unmatched_files:
+        logging.info("No unmatched files to process")
+        return
+
+    if mode == REVIEW_MODE_PROCESS:
+        launch_file_processes(unmatched_files, target_folder, interval, max_parallel)
+        return
+
+    if review_queue is not None:
+        review_queue.add(unmatched_files)
+        logging.info(f"Queued {len(unmatched_files)} files for review ({review_queue.total} in total)")
+        return
+
+    review_queue = ReviewQueue(target_folder)
+    review_queue.add(unmatched_files)
+    review_queue.run()
+
+
+def launch_file_processes(unmatched_files: List[str], target_folder: str, interval: int, max_parallel: int = DEFAULT_MAX_PARALLEL) -> None:
     """
     Launch processes for unmatched files in fire-and-forget mode with parallel limit.
     Maintains max_parallel concurrent processes, checking every 'interval' seconds.
@@ -15,23 +15,28 @@ import time
 import cv2
 import subprocess
 
-# Try to import rawpy for RAW format support
-try:
-    import rawpy
-    RAWPY_AVAILABLE = True
-except ImportError:
-    RAWPY_AVAILABLE = False
-    logging.warning("rawpy not installed - RAW files will show small thumbnails only")
-
+from shared.display_cache import DisplayImageCache, RESIZE_DEBOUNCE_MS
+from shared.raw_preview import develop_raw, load_raw_image
 from sortunsortedmedialib.constants import CAMERA_REGEXES, RAW_EXTENSIONS
 from sortunsortedmedialib.media_helper import is_video_file, is_jpg_file
 from sortunsortedmedialib.media_classifier import detect_camera_from_filename
 from sortunsortedmedialib.exif_camera_detector import combine_regex_and_exif_detection
+from sortunsortedmedialib.exif_probe import get_exif_probe
 
 
 class MediaViewer:
-    def __init__(self, root: tk.Tk, target_folder: str):
+    def __init__(self, root: tk.Tk, target_folder: str, keep_open: bool = False,
+                 on_close: Optional[Callable] = None):
+        """
+        Args:
+            root: Tk root window
+            target_folder: Target folder for sorted media
+            keep_open: Keep the window open after a file is categorized (review queue mode)
+            on_close: Called when the user closes the window; without it closing exits the script
+        """
         self.root = root
+        self.keep_open = keep_open
+        self.on_close = on_close
         self.root.title("Media Viewer & Categorizer")
         self.root.geometry("1200x800")
         self.root.minsize(800, 600)
@@ -42,6 +47,9 @@ class MediaViewer:
         self.current_image: Optional[ImageTk.PhotoImage] = None
         self.original_image_size: Optional[tuple] = None
         self.cached_pil_image: Optional[Image.Image] = None  # Cache for preloaded/RAW images
+        self.display_cache: Optional[DisplayImageCache] = None  # Pre-scaled copies for window resizing
+        self._resize_job = None  # Pending high-quality resize after window dragging
+        self._last_window_size: Optional[tuple] = None
 
         # Video playback attributes
         self.video_playing = False
@@ -72,6 +80,9 @@ class MediaViewer:
         # Bind Enter key globally for processing file
         self.root.bind('<Return>', self.handle_enter_key)
 
+        # Ctrl+R develops the current RAW file at full resolution
+        self.root.bind('<Control-r>', self.show_full_raw)
+
         # Bind mouse click globally to remove focus from entry widgets
         self.root.bind_all('<Button-1>', self.on_global_click, '+')
 
@@ -188,6 +199,11 @@ class MediaViewer:
         self.explorer_button = ttk.Button(action_buttons_frame, text="Open in Explorer",
                                         command=self.open_in_explorer)
         self.explorer_button.pack(side=tk.LEFT, padx=2)
+
+        # Develop the RAW data instead of showing the embedded preview
+        self.full_raw_button = ttk.Button(action_buttons_frame, text="Full RAW",
+                                        command=self.show_full_raw)
+        self.full_raw_button.pack(side=tk.LEFT, padx=2)
         
         # Category suggestions from target folder
         self.setup_category_buttons(control_frame)
@@ -272,13 +288,15 @@ class MediaViewer:
         # Bind canvas resize to re-layout buttons
         canvas.bind("<Configure>", lambda e: self._layout_category_buttons())
             
-    def load_media(self, file_path: str, completion_callback: Optional[Callable] = None, preloaded_image: Optional[Image.Image] = None):
+    def load_media(self, file_path: str, completion_callback: Optional[Callable] = None, preloaded_image: Optional[Image.Image] = None,
+                   camera: Optional[str] = None):
         """Load and display media file.
 
         Args:
             file_path: Path to the media file
             completion_callback: Callback function when processing is complete
             preloaded_image: Pre-loaded PIL Image (for RAW files to avoid GUI blocking)
+            camera: Camera detected beforehand (skips EXIF detection)
         """
         self.current_file_path = file_path
         self.completion_callback = completion_callback
@@ -290,7 +308,12 @@ class MediaViewer:
         self.file_path_label.configure(text=file_path)
 
         # Update camera detection
-        detected_camera = self.detect_camera()
+        if camera:
+            self.camera_entry.delete(0, tk.END)
+            self.camera_entry.insert(0, camera)
+            detected_camera = camera
+        else:
+            detected_camera = self.detect_camera()
         self.camera_label.configure(text=detected_camera)
 
         if is_video_file(file_path):
@@ -321,31 +344,16 @@ class MediaViewer:
                 logging.info(f"Using preloaded image: {preloaded_image.size}")
                 image = preloaded_image
             # Otherwise load from file
-            elif self.is_raw_file(file_path) and RAWPY_AVAILABLE:
-                # Load RAW file with rawpy for full resolution
-                logging.info(f"Loading RAW file with rawpy: {file_path}")
-                try:
-                    with rawpy.imread(file_path) as raw:
-                        rgb = raw.postprocess(
-                            use_camera_wb=True,
-                            use_auto_wb=False,
-                            output_bps=8,
-                            no_auto_bright=True,
-                            output_color=rawpy.ColorSpace.sRGB
-                        )
-                        image = Image.fromarray(rgb)
-                        logging.info(f"RAW file loaded successfully: {image.size}")
-                except Exception as raw_error:
-                    logging.warning(f"Failed to load RAW with rawpy: {raw_error}, falling back to embedded preview")
-                    image = Image.open(file_path)  # Fallback to thumbnail
+            elif self.is_raw_file(file_path):
+                # Embedded preview; the RAW data is developed only on request (Full RAW)
+                image = load_raw_image(file_path, tool_path=get_exif_probe().tool_path)
             else:
                 # Load standard image file
-                if self.is_raw_file(file_path) and not RAWPY_AVAILABLE:
-                    logging.warning(f"RAW file detected but rawpy not available - loading thumbnail only")
                 image = Image.open(file_path)
 
             # Cache the loaded image for faster resize operations
             self.cached_pil_image = image
+            self.display_cache = DisplayImageCache(image)
             self.original_image_size = image.size
 
             # Resize for current display area
@@ -355,8 +363,42 @@ class MediaViewer:
             logging.error(f"Error loading image: {e}")
             self.media_label.configure(image="", text=f"Error loading image:\n{str(e)}")
             
-    def resize_image(self):
-        """Resize current image to fit display area responsively."""
+    def show_full_raw(self, event=None):
+        """Develop the current RAW file at full resolution in the background and show it."""
+        file_path = self.current_file_path
+        if not file_path or not self.is_raw_file(file_path):
+            return
+
+        self.file_path_label.configure(text=f"{file_path}\n(developing RAW...)")
+
+        def develop():
+            try:
+                image = develop_raw(file_path)
+            except Exception as e:
+                logging.error(f"Failed to develop RAW file {file_path}: {e}")
+                image = None
+            self.root.after(0, self._show_developed_raw, file_path, image)
+
+        threading.Thread(target=develop, name="raw-develop", daemon=True).start()
+
+    def _show_developed_raw(self, file_path: str, image: Optional[Image.Image]):
+        """Replace the preview with the developed image (Tk thread)."""
+        if file_path != self.current_file_path:
+            return  # The user moved on to another file
+        self.file_path_label.configure(text=file_path)
+        if image is None:
+            return
+        self.cached_pil_image = image
+        self.display_cache = DisplayImageCache(image)
+        self.original_image_size = image.size
+        self.resize_image()
+
+    def resize_image(self, fast: bool = False):
+        """Resize current image to fit display area responsively.
+
+        Args:
+            fast: Quick bilinear resize while the window is being dragged
+        """
         if not self.current_file_path or not self.original_image_size:
             return
 
@@ -366,24 +408,12 @@ class MediaViewer:
             display_width = max(self.media_label.winfo_width() - 20, 300)
             display_height = max(self.media_label.winfo_height() - 20, 200)
 
-            # Use cached image if available (MUCH faster, especially for RAW files!)
-            if self.cached_pil_image is not None:
-                image = self.cached_pil_image
-            else:
+            if self.display_cache is None:
                 # Fallback to loading from file (shouldn't happen with preloading)
-                image = Image.open(self.current_file_path)
-
-            # Calculate scaling to fit area while maintaining aspect ratio
-            # Never scale above 100% of original size
-            scale_x = min(display_width / image.width, 1.0)
-            scale_y = min(display_height / image.height, 1.0)
-            scale = min(scale_x, scale_y)
+                self.display_cache = DisplayImageCache(Image.open(self.current_file_path))
 
-            new_width = int(image.width * scale)
-            new_height = int(image.height * scale)
-
-            # Resize image (work on copy to preserve cache)
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # Served from the nearest pre-scaled level (MUCH faster for large TIFF/RAW images)
+            resized_image = self.display_cache.fit(display_width, display_height, fast)
 
             # Convert to PhotoImage
             self.current_image = ImageTk.PhotoImage(resized_image)
@@ -398,9 +428,22 @@ class MediaViewer:
         """Handle window resize events."""
         # Only resize image if it's the main window being resized
         if event.widget == self.root and self.current_file_path and not is_video_file(self.current_file_path):
-            # Delay resize to avoid too many calls
-            self.root.after(100, self.resize_image)
-            
+            window_size = (event.width, event.height)
+            if window_size == self._last_window_size:
+                return  # Window moved, not resized
+            self._last_window_size = window_size
+
+            # Quick resize while dragging, high-quality pass once the events stop
+            self.resize_image(fast=True)
+            if self._resize_job is not None:
+                self.root.after_cancel(self._resize_job)
+            self._resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._finish_resize)
+
+    def _finish_resize(self):
+        """High-quality resize after the last resize event."""
+        self._resize_job = None
+        self.resize_image()
+
     def load_video(self, file_path: str):
         """Load and prepare video for playback, displaying first frame at full size."""
         try:
@@ -450,6 +493,7 @@ class MediaViewer:
         """Clear current media display and release video resources."""
         self.current_image = None
         self.cached_pil_image = None  # Clear cache
+        self.display_cache = None
         self.media_label.configure(image="", text="No media loaded")
         self.stop_video()
 
@@ -688,6 +732,10 @@ class MediaViewer:
         
     def process_current_file(self):
         """Process the current file with selected category."""
+        if self.keep_open and self.completion_callback is None:
+            # Waiting for the next file of the review queue
+            return
+
         category = self.input_entry.get().strip()
         if not category:
             messagebox.showwarning("No Category", "Please enter a category or select one from the buttons.")
@@ -697,10 +745,23 @@ class MediaViewer:
         final_camera = self.camera_entry.get().strip() or "Unknown"
 
         # Close window and call completion callback
-        if self.completion_callback:
-            self.completion_callback(category, final_camera)
+        callback = self.completion_callback
+        self.completion_callback = None
+        if callback:
+            callback(category, final_camera)
 
-        self.root.destroy()
+        if self.keep_open:
+            self.show_waiting()
+        else:
+            self.root.destroy()
+
+    def show_waiting(self):
+        """Clear the viewer while the next file of the review queue is prepared."""
+        self.clear_media()
+        self.current_file_path = None
+        self.input_entry.delete(0, tk.END)
+        self.file_path_label.configure(text="")
+        self.media_label.configure(text="Loading next file...")
 
     def open_in_explorer(self):
         """Open the current file location in Windows Explorer."""
@@ -796,6 +857,13 @@ class MediaViewer:
 
     def on_window_close(self):
         """Handle window close event - equivalent to Ctrl+C."""
+        if self.on_close is not None:
+            logging.info("Window closed by user - stopping review")
+            self.clear_media()
+            self.on_close()
+            self.root.destroy()
+            return
+
         logging.info("Window closed by user - terminating script")
         self.root.destroy()
 
@@ -920,7 +988,8 @@ class MediaViewer:
             logging.info("Video playback thread stopped")
 
 
-def show_media_viewer(file_path: str, target_folder: str, completion_callback: Optional[Callable] = None, preloaded_image: Optional[Image.Image] = None):
+def show_media_viewer(file_path: str, target_folder: str, completion_callback: Optional[Callable] = None, preloaded_image: Optional[Image.Image] = None,
+                      camera: Optional[str] = None):
     """Show the media viewer for a specific file.
 
     Args:
@@ -928,10 +997,11 @@ def show_media_viewer(file_path: str, target_folder: str, completion_callback: O
         target_folder: Target folder for sorted media
         completion_callback: Callback function when processing is complete
         preloaded_image: Pre-loaded PIL Image (for RAW files to avoid GUI blocking)
+        camera: Camera detected beforehand (skips EXIF detection)
     """
     root = tk.Tk()
     viewer = MediaViewer(root, target_folder)
-    viewer.load_media(file_path, completion_callback, preloaded_image=preloaded_image)
+    viewer.load_media(file_path, completion_callback, preloaded_image=preloaded_image, camera=camera)
 
     # Center window
     root.update_idletasks()
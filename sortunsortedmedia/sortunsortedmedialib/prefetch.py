@@ -0,0 +1,197 @@
+"""
+Background prefetch of the next files in the review queue.
+
+While the user categorizes one file, the prefetcher prepares the next few:
+it decodes the image (or develops the RAW file), detects the camera and the
+creation date (both ExifTool calls) and looks up the companion file (JPG
+equivalent or original of an edited file). When the user advances, the next
+file is shown without waiting for ExifTool or the RAW preview.
+
+The number of files prepared ahead (depth) and the memory held by decoded
+images are limited; when the cap is reached the metadata is still prefetched
+but the image is decoded again when the file is shown.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from PIL import Image
+
+from shared.raw_preview import load_raw_image
+from sortunsortedmedialib.companion_file_finder import find_jpg_equivalent, find_original_file
+from sortunsortedmedialib.constants import (
+    DEFAULT_PREFETCH_DEPTH,
+    DEFAULT_PREFETCH_MEMORY_MB,
+    EXTENSION_TYPES,
+    PREFETCH_WORKERS,
+    RAW_EXTENSIONS
+)
+from sortunsortedmedialib.exif_camera_detector import combine_regex_and_exif_detection
+from sortunsortedmedialib.exif_probe import get_best_creation_date, get_exif_probe
+from sortunsortedmedialib.media_classifier import detect_camera_from_filename
+from sortunsortedmedialib.media_helper import is_edited_file, is_jpg_file
+
+
+@dataclass
+class PrefetchedFile:
+    """Everything prepared for one file before it is shown."""
+
+    path: str
+    camera: str
+    creation_date: Optional[datetime]
+    companion_checked: bool = False
+    companion_path: Optional[str] = None
+    image: Optional[Image.Image] = None
+    image_bytes: int = 0
+
+
+def load_display_image(file_path: str) -> Optional[Image.Image]:
+    """
+    Decode an image for display (RAW files are shown from their embedded preview).
+
+    Returns:
+        Loaded PIL image, or None for videos
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if EXTENSION_TYPES.get(extension.lstrip('.')) == "Video":
+        return None
+
+    if extension in RAW_EXTENSIONS:
+        # Embedded preview, developed RAW data only when there is none
+        return load_raw_image(file_path, tool_path=get_exif_probe().tool_path)
+
+    image = Image.open(file_path)
+    image.load()
+    return image
+
+
+def image_size_bytes(image: Optional[Image.Image]) -> int:
+    """Approximate memory held by a decoded image."""
+    if image is None:
+        return 0
+    return image.width * image.height * len(image.getbands())
+
+
+def prefetch_file(file_path: str, target_folder: str) -> PrefetchedFile:
+    """
+    Prepare one file the way process_media_file and the viewer need it.
+
+    Args:
+        file_path: Media file to prepare
+        target_folder: Target folder searched for companion files
+
+    Returns:
+        PrefetchedFile with camera, date, companion and decoded image
+    """
+    filename = os.path.basename(file_path)
+    name, extension = os.path.splitext(filename)
+    media_type = EXTENSION_TYPES.get(extension.lower().lstrip('.'), "Foto")
+    is_edited = is_edited_file(filename)
+
+    camera = combine_regex_and_exif_detection(file_path, detect_camera_from_filename(name))
+    creation_date = get_best_creation_date(file_path)
+    result = PrefetchedFile(file_path, camera, creation_date)
+
+    # Same companion rules as process_media_file
+    if not is_jpg_file(file_path) and media_type != "Video" and not is_edited:
+        result.companion_checked = True
+        result.companion_path = find_jpg_equivalent(filename, target_folder)
+    elif is_edited:
+        result.companion_checked = True
+        result.companion_path = find_original_file(filename, target_folder, media_type == "Video")
+
+    # A file with a companion is sorted without being shown
+    if result.companion_path is None:
+        result.image = load_display_image(file_path)
+        result.image_bytes = image_size_bytes(result.image)
+    return result
+
+
+class MediaPrefetcher:
+    """Prepares the next files of the review queue in background threads."""
+
+    def __init__(self, target_folder: str, depth: int = DEFAULT_PREFETCH_DEPTH,
+                 memory_cap_mb: int = DEFAULT_PREFETCH_MEMORY_MB, workers: int = PREFETCH_WORKERS,
+                 loader: Callable[[str, str], PrefetchedFile] = prefetch_file):
+        """
+        Args:
+            target_folder: Target folder searched for companion files
+            depth: Number of files prepared ahead of the current one
+            memory_cap_mb: Memory for decoded images held ahead (MB)
+            workers: Background threads
+            loader: Function preparing one file (replaceable in tests)
+        """
+        self.target_folder = target_folder
+        self.depth = max(0, depth)
+        self.memory_cap = max(0, memory_cap_mb) * 1024 * 1024
+        self._loader = loader
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.held_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.dropped_images = 0
+
+    def prefetch(self, upcoming: Iterable[str]) -> None:
+        """Start preparing the first ``depth`` files of ``upcoming`` that are not prepared yet."""
+        with self._lock:
+            for index, file_path in enumerate(upcoming):
+                if index >= self.depth:
+                    break
+                if file_path not in self._futures:
+                    self._futures[file_path] = self._executor.submit(self._load, file_path)
+
+    def take(self, file_path: str) -> Optional[PrefetchedFile]:
+        """
+        Get the prepared data for ``file_path`` (waits if it is still being prepared).
+
+        Returns:
+            PrefetchedFile, or None when the file was not prefetched or preparing it failed
+        """
+        with self._lock:
+            future = self._futures.pop(file_path, None)
+        if future is None:
+            self.misses += 1
+            return None
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logging.warning(f"Prefetch failed for {file_path}: {e}")
+            self.misses += 1
+            return None
+
+        with self._lock:
+            self.held_bytes -= result.image_bytes
+        self.hits += 1
+        return result
+
+    def close(self) -> None:
+        """Stop preparing files and release the prepared images."""
+        with self._lock:
+            futures, self._futures = self._futures, {}
+        for future in futures.values():
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self.held_bytes = 0
+        logging.info(f"Prefetch: {self.hits} hits, {self.misses} misses, "
+                     f"{self.dropped_images} images over the memory cap")
+
+    def _load(self, file_path: str) -> PrefetchedFile:
+        result = self._loader(file_path, self.target_folder)
+        with self._lock:
+            if result.image is not None and self.held_bytes + result.image_bytes > self.memory_cap:
+                # Keep the metadata, decode the image again when the file is shown
+                logging.debug(f"Prefetch memory cap reached, not keeping image of {file_path}")
+                result.image = None
+                result.image_bytes = 0
+                self.dropped_images += 1
+            self.held_bytes += result.image_bytes
+        return result
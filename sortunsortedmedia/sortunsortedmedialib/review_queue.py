@@ -0,0 +1,208 @@
+"""
+In-process review queue for unmatched media files.
+
+The per-file mode starts a new Python interpreter running
+sortunsortedmediafile.py for every file, which pays interpreter startup, the
+imports (tkinter, cv2, PIL, rawpy), window creation and the launch interval
+each time. The review queue keeps one viewer window open instead:
+
+- A worker thread takes files from the queue and runs process_media_file.
+  Files that need no user input (alternative formats with a JPG equivalent,
+  edited files with a known original) are sorted without showing anything.
+- When a file needs a category, the worker hands it to the viewer (Tk runs in
+  the main thread and polls for requests) and waits for the user's answer.
+- Closing the window stops the review; the remaining files stay unsorted.
+- With a MediaPrefetcher the next files are prepared in the background while
+  the user looks at the current one.
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sortunsortedmedialib.constants import REVIEW_POLL_INTERVAL_MS
+
+Selection = Tuple[Optional[str], Optional[str]]
+
+
+class ReviewQueue:
+    """Queue of files reviewed one after another in a single viewer window."""
+
+    def __init__(self, target_folder: str, process_file: Optional[Callable] = None,
+                 poll_interval_ms: int = REVIEW_POLL_INTERVAL_MS, prefetcher=None):
+        """
+        Args:
+            target_folder: Target folder for sorted media
+            process_file: Function processing one file, called as
+                process_file(media_path, target_folder, categorize=...);
+                defaults to sortunsortedmediafile.process_media_file
+            poll_interval_ms: How often the viewer checks for the next file
+            prefetcher: MediaPrefetcher preparing the next files (None = no prefetch)
+        """
+        self.target_folder = target_folder
+        self.poll_interval_ms = poll_interval_ms
+        self._process_file = process_file
+        self.prefetcher = prefetcher
+        self._files: deque = deque()
+        self._files_lock = threading.Lock()
+        self._requests: "queue.Queue" = queue.Queue()
+        self._answers: "queue.Queue[Selection]" = queue.Queue()
+        self._closed = threading.Event()
+        self.total = 0
+        self.processed = 0
+        self.failed = 0
+
+    def add(self, files: Iterable[str]) -> None:
+        """Append files to the queue (in order)."""
+        with self._files_lock:
+            for file_path in files:
+                self._files.append(file_path)
+                self.total += 1
+
+    @property
+    def pending(self) -> int:
+        """Number of queued files not yet taken for processing."""
+        with self._files_lock:
+            return len(self._files)
+
+    def upcoming(self, count: int) -> List[str]:
+        """The next ``count`` queued files, without taking them."""
+        with self._files_lock:
+            return [self._files[index] for index in range(min(count, len(self._files)))]
+
+    @property
+    def closed(self) -> bool:
+        """Whether the review was stopped."""
+        return self._closed.is_set()
+
+    def close(self) -> None:
+        """Stop the review; a worker waiting for an answer gives up the current file."""
+        self._closed.set()
+
+    def run(self) -> None:
+        """Review all queued files in one viewer window (blocks until done or closed)."""
+        if not self.pending:
+            return
+
+        import tkinter as tk
+        from sortunsortedmedialib.media_viewer import MediaViewer
+
+        print(f"\nReviewing {self.pending} files in one viewer window...")
+        print("Close the window to stop (unprocessed files stay in the unsorted folder).\n")
+        logging.info(f"Starting review queue with {self.pending} files")
+
+        root = tk.Tk()
+        viewer = MediaViewer(root, self.target_folder, keep_open=True, on_close=self.close)
+        viewer.show_waiting()
+
+        worker = threading.Thread(target=self.process_pending, args=(self.request_category,),
+                                  name="review-worker", daemon=True)
+        worker.start()
+        root.after(self.poll_interval_ms, self._poll, root, viewer)
+        root.mainloop()
+
+        self.close()
+        worker.join()
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        self._report()
+
+    def process_pending(self, categorize: Callable[..., Optional[Selection]]) -> None:
+        """
+        Process queued files until the queue is empty or the review is closed.
+
+        Args:
+            categorize: Passed to process_file to ask the user for (category, camera)
+        """
+        process_file = self._process_file
+        if process_file is None:
+            from sortunsortedmediafile import process_media_file as process_file
+
+        index = 0
+        try:
+            while not self.closed:
+                with self._files_lock:
+                    if not self._files:
+                        break
+                    file_path = self._files.popleft()
+                index += 1
+                logging.info(f"Processing file {index}/{self.total}: {file_path}")
+
+                kwargs = {"categorize": categorize}
+                if self.prefetcher is not None:
+                    # Prepare the next files while this one is reviewed
+                    self.prefetcher.prefetch(self.upcoming(self.prefetcher.depth))
+                    kwargs["prefetched"] = self.prefetcher.take(file_path)
+
+                try:
+                    result = process_file(file_path, self.target_folder, **kwargs)
+                except Exception as e:
+                    logging.error(f"Error processing {file_path}: {e}", exc_info=True)
+                    result = None
+
+                if result:
+                    self.processed += 1
+                    print(f"  ✓ {index}/{self.total}: {result}")
+                elif not self.closed:
+                    self.failed += 1
+                    print(f"  ✗ {index}/{self.total}: failed to process {file_path}")
+        finally:
+            # Tell the viewer there is nothing more to show
+            self._requests.put(None)
+
+    def request_category(self, media_path: str, target_folder: str = None,
+                         preloaded_image=None, camera: Optional[str] = None) -> Optional[Selection]:
+        """
+        Show ``media_path`` in the viewer and wait for the user (called from the worker).
+
+        Returns:
+            Tuple of (category, camera), or None when the review was closed
+        """
+        if self.closed:
+            return None
+        self._requests.put((media_path, preloaded_image, camera))
+        while not self.closed:
+            try:
+                return self._answers.get(timeout=self.poll_interval_ms / 1000)
+            except queue.Empty:
+                continue
+        return None
+
+    def answer(self, category: str, camera: str) -> None:
+        """Deliver the user's selection for the shown file (called from the viewer)."""
+        self._answers.put((category, camera))
+
+    def _poll(self, root, viewer) -> None:
+        """Show the next file the worker asks for; runs in the Tk thread."""
+        if self.closed:
+            return
+        try:
+            request = self._requests.get_nowait()
+        except queue.Empty:
+            root.after(self.poll_interval_ms, self._poll, root, viewer)
+            return
+
+        if request is None:
+            logging.info("Review queue finished")
+            root.destroy()
+            return
+
+        media_path, preloaded_image, camera = request
+        viewer.load_media(media_path, self.answer, preloaded_image=preloaded_image, camera=camera)
+        root.deiconify()
+        root.lift()
+        root.after(self.poll_interval_ms, self._poll, root, viewer)
+
+    def _report(self) -> None:
+        remaining = self.total - self.processed - self.failed
+        print(f"\n{'='*60}")
+        print("Review Summary:")
+        print(f"  Total files: {self.total}")
+        print(f"  Sorted: {self.processed}")
+        print(f"  Failed: {self.failed}")
+        print(f"  Not processed: {remaining}")
+        print(f"{'='*60}")
+        logging.info(f"Review queue done. Sorted: {self.processed}, Failed: {self.failed}, "
+                     f"Not processed: {remaining}")
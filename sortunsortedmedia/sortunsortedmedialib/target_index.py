@@ -0,0 +1,225 @@
+"""
+Filename index of the sorted target tree.
+
+companion_file_finder used to walk the whole Foto/JPG (or Video) tree for
+every lookup, so sorting one file could read hundreds of thousands of
+directory entries. TargetTreeIndex lists each tree once per session and maps
+file names without extension to their paths, in os.walk order, so lookups
+are dictionary accesses.
+
+The listings can be persisted in a JSON cache. On load every directory's
+mtime is compared with the cached one and only changed directories are
+listed again (adding or removing a file changes the mtime of its directory;
+a new subdirectory changes the mtime of its parent). Files moved into the
+target tree during the session are added with add_file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from sortunsortedmedialib.constants import TARGET_INDEX_CACHE_VERSION
+
+DirectoryListing = Dict[str, object]  # {"mtime_ns": int, "files": [...], "dirs": [...]}
+
+
+class _Tree:
+    """Listings of one indexed root (e.g. <target>/Foto/JPG)."""
+
+    def __init__(self, root: str, directories: Dict[str, DirectoryListing]):
+        self.root = root
+        self.directories = directories
+        self.names: Dict[str, List[str]] = {}
+        # Directories are stored top-down in walk order, files of a directory before its subdirectories
+        for relative, listing in directories.items():
+            directory = os.path.join(root, relative) if relative else root
+            for name in listing["files"]:
+                self.names.setdefault(os.path.splitext(name)[0], []).append(os.path.join(directory, name))
+
+    def add(self, file_path: str) -> None:
+        directory, name = os.path.split(file_path)
+        relative = os.path.relpath(directory, self.root)
+        relative = "" if relative == os.curdir else relative
+        listing = self.directories.get(relative)
+        if listing is not None and name not in listing["files"]:
+            listing["files"].append(name)
+        paths = self.names.setdefault(os.path.splitext(name)[0], [])
+        if file_path not in paths:
+            paths.append(file_path)
+
+
+class TargetTreeIndex:
+    """File name index of the trees below a target folder."""
+
+    def __init__(self, target_folder: str, cache_path: Optional[str] = None):
+        """
+        Args:
+            target_folder: Sorted target folder
+            cache_path: JSON file with persisted listings (None = index lives only in memory)
+        """
+        self.target_folder = target_folder
+        self.cache_path = cache_path
+        self._trees: Dict[str, _Tree] = {}
+        self._cached: Dict[str, Dict[str, DirectoryListing]] = {}
+        self._lock = threading.Lock()
+        self.directories_listed = 0
+        self.directories_reused = 0
+        if cache_path:
+            self._load_cache()
+
+    def lookup(self, root: str, stem: str) -> List[str]:
+        """
+        Paths below ``root`` whose file name without extension is ``stem``, in os.walk order.
+
+        Paths that no longer exist are dropped.
+        """
+        with self._lock:
+            tree = self._tree(root)
+            paths = tree.names.get(stem, [])
+            existing = [path for path in paths if os.path.exists(path)]
+            if len(existing) != len(paths):
+                tree.names[stem] = existing
+            return list(existing)
+
+    def add_file(self, file_path: str) -> None:
+        """Add a file moved into the target tree during the session."""
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            for root, tree in self._trees.items():
+                if os.path.normcase(file_path).startswith(os.path.normcase(root) + os.sep):
+                    tree.add(file_path)
+
+    def save(self) -> None:
+        """Write the listings to the cache file."""
+        with self._lock:
+            self._write_cache()
+
+    def _write_cache(self) -> None:
+        if not self.cache_path:
+            return
+        trees = dict(self._cached)
+        trees.update({root: tree.directories for root, tree in self._trees.items()})
+        data = {"version": TARGET_INDEX_CACHE_VERSION, "target_folder": self.target_folder, "trees": trees}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"Could not save target index cache {self.cache_path}: {e}")
+
+    def _tree(self, root: str) -> _Tree:
+        root = os.path.abspath(root)
+        tree = self._trees.get(root)
+        if tree is None:
+            listed, reused = self.directories_listed, self.directories_reused
+            tree = _Tree(root, self._scan(root, self._cached.pop(root, {})))
+            self._trees[root] = tree
+            logging.info(f"Indexed {root}: {len(tree.directories)} directories "
+                         f"({self.directories_listed - listed} listed, {self.directories_reused - reused} from cache)")
+            if self.directories_listed != listed:
+                self._write_cache()
+        return tree
+
+    def _scan(self, root: str, cached: Dict[str, DirectoryListing]) -> Dict[str, DirectoryListing]:
+        """List ``root`` top-down, reusing cached listings of directories whose mtime is unchanged."""
+        directories: Dict[str, DirectoryListing] = {}
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            directory = os.path.join(root, relative) if relative else root
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            listing = cached.get(relative)
+            if listing is not None and listing.get("mtime_ns") == mtime_ns:
+                self.directories_reused += 1
+            else:
+                listing = self._list(directory, mtime_ns)
+                if listing is None:
+                    continue
+                self.directories_listed += 1
+
+            directories[relative] = listing
+            # Reversed so the first subdirectory is visited next, as in os.walk
+            stack.extend(os.path.join(relative, name) if relative else name for name in reversed(listing["dirs"]))
+        return directories
+
+    @staticmethod
+    def _list(directory: str, mtime_ns: int) -> Optional[DirectoryListing]:
+        files, dirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError as e:
+            logging.debug(f"Cannot list {directory}: {e}")
+            return None
+        return {"mtime_ns": mtime_ns, "files": files, "dirs": dirs}
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable target index cache {self.cache_path}: {e}")
+            return
+        if data.get("version") != TARGET_INDEX_CACHE_VERSION:
+            logging.info(f"Target index cache {self.cache_path} has an old format, rebuilding")
+            return
+        self._cached = data.get("trees", {})
+
+
+_indexes: Dict[str, TargetTreeIndex] = {}
+_indexes_lock = threading.Lock()
+_cache_folder: Optional[str] = None
+
+
+def enable_index_cache(cache_folder: Optional[str]) -> None:
+    """Persist target indexes created from now on in ``cache_folder`` (None = memory only)."""
+    global _cache_folder
+    _cache_folder = cache_folder
+
+
+def cache_path_for(target_folder: str, cache_folder: str) -> str:
+    """Cache file of a target folder inside ``cache_folder``."""
+    key = os.path.normcase(os.path.abspath(target_folder))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_folder, f"target_index_{digest}.json")
+
+
+def get_target_index(target_folder: str) -> TargetTreeIndex:
+    """The session's index of ``target_folder`` (created on first use)."""
+    key = os.path.normcase(os.path.abspath(target_folder))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            cache_path = cache_path_for(target_folder, _cache_folder) if _cache_folder else None
+            index = TargetTreeIndex(target_folder, cache_path)
+            _indexes[key] = index
+        return index
+
+
+def register_sorted_file(file_path: str, target_folder: str) -> None:
+    """Add a file moved into ``target_folder`` to the session's index, if one exists."""
+    key = os.path.normcase(os.path.abspath(target_folder))
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is not None:
+        index.add_file(file_path)
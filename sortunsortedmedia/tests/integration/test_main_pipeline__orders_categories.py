@@ -19,6 +19,9 @@ def test_main_processes_categories_in_order(monkeypatch):
         target_folder="X:/target",
         interval=0,
         max_parallel=1,
+        review_mode="queue",
+        prefetch_depth=0,
+        prefetch_memory_mb=0,
         debug=False,
     )
 
@@ -0,0 +1,58 @@
+"""
+Benchmark: one ExifTool process per file vs. the persistent -stay_open worker.
+
+Uses a small Python stand-in for ExifTool so the comparison measures process
+startup overhead, which is what the persistent worker removes.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+from shared.exiftool_worker import benchmark_exiftool_modes
+
+FAKE_EXIFTOOL = r'''
+import json
+import sys
+
+def answer(args):
+    files = [a for a in args if not a.startswith("-")]
+    return json.dumps([{"SourceFile": f} for f in files])
+
+if "-stay_open" in sys.argv:
+    pending = []
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        if line == "False" and pending[-1:] == ["-stay_open"]:
+            break
+        if line.startswith("-execute"):
+            echo = pending[pending.index("-echo4") + 1] if "-echo4" in pending else ""
+            print(answer([a for a in pending if a != echo]))
+            print("{ready" + line[len("-execute"):] + "}", flush=True)
+            print(echo.replace("${status}", "0"), file=sys.stderr, flush=True)
+            pending = []
+        else:
+            pending.append(line)
+else:
+    print(answer(sys.argv[1:]))
+'''
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ExifTool relies on a shebang script")
+def test_persistent_worker_outperforms_per_file_spawn(tmp_path):
+    tool = tmp_path / "exiftool"
+    tool.write_text(f"#!{sys.executable}\n" + FAKE_EXIFTOOL, encoding="utf-8")
+    tool.chmod(0o755)
+    files = [f"C:/photos/IMG_{i:04d}.jpg" for i in range(40)]
+
+    results = benchmark_exiftool_modes(files, str(tool))
+
+    assert results["files"] == 40
+    assert results["persistent_seconds"] < results["spawn_seconds"]
+    assert results["speedup"] > 1
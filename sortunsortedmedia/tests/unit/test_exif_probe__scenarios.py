@@ -0,0 +1,96 @@
+"""
+Unit tests for sortunsortedmedialib/exif_probe.py.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+import sortunsortedmedialib.exif_camera_detector as exif_camera_detector
+import sortunsortedmedialib.exif_probe as exif_probe
+
+
+def fake_exiftool(calls, record=None, returncode=0):
+    def run(tool_path, args, check=True, timeout=None, **_k):
+        calls.append(list(args))
+        stdout = json.dumps([record]) if record is not None else ""
+        return subprocess.CompletedProcess([tool_path] + list(args), returncode, stdout, "")
+    return run
+
+
+def test_probe__camera_and_date_share_one_call(monkeypatch, tmp_path):
+    media = tmp_path / "IMG_1.JPG"
+    media.write_bytes(b"x")
+    calls = []
+    record = {"Make": "Canon", "Model": "EOS R5", "DateTimeOriginal": "2024:10:01 12:00:00",
+              "FileModifyDate": "2024:11:02 08:00:00+01:00"}
+    monkeypatch.setattr(exif_probe, "run_exiftool", fake_exiftool(calls, record))
+    probe = exif_probe.ExifProbe(tool_path="exiftool")
+    monkeypatch.setattr(exif_camera_detector, "get_exif_probe", lambda: probe)
+
+    detector = exif_camera_detector.EXIFCameraDetector()
+    detector.exiftool_path = "exiftool"
+
+    camera = detector.get_camera_from_exif(str(media))
+    created = probe.creation_date(str(media))
+
+    assert camera == "Canon EOS R5"
+    assert created == datetime(2024, 10, 1, 12, 0, 0)
+    assert len(calls) == 1
+    assert "-Make" in calls[0] and "-time:all" in calls[0]
+    assert probe.reads == 1 and probe.hits == 1
+
+
+def test_probe__changed_file_is_read_again(monkeypatch, tmp_path):
+    media = tmp_path / "IMG_1.JPG"
+    media.write_bytes(b"x")
+    calls = []
+    monkeypatch.setattr(exif_probe, "run_exiftool", fake_exiftool(calls, {"Make": "Canon"}))
+    probe = exif_probe.ExifProbe(tool_path="exiftool")
+
+    probe.read(str(media))
+    stat = os.stat(media)
+    os.utime(media, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    probe.read(str(media))
+
+    assert len(calls) == 2
+
+
+def test_probe__failed_read_falls_back_to_file_date(monkeypatch, tmp_path):
+    media = tmp_path / "IMG_1.JPG"
+    media.write_bytes(b"x")
+    calls = []
+    monkeypatch.setattr(exif_probe, "run_exiftool", fake_exiftool(calls, returncode=1))
+    probe = exif_probe.ExifProbe(tool_path="exiftool")
+
+    created = probe.creation_date(str(media))
+    probe.read(str(media))
+
+    assert created == datetime.fromtimestamp(min(os.path.getctime(media), os.path.getmtime(media)))
+    # Failures are not cached
+    assert len(calls) == 2
+
+
+def test_probe__cache_is_bounded(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(exif_probe, "run_exiftool", fake_exiftool(calls, {}))
+    probe = exif_probe.ExifProbe(tool_path="exiftool", cache_size=2)
+    files = []
+    for index in range(3):
+        media = tmp_path / f"IMG_{index}.JPG"
+        media.write_bytes(b"x")
+        files.append(str(media))
+        probe.read(str(media))
+
+    probe.read(files[0])
+
+    assert len(calls) == 4
@@ -0,0 +1,131 @@
+"""
+Unit tests for sortunsortedmedialib/prefetch.py.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+import sortunsortedmedialib.prefetch as prefetch
+from sortunsortedmedialib.review_queue import ReviewQueue
+
+
+def fake_loader(loaded, size=(10, 10)):
+    def load(path, target):
+        loaded.append(path)
+        image = Image.new("RGB", size)
+        return prefetch.PrefetchedFile(path, "Cam", None, image=image,
+                                       image_bytes=prefetch.image_size_bytes(image))
+    return load
+
+
+def test_prefetch__respects_depth_and_returns_results():
+    loaded = []
+    prefetcher = prefetch.MediaPrefetcher("T", depth=2, memory_cap_mb=1, loader=fake_loader(loaded))
+
+    prefetcher.prefetch(["a.jpg", "b.jpg", "c.jpg"])
+    first = prefetcher.take("a.jpg")
+    prefetcher.take("b.jpg")
+    prefetcher.close()
+
+    assert sorted(loaded) == ["a.jpg", "b.jpg"]
+    assert first.camera == "Cam" and first.image.size == (10, 10)
+    assert prefetcher.take("c.jpg") is None
+    assert (prefetcher.hits, prefetcher.misses) == (2, 1)
+    assert prefetcher.held_bytes == 0
+
+
+def test_prefetch__memory_cap_drops_images_but_keeps_metadata():
+    loaded = []
+    # 500x500 RGB = 750 KB per image, cap 1 MB: only one image can be held
+    prefetcher = prefetch.MediaPrefetcher("T", depth=3, memory_cap_mb=1, workers=1,
+                                          loader=fake_loader(loaded, size=(500, 500)))
+
+    prefetcher.prefetch(["a.jpg", "b.jpg", "c.jpg"])
+    # One worker loads in order, so taking the last file waits until all are loaded
+    results = [prefetcher.take(name) for name in ("c.jpg", "b.jpg", "a.jpg")][::-1]
+    prefetcher.close()
+
+    assert [r.image is not None for r in results] == [True, False, False]
+    assert all(r.camera == "Cam" for r in results)
+    assert prefetcher.dropped_images == 2
+
+
+def test_review_queue__passes_prefetched_data_to_process_file():
+    received = {}
+    loaded = []
+
+    def process_file(path, target, categorize, prefetched):
+        received[path] = prefetched
+        return path
+
+    prefetcher = prefetch.MediaPrefetcher("T", depth=2, memory_cap_mb=16, loader=fake_loader(loaded))
+    review = ReviewQueue("T", process_file=process_file, prefetcher=prefetcher)
+    review.add(["a.jpg", "b.jpg", "c.jpg"])
+
+    review.process_pending(lambda *_a: ("Cat", "Cam"))
+    prefetcher.close()
+
+    # The first file is processed directly, the following ones were prepared ahead
+    assert received["a.jpg"] is None
+    assert received["b.jpg"].path == "b.jpg"
+    assert received["c.jpg"].path == "c.jpg"
+    assert review.processed == 3
+
+
+def test_prefetch_file__skips_image_when_companion_found(monkeypatch, tmp_path):
+    source = tmp_path / "IMG_1.png"
+    Image.new("RGB", (4, 4)).save(source)
+    monkeypatch.setattr(prefetch, "combine_regex_and_exif_detection", lambda *_a: "Canon")
+    monkeypatch.setattr(prefetch, "get_best_creation_date", lambda _p: None)
+    monkeypatch.setattr(prefetch, "find_jpg_equivalent", lambda *_a: "T/Foto/JPG/IMG_1.jpg")
+
+    result = prefetch.prefetch_file(str(source), "T")
+
+    assert result.camera == "Canon"
+    assert result.companion_checked and result.companion_path == "T/Foto/JPG/IMG_1.jpg"
+    assert result.image is None
+
+    monkeypatch.setattr(prefetch, "find_jpg_equivalent", lambda *_a: None)
+    result = prefetch.prefetch_file(str(source), "T")
+    assert result.image.size == (4, 4)
+    assert result.image_bytes == 48
+
+
+def test_process_media_file__rechecks_companion_missing_at_prefetch(tmp_path):
+    from datetime import datetime
+
+    import sortunsortedmediafile as script
+
+    unsorted = tmp_path / "unsorted"
+    unsorted.mkdir()
+    target = tmp_path / "sorted"
+    target.mkdir()
+    jpg, png = unsorted / "IMG_1.jpg", unsorted / "IMG_1.png"
+    Image.new("RGB", (4, 4)).save(jpg)
+    Image.new("RGB", (4, 4)).save(png)
+    taken = datetime(2024, 5, 1, 10, 0, 0)
+    asked = []
+
+    def categorize(path, *_a):
+        asked.append(Path(path).name)
+        return "Abstrakty", "Canon EOS R5"
+
+    # Prefetched while the JPG was still waiting for the user: no companion yet
+    png_prefetched = prefetch.PrefetchedFile(str(png), "Canon EOS R5", taken,
+                                             companion_checked=True, companion_path=None)
+    jpg_prefetched = prefetch.PrefetchedFile(str(jpg), "Canon EOS R5", taken)
+
+    moved_jpg = script.process_media_file(str(jpg), str(target), categorize, jpg_prefetched)
+    moved_png = script.process_media_file(str(png), str(target), categorize, png_prefetched)
+
+    assert asked == ["IMG_1.jpg"]
+    assert Path(moved_png).parent.parent.name == Path(moved_jpg).parent.parent.name
+    assert "Abstrakty" in Path(moved_png).parts
@@ -0,0 +1,90 @@
+"""
+Unit tests for sortunsortedmedialib/review_queue.py (without a display).
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+import sortunsortedmedialib.media_helper as media_helper
+from sortunsortedmedialib.review_queue import ReviewQueue
+
+
+def test_process_pending__keeps_order_and_counts():
+    seen = []
+
+    def process_file(path, target, categorize):
+        seen.append((path, target))
+        if path == "bad.jpg":
+            return None
+        return f"{target}/{path}"
+
+    review = ReviewQueue("T", process_file=process_file)
+    review.add(["a.jpg", "bad.jpg"])
+    review.add(["c.png"])
+
+    review.process_pending(lambda *_a: ("Cat", "Cam"))
+
+    assert seen == [("a.jpg", "T"), ("bad.jpg", "T"), ("c.png", "T")]
+    assert (review.total, review.processed, review.failed, review.pending) == (3, 2, 1, 0)
+
+
+def test_request_category__round_trip_through_viewer_thread():
+    def process_file(path, target, categorize):
+        category, camera = categorize(path, target, None)
+        return f"{target}/{category}/{camera}/{path}"
+
+    review = ReviewQueue("T", process_file=process_file, poll_interval_ms=10)
+    review.add(["a.jpg", "b.jpg"])
+    shown = []
+
+    def viewer():
+        # Stand-in for the Tk poll loop: show each request and answer it
+        while True:
+            request = review._requests.get(timeout=5)
+            if request is None:
+                return
+            shown.append(request[0])
+            review.answer(f"Cat-{request[0]}", "Cam")
+
+    thread = threading.Thread(target=viewer)
+    thread.start()
+    review.process_pending(review.request_category)
+    thread.join(timeout=5)
+
+    assert shown == ["a.jpg", "b.jpg"]
+    assert review.processed == 2
+
+
+def test_close__cancels_waiting_file_and_stops():
+    def process_file(path, target, categorize):
+        return None if categorize(path, target, None) is None else path
+
+    review = ReviewQueue("T", process_file=process_file, poll_interval_ms=10)
+    review.add(["a.jpg", "b.jpg"])
+    threading.Timer(0.05, review.close).start()
+
+    review.process_pending(review.request_category)
+
+    assert review.processed == 0
+    assert review.failed == 0
+    assert review.pending == 1
+
+
+def test_process_unmatched_files__routes_by_mode(monkeypatch):
+    launched = []
+    monkeypatch.setattr(media_helper, "launch_file_processes", lambda files, *_a: launched.append(files))
+    shared = ReviewQueue("T")
+
+    media_helper.process_unmatched_files(["a.jpg"], "T", 0, 1, mode="process")
+    media_helper.process_unmatched_files(["b.jpg"], "T", 0, 1, mode="queue", review_queue=shared)
+    media_helper.process_unmatched_files(["c.jpg"], "T", 0, 1, mode="queue", review_queue=shared)
+
+    assert launched == [["a.jpg"]]
+    assert shared.total == 2
@@ -0,0 +1,120 @@
+"""
+Unit tests for shared/raw_preview.py.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+from shared import raw_preview
+
+
+class NoThumbnail(Exception):
+    pass
+
+
+def fake_rawpy(thumb_size=None, flip=0, developed_size=(4000, 3000), calls=None):
+    calls = calls if calls is not None else []
+
+    class Raw:
+        sizes = SimpleNamespace(flip=flip)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_a):
+            return False
+
+        def extract_thumb(self):
+            calls.append("thumb")
+            if thumb_size is None:
+                raise NoThumbnail()
+            buffer = io.BytesIO()
+            Image.new("RGB", thumb_size).save(buffer, "JPEG")
+            return SimpleNamespace(format="jpeg", data=buffer.getvalue())
+
+        def postprocess(self, **_k):
+            calls.append("postprocess")
+            import numpy as np
+            return np.zeros((developed_size[1], developed_size[0], 3), dtype="uint8")
+
+    return SimpleNamespace(
+        imread=lambda _p: Raw(),
+        LibRawNoThumbnailError=NoThumbnail,
+        LibRawUnsupportedThumbnailError=NoThumbnail,
+        ThumbFormat=SimpleNamespace(JPEG="jpeg"),
+        ColorSpace=SimpleNamespace(sRGB="srgb"),
+    )
+
+
+@pytest.fixture
+def use_rawpy(monkeypatch):
+    def install(**kwargs):
+        calls = []
+        monkeypatch.setattr(raw_preview, "rawpy", fake_rawpy(calls=calls, **kwargs), raising=False)
+        monkeypatch.setattr(raw_preview, "RAWPY_AVAILABLE", True)
+        return calls
+    return install
+
+
+def test_load_raw_image__uses_embedded_preview(use_rawpy):
+    calls = use_rawpy(thumb_size=(1620, 1080))
+
+    image = raw_preview.load_raw_image("C:/IMG_1.NEF")
+
+    assert image.size == (1620, 1080)
+    assert calls == ["thumb"]
+
+
+def test_load_raw_image__applies_raw_orientation(use_rawpy):
+    use_rawpy(thumb_size=(1620, 1080), flip=6)
+
+    assert raw_preview.load_raw_image("C:/IMG_1.NEF").size == (1080, 1620)
+
+
+def test_load_raw_image__develops_without_usable_preview(use_rawpy):
+    calls = use_rawpy(thumb_size=None)
+    assert raw_preview.load_raw_image("C:/IMG_1.NEF").size == (4000, 3000)
+    assert calls == ["thumb", "postprocess"]
+
+    calls = use_rawpy(thumb_size=(160, 120))
+    assert raw_preview.load_raw_image("C:/IMG_1.NEF").size == (4000, 3000)
+    assert calls == ["thumb", "postprocess"]
+
+
+def test_load_raw_image__full_resolution_on_request(use_rawpy):
+    calls = use_rawpy(thumb_size=(1620, 1080))
+
+    image = raw_preview.load_raw_image("C:/IMG_1.NEF", full_resolution=True)
+
+    assert image.size == (4000, 3000)
+    assert calls == ["postprocess"]
+
+
+def test_load_raw_preview__exiftool_without_rawpy(monkeypatch):
+    monkeypatch.setattr(raw_preview, "RAWPY_AVAILABLE", False)
+    buffer = io.BytesIO()
+    Image.new("RGB", (2048, 1365)).save(buffer, "JPEG")
+    commands = []
+
+    def run(cmd, **_k):
+        commands.append(cmd)
+        return SimpleNamespace(returncode=0, stdout=buffer.getvalue())
+
+    monkeypatch.setattr(raw_preview.subprocess, "run", run)
+
+    image = raw_preview.load_raw_preview("C:/IMG_1.CR2", tool_path="exiftool")
+
+    assert image.size == (2048, 1365)
+    assert commands[0][:3] == ["exiftool", "-b", "-JpgFromRaw"]
+    assert raw_preview.load_raw_preview("C:/IMG_1.CR2") is None
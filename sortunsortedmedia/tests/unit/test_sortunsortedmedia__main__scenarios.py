@@ -19,6 +19,9 @@ def make_args(tmp_path, **overrides):
         target_folder=str(tmp_path / "target"),
         interval=0,
         max_parallel=1,
+        review_mode="queue",
+        prefetch_depth=0,
+        prefetch_memory_mb=0,
         debug=False,
     )
     defaults.update(overrides)
@@ -0,0 +1,89 @@
+"""
+Unit tests for sortunsortedmedialib/target_index.py.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "sortunsortedmedia"
+sys.path.insert(0, str(package_root))
+
+from sortunsortedmedialib.target_index import TargetTreeIndex, cache_path_for, get_target_index
+
+
+def touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    return path
+
+
+def walk_matches(root: Path, stem: str):
+    return [os.path.join(r, f) for r, _, files in os.walk(root) for f in files if os.path.splitext(f)[0] == stem]
+
+
+def test_lookup__matches_os_walk_order(tmp_path):
+    root = tmp_path / "Foto" / "JPG"
+    for relative in ["A/2024/01/Cam/IMG_1.JPG", "A/2024/01/Cam/IMG_1.jpeg", "B/2023/12/Cam/IMG_1.jpg",
+                     "IMG_1.JPG", "B/2023/12/Cam/IMG_2.JPG"]:
+        touch(root / relative)
+
+    index = TargetTreeIndex(str(tmp_path))
+
+    assert index.lookup(str(root), "IMG_1") == walk_matches(root, "IMG_1")
+    assert index.lookup(str(root), "IMG_3") == []
+    assert index.directories_listed == 9
+
+
+def test_lookup__added_and_removed_files(tmp_path):
+    root = tmp_path / "Foto" / "JPG"
+    old = touch(root / "A" / "IMG_1.JPG")
+    index = TargetTreeIndex(str(tmp_path))
+    assert index.lookup(str(root), "IMG_1") == [str(old)]
+
+    new = touch(root / "B" / "IMG_2.JPG")
+    index.add_file(str(new))
+    old.unlink()
+
+    assert index.lookup(str(root), "IMG_2") == [str(new)]
+    assert index.lookup(str(root), "IMG_1") == []
+
+
+def test_cache__reuses_unchanged_directories(tmp_path):
+    target = tmp_path / "target"
+    root = target / "Video"
+    touch(root / "A" / "2024" / "MOV_1.MP4")
+    touch(root / "B" / "2024" / "MOV_2.MP4")
+    cache_path = cache_path_for(str(target), str(tmp_path / "cache"))
+
+    first = TargetTreeIndex(str(target), cache_path)
+    first.lookup(str(root), "MOV_1")
+    assert os.path.exists(cache_path)
+
+    added = touch(root / "B" / "2024" / "MOV_3.MP4")
+    # Make sure the directory mtime differs even on coarse filesystem clocks
+    stat = os.stat(added.parent)
+    os.utime(added.parent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    second = TargetTreeIndex(str(target), cache_path)
+    assert second.lookup(str(root), "MOV_3") == [str(added)]
+    assert second.lookup(str(root), "MOV_1") == [str(root / "A" / "2024" / "MOV_1.MP4")]
+    assert second.directories_listed == 1
+    assert second.directories_reused == 4
+
+
+def test_cache__unreadable_file_is_ignored(tmp_path):
+    cache_path = tmp_path / "index.json"
+    cache_path.write_text("{not json", encoding="utf-8")
+    touch(tmp_path / "Video" / "MOV_1.MP4")
+
+    index = TargetTreeIndex(str(tmp_path), str(cache_path))
+
+    assert index.lookup(str(tmp_path / "Video"), "MOV_1") == [str(tmp_path / "Video" / "MOV_1.MP4")]
+
+
+def test_get_target_index__one_index_per_target(tmp_path):
+    assert get_target_index(str(tmp_path)) is get_target_index(str(tmp_path) + os.sep)
@@ -269,7 +269,7 @@ def load_csv(path: str) -> List[Dict[str, str]]:
         raise
     return records
 
-def save_csv_with_backup(data: List[Dict[str, str]], path: str) -> None:
+def save_csv_with_backup(data: List[Dict[str, str]], path: str, backup: bool = True) -> None:
     """
     Creates a backup of the original CSV and saves the new data.
     Preserves column order from the first record.
@@ -277,18 +277,20 @@ def save_csv_with_backup(data: List[Dict[str, str]], path: str) -> None:
     Args:
         data: List of dictionaries representing CSV rows
         path: Path to the CSV file
+        backup: Create the timestamped backup (False for repeated saves in one run)
     """
     from datetime import datetime
 
     logging.info("Saving CSV with backup: %s", path)
 
-    # Create backup with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{os.path.splitext(path)[0]}_{timestamp}.csv"
+    if backup:
+        # Create backup with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = f"{os.path.splitext(path)[0]}_{timestamp}.csv"
 
-    # Create backup
-    copy_file(path, backup_path)
-    logging.info("Created backup at: %s", backup_path)
+        # Create backup
+        copy_file(path, backup_path)
+        logging.info("Created backup at: %s", backup_path)
 
     # Ensure the directory exists
     ensure_directory(os.path.dirname(path))
@@ -13,6 +13,60 @@ except ImportError:
 # Flag to log xxhash fallback warning only once (at first use, not at import time)
 _xxhash_warning_logged = False
 
+# Optional persistent hash index (shared.hash_index.HashIndex) consulted by compute_file_hash
+_hash_index = None
+
+
+def set_hash_index(index) -> None:
+    """
+    Activate a persistent hash index for compute_file_hash (None deactivates it).
+
+    Args:
+        index: Object with lookup/store/rename methods, e.g. shared.hash_index.HashIndex
+    """
+    global _hash_index
+    _hash_index = index
+
+
+def get_hash_index():
+    """Return the active persistent hash index or None."""
+    return _hash_index
+
+
+def record_file_move(src: str, dst: str) -> None:
+    """
+    Tell the active hash index that a file was renamed or moved.
+
+    Renames keep size and mtime, so the stored hash stays valid under the new path.
+    Does nothing when no index is active.
+    """
+    if _hash_index is not None:
+        try:
+            _hash_index.rename(src, dst)
+        except Exception as e:
+            logging.warning("Failed to update hash index for %s -> %s: %s", src, dst, e)
+
+
+def hash_file_contents(path: str, method: str = "xxhash64") -> str:
+    """
+    Read the file and compute its hash, bypassing the persistent index.
+
+    Args:
+        path: Path to file to hash
+        method: Hash algorithm ("xxhash64", "md5", "sha256")
+
+    Returns:
+        Hex digest of file hash
+    """
+    if method == "xxhash64":
+        h = xxhash.xxh64()
+    else:
+        h = hashlib.new(method)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):  # 64KB chunks for better performance
+            h.update(chunk)
+    return h.hexdigest()
+
 
 def compute_file_hash(path: str, method: str = "xxhash64") -> str:
     """
@@ -28,35 +82,32 @@ def compute_file_hash(path: str, method: str = "xxhash64") -> str:
     Note:
         xxhash64 is 10-15x faster than MD5 for large files.
         Falls back to MD5 if xxhash is not installed.
+        When a hash index is active (set_hash_index), unchanged files are not re-read.
     """
     global _xxhash_warning_logged
     logging.debug("Computing %s hash for file: %s", method, path)
     try:
-        if method == "xxhash64":
-            if not XXHASH_AVAILABLE:
-                if not _xxhash_warning_logged:
-                    logging.warning("xxhash not available, falling back to MD5. Install with: pip install xxhash")
-                    _xxhash_warning_logged = True
-                method = "md5"
-            else:
-                h = xxhash.xxh64()
-                with open(path, "rb") as f:
-                    for chunk in iter(lambda: f.read(65536), b""):  # 64KB chunks for better performance
-                        h.update(chunk)
-                result = h.hexdigest()
-                logging.debug("Computed xxhash64 hash for %s: %s", path, result)
-                return result
-
-        # Fallback to hashlib for other methods (md5, sha256, etc.)
-        h = hashlib.new(method)
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(65536), b""):  # 64KB chunks for better performance
-                h.update(chunk)
-        result = h.hexdigest()
+        if method == "xxhash64" and not XXHASH_AVAILABLE:
+            if not _xxhash_warning_logged:
+                logging.warning("xxhash not available, falling back to MD5. Install with: pip install xxhash")
+                _xxhash_warning_logged = True
+            method = "md5"
+
+        index = _hash_index
+        stat = None
+        if index is not None:
+            stat = os.stat(path)
+            cached = index.lookup(path, method, stat)
+            if cached is not None:
+                logging.debug("Hash index hit for %s: %s", path, cached)
+                return cached
+
+        result = hash_file_contents(path, method)
         logging.debug("Computed %s hash for %s: %s", method, path, result)
+
+        if index is not None:
+            index.store(path, method, result, stat)
         return result
     except Exception as e:
         logging.error("Failed to compute hash for %s: %s", path, e)
         raise
-
-
@@ -23,6 +23,8 @@ def test_main_runs_all_phases(monkeypatch):
         edit_photo_dir="X:/edit_photos",
         edit_video_dir="X:/edit_videos",
         log_dir="X:/logs",
+        workers=2,
+        checkpoint_interval=0,
         debug=False,
     )
 
@@ -31,7 +33,7 @@ def test_main_runs_all_phases(monkeypatch):
     def fake_load_csv(_path):
         return list(store["data"])
 
-    def fake_save_csv_with_backup(data, _path):
+    def fake_save_csv_with_backup(data, _path, **_kwargs):
         store["data"] = list(data)
 
     def fake_list_files(directory, recursive=True):
@@ -41,7 +43,7 @@ def test_main_runs_all_phases(monkeypatch):
             return ["C:/videos/c.mp4"]
         return []
 
-    def fake_process_media_file(path, _db, _limits, _exiftool, _existing):
+    def fake_process_media_file(path, _db, _limits, _exiftool, _existing, **_kwargs):
         return {COLUMN_FILENAME: Path(path).name}
 
     monkeypatch.setattr(updatemediadatabase, "parse_arguments", lambda: args)
@@ -59,3 +61,47 @@ def test_main_runs_all_phases(monkeypatch):
 
     filenames = {row[COLUMN_FILENAME] for row in store["data"]}
     assert filenames == {"a.jpg", "b.png", "c.mp4"}
+
+
+def test_main_saves_once_without_checkpoints(monkeypatch):
+    args = types.SimpleNamespace(
+        media_csv="X:/media.csv",
+        limits_csv="X:/limits.csv",
+        photo_dir="X:/photos",
+        video_dir="X:/videos",
+        edit_photo_dir="X:/edit_photos",
+        edit_video_dir="X:/edit_videos",
+        log_dir="X:/logs",
+        workers=2,
+        checkpoint_interval=0,
+        debug=False,
+    )
+    saves = []
+
+    def fake_list_files(directory, recursive=True):
+        if directory.endswith("photos"):
+            return ["C:/photos/a.jpg", "C:/photos/b.png", "C:/photos/d.jpg"]
+        if directory.endswith("videos"):
+            return ["C:/videos/c.mp4"]
+        return []
+
+    monkeypatch.setattr(updatemediadatabase, "parse_arguments", lambda: args)
+    monkeypatch.setattr(updatemediadatabase, "ensure_directory", lambda _p: None)
+    monkeypatch.setattr(updatemediadatabase, "get_log_filename", lambda _p: "log.txt")
+    monkeypatch.setattr(updatemediadatabase, "setup_logging", lambda **_k: None)
+    monkeypatch.setattr(updatemediadatabase, "ensure_exiftool", lambda: "exiftool")
+    monkeypatch.setattr(updatemediadatabase, "load_csv", lambda _p: [])
+    monkeypatch.setattr(updatemediadatabase, "save_csv_with_backup",
+                        lambda data, _path, backup=True: saves.append((len(data), backup)))
+    monkeypatch.setattr(updatemediadatabase, "list_files", fake_list_files)
+    monkeypatch.setattr(updatemediadatabase, "process_media_file",
+                        lambda path, *_a, **_k: {COLUMN_FILENAME: Path(path).name})
+    monkeypatch.setattr(updatemediadatabase.os.path, "exists", lambda _p: True)
+
+    updatemediadatabase.main()
+    assert saves == [(4, True)]
+
+    saves.clear()
+    args.checkpoint_interval = 2
+    updatemediadatabase.main()
+    assert saves == [(2, True), (4, False)]
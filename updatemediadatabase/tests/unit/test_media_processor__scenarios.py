@@ -68,3 +68,30 @@ def test_process_media_file__creates_record(monkeypatch):
         existing_filenames=set(),
     )
     assert record == {"Soubor": "file.jpg"}
+
+
+def test_find_original_file__index_matches_linear_search():
+    database = [
+        {media_processor.COLUMN_FILENAME: "IMG_001.jpg", "Cesta": "first"},
+        {media_processor.COLUMN_FILENAME: "IMG_002.jpg"},
+        {media_processor.COLUMN_FILENAME: "IMG_001.jpg", "Cesta": "duplicate"},
+    ]
+    index = media_processor.OriginalFileIndex(database)
+
+    for name in ["IMG_001_bw.jpg", "IMG_002_sharpen.jpg", "IMG_003_bw.jpg", "plain.jpg"]:
+        assert media_processor.find_original_file(name, database, index) is \
+            media_processor.find_original_file(name, database)
+    assert media_processor.find_original_file("IMG_001_bw.jpg", database, index)["Cesta"] == "first"
+
+
+def test_find_original_file__index_sees_appended_records():
+    database = [{media_processor.COLUMN_FILENAME: "IMG_001.jpg"}]
+    index = media_processor.OriginalFileIndex(database)
+    assert media_processor.find_original_file("IMG_004_bw.jpg", database, index) is None
+
+    new_record = {media_processor.COLUMN_FILENAME: "IMG_004.jpg"}
+    database.append(new_record)
+    index.add(new_record)
+
+    assert media_processor.find_original_file("IMG_004_bw.jpg", database, index) is new_record
+    assert len(index) == 2
@@ -43,3 +43,43 @@ def test_main__exiftool_missing(monkeypatch):
     monkeypatch.setattr(main_module, "ensure_exiftool", lambda: (_ for _ in ()).throw(RuntimeError("missing")))
 
     assert main_module.main() is None
+
+
+def test_process_files__keeps_order_and_skips_duplicates(monkeypatch):
+    import time
+
+    def fake_process_media_file(path, _db, _limits, _exiftool, existing, **_kwargs):
+        name = Path(path).name
+        time.sleep(0.01 if name.startswith("a") else 0)
+        if name in existing:
+            return None
+        return {main_module.COLUMN_FILENAME: name}
+
+    monkeypatch.setattr(main_module, "process_media_file", fake_process_media_file)
+    existing = {"known.jpg"}
+    files = ["C:/x/a1.jpg", "C:/x/b1.jpg", "C:/x/known.jpg", "C:/y/a1.jpg", "C:/x/c1.jpg"]
+
+    records = main_module.process_files(files, "Processing", [], [], "exiftool", existing, workers=3)
+
+    assert [r[main_module.COLUMN_FILENAME] for r in records] == ["a1.jpg", "b1.jpg", "c1.jpg"]
+    assert existing == {"known.jpg", "a1.jpg", "b1.jpg", "c1.jpg"}
+
+
+def test_database_writer__checkpoints_and_single_backup(monkeypatch):
+    saves = []
+    monkeypatch.setattr(main_module, "save_csv_with_backup",
+                        lambda data, _path, backup=True: saves.append((len(data), backup)))
+
+    database = [{main_module.COLUMN_FILENAME: "old.jpg"}]
+    writer = main_module.DatabaseWriter(database, "media.csv", checkpoint_interval=2)
+    for name in ["a.jpg", "b.jpg", "c.jpg"]:
+        writer.append({main_module.COLUMN_FILENAME: name})
+
+    assert saves == [(3, True)]
+    assert writer.pending == 1
+
+    writer.save()
+
+    assert saves == [(3, True), (4, False)]
+    assert writer.pending == 0
+    assert len(database) == 4
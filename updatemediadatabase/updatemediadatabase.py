@@ -11,12 +11,15 @@ media against size and resolution limits for different photo banks.
 import os
 import argparse
 import logging
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Import shared modules
 from shared.utils import get_log_filename
 from shared.file_operations import ensure_directory, list_files, load_csv, save_csv_with_backup
 from shared.logging_config import setup_logging
+from shared.exiftool_worker import start_shared_pool, shutdown_shared_workers
 from tqdm import tqdm
 
 # Import project-specific modules
@@ -28,10 +31,12 @@ from updatemedialdatabaselib.constants import (
     DEFAULT_EDIT_PHOTO_DIR,
     DEFAULT_EDIT_VIDEO_DIR,
     DEFAULT_LOG_DIR,
+    DEFAULT_EXIFTOOL_WORKERS,
+    DEFAULT_CHECKPOINT_INTERVAL,
     COLUMN_FILENAME
 )
 from updatemedialdatabaselib.exif_downloader import ensure_exiftool
-from updatemedialdatabaselib.media_processor import process_media_file
+from updatemedialdatabaselib.media_processor import OriginalFileIndex, process_media_file
 
 def split_files_by_type(all_files: List[str]) -> Dict[str, List[str]]:
     """
@@ -83,6 +88,134 @@ def get_basename_from_filepath(file_path: str) -> str:
     """
     return os.path.splitext(os.path.basename(file_path))[0]
 
+def process_files(
+    files: List[str],
+    description: str,
+    database: List[Dict[str, str]],
+    limits: List[Dict[str, str]],
+    exiftool_path: str,
+    existing_filenames: set,
+    workers: int,
+    original_index: Optional[OriginalFileIndex] = None,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Process files on several threads and collect new records in submission order.
+
+    Each thread runs process_media_file, whose ExifTool calls are spread over the
+    shared worker pool. Results are consumed in the original file order, so a
+    filename seen twice in the same phase is still only added once.
+
+    Args:
+        files: Files to process
+        description: Progress bar label
+        database: Database records loaded before this phase
+        limits: Photo bank limits
+        exiftool_path: Path to the ExifTool executable
+        existing_filenames: Filenames already in the database (updated in place)
+        workers: Number of parallel extraction threads
+        original_index: Filename index of the database (extended with the new records)
+        on_record: Called with each new record as soon as it is accepted, in file order
+
+    Returns:
+        New database records
+    """
+    new_records = []
+    snapshot = set(existing_filenames)
+    started = time.perf_counter()
+
+    def process(file_path: str):
+        return process_media_file(file_path, database, limits, exiftool_path, snapshot,
+                                  original_index=original_index)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(process, files)
+        with tqdm(results, total=len(files), desc=description, unit="file") as pbar:
+            for record in pbar:
+                if not record:
+                    continue
+                filename = record.get(COLUMN_FILENAME)
+                if filename in existing_filenames:
+                    continue
+                new_records.append(record)
+                existing_filenames.add(filename)
+                if on_record:
+                    on_record(record)
+
+    if original_index is not None:
+        original_index.extend(new_records)
+
+    elapsed = time.perf_counter() - started
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    print(f"{description}: {len(files)} files in {elapsed:.1f}s ({rate:.1f} files/s)")
+    logging.info(f"{description}: {len(files)} files in {elapsed:.1f}s ({rate:.1f} files/s, {workers} workers)")
+    return new_records
+
+class DatabaseWriter:
+    """
+    Collects new records in the in-memory database and saves it to the CSV.
+
+    The database is written once at the end of the run. With a checkpoint
+    interval, it is also written every ``checkpoint_interval`` new records so
+    a crash loses at most that many records. Only the first save of the run
+    creates a timestamped backup, which therefore holds the database as it was
+    before the run.
+    """
+
+    def __init__(self, database: List[Dict[str, Any]], media_csv: str, checkpoint_interval: int = 0):
+        """
+        Args:
+            database: Records loaded at startup (new records are appended in place)
+            media_csv: Path to the media CSV database
+            checkpoint_interval: Save after this many new records (0 = only at the end)
+        """
+        self.database = database
+        self.media_csv = media_csv
+        self.checkpoint_interval = checkpoint_interval
+        self.pending = 0
+        self.saves = 0
+        self.save_seconds = 0.0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a new record and save a checkpoint when the interval is reached."""
+        self.database.append(record)
+        self.pending += 1
+        if self.checkpoint_interval > 0 and self.pending >= self.checkpoint_interval:
+            try:
+                self.save()
+                logging.info(f"Checkpoint: saved database with {len(self.database)} records")
+            except Exception as e:
+                # Keep going, the records stay pending for the next save
+                logging.error(f"Failed to save checkpoint: {e}")
+
+    def save(self) -> None:
+        """Write the whole database to the CSV."""
+        started = time.perf_counter()
+        save_csv_with_backup(self.database, self.media_csv, backup=self.saves == 0)
+        self.save_seconds += time.perf_counter() - started
+        self.saves += 1
+        self.pending = 0
+        logging.info(f"Saved database with {len(self.database)} records")
+
+def print_timing_summary(timings: List[Tuple[str, int, int, float]], writer: DatabaseWriter) -> None:
+    """
+    Print and log the time spent in each phase and in saving the database.
+
+    Args:
+        timings: (phase, files, new records, seconds) for each phase that ran
+        writer: Writer used for the run
+    """
+    if not timings and not writer.saves:
+        return
+    print("\n=== Timing summary ===")
+    for phase, files, new_count, seconds in timings:
+        line = f"{phase}: {files} files, {new_count} new records in {seconds:.1f}s"
+        print(f"  {line}")
+        logging.info(f"Timing - {line}")
+    line = f"Saving: {writer.saves} saves in {writer.save_seconds:.1f}s"
+    print(f"  {line}")
+    logging.info(f"Timing - {line}")
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -103,6 +236,10 @@ def parse_arguments():
     parser.add_argument("--log_dir", type=str, default=DEFAULT_LOG_DIR,
                         help="Directory for log files")
     # ExifTool path is now managed via constants, no longer a parameter
+    parser.add_argument("--workers", type=int, default=DEFAULT_EXIFTOOL_WORKERS,
+                        help="Number of parallel ExifTool workers for metadata extraction")
+    parser.add_argument("--checkpoint_interval", type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help="Also save the database every N new records (0 = save once at the end)")
     parser.add_argument("--debug", action="store_true",
                         help="Enable debug logging")
     return parser.parse_args()
@@ -141,6 +278,10 @@ def main():
         if filename:
             existing_filenames.add(filename)
     logging.debug(f"Extracted {len(existing_filenames)} existing filenames for lookup")
+
+    # Index originals once so edited files do not scan the whole database
+    original_index = OriginalFileIndex(database)
+    logging.debug(f"Indexed {len(original_index)} records for original file lookup")
     
     # Load limits
     try:
@@ -195,148 +336,113 @@ def main():
     print(f"  Non-JPG images: {len(non_jpg_images)}")
     logging.info(f"Split files: {len(jpg_files)} JPG, {len(videos)} videos, {len(non_jpg_images)} non-JPG images")
 
-    # Step 3: Process JPG files first
-    if jpg_files:
-        print("\n=== Phase 1: Processing JPG files ===")
-        logging.info("Phase 1: Processing JPG files")
-        new_records = []
-
-        with tqdm(jpg_files, desc="Processing JPG files", unit="file") as pbar:
-            for file_path in pbar:
-                pbar.set_postfix_str(f"Current: {os.path.basename(file_path)}")
-                record = process_media_file(file_path, database, limits, exiftool_path, existing_filenames)
-                if record:
-                    new_records.append(record)
-                    existing_filenames.add(record.get(COLUMN_FILENAME))
-
-        if new_records:
-            print(f"Adding {len(new_records)} JPG records to database")
-            logging.info(f"Adding {len(new_records)} JPG records to database")
-            database = database + new_records
+    # Persistent ExifTool processes shared by all phases
+    pool = start_shared_pool(exiftool_path, args.workers)
+    if pool:
+        logging.info(f"Using {pool.size} persistent ExifTool workers")
 
-            try:
-                print("Saving database after JPG processing...")
-                save_csv_with_backup(database, args.media_csv)
-                print(f"✅ Saved database with {len(database)} total records")
-                logging.info(f"Saved database with {len(database)} records after JPG phase")
-            except Exception as e:
-                logging.error(f"Failed to save database after JPG phase: {e}")
-                print(f"❌ Failed to save database: {e}")
-                return
+    # New records stay in memory and are saved once at the end (plus optional checkpoints)
+    writer = DatabaseWriter(database, args.media_csv, args.checkpoint_interval)
+    timings = []
 
-            # Reload database to ensure we have the latest data
-            try:
-                database = load_csv(args.media_csv)
-                existing_filenames = set(record.get(COLUMN_FILENAME) for record in database if record.get(COLUMN_FILENAME))
-                logging.debug(f"Reloaded database: {len(database)} records, {len(existing_filenames)} filenames")
-            except Exception as e:
-                logging.error(f"Failed to reload database: {e}")
-        else:
-            print("No new JPG records to add")
-            logging.info("No new JPG records")
-
-    # Step 4: Process videos
-    if videos:
-        print("\n=== Phase 2: Processing videos ===")
-        logging.info("Phase 2: Processing videos")
-        new_records = []
-
-        with tqdm(videos, desc="Processing videos", unit="file") as pbar:
-            for file_path in pbar:
-                pbar.set_postfix_str(f"Current: {os.path.basename(file_path)}")
-                record = process_media_file(file_path, database, limits, exiftool_path, existing_filenames)
-                if record:
-                    new_records.append(record)
-                    existing_filenames.add(record.get(COLUMN_FILENAME))
-
-        if new_records:
-            print(f"Adding {len(new_records)} video records to database")
-            logging.info(f"Adding {len(new_records)} video records to database")
-            database = database + new_records
-
-            try:
-                print("Saving database after video processing...")
-                save_csv_with_backup(database, args.media_csv)
-                print(f"✅ Saved database with {len(database)} total records")
-                logging.info(f"Saved database with {len(database)} records after video phase")
-            except Exception as e:
-                logging.error(f"Failed to save database after video phase: {e}")
-                print(f"❌ Failed to save database: {e}")
-                return
+    try:
+        # Step 3: Process JPG files first
+        if jpg_files:
+            print("\n=== Phase 1: Processing JPG files ===")
+            logging.info("Phase 1: Processing JPG files")
+            started = time.perf_counter()
+            new_records = process_files(jpg_files, "Processing JPG files", database, limits, exiftool_path,
+                                        existing_filenames, args.workers, original_index, writer.append)
+            timings.append(("JPG files", len(jpg_files), len(new_records), time.perf_counter() - started))
 
-            # Reload database
-            try:
-                database = load_csv(args.media_csv)
-                existing_filenames = set(record.get(COLUMN_FILENAME) for record in database if record.get(COLUMN_FILENAME))
-                logging.debug(f"Reloaded database: {len(database)} records, {len(existing_filenames)} filenames")
-            except Exception as e:
-                logging.error(f"Failed to reload database: {e}")
-        else:
-            print("No new video records to add")
-            logging.info("No new video records")
-
-    # Step 5: Process non-JPG images (only if JPG version doesn't exist in DB)
-    if non_jpg_images:
-        print("\n=== Phase 3: Processing non-JPG images ===")
-        logging.info("Phase 3: Processing non-JPG images")
-
-        # Build a set of basenames from existing JPG files in database
-        jpg_basenames_in_db = set()
-        for record in database:
-            filename = record.get(COLUMN_FILENAME)
-            if filename and filename.lower().endswith(('.jpg', '.jpeg')):
-                basename = get_basename_from_filepath(filename)
-                jpg_basenames_in_db.add(basename)
-
-        logging.debug(f"Found {len(jpg_basenames_in_db)} JPG basenames in database")
-
-        # Filter non-JPG files: skip if JPG version exists
-        files_to_process = []
-        skipped_count = 0
-        for file_path in non_jpg_images:
-            basename = get_basename_from_filepath(file_path)
-            if basename in jpg_basenames_in_db:
-                logging.debug(f"Skipping {os.path.basename(file_path)} - JPG version exists in database")
-                skipped_count += 1
+            if new_records:
+                print(f"Added {len(new_records)} JPG records to database")
+                logging.info(f"Added {len(new_records)} JPG records to database")
             else:
-                files_to_process.append(file_path)
+                print("No new JPG records to add")
+                logging.info("No new JPG records")
+
+        # Step 4: Process videos
+        if videos:
+            print("\n=== Phase 2: Processing videos ===")
+            logging.info("Phase 2: Processing videos")
+            started = time.perf_counter()
+            new_records = process_files(videos, "Processing videos", database, limits, exiftool_path,
+                                        existing_filenames, args.workers, original_index, writer.append)
+            timings.append(("Videos", len(videos), len(new_records), time.perf_counter() - started))
 
-        print(f"  Files to process: {len(files_to_process)}")
-        print(f"  Files skipped (JPG exists): {skipped_count}")
-        logging.info(f"Non-JPG: {len(files_to_process)} to process, {skipped_count} skipped (JPG exists)")
+            if new_records:
+                print(f"Added {len(new_records)} video records to database")
+                logging.info(f"Added {len(new_records)} video records to database")
+            else:
+                print("No new video records to add")
+                logging.info("No new video records")
+
+        # Step 5: Process non-JPG images (only if JPG version doesn't exist in DB)
+        if non_jpg_images:
+            print("\n=== Phase 3: Processing non-JPG images ===")
+            logging.info("Phase 3: Processing non-JPG images")
+            started = time.perf_counter()
+
+            # Build a set of basenames from existing JPG files in database
+            jpg_basenames_in_db = set()
+            for record in database:
+                filename = record.get(COLUMN_FILENAME)
+                if filename and filename.lower().endswith(('.jpg', '.jpeg')):
+                    basename = get_basename_from_filepath(filename)
+                    jpg_basenames_in_db.add(basename)
+
+            logging.debug(f"Found {len(jpg_basenames_in_db)} JPG basenames in database")
+
+            # Filter non-JPG files: skip if JPG version exists
+            files_to_process = []
+            skipped_count = 0
+            for file_path in non_jpg_images:
+                basename = get_basename_from_filepath(file_path)
+                if basename in jpg_basenames_in_db:
+                    logging.debug(f"Skipping {os.path.basename(file_path)} - JPG version exists in database")
+                    skipped_count += 1
+                else:
+                    files_to_process.append(file_path)
+
+            print(f"  Files to process: {len(files_to_process)}")
+            print(f"  Files skipped (JPG exists): {skipped_count}")
+            logging.info(f"Non-JPG: {len(files_to_process)} to process, {skipped_count} skipped (JPG exists)")
 
-        if files_to_process:
             new_records = []
+            if files_to_process:
+                new_records = process_files(files_to_process, "Processing non-JPG images", database, limits,
+                                            exiftool_path, existing_filenames, args.workers, original_index,
+                                            writer.append)
+
+                if new_records:
+                    print(f"Added {len(new_records)} non-JPG records to database")
+                    logging.info(f"Added {len(new_records)} non-JPG records to database")
+                else:
+                    print("No new non-JPG records to add")
+                    logging.info("No new non-JPG records")
+            else:
+                print("No non-JPG files to process (all have JPG versions)")
+                logging.info("No non-JPG files to process")
+            timings.append(("Non-JPG images", len(non_jpg_images), len(new_records), time.perf_counter() - started))
 
-            with tqdm(files_to_process, desc="Processing non-JPG images", unit="file") as pbar:
-                for file_path in pbar:
-                    pbar.set_postfix_str(f"Current: {os.path.basename(file_path)}")
-                    record = process_media_file(file_path, database, limits, exiftool_path, existing_filenames)
-                    if record:
-                        new_records.append(record)
-                        existing_filenames.add(record.get(COLUMN_FILENAME))
+        # Step 6: Save all new records at once
+        if writer.pending:
+            try:
+                print(f"\nSaving database with {len(database)} total records...")
+                writer.save()
+                print(f"✅ Saved database with {len(database)} total records")
+            except Exception as e:
+                logging.error(f"Failed to save database: {e}")
+                print(f"❌ Failed to save database: {e}")
+                return
+        elif writer.saves == 0:
+            print("\nNo new records, database unchanged")
+            logging.info("No new records, database not saved")
+    finally:
+        shutdown_shared_workers()
+        print_timing_summary(timings, writer)
 
-            if new_records:
-                print(f"Adding {len(new_records)} non-JPG records to database")
-                logging.info(f"Adding {len(new_records)} non-JPG records to database")
-                database = database + new_records
-
-                try:
-                    print("Saving database after non-JPG processing...")
-                    save_csv_with_backup(database, args.media_csv)
-                    print(f"✅ Saved database with {len(database)} total records")
-                    logging.info(f"Saved database with {len(database)} records after non-JPG phase")
-                except Exception as e:
-                    logging.error(f"Failed to save database after non-JPG phase: {e}")
-                    print(f"❌ Failed to save database: {e}")
-                    return
-            else:
-                print("No new non-JPG records to add")
-                logging.info("No new non-JPG records")
-        else:
-            print("No non-JPG files to process (all have JPG versions)")
-            logging.info("No non-JPG files to process")
-    
     print("\n✅ UpdateMediaDatabase completed successfully")
     logging.info("UpdateMediaDatabase completed successfully")
 
@@ -19,6 +19,12 @@ DEFAULT_LOG_DIR = "H:/Logs"
 # ExifTool path (consistent with other scripts)
 EXIFTOOL_PATH = "F:/Dropbox/exiftool-12.30/exiftool.exe"
 
+# Number of persistent ExifTool processes used for metadata extraction
+DEFAULT_EXIFTOOL_WORKERS = 4
+
+# Save the database every N new records during a run (0 = save once at the end)
+DEFAULT_CHECKPOINT_INTERVAL = 0
+
 # Media file extensions (consistent with givephotobankreadymediafiles)
 IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.dng', '.nef', '.raw', '.cr2', '.arw', '.psd']
 VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.wmv', '.mkv']
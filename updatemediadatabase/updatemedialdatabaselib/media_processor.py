@@ -222,13 +222,55 @@ def create_database_record(metadata: Dict[str, Any], validation_results: Dict[st
 
     return record
 
-def find_original_file(edited_filename: str, database: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+class OriginalFileIndex:
+    """
+    Filename -> record map used to find the original of an edited file.
+
+    Build it once per run from the loaded database and add records as they are
+    appended, so each edited file costs a dictionary lookup instead of a scan
+    of the whole database. The first record with a given filename wins, as in
+    the linear search.
+    """
+
+    def __init__(self, database: Optional[List[Dict[str, str]]] = None):
+        """
+        Args:
+            database: Records to index
+        """
+        self._records: Dict[str, Dict[str, str]] = {}
+        if database:
+            self.extend(database)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: Dict[str, str]) -> None:
+        """Index a record appended to the database."""
+        filename = record.get(COLUMN_FILENAME)
+        if filename and filename not in self._records:
+            self._records[filename] = record
+
+    def extend(self, records: List[Dict[str, str]]) -> None:
+        """Index several appended records."""
+        for record in records:
+            self.add(record)
+
+    def get(self, filename: str) -> Optional[Dict[str, str]]:
+        """Return the record for an exact filename, or None."""
+        return self._records.get(filename)
+
+def find_original_file(
+    edited_filename: str,
+    database: List[Dict[str, str]],
+    original_index: Optional[OriginalFileIndex] = None
+) -> Optional[Dict[str, str]]:
     """
     Find the original file record for an edited file.
     
     Args:
         edited_filename: The filename of the edited file
         database: The database of media files
+        original_index: Index of the database; scans the database when not given
         
     Returns:
         The original file record or None if not found
@@ -239,11 +281,15 @@ def find_original_file(edited_filename: str, database: List[Dict[str, str]]) ->
         logging.debug(f"Could not determine original filename for: {edited_filename}")
         return None
     
-    # Search for original file in database
-    for record in database:
-        if record.get(COLUMN_FILENAME) == original_filename:
-            logging.debug(f"Found original file for {edited_filename}: {original_filename}")
-            return record
+    # Look the original up in the index or search the database
+    if original_index is not None:
+        record = original_index.get(original_filename)
+    else:
+        record = next((r for r in database if r.get(COLUMN_FILENAME) == original_filename), None)
+
+    if record is not None:
+        logging.debug(f"Found original file for {edited_filename}: {original_filename}")
+        return record
     
     logging.debug(f"Original file not found in database: {original_filename}")
     return None
@@ -289,7 +335,8 @@ def process_media_file(
     database: List[Dict[str, str]],
     limits: List[Dict[str, str]],
     exiftool_path: str,
-    existing_filenames: set
+    existing_filenames: set,
+    original_index: Optional[OriginalFileIndex] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Process a media file and create a database record.
@@ -300,6 +347,7 @@ def process_media_file(
         limits: List of dictionaries with limits for each photo bank
         exiftool_path: Path to the ExifTool executable
         existing_filenames: Set of existing filenames for efficient lookup
+        original_index: Filename index of the database for finding originals of edited files
 
     Returns:
         A new database record or None if the file should be skipped
@@ -328,7 +376,7 @@ def process_media_file(
         edit_type = get_edit_type(filename)
         if edit_type:
             # Find original file in database
-            original_record = find_original_file(filename, database)
+            original_record = find_original_file(filename, database, original_index)
             if original_record:
                 # Copy relevant metadata from original
                 for field in ["Title", "Description", "Keywords"]:
@@ -9,6 +9,7 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from shared.exiftool_worker import run_exiftool
 from updatemedialdatabaselib.constants import (
     IMAGE_EXTENSIONS,
     VIDEO_EXTENSIONS,
@@ -29,6 +30,10 @@ from updatemedialdatabaselib.constants import (
 def extract_metadata(file_path: str, exiftool_path: str) -> Dict[str, Any]:
     """
     Extract metadata from a media file using ExifTool.
+
+    Runs on the shared persistent ExifTool worker (or worker pool started with
+    ``start_shared_pool``) when available, otherwise spawns ExifTool for the file.
+    Safe to call from several threads at once.
     
     Args:
         file_path: Path to the media file
@@ -59,7 +64,7 @@ def extract_metadata(file_path: str, exiftool_path: str) -> Dict[str, Any]:
         ]
         
         logging.debug(f"Running ExifTool command: {' '.join(command)}")
-        result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', errors='replace', check=True)
+        result = run_exiftool(exiftool_path, command[1:], encoding='utf-8')
 
         # Check if we have valid output
         if not result.stdout:
@@ -25,9 +25,12 @@ class DummyCredentialsManager:
 
 
 class DummyUploader:
-    def __init__(self, _creds):
+    def __init__(self, _creds, **_k):
         self.creds = _creds
 
+    def get_connection_limit(self, _photobank):
+        return 1
+
     def upload_to_photobanks(self, _media_folder, photobanks, _export_dir, _dry_run):
         return {name: {"success": 1, "failure": 0, "skipped": 0, "error": 0} for name in photobanks}
 
@@ -40,6 +43,16 @@ def test_main_dry_run_success(monkeypatch):
         credentials_file="X:/creds.json",
         debug=False,
         dry_run=True,
+        parallel_banks=1,
+        connections=[],
+        ledger="X:/ledger.sqlite",
+        no_ledger=True,
+        force_upload=False,
+        remaining=False,
+        order="smallest-first",
+        bank_rate=[],
+        total_rate=None,
+        rate_window=[],
         all=False,
         shutterstock=True,
         pond5=False,
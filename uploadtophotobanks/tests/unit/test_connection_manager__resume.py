@@ -0,0 +1,257 @@
+"""
+Resume tests for uploadtophotobanksslib/connection_manager.py against in-memory FTP/SFTP stand-ins.
+"""
+
+from __future__ import annotations
+
+import ftplib
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "uploadtophotobanks"
+sys.path.insert(0, str(package_root))
+
+import uploadtophotobanksslib.connection_manager as connection_manager
+
+
+class StandInServer:
+    """Files stored by the stand-in clients; drops the connection after ``drop_after`` bytes."""
+
+    def __init__(self, drop_after=None, supports_rest=True, supports_appe=True):
+        self.files = {}
+        self.drop_after = list(drop_after or [])
+        self.supports_rest = supports_rest
+        self.supports_appe = supports_appe
+        self.bytes_received = 0
+        self.commands = []
+
+    def receive(self, path, data, offset):
+        """Store ``data`` at ``offset``, cut short when a drop is scheduled."""
+        limit = self.drop_after.pop(0) if self.drop_after else None
+        if limit is not None:
+            data = data[:limit]
+        current = self.files.get(path, b"")[:offset]
+        self.files[path] = current + data
+        self.bytes_received += len(data)
+        return limit is None
+
+
+class StandInFTP:
+    """The subset of ftplib.FTP used by FTPConnection."""
+
+    sock = None
+
+    def __init__(self, server):
+        self.server = server
+        self.connected = True
+        self.cwd_path = "/"
+
+    def voidcmd(self, cmd):
+        if not self.connected:
+            raise EOFError("connection closed")
+        return "200 OK"
+
+    def size(self, path):
+        if path not in self.server.files:
+            raise ftplib.error_perm("550 No such file")
+        return len(self.server.files[path])
+
+    def cwd(self, path):
+        self.cwd_path = path
+
+    def storbinary(self, cmd, fp, blocksize=8192, callback=None, rest=None):
+        verb, path = cmd.split(" ", 1)
+        self.server.commands.append((verb, rest))
+        if rest is not None and not self.server.supports_rest:
+            raise ftplib.error_perm("502 REST not implemented")
+        if verb == "APPE" and not self.server.supports_appe:
+            raise ftplib.error_perm("502 APPE not implemented")
+        offset = rest or (len(self.server.files.get(path, b"")) if verb == "APPE" else 0)
+        data = fp.read()
+        complete = self.server.receive(path, data, offset)
+        if callback:
+            # Like ftplib: once per block that went out
+            sent = data[:len(self.server.files[path]) - offset]
+            for start in range(0, len(sent), blocksize):
+                callback(sent[start:start + blocksize])
+        if not complete:
+            self.connected = False
+            raise ConnectionResetError("connection reset during transfer")
+        return "226 Transfer complete"
+
+    def quit(self):
+        self.connected = False
+
+
+def make_ftp_connection(monkeypatch, server):
+    monkeypatch.setitem(connection_manager.PHOTOBANK_CONFIGS, "StandInFTP",
+                        {"protocol": "ftp", "host": "localhost", "port": 21})
+    monkeypatch.setattr(connection_manager.time, "sleep", lambda _s: None)
+    conn = connection_manager.FTPConnection("StandInFTP", {"username": "u", "password": "p"})
+
+    def connect(_file_path=None):
+        conn.ftp = StandInFTP(server)
+        return True
+
+    conn.connect = connect
+    conn.connect()
+    return conn
+
+
+def test_ftp_upload__resumes_with_rest_after_drop(tmp_path, monkeypatch):
+    payload = bytes(range(256)) * 400
+    local = tmp_path / "video.mov"
+    local.write_bytes(payload)
+    server = StandInServer(drop_after=[40000])
+    conn = make_ftp_connection(monkeypatch, server)
+    conn.change_directory("/video")
+
+    assert conn.upload_file(str(local), "video.mov") is True
+
+    assert server.files["video.mov"] == payload
+    assert server.bytes_received == len(payload)
+    assert server.commands == [("STOR", None), ("STOR", 40000)]
+    assert conn.resume_mode == "rest"
+    assert conn.ftp.cwd_path == "/video"
+
+
+def test_ftp_upload__reports_progress_per_block(tmp_path, monkeypatch):
+    payload = bytes(range(256)) * 400
+    local = tmp_path / "photo.jpg"
+    local.write_bytes(payload)
+    server = StandInServer(drop_after=[40000])
+    conn = make_ftp_connection(monkeypatch, server)
+    reported = []
+
+    assert conn.upload_file(str(local), "photo.jpg", progress=reported.append) is True
+
+    assert sum(reported) == len(payload)
+    assert max(reported) <= 8192
+
+
+def test_ftp_upload__falls_back_to_appe(tmp_path, monkeypatch):
+    payload = b"x" * 10000
+    local = tmp_path / "photo.tif"
+    local.write_bytes(payload)
+    server = StandInServer(drop_after=[3000], supports_rest=False)
+    conn = make_ftp_connection(monkeypatch, server)
+
+    assert conn.upload_file(str(local), "photo.tif") is True
+
+    assert server.files["photo.tif"] == payload
+    assert server.commands == [("STOR", None), ("STOR", 3000), ("APPE", None)]
+    assert conn.resume_mode == "appe"
+
+
+def test_ftp_upload__restarts_when_server_cannot_resume(tmp_path, monkeypatch):
+    payload = b"y" * 5000
+    local = tmp_path / "photo.jpg"
+    local.write_bytes(payload)
+    server = StandInServer(drop_after=[1000], supports_rest=False, supports_appe=False)
+    conn = make_ftp_connection(monkeypatch, server)
+
+    assert conn.upload_file(str(local), "photo.jpg") is True
+
+    assert server.files["photo.jpg"] == payload
+    assert server.commands[-1] == ("STOR", None)
+    assert conn.resume_mode == "none"
+
+
+def test_ftp_upload__complete_file_is_not_resent(tmp_path, monkeypatch):
+    payload = b"z" * 2000
+    local = tmp_path / "photo.jpg"
+    local.write_bytes(payload)
+    # Everything arrives, but the connection drops before the final reply
+    server = StandInServer(drop_after=[2000])
+    conn = make_ftp_connection(monkeypatch, server)
+
+    assert conn.upload_file(str(local), "photo.jpg") is True
+    assert server.bytes_received == 2000
+    assert len(server.commands) == 1
+
+
+class StandInRemoteFile(io.BytesIO):
+    def __init__(self, server, path, initial):
+        super().__init__(initial)
+        self.server = server
+        self.path = path
+
+    def set_pipelined(self, _pipelined=True):
+        pass
+
+    def close(self):
+        self.server.files[self.path] = self.getvalue()
+        super().close()
+
+
+class StandInSFTP:
+    """The subset of paramiko.SFTPClient used by SFTPConnection."""
+
+    def __init__(self, server):
+        self.server = server
+        self.connected = True
+
+    def listdir(self, _path):
+        if not self.connected:
+            raise EOFError("connection closed")
+        return []
+
+    def stat(self, path):
+        if path not in self.server.files:
+            raise FileNotFoundError(path)
+        return SimpleNamespace(st_size=len(self.server.files[path]))
+
+    def put(self, local_path, remote_path, callback=None):
+        with open(local_path, "rb") as f:
+            data = f.read()
+            if not self.server.receive(remote_path, data, 0):
+                self.connected = False
+                raise EOFError("server closed the connection")
+        if callback:
+            callback(len(data), len(data))
+
+    def open(self, path, mode):
+        assert mode == "r+b"
+        return StandInRemoteFile(self.server, path, self.server.files[path])
+
+    def close(self):
+        self.connected = False
+
+
+def test_sftp_upload__resumes_from_remote_size(tmp_path, monkeypatch):
+    payload = bytes(range(256)) * 300
+    local = tmp_path / "clip.mp4"
+    local.write_bytes(payload)
+    server = StandInServer(drop_after=[50000])
+    monkeypatch.setitem(connection_manager.PHOTOBANK_CONFIGS, "StandInSFTP",
+                        {"protocol": "sftp", "host": "localhost", "port": 22})
+    monkeypatch.setattr(connection_manager.time, "sleep", lambda _s: None)
+    monkeypatch.setattr(connection_manager, "SFTP_CHUNK_SIZE", 4096)
+    conn = connection_manager.SFTPConnection("StandInSFTP", {"username": "u", "password": "p"})
+
+    def connect():
+        conn.ssh_client = object()
+        conn.sftp_client = StandInSFTP(server)
+        return True
+
+    conn.connect = connect
+    conn.connect()
+
+    assert conn.upload_file(str(local), "clip.mp4") is True
+    assert server.files["clip.mp4"] == payload
+    assert server.bytes_received == 50000
+
+
+@pytest.mark.parametrize("remote, expected", [(None, 0), (0, 0), (400, 400), (2000, 0)])
+def test_resume_offset__only_trusts_partial_files(monkeypatch, remote, expected):
+    monkeypatch.setitem(connection_manager.PHOTOBANK_CONFIGS, "StandInFTP",
+                        {"protocol": "ftp", "host": "localhost", "port": 21})
+    conn = connection_manager.FTPConnection("StandInFTP", {"username": "u", "password": "p"})
+    conn.remote_size = lambda _p: remote
+
+    assert conn.resume_offset("file.jpg", 1000) == expected
@@ -49,3 +49,74 @@ def test_disconnect_all__clears():
     manager.connections["Bank"] = DummyConn()
     manager.disconnect_all()
     assert manager.connections == {}
+
+
+def test_connection_pool__opens_lazily_up_to_size():
+    created = []
+
+    class DummyConn:
+        def disconnect(self):
+            created.remove(self)
+
+    def factory():
+        conn = DummyConn()
+        created.append(conn)
+        return conn
+
+    pool = connection_manager.ConnectionPool("Bank", factory, size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    second = pool.acquire()
+
+    assert second is not first
+    assert pool.open_connections == 2
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+    assert created == []
+
+
+def test_connection_pool__all_concurrent_opens_fail():
+    import threading
+    import time
+
+    both_opening = threading.Barrier(2)
+    first_failed = threading.Event()
+    calls = []
+
+    def factory():
+        calls.append(None)
+        index = len(calls)
+        both_opening.wait(timeout=5)
+        if index == 1:
+            first_failed.set()
+        else:
+            # Fail while the other thread already waits for a connection
+            first_failed.wait(timeout=5)
+            time.sleep(0.05)
+        return None
+
+    pool = connection_manager.ConnectionPool("Bank", factory, size=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.acquire()), daemon=True) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert results == [None, None]
+    assert pool.open_connections == 0
+
+
+def test_get_connection_pool__uses_configured_limit_and_is_cached(monkeypatch):
+    monkeypatch.setattr(connection_manager, "get_max_connections", lambda _bank: 3)
+    manager = connection_manager.ConnectionManager()
+
+    pool = manager.get_connection_pool("Bank", {"username": "u", "password": "p"})
+
+    assert pool.size == 3
+    assert manager.get_connection_pool("Bank", {}) is pool
+    manager.disconnect_all()
+    assert manager.pools == {}
@@ -0,0 +1,73 @@
+"""
+Unit tests for uploadtophotobanksslib/upload_ledger.py.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "uploadtophotobanks"
+sys.path.insert(0, str(package_root))
+
+import uploadtophotobanksslib.upload_ledger as upload_ledger
+
+
+def test_upload_ledger__records_and_persists(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"photo")
+    db_path = tmp_path / "ledger.sqlite"
+
+    with upload_ledger.UploadLedger(str(db_path)) as ledger:
+        assert ledger.is_uploaded("Pond5", str(photo)) is False
+        ledger.record("Pond5", str(photo), "a.jpg")
+
+    with upload_ledger.UploadLedger(str(db_path)) as ledger:
+        assert ledger.is_uploaded("Pond5", str(photo)) is True
+        assert ledger.is_uploaded("Alamy", str(photo)) is False
+        assert ledger.uploaded_count() == 1
+        entry = ledger.entries("Pond5")[0]
+        assert entry["remote_name"] == "a.jpg"
+        assert entry["size"] == 5
+
+
+def test_upload_ledger__matches_renamed_copy_by_content(tmp_path):
+    original = tmp_path / "a.jpg"
+    original.write_bytes(b"same content")
+    copy = tmp_path / "b.jpg"
+    copy.write_bytes(b"same content")
+    other = tmp_path / "c.jpg"
+    other.write_bytes(b"other content")
+
+    with upload_ledger.UploadLedger(str(tmp_path / "ledger.sqlite")) as ledger:
+        ledger.record("Pond5", str(original), "a.jpg")
+
+        assert ledger.remaining("Pond5", [str(copy), str(other)]) == [str(other)]
+
+
+def test_upload_ledger__unchanged_file_is_not_hashed_again(tmp_path, monkeypatch):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"photo")
+    db_path = str(tmp_path / "ledger.sqlite")
+    with upload_ledger.UploadLedger(db_path) as ledger:
+        ledger.record("Pond5", str(photo), "a.jpg")
+
+    def fail_hash(_path):
+        raise AssertionError("hashed an unchanged file")
+
+    monkeypatch.setattr(upload_ledger, "compute_file_hash", fail_hash)
+    with upload_ledger.UploadLedger(db_path) as ledger:
+        assert ledger.is_uploaded("Pond5", str(photo)) is True
+
+
+def test_upload_ledger__modified_file_is_remaining(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"photo")
+    with upload_ledger.UploadLedger(str(tmp_path / "ledger.sqlite")) as ledger:
+        ledger.record("Pond5", str(photo), "a.jpg")
+        photo.write_bytes(b"retouched photo")
+        os.utime(photo, ns=(1, 1))
+
+        assert ledger.is_uploaded("Pond5", str(photo)) is False
@@ -0,0 +1,107 @@
+"""
+Unit tests for uploadtophotobanksslib/upload_scheduler.py.
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[3]
+package_root = project_root / "uploadtophotobanks"
+sys.path.insert(0, str(package_root))
+
+import uploadtophotobanksslib.upload_scheduler as upload_scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize("value, expected", [("500K", 512000), ("2M", 2 * 1024 ** 2), ("1.5MB/s", 1.5 * 1024 ** 2), ("100", 100)])
+def test_parse_rate(value, expected):
+    assert upload_scheduler.parse_rate(value) == expected
+
+
+def test_parse_rate__invalid():
+    with pytest.raises(ValueError):
+        upload_scheduler.parse_rate("fast")
+
+
+def test_parse_rate_window__crossing_midnight():
+    window = upload_scheduler.parse_rate_window("22:00-06:30=1M")
+
+    assert window.contains(datetime(2024, 1, 1, 23, 0))
+    assert window.contains(datetime(2024, 1, 1, 6, 0))
+    assert not window.contains(datetime(2024, 1, 1, 12, 0))
+
+
+def test_rate_limiter__throttles_to_rate():
+    clock = FakeClock()
+    limiter = upload_scheduler.RateLimiter(1000, clock=clock, sleep=clock.sleep)
+
+    for _ in range(10):
+        limiter.consume(500)
+
+    assert clock.now == pytest.approx(5.0)
+
+
+def test_rate_limiter__window_applies_only_in_its_time():
+    clock = FakeClock()
+    moment = {"value": datetime(2024, 1, 1, 10, 0)}
+    window = upload_scheduler.parse_rate_window("08:00-18:00=100")
+    limiter = upload_scheduler.RateLimiter(0, [window], clock=clock, sleep=clock.sleep, now=lambda: moment["value"])
+
+    limiter.consume(200)
+    assert clock.now == pytest.approx(2.0)
+
+    moment["value"] = datetime(2024, 1, 1, 20, 0)
+    limiter.consume(10_000)
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_scheduler__orders_jobs_and_banks(tmp_path):
+    files = {}
+    for name, size in (("video.mov", 3000), ("a.jpg", 10), ("b.jpg", 200)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        files[name] = str(path)
+
+    class Validator:
+        def validate_file_for_photobank(self, path, _bank):
+            return not path.endswith("b.jpg")
+
+    scheduler = upload_scheduler.UploadScheduler("smallest-first")
+    jobs, rejected = scheduler.plan("Bank", list(files.values()), Validator())
+
+    assert [job.filename for job in jobs] == ["a.jpg", "video.mov"]
+    assert rejected == [files["b.jpg"]]
+    assert scheduler.order_banks({"Big": 10_000, "Small": 5}) == ["Small", "Big"]
+    assert [job.filename for job in upload_scheduler.UploadScheduler("fifo").order(jobs)] == ["a.jpg", "video.mov"]
+
+    with pytest.raises(ValueError):
+        upload_scheduler.UploadScheduler("random")
+
+
+def test_throughput_meter__rate_and_eta():
+    clock = FakeClock()
+    meter = upload_scheduler.ThroughputMeter("Bank", 4 * 1024 ** 2, clock=clock, report_interval=1000)
+
+    clock.now = 2.0
+    meter.add(1024 ** 2)
+
+    assert meter.rate == pytest.approx(512 * 1024)
+    assert meter.eta_seconds == pytest.approx(6.0)
+    assert meter.status() == "Bank: 1.0 / 4.0 MB, 512.0 KB/s, ETA 00:00:06"
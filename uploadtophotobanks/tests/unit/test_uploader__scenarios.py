@@ -61,3 +61,138 @@ def test_validate_credentials(monkeypatch):
     up.connection_manager.get_connection = lambda *_a, **_k: DummyConnection()
     up.connection_manager.disconnect = lambda *_a, **_k: None
     assert up.validate_credentials("Bank") is True
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def upload_file(self, local_path, remote_path, progress=None):
+        self.log.append((id(self), remote_path))
+        return not remote_path.startswith("bad")
+
+    def disconnect(self):
+        pass
+
+
+def _prepare_bank(tmp_path, monkeypatch, names, max_connections=3):
+    media = tmp_path / "media"
+    media.mkdir()
+    for name in names:
+        (media / name).write_text(name, encoding="utf-8")
+    export = tmp_path / "export"
+    export.mkdir()
+    (export / "BankOutput.csv").write_text("Filename\n", encoding="utf-8")
+    monkeypatch.setattr(uploader, "PHOTOBANK_CONFIGS", {
+        "Bank": {"protocol": "ftp", "supported_formats": [".jpg"], "max_connections": max_connections},
+    })
+    monkeypatch.setattr(uploader, "load_csv", lambda _p: [])
+    return str(media), str(export)
+
+
+def test_upload_to_photobanks__uses_connection_pool(tmp_path, monkeypatch):
+    names = [f"{i}.jpg" for i in range(6)] + ["bad.jpg"]
+    media, export = _prepare_bank(tmp_path, monkeypatch, names)
+    up = uploader.PhotobankUploader({"Bank": {"username": "u", "password": "p"}},
+                                    connection_limits={"Bank": 2})
+    up.file_validator.validate_file_for_photobank = lambda *_a: True
+    log, opened = [], []
+
+    def create_connection(_bank, _creds):
+        opened.append(1)
+        return FakeConnection(log)
+
+    up.connection_manager.create_connection = create_connection
+
+    results = up.upload_to_photobanks(media, ["Bank"], export)
+
+    assert results == {"Bank": {"success": 6, "failure": 1, "skipped": 0}}
+    assert sorted(name for _conn, name in log) == sorted(names)
+    assert 1 <= len(opened) <= 2
+    assert up.connection_manager.pools == {}
+
+
+def test_upload_to_photobanks__refused_extra_connection_keeps_uploading(tmp_path, monkeypatch):
+    names = [f"{i}.jpg" for i in range(5)]
+    media, export = _prepare_bank(tmp_path, monkeypatch, names)
+    up = uploader.PhotobankUploader({"Bank": {"username": "u", "password": "p"}})
+    up.file_validator.validate_file_for_photobank = lambda *_a: True
+    log, attempts = [], []
+
+    def create_connection(_bank, _creds):
+        attempts.append(1)
+        return FakeConnection(log) if len(attempts) == 1 else None
+
+    up.connection_manager.create_connection = create_connection
+
+    results = up.upload_to_photobanks(media, ["Bank"], export)
+
+    assert results["Bank"]["success"] == 5
+    assert len({conn for conn, _name in log}) == 1
+
+
+def test_upload_to_photobanks__no_connection_is_error(tmp_path, monkeypatch):
+    media, export = _prepare_bank(tmp_path, monkeypatch, ["a.jpg", "b.jpg"])
+    up = uploader.PhotobankUploader({"Bank": {"username": "u", "password": "p"}})
+    up.file_validator.validate_file_for_photobank = lambda *_a: True
+    up.connection_manager.create_connection = lambda *_a: None
+
+    assert up.upload_to_photobanks(media, ["Bank"], export) == {"Bank": {"error": 2}}
+
+
+def test_get_connection_limit__override_and_config(monkeypatch):
+    monkeypatch.setattr(uploader, "get_max_connections", lambda bank: 1 if bank == "123RF" else 2)
+    up = uploader.PhotobankUploader(credentials={}, connection_limits={"Pond5": 4})
+
+    assert up.get_connection_limit("Pond5") == 4
+    assert up.get_connection_limit("123RF") == 1
+    assert up.get_connection_limit("Alamy") == 2
+
+
+def test_upload_to_photobanks__ledger_skips_uploaded_files(tmp_path, monkeypatch):
+    from uploadtophotobanksslib.upload_ledger import UploadLedger
+
+    media, export = _prepare_bank(tmp_path, monkeypatch, ["a.jpg", "b.jpg", "c.jpg"])
+    ledger = UploadLedger(str(tmp_path / "ledger.sqlite"))
+    ledger.record("Bank", os.path.join(media, "a.jpg"), "a.jpg")
+    up = uploader.PhotobankUploader({"Bank": {"username": "u", "password": "p"}}, ledger=ledger)
+    up.file_validator.validate_file_for_photobank = lambda *_a: True
+    log = []
+    up.connection_manager.create_connection = lambda *_a: FakeConnection(log)
+
+    assert up.report_remaining(media, ["Bank"]) == {"Bank": {"total": 3, "uploaded": 1, "remaining": 2}}
+    results = up.upload_to_photobanks(media, ["Bank"], export)
+
+    assert results == {"Bank": {"success": 2, "failure": 0, "skipped": 1}}
+    assert sorted(name for _conn, name in log) == ["b.jpg", "c.jpg"]
+    assert ledger.uploaded_count("Bank") == 3
+
+    # Second run: nothing left, no connection opened
+    up.connection_manager.create_connection = lambda *_a: (_ for _ in ()).throw(AssertionError("connected"))
+    assert up.upload_to_photobanks(media, ["Bank"], export) == {"Bank": {"success": 0, "failure": 0, "skipped": 3}}
+    ledger.close()
+
+
+def test_upload_to_photobanks__smallest_first_and_byte_progress(tmp_path, monkeypatch):
+    media, export = _prepare_bank(tmp_path, monkeypatch, [])
+    for name, size in (("big.jpg", 5000), ("small.jpg", 10), ("mid.jpg", 500)):
+        (Path(media) / name).write_bytes(b"x" * size)
+    (Path(media) / "invalid.jpg").write_bytes(b"bad")
+    up = uploader.PhotobankUploader({"Bank": {"username": "u", "password": "p"}},
+                                    connection_limits={"Bank": 1},
+                                    scheduler=uploader.UploadScheduler("smallest-first"))
+    up.file_validator.validate_file_for_photobank = lambda path, _bank: not path.endswith("invalid.jpg")
+    sent = []
+
+    class ReportingConnection(FakeConnection):
+        def upload_file(self, local_path, remote_path, progress=None):
+            progress(os.path.getsize(local_path))
+            return super().upload_file(local_path, remote_path)
+
+    up.connection_manager.create_connection = lambda *_a: ReportingConnection(sent)
+
+    results = up.upload_to_photobanks(media, ["Bank"], export)
+
+    assert results == {"Bank": {"success": 3, "failure": 1, "skipped": 0}}
+    assert [name for _conn, name in sent] == ["small.jpg", "mid.jpg", "big.jpg"]
+    assert up.scheduler.meters["Bank"].sent_bytes == 5510
@@ -33,3 +33,15 @@ def test_validate_input_files(monkeypatch):
     args = SimpleNamespace(media_folder="C:/media", export_dir="C:/export")
     monkeypatch.setattr(main_module.os.path, "exists", lambda _p: False)
     assert main_module.validate_input_files(args) is False
+
+
+def test_parse_connection_limits():
+    assert main_module.parse_connection_limits(["ShutterStock=4", " 123RF = 1"]) == {"ShutterStock": 4, "123RF": 1}
+    assert main_module.parse_connection_limits([]) == {}
+
+    for bad in (["Pond5"], ["Pond5=0"], ["Pond5=x"]):
+        try:
+            main_module.parse_connection_limits(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} should be rejected")
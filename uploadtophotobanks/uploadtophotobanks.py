@@ -27,9 +27,15 @@ from uploadtophotobanksslib.constants import (
     DEFAULT_EXPORT_DIR,
     DEFAULT_LOG_DIR,
     DEFAULT_CREDENTIALS_FILE,
+    DEFAULT_PARALLEL_BANKS,
+    DEFAULT_UPLOAD_LEDGER_FILE,
+    DEFAULT_UPLOAD_ORDER,
+    UPLOAD_ORDER_POLICIES,
     PHOTOBANK_CONFIGS
 )
 from uploadtophotobanksslib.uploader import PhotobankUploader
+from uploadtophotobanksslib.upload_ledger import UploadLedger
+from uploadtophotobanksslib.upload_scheduler import UploadScheduler, parse_rate, parse_rate_window
 from uploadtophotobanksslib.credentials_manager import CredentialsManager
 
 
@@ -43,6 +49,9 @@ Examples:
   %(prog)s --shutterstock --pond5 --dry-run
   %(prog)s --all --credentials-file config/my_creds.json
   %(prog)s --alamy --photo-csv "L:\\PhotoMedia.csv"
+  %(prog)s --all --parallel-banks 3 --connections ShutterStock=4 --connections 123RF=1
+  %(prog)s --all --remaining
+  %(prog)s --all --bank-rate Pond5=1M --rate-window 08:00-18:00=2M
   %(prog)s --setup-credentials
 
 Supported photobanks:
@@ -73,6 +82,31 @@ Security notes:
     parser.add_argument("--dry-run", action="store_true",
                         help="Validate files and test connections without uploading")
 
+    # Concurrency
+    parser.add_argument("--parallel-banks", type=int, default=DEFAULT_PARALLEL_BANKS,
+                        help="Number of photobanks to upload to at the same time")
+    parser.add_argument("--connections", action="append", default=[], metavar="BANK=N",
+                        help="Simultaneous connections for a photobank (repeatable; "
+                             "default: the bank's configured limit)")
+
+    # Scheduling and bandwidth
+    parser.add_argument("--order", choices=UPLOAD_ORDER_POLICIES, default=DEFAULT_UPLOAD_ORDER,
+                        help="Order in which files are uploaded to each photobank")
+    parser.add_argument("--bank-rate", action="append", default=[], metavar="BANK=RATE",
+                        help="Bandwidth cap for a photobank, e.g. Pond5=1M (repeatable)")
+    parser.add_argument("--total-rate", type=str, default=None, metavar="RATE",
+                        help="Bandwidth cap for all photobanks together, e.g. 5M")
+    parser.add_argument("--rate-window", action="append", default=[], metavar="HH:MM-HH:MM=RATE",
+                        help="Total bandwidth cap for a time of day, e.g. 08:00-18:00=2M (repeatable)")
+
+    # Upload ledger
+    parser.add_argument("--ledger", type=str, default=DEFAULT_UPLOAD_LEDGER_FILE,
+                        help="SQLite ledger of successful uploads")
+    parser.add_argument("--no-ledger", action="store_true",
+                        help="Do not read or write the upload ledger")
+    parser.add_argument("--force-upload", action="store_true",
+                        help="Upload files even if the ledger lists them as uploaded")
+
     # Photobank selection
     photobank_group = parser.add_argument_group("Photobank Selection")
     photobank_group.add_argument("--all", action="store_true",
@@ -104,6 +138,8 @@ Security notes:
                                help="List files ready for upload (no actual upload)")
     utility_group.add_argument("--create-credentials-template", action="store_true",
                                help="Create credentials template file")
+    utility_group.add_argument("--remaining", action="store_true",
+                               help="Show files not yet uploaded per photobank (ledger only, no network)")
 
     return parser.parse_args()
 
@@ -154,20 +190,35 @@ def main():
 
         # Initialize uploader
         all_credentials = credentials_manager.get_all_credentials()
-        uploader = PhotobankUploader(all_credentials)
+        ledger = None if args.no_ledger else UploadLedger(args.ledger)
+        uploader = PhotobankUploader(
+            all_credentials,
+            connection_limits=parse_connection_limits(args.connections),
+            max_parallel_banks=args.parallel_banks,
+            ledger=ledger,
+            skip_uploaded=not args.force_upload,
+            scheduler=build_scheduler(args)
+        )
 
-        # Display upload plan
-        display_upload_plan(args, selected_photobanks, uploader)
+        try:
+            if args.remaining:
+                return handle_remaining(args, selected_photobanks, uploader)
 
-        # Proceed directly with upload (no confirmation needed)
+            # Display upload plan
+            display_upload_plan(args, selected_photobanks, uploader)
 
-        # Perform upload
-        results = uploader.upload_to_photobanks(
-            args.media_folder,
-            selected_photobanks,
-            args.export_dir,
-            args.dry_run
-        )
+            # Proceed directly with upload (no confirmation needed)
+
+            # Perform upload
+            results = uploader.upload_to_photobanks(
+                args.media_folder,
+                selected_photobanks,
+                args.export_dir,
+                args.dry_run
+            )
+        finally:
+            if ledger:
+                ledger.close()
 
         # Display results
         display_results(results, args.dry_run)
@@ -298,6 +349,25 @@ def handle_list_uploadable(args, credentials_manager):
     return 0
 
 
+def handle_remaining(args, photobanks, uploader):
+    """Show per photobank how many files are still to be uploaded, based on the ledger."""
+    if uploader.ledger is None:
+        print("Upload ledger is disabled - every file counts as remaining")
+
+    report = uploader.report_remaining(args.media_folder, photobanks)
+
+    print("\nRemaining uploads:")
+    print("=" * 50)
+    total_remaining = 0
+    for photobank, counts in report.items():
+        print(f"{photobank:15}: {counts['remaining']:4d} remaining, "
+              f"{counts['uploaded']:4d} uploaded, {counts['total']:4d} total")
+        total_remaining += counts["remaining"]
+    print("-" * 50)
+    print(f"{'Total':15}: {total_remaining:4d} remaining")
+    return 0
+
+
 def get_selected_photobanks(args, credentials_manager):
     """Determine which photobanks to upload to."""
     available_photobanks = credentials_manager.list_photobanks()
@@ -326,6 +396,34 @@ def get_selected_photobanks(args, credentials_manager):
     return selected
 
 
+def parse_connection_limits(values):
+    """Parse repeated BANK=N arguments into a dict of connection limits."""
+    limits = {}
+    for value in values or []:
+        bank, separator, count = value.partition("=")
+        if not separator or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid connection limit '{value}', expected BANK=N with N >= 1")
+        limits[bank.strip()] = int(count)
+    return limits
+
+
+def build_scheduler(args):
+    """Create the upload scheduler from the ordering and bandwidth arguments."""
+    bank_rates = {}
+    for value in args.bank_rate or []:
+        bank, separator, rate = value.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid bandwidth cap '{value}', expected BANK=RATE")
+        bank_rates[bank.strip()] = parse_rate(rate)
+
+    return UploadScheduler(
+        policy=args.order,
+        bank_rates=bank_rates,
+        total_rate=parse_rate(args.total_rate) if args.total_rate else 0,
+        rate_windows=[parse_rate_window(value) for value in args.rate_window or []]
+    )
+
+
 def validate_input_files(args):
     """Validate that required input files exist."""
     if not os.path.exists(args.media_folder):
@@ -359,7 +457,8 @@ def display_upload_plan(args, photobanks, uploader):
             compatible_files = uploader._filter_files_for_photobank(media_files, photobank)
             count = len(compatible_files)
             protocol = PHOTOBANK_CONFIGS[photobank]["protocol"].upper()
-            print(f"{photobank:15} ({protocol:4}): {count:4d} files")
+            connections = uploader.get_connection_limit(photobank)
+            print(f"{photobank:15} ({protocol:4}): {count:4d} files, {connections} connection(s)")
     except Exception as e:
         logging.error(f"Failed to scan media files: {e}")
         total_files = 0
@@ -4,9 +4,12 @@ Connection manager for various photobank FTP/SFTP servers.
 """
 import ftplib
 import logging
+import os
 import ssl
+import threading
 import time
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Dict, Any
 import paramiko
 from paramiko import SSHClient, AutoAddPolicy
 
@@ -14,7 +17,11 @@ from uploadtophotobanksslib.constants import (
     PHOTOBANK_CONFIGS,
     DEFAULT_TIMEOUT,
     DEFAULT_RETRY_COUNT,
-    DEFAULT_RETRY_DELAY
+    DEFAULT_RETRY_DELAY,
+    SFTP_CHUNK_SIZE,
+    UPLOAD_MAX_RETRIES,
+    UPLOAD_RETRY_DELAY,
+    get_max_connections
 )
 
 
@@ -38,14 +45,40 @@ class PhotobankConnection:
         """Disconnect from the photobank server."""
         raise NotImplementedError
 
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Upload a file to the server."""
+    def upload_file(self, local_path: str, remote_path: str,
+                    progress: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Upload a file to the server.
+
+        ``progress`` is called with the number of bytes of every block sent;
+        it may block to throttle the transfer.
+        """
         raise NotImplementedError
 
     def is_connected(self) -> bool:
         """Check if connection is active."""
         raise NotImplementedError
 
+    def remote_size(self, remote_path: str) -> Optional[int]:
+        """Size of a remote file in bytes, or None if it does not exist or cannot be queried."""
+        raise NotImplementedError
+
+    def resume_offset(self, remote_path: str, file_size: int) -> int:
+        """
+        Byte offset an interrupted upload can continue from.
+
+        This is the size of the partial file the server confirms; 0 (start over)
+        when the file is missing, cannot be checked, or is larger than the local file.
+        """
+        try:
+            size = self.remote_size(remote_path)
+        except Exception as e:
+            logging.debug(f"Could not get remote size of {remote_path}: {e}")
+            return 0
+        if not size or size > file_size:
+            return 0
+        return size
+
 
 class FTPConnection(PhotobankConnection):
     """FTP connection handler for photobanks."""
@@ -53,6 +86,9 @@ class FTPConnection(PhotobankConnection):
     def __init__(self, photobank: str, credentials: Dict[str, str]):
         super().__init__(photobank, credentials)
         self.ftp = None
+        self.current_directory: Optional[str] = None
+        # Resume method that worked on this server: "rest", "appe" or "none"
+        self.resume_mode: Optional[str] = None
 
     def connect(self, file_path: Optional[str] = None) -> bool:
         """Connect to FTP server."""
@@ -148,13 +184,19 @@ class FTPConnection(PhotobankConnection):
             finally:
                 self.ftp = None
 
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Upload a file via FTP with robustness for slow servers."""
+    def upload_file(self, local_path: str, remote_path: str,
+                    progress: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Upload a file via FTP with robustness for slow servers.
+
+        A failed attempt is resumed from the size of the partial remote file
+        (REST + STOR, or APPE when the server does not accept REST) instead of
+        sending the whole file again.
+        """
         if not self.is_connected():
             logging.error("Not connected to FTP server")
             return False
 
-        import os
         file_size = os.path.getsize(local_path)
         logging.info(f"Uploading {local_path} to {remote_path} ({file_size:,} bytes)")
 
@@ -163,34 +205,39 @@ class FTPConnection(PhotobankConnection):
         def progress_callback(block):
             nonlocal bytes_transferred
             bytes_transferred += len(block)
+            if progress:
+                progress(len(block))
             if bytes_transferred % (1024 * 1024) == 0:  # Log every 1MB
-                progress = (bytes_transferred / file_size) * 100 if file_size > 0 else 0
-                logging.debug(f"Upload progress: {progress:.1f}% ({bytes_transferred:,} / {file_size:,} bytes)")
+                percent = (bytes_transferred / file_size) * 100 if file_size > 0 else 0
+                logging.debug(f"Upload progress: {percent:.1f}% ({bytes_transferred:,} / {file_size:,} bytes)")
 
-        max_retries = 3
-        retry_delay = 10
+        max_retries = UPLOAD_MAX_RETRIES
+        retry_delay = UPLOAD_RETRY_DELAY
 
         for attempt in range(max_retries):
             try:
                 # Verify connection before upload
                 if not self.is_connected():
                     logging.warning(f"Connection lost, attempting to reconnect (attempt {attempt + 1})")
-                    if not self.connect():
+                    if not self.connect(local_path):
                         continue
+                    self._restore_directory()
 
                 # Set longer timeout for data operations
                 if hasattr(self.ftp, 'sock') and self.ftp.sock:
                     self.ftp.sock.settimeout(1200)  # 20 minutes for very slow uploads
 
+                offset = self.resume_offset(remote_path, file_size) if attempt > 0 else 0
+                if offset == file_size:
+                    logging.info(f"Server already has all {file_size:,} bytes of {remote_path}")
+                    return True
+
                 logging.info(f"Starting upload attempt {attempt + 1}/{max_retries}")
-                bytes_transferred = 0
+                bytes_transferred = offset
 
-                with open(local_path, 'rb') as f:
-                    # Use callback for progress tracking on slow uploads
-                    if file_size > 10 * 1024 * 1024:  # Files > 10MB get progress tracking
-                        self.ftp.storbinary(f'STOR {remote_path}', f, callback=progress_callback)
-                    else:
-                        self.ftp.storbinary(f'STOR {remote_path}', f)
+                # Use callback for progress tracking on slow uploads
+                callback = progress_callback if progress or file_size > 10 * 1024 * 1024 else None  # Files > 10MB
+                self._store(local_path, remote_path, offset, callback)
 
                 logging.info(f"Successfully uploaded {local_path}")
                 return True
@@ -200,7 +247,6 @@ class FTPConnection(PhotobankConnection):
 
                 if attempt < max_retries - 1:
                     logging.info(f"Retrying upload in {retry_delay} seconds...")
-                    import time
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                 else:
@@ -209,6 +255,46 @@ class FTPConnection(PhotobankConnection):
 
         return False
 
+    def _store(self, local_path: str, remote_path: str, offset: int, callback=None) -> None:
+        """Send ``local_path`` from ``offset`` on, trying REST + STOR, then APPE, then a full STOR."""
+        with open(local_path, 'rb') as f:
+            if offset:
+                logging.info(f"Resuming {remote_path} at byte {offset:,}")
+                for mode in ("rest", "appe"):
+                    if self.resume_mode not in (None, mode):
+                        continue
+                    f.seek(offset)
+                    try:
+                        if mode == "rest":
+                            self.ftp.storbinary(f'STOR {remote_path}', f, callback=callback, rest=offset)
+                        else:
+                            self.ftp.storbinary(f'APPE {remote_path}', f, callback=callback)
+                        self.resume_mode = mode
+                        return
+                    except (ftplib.error_perm, ftplib.error_reply) as e:
+                        if f.tell() != offset:
+                            raise  # Data was already sent, so the command itself worked
+                        logging.info(f"{self.photobank} rejected {mode.upper()} resume: {e}")
+                if self.resume_mode is None:
+                    self.resume_mode = "none"
+                logging.info(f"Restarting {remote_path} from the beginning")
+
+            f.seek(0)
+            self.ftp.storbinary(f'STOR {remote_path}', f, callback=callback)
+
+    def remote_size(self, remote_path: str) -> Optional[int]:
+        """Size of a remote file via SIZE (binary mode), None if unknown."""
+        self.ftp.voidcmd('TYPE I')
+        try:
+            return self.ftp.size(remote_path)
+        except ftplib.error_perm:
+            return None
+
+    def _restore_directory(self) -> None:
+        """Return to the last working directory after a reconnect."""
+        if self.current_directory and self.current_directory != "/":
+            self.ftp.cwd(self.current_directory)
+
     def change_directory(self, directory: str) -> bool:
         """Change to specified directory."""
         if not self.is_connected():
@@ -216,6 +302,7 @@ class FTPConnection(PhotobankConnection):
 
         try:
             self.ftp.cwd(directory)
+            self.current_directory = directory
             logging.debug(f"Changed to directory: {directory}")
             return True
         except Exception as e:
@@ -289,23 +376,85 @@ class SFTPConnection(PhotobankConnection):
 
         logging.debug(f"Disconnected from {self.photobank}")
 
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Upload a file via SFTP."""
+    def upload_file(self, local_path: str, remote_path: str,
+                    progress: Optional[Callable[[int], None]] = None) -> bool:
+        """Upload a file via SFTP, resuming from the remote file size after a failed attempt."""
         if not self.is_connected():
             logging.error("Not connected to SFTP server")
             return False
 
-        try:
-            logging.info(f"Uploading {local_path} to {remote_path}")
+        file_size = os.path.getsize(local_path)
+        retry_delay = UPLOAD_RETRY_DELAY
 
-            self.sftp_client.put(local_path, remote_path)
+        for attempt in range(UPLOAD_MAX_RETRIES):
+            try:
+                if attempt > 0 and not self.is_connected():
+                    logging.warning(f"Connection lost, attempting to reconnect (attempt {attempt + 1})")
+                    if not self.connect():
+                        continue
 
-            logging.info(f"Successfully uploaded {local_path}")
-            return True
+                offset = self.resume_offset(remote_path, file_size) if attempt > 0 else 0
+                logging.info(f"Uploading {local_path} to {remote_path}")
 
-        except Exception as e:
-            logging.error(f"Failed to upload {local_path}: {e}")
-            return False
+                if offset == 0:
+                    self.sftp_client.put(local_path, remote_path, callback=self._put_callback(progress))
+                elif offset < file_size:
+                    logging.info(f"Resuming {remote_path} at byte {offset:,}")
+                    self._append(local_path, remote_path, offset, file_size, progress)
+
+                logging.info(f"Successfully uploaded {local_path}")
+                return True
+
+            except Exception as e:
+                if attempt < UPLOAD_MAX_RETRIES - 1:
+                    logging.warning(f"Upload attempt {attempt + 1} failed for {local_path}: {e}")
+                    logging.info(f"Retrying upload in {retry_delay} seconds...")
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    logging.error(f"Failed to upload {local_path}: {e}")
+
+        return False
+
+    @staticmethod
+    def _put_callback(progress: Optional[Callable[[int], None]]):
+        """Adapt paramiko's (transferred, total) callback to per-block byte counts."""
+        if progress is None:
+            return None
+        last = 0
+
+        def callback(transferred: int, _total: int) -> None:
+            nonlocal last
+            progress(transferred - last)
+            last = transferred
+
+        return callback
+
+    def _append(self, local_path: str, remote_path: str, offset: int, file_size: int,
+                progress: Optional[Callable[[int], None]] = None) -> None:
+        """Write the rest of ``local_path`` into the partial remote file, starting at ``offset``."""
+        with open(local_path, 'rb') as source, self.sftp_client.open(remote_path, 'r+b') as target:
+            source.seek(offset)
+            target.seek(offset)
+            target.set_pipelined(True)
+            while True:
+                chunk = source.read(SFTP_CHUNK_SIZE)
+                if not chunk:
+                    break
+                target.write(chunk)
+                if progress:
+                    progress(len(chunk))
+
+        size = self.sftp_client.stat(remote_path).st_size
+        if size != file_size:
+            raise IOError(f"size mismatch after resume: {size} != {file_size}")
+
+    def remote_size(self, remote_path: str) -> Optional[int]:
+        """Size of a remote file via stat, None if it does not exist."""
+        try:
+            return self.sftp_client.stat(remote_path).st_size
+        except FileNotFoundError:
+            return None
 
     def is_connected(self) -> bool:
         """Check if SFTP connection is active."""
@@ -352,13 +501,102 @@ class RF123Connection(FTPConnection):
 
         return False
 
-    def upload_file_with_switch(self, local_path: str, remote_path: str) -> bool:
+    def upload_file_with_switch(self, local_path: str, remote_path: str,
+                                progress: Optional[Callable[[int], None]] = None) -> bool:
         """Upload file, switching servers if necessary."""
         if not self.connect_for_file(local_path):
             logging.error(f"Failed to connect to appropriate 123RF server for {local_path}")
             return False
 
-        return self.upload_file(local_path, remote_path)
+        return self.upload_file(local_path, remote_path, progress)
+
+
+class ConnectionPool:
+    """
+    Up to ``size`` connections to one photobank shared by upload threads.
+
+    Connections are opened lazily when a thread needs one and none is idle. If
+    the server refuses an additional connection, the pool shrinks to the
+    connections it already has instead of failing the upload.
+    """
+
+    def __init__(self, photobank: str, factory: Callable[[], Optional[PhotobankConnection]], size: int):
+        """
+        Args:
+            photobank: Photobank name (for logging)
+            factory: Creates and connects a new connection, returns None on failure
+            size: Maximum number of simultaneous connections
+        """
+        self.photobank = photobank
+        self.size = max(1, size)
+        self._factory = factory
+        self._idle: List[PhotobankConnection] = []
+        self._all: List[PhotobankConnection] = []
+        self._opened = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> Optional[PhotobankConnection]:
+        """Take an idle connection, open a new one, or wait for one; None if none can be opened."""
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._opened < self.size:
+                    self._opened += 1
+                    break
+                if self._opened == 0:
+                    return None
+                self._condition.wait()
+
+        connection = self._factory()
+
+        with self._condition:
+            if connection is None:
+                self._opened -= 1
+                # Stop opening more connections; keep using the ones that work
+                self.size = max(self._opened, 0)
+                self._condition.notify_all()
+                if self._opened:
+                    logging.warning(f"{self.photobank}: continuing with {self._opened} connection(s)")
+                # Opens still in flight may fail too; stop waiting once none is left
+                while not self._idle and self._opened:
+                    self._condition.wait()
+                return self._idle.pop() if self._idle else None
+            self._all.append(connection)
+            logging.debug(f"{self.photobank}: opened connection {len(self._all)}/{self.size}")
+            return connection
+
+    def release(self, connection: PhotobankConnection) -> None:
+        """Return a connection to the pool."""
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Optional[PhotobankConnection]]:
+        """Context manager around acquire/release."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            if connection is not None:
+                self.release(connection)
+
+    @property
+    def open_connections(self) -> int:
+        """Number of connections opened so far."""
+        return len(self._all)
+
+    def close(self) -> None:
+        """Disconnect every connection of the pool."""
+        with self._condition:
+            connections, self._all, self._idle = self._all, [], []
+            self._opened = 0
+        for connection in connections:
+            try:
+                connection.disconnect()
+            except Exception as e:
+                logging.error(f"Error disconnecting from {self.photobank}: {e}")
 
 
 class ConnectionManager:
@@ -366,6 +604,8 @@ class ConnectionManager:
 
     def __init__(self):
         self.connections: Dict[str, PhotobankConnection] = {}
+        self.pools: Dict[str, ConnectionPool] = {}
+        self._lock = threading.Lock()
 
     def get_connection(self, photobank: str, credentials: Dict[str, str]) -> Optional[PhotobankConnection]:
         """Get or create a connection for the specified photobank."""
@@ -373,6 +613,35 @@ class ConnectionManager:
         if photobank in self.connections and self.connections[photobank].is_connected():
             return self.connections[photobank]
 
+        connection = self.create_connection(photobank, credentials)
+        if connection:
+            self.connections[photobank] = connection
+        return connection
+
+    def get_connection_pool(self, photobank: str, credentials: Dict[str, str],
+                            size: Optional[int] = None) -> ConnectionPool:
+        """
+        Get or create the connection pool for the specified photobank.
+
+        Args:
+            photobank: Photobank name
+            credentials: Credentials for the photobank
+            size: Maximum simultaneous connections (default: the bank's configured limit)
+        """
+        with self._lock:
+            pool = self.pools.get(photobank)
+            if pool is None:
+                pool = ConnectionPool(
+                    photobank,
+                    lambda: self.create_connection(photobank, credentials),
+                    size or get_max_connections(photobank)
+                )
+                self.pools[photobank] = pool
+            return pool
+
+    def create_connection(self, photobank: str, credentials: Dict[str, str]) -> Optional[PhotobankConnection]:
+        """Create and connect a new, unshared connection for the specified photobank."""
+
         config = PHOTOBANK_CONFIGS.get(photobank)
         if not config:
             logging.error(f"Unsupported photobank: {photobank}")
@@ -395,7 +664,6 @@ class ConnectionManager:
         # Attempt connection with retry logic
         for attempt in range(DEFAULT_RETRY_COUNT):
             if connection.connect():
-                self.connections[photobank] = connection
                 return connection
 
             if attempt < DEFAULT_RETRY_COUNT - 1:
@@ -407,6 +675,12 @@ class ConnectionManager:
 
     def disconnect_all(self) -> None:
         """Disconnect all active connections."""
+        with self._lock:
+            pools, self.pools = list(self.pools.values()), {}
+        for pool in pools:
+            pool.close()
+            logging.info(f"Closed {pool.photobank} connection pool")
+
         for photobank, connection in self.connections.items():
             try:
                 connection.disconnect()
@@ -418,6 +692,10 @@ class ConnectionManager:
 
     def disconnect(self, photobank: str) -> None:
         """Disconnect from specific photobank."""
+        with self._lock:
+            pool = self.pools.pop(photobank, None)
+        if pool is not None:
+            pool.close()
         if photobank in self.connections:
             try:
                 self.connections[photobank].disconnect()
@@ -48,6 +48,10 @@ def get_category_column(photobank: str) -> str:
     """Get category column name for given photobank."""
     return f"{photobank}{COL_CATEGORY_SUFFIX}"
 
+def get_max_connections(photobank: str) -> int:
+    """Get the number of simultaneous upload connections allowed for given photobank."""
+    return PHOTOBANK_CONFIGS.get(photobank, {}).get("max_connections", DEFAULT_MAX_CONNECTIONS)
+
 # Photobank configuration (based on documentation analysis)
 PHOTOBANK_CONFIGS = {
     "ShutterStock": {
@@ -83,6 +87,7 @@ PHOTOBANK_CONFIGS = {
         "passive": True,
         "directory": "/",
         "quota": {"photos": 4*1024*1024*1024, "video": 30*1024*1024*1024},
+        "max_connections": 1,  # Server switching per content type
         "supported_formats": ['.jpg', '.eps', '.mp4', '.mp3'],
         "min_mp": 6
     },
@@ -164,6 +169,7 @@ PHOTOBANK_CONFIGS = {
         "supported_formats": ['.jpg', '.eps', '.psd'],
         "requires_level": 3,
         "requires_published_files": 500,
+        "max_connections": 1,
         "min_mp": 3,
         "note": "Requires Level 3 contributor status (500+ published files)"
     },
@@ -177,6 +183,7 @@ PHOTOBANK_CONFIGS = {
             "vectors": "/vectorimages"
         },
         "supported_formats": ['.jpg', '.eps', '.ai'],
+        "max_connections": 1,
         "note": "FTP credentials must be obtained from contributor dashboard or support@mostphotos.com"
     },
     # Web-only banks (no FTP/SFTP upload support)
@@ -217,6 +224,17 @@ DEFAULT_TIMEOUT = 300  # 5 minutes
 DEFAULT_RETRY_COUNT = 3
 DEFAULT_RETRY_DELAY = 5  # seconds
 
+# Upload scheduling (see upload_scheduler.py)
+UPLOAD_ORDER_POLICIES = ("fifo", "smallest-first", "largest-first")
+DEFAULT_UPLOAD_ORDER = "smallest-first"  # Small files are not stuck behind large videos
+THROUGHPUT_REPORT_INTERVAL = 30  # seconds between per-bank throughput/ETA log lines
+
+# Parallel upload settings
+# Simultaneous connections per photobank unless the bank config sets "max_connections"
+DEFAULT_MAX_CONNECTIONS = 2
+# Number of photobanks uploaded to at the same time
+DEFAULT_PARALLEL_BANKS = 4
+
 # FTP settings
 DEFAULT_FTP_PORT = 21
 DEFAULT_FTPS_PORT = 990
@@ -224,6 +242,11 @@ DEFAULT_SFTP_PORT = 22
 
 # Upload chunk size (in bytes)
 DEFAULT_CHUNK_SIZE = 8192  # 8KB
+SFTP_CHUNK_SIZE = 32768  # 32KB, same as paramiko's put()
+
+# Upload retries (interrupted transfers are resumed from the size the server confirms)
+UPLOAD_MAX_RETRIES = 3
+UPLOAD_RETRY_DELAY = 10  # seconds, doubled after every failed attempt
 
 # Base directory paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -238,6 +261,9 @@ DEFAULT_LOG_DIR = r"H:\Logs"
 DEFAULT_CREDENTIALS_FILE = os.path.join(BASE_DIR, "config", "credentials.json")
 DEFAULT_BANK_CONFIG_FILE = os.path.join(BASE_DIR, "config", "bank_configs.json")
 
+# Ledger of successful uploads (see upload_ledger.py)
+DEFAULT_UPLOAD_LEDGER_FILE = os.path.join(BASE_DIR, "config", "upload_ledger.sqlite")
+
 # Upload result constants
 UPLOAD_SUCCESS = "success"
 UPLOAD_FAILURE = "failure"
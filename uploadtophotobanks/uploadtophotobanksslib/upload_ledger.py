@@ -0,0 +1,146 @@
+"""
+Persistent ledger of successful photobank uploads.
+
+Every successful upload is recorded with its photobank, content hash, size,
+remote name and time in a SQLite file. Before a file is transferred the
+uploader asks the ledger whether the same content already reached that
+photobank, so an interrupted run can simply be started again and only the
+missing files are sent.
+
+Files are matched by content hash, so a renamed or re-exported copy of an
+uploaded file is still recognised. The path, size and mtime of the uploaded
+file are stored too, which lets unchanged files be recognised without reading
+them again.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from shared.hash_utils import compute_file_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    bank TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    remote_name TEXT NOT NULL,
+    local_path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    PRIMARY KEY (bank, file_hash)
+);
+CREATE INDEX IF NOT EXISTS uploads_path ON uploads (bank, local_path);
+"""
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a local path into the key stored in the ledger."""
+    return os.path.normcase(os.path.abspath(path)).replace("\\", "/")
+
+
+class UploadLedger:
+    """SQLite record of which file contents were uploaded to which photobank."""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Location of the SQLite file (created if missing)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logging.debug(f"Opened upload ledger {db_path}")
+
+    def __enter__(self) -> "UploadLedger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def is_uploaded(self, bank: str, file_path: str) -> bool:
+        """
+        Check whether the content of ``file_path`` was already uploaded to ``bank``.
+
+        Unchanged files (same path, size and mtime as when uploaded) are answered
+        without hashing; other files are hashed and looked up by content.
+        """
+        stat = os.stat(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM uploads WHERE bank = ? AND local_path = ? AND size = ? AND mtime_ns = ?",
+                (bank, normalize_path(file_path), stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row is not None:
+            return True
+
+        file_hash = self._hash(file_path, stat)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT remote_name FROM uploads WHERE bank = ? AND file_hash = ?", (bank, file_hash)
+            ).fetchone()
+        if row is not None:
+            logging.debug(f"{file_path} has the same content as {row[0]} already uploaded to {bank}")
+            return True
+        return False
+
+    def record(self, bank: str, file_path: str, remote_name: str) -> None:
+        """Record a successful upload of ``file_path`` to ``bank`` as ``remote_name``."""
+        stat = os.stat(file_path)
+        file_hash = self._hash(file_path, stat)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads "
+                "(bank, file_hash, size, remote_name, local_path, mtime_ns, uploaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bank, file_hash, stat.st_size, remote_name, normalize_path(file_path),
+                 stat.st_mtime_ns, datetime.now().isoformat(timespec="seconds")),
+            )
+            self._conn.commit()
+
+    def remaining(self, bank: str, file_paths: Iterable[str]) -> List[str]:
+        """Return the files of ``file_paths`` not yet uploaded to ``bank``."""
+        return [path for path in file_paths if not self.is_uploaded(bank, path)]
+
+    def uploaded_count(self, bank: Optional[str] = None) -> int:
+        """Number of uploads recorded (for one bank or in total)."""
+        with self._lock:
+            if bank is None:
+                return self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM uploads WHERE bank = ?", (bank,)).fetchone()[0]
+
+    def entries(self, bank: str) -> List[Dict[str, object]]:
+        """Recorded uploads for ``bank``, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_hash, size, remote_name, local_path, uploaded_at FROM uploads "
+                "WHERE bank = ? ORDER BY uploaded_at",
+                (bank,),
+            ).fetchall()
+        keys = ("file_hash", "size", "remote_name", "local_path", "uploaded_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _hash(self, file_path: str, stat: os.stat_result) -> str:
+        """Content hash of a file, computed once per (path, size, mtime) during a run."""
+        key = (normalize_path(file_path), stat.st_size, stat.st_mtime_ns)
+        file_hash = self._hashes.get(key)
+        if file_hash is None:
+            file_hash = compute_file_hash(file_path)
+            self._hashes[key] = file_hash
+        return file_hash
@@ -0,0 +1,315 @@
+"""
+Upload scheduling: queue order, bandwidth limits and throughput reporting.
+
+The scheduler decides in which order validated files are sent to each
+photobank and in which order photobanks are started, and throttles the
+transfers:
+
+- Ordering policies: "fifo" (by file name, the previous behaviour),
+  "smallest-first" (small JPGs are not stuck behind large videos) and
+  "largest-first".
+- Bandwidth caps per photobank and for the whole run, optionally limited to
+  time windows (e.g. only throttle during working hours).
+- Per-photobank throughput and ETA, logged while uploading.
+
+Connections report every block they send through a progress callback; the
+callback returned by ``UploadScheduler.transfer_callback`` blocks until the
+limits allow the next block.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from uploadtophotobanksslib.constants import (
+    DEFAULT_UPLOAD_ORDER,
+    THROUGHPUT_REPORT_INTERVAL,
+    UPLOAD_ORDER_POLICIES
+)
+
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?(?:/s)?\s*$", re.IGNORECASE)
+_WINDOW_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*(.+)$")
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_rate(value: str) -> float:
+    """
+    Parse a transfer rate such as "500K", "2M" or "1.5MB/s" into bytes per second.
+
+    Raises:
+        ValueError: If the value is not a rate
+    """
+    match = _RATE_PATTERN.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid rate '{value}', expected e.g. 500K, 2M or 1.5MB/s")
+    return float(match.group(1)) * _UNITS[match.group(2).upper()]
+
+
+def parse_rate_window(value: str) -> "RateWindow":
+    """
+    Parse "HH:MM-HH:MM=RATE" into a RateWindow (windows may cross midnight).
+
+    Raises:
+        ValueError: If the value is not a window
+    """
+    match = _WINDOW_PATTERN.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid rate window '{value}', expected e.g. 08:00-18:00=1M")
+    start = int(match.group(1)) * 60 + int(match.group(2))
+    end = int(match.group(3)) * 60 + int(match.group(4))
+    return RateWindow(start, end, parse_rate(match.group(5)))
+
+
+def format_rate(bytes_per_second: float) -> str:
+    """Human readable rate, e.g. "1.2 MB/s"."""
+    for unit, size in (("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if bytes_per_second >= size:
+            return f"{bytes_per_second / size:.1f} {unit}/s"
+    return f"{bytes_per_second:.0f} B/s"
+
+
+@dataclass
+class RateWindow:
+    """A rate that applies between two times of day (minutes after midnight)."""
+
+    start_minute: int
+    end_minute: int
+    bytes_per_second: float
+
+    def contains(self, moment: datetime) -> bool:
+        minute = moment.hour * 60 + moment.minute
+        if self.start_minute <= self.end_minute:
+            return self.start_minute <= minute < self.end_minute
+        return minute >= self.start_minute or minute < self.end_minute
+
+
+@dataclass
+class UploadJob:
+    """A validated file queued for one photobank."""
+
+    photobank: str
+    path: str
+    size: int
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all connections it applies to.
+
+    The rate is the first matching time window, otherwise the base rate;
+    a rate of 0 means unlimited.
+    """
+
+    def __init__(self, bytes_per_second: float = 0, windows: Optional[List[RateWindow]] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 now: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            bytes_per_second: Base rate (0 = unlimited)
+            windows: Rates for times of day, checked before the base rate
+            clock, sleep, now: Time sources (replaceable in tests)
+        """
+        self.bytes_per_second = bytes_per_second
+        self.windows = list(windows or [])
+        self._clock = clock
+        self._sleep = sleep
+        self._now = now
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated = clock()
+
+    def current_rate(self) -> float:
+        """Rate in effect right now (0 = unlimited)."""
+        if self.windows:
+            moment = self._now()
+            for window in self.windows:
+                if window.contains(moment):
+                    return window.bytes_per_second
+        return self.bytes_per_second
+
+    @property
+    def active(self) -> bool:
+        """Whether the limiter can ever throttle."""
+        return bool(self.bytes_per_second or self.windows)
+
+    def consume(self, amount: int) -> None:
+        """Block until ``amount`` bytes may be sent."""
+        rate = self.current_rate()
+        if rate <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            # Allow bursts of at most one second worth of data
+            self._tokens = min(rate, self._tokens + (now - self._updated) * rate) - amount
+            self._updated = now
+            wait = -self._tokens / rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+
+class ThroughputMeter:
+    """Bytes sent to one photobank, with rate and ETA."""
+
+    def __init__(self, photobank: str, total_bytes: int, clock: Callable[[], float] = time.monotonic,
+                 report_interval: float = THROUGHPUT_REPORT_INTERVAL):
+        self.photobank = photobank
+        self.total_bytes = total_bytes
+        self.sent_bytes = 0
+        self._clock = clock
+        self._started = clock()
+        self._report_interval = report_interval
+        self._last_report = self._started
+        self._lock = threading.Lock()
+
+    def add(self, amount: int) -> None:
+        """Count sent bytes and log the status every report interval."""
+        with self._lock:
+            self.sent_bytes += amount
+            now = self._clock()
+            if now - self._last_report < self._report_interval:
+                return
+            self._last_report = now
+        logging.info(self.status())
+
+    @property
+    def rate(self) -> float:
+        """Average bytes per second since the start."""
+        elapsed = self._clock() - self._started
+        return self.sent_bytes / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until all bytes are sent, None while the rate is unknown."""
+        rate = self.rate
+        if rate <= 0:
+            return None
+        return max(0.0, self.total_bytes - self.sent_bytes) / rate
+
+    def status(self) -> str:
+        """One-line status: sent/total, rate and ETA."""
+        eta = self.eta_seconds
+        eta_text = "unknown" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))
+        return (
+            f"{self.photobank}: {self.sent_bytes / 1024 ** 2:.1f} / {self.total_bytes / 1024 ** 2:.1f} MB, "
+            f"{format_rate(self.rate)}, ETA {eta_text}"
+        )
+
+
+class UploadScheduler:
+    """Orders upload queues and applies per-bank and total bandwidth limits."""
+
+    def __init__(
+        self,
+        policy: str = DEFAULT_UPLOAD_ORDER,
+        bank_rates: Optional[Dict[str, float]] = None,
+        total_rate: float = 0,
+        rate_windows: Optional[List[RateWindow]] = None
+    ):
+        """
+        Args:
+            policy: Queue order, one of UPLOAD_ORDER_POLICIES
+            bank_rates: Bandwidth cap in bytes per second per photobank
+            total_rate: Bandwidth cap for all photobanks together (0 = unlimited)
+            rate_windows: Total caps for times of day (e.g. working hours), used instead of total_rate
+        """
+        if policy not in UPLOAD_ORDER_POLICIES:
+            raise ValueError(f"Unknown upload order '{policy}', expected one of {', '.join(UPLOAD_ORDER_POLICIES)}")
+        self.policy = policy
+        self.total_limiter = RateLimiter(total_rate, rate_windows)
+        self.bank_limiters = {bank: RateLimiter(rate) for bank, rate in (bank_rates or {}).items() if rate}
+        self.meters: Dict[str, ThroughputMeter] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, photobank: str, file_paths: List[str], validator) -> Tuple[List[UploadJob], List[str]]:
+        """
+        Validate files for a photobank and order the valid ones by the policy.
+
+        Args:
+            photobank: Photobank name
+            file_paths: Candidate files
+            validator: FileValidator used to reject files before anything is sent
+
+        Returns:
+            (ordered jobs, rejected file paths)
+        """
+        jobs, rejected = [], []
+        for path in file_paths:
+            if validator.validate_file_for_photobank(path, photobank):
+                jobs.append(UploadJob(photobank, path, os.path.getsize(path)))
+            else:
+                logging.error(f"File validation failed for {os.path.basename(path)}")
+                rejected.append(path)
+        return self.order(jobs), rejected
+
+    def order(self, jobs: List[UploadJob]) -> List[UploadJob]:
+        """Order one photobank's jobs by the policy (stable by file name)."""
+        jobs = sorted(jobs, key=lambda job: job.path)
+        if self.policy == "smallest-first":
+            jobs.sort(key=lambda job: job.size)
+        elif self.policy == "largest-first":
+            jobs.sort(key=lambda job: job.size, reverse=True)
+        return jobs
+
+    def order_banks(self, queued_bytes: Dict[str, int]) -> List[str]:
+        """
+        Order photobanks for starting; with "smallest-first" the banks with the
+        least data start first, so more banks finish early when not all run at once.
+        """
+        banks = list(queued_bytes)
+        if self.policy == "smallest-first":
+            banks.sort(key=lambda bank: queued_bytes[bank])
+        elif self.policy == "largest-first":
+            banks.sort(key=lambda bank: queued_bytes[bank], reverse=True)
+        return banks
+
+    def start_bank(self, photobank: str, jobs: List[UploadJob]) -> ThroughputMeter:
+        """Create the throughput meter for a photobank's queue."""
+        meter = ThroughputMeter(photobank, sum(job.size for job in jobs))
+        with self._lock:
+            self.meters[photobank] = meter
+        limiter = self.bank_limiters.get(photobank)
+        limits = []
+        if limiter:
+            limits.append(f"{format_rate(limiter.bytes_per_second)} for {photobank}")
+        if self.total_limiter.active:
+            limits.append("shared total limit")
+        logging.info(
+            f"Scheduled {len(jobs)} files ({meter.total_bytes / 1024 ** 2:.1f} MB) for {photobank}, "
+            f"order {self.policy}" + (f", limited to {' and '.join(limits)}" if limits else "")
+        )
+        return meter
+
+    def transfer_callback(self, photobank: str, on_bytes: Optional[Callable[[int], None]] = None
+                          ) -> Callable[[int], None]:
+        """
+        Callback for connections, called with the size of every sent block.
+
+        It updates the photobank's meter and ``on_bytes`` (e.g. a progress bar),
+        then waits as long as the bandwidth limits require.
+        """
+        meter = self.meters.get(photobank)
+        limiter = self.bank_limiters.get(photobank)
+
+        def callback(amount: int) -> None:
+            if meter:
+                meter.add(amount)
+            if on_bytes:
+                on_bytes(amount)
+            if limiter:
+                limiter.consume(amount)
+            self.total_limiter.consume(amount)
+
+        return callback
+
+    def summary(self) -> List[str]:
+        """Final throughput line per photobank."""
+        with self._lock:
+            return [meter.status() for meter in self.meters.values()]
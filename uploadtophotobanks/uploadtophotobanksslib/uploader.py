@@ -3,6 +3,9 @@ Main uploader logic for photobank files.
 """
 import os
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from tqdm import tqdm
 
@@ -14,25 +17,48 @@ from uploadtophotobanksslib.constants import (
     UPLOAD_SUCCESS,
     UPLOAD_FAILURE,
     UPLOAD_SKIPPED,
-    get_status_column
+    DEFAULT_PARALLEL_BANKS,
+    get_status_column,
+    get_max_connections
 )
 from uploadtophotobanksslib.connection_manager import ConnectionManager
 from uploadtophotobanksslib.file_validator import FileValidator
+from uploadtophotobanksslib.upload_ledger import UploadLedger
+from uploadtophotobanksslib.upload_scheduler import UploadJob, UploadScheduler
 from shared.file_operations import load_csv, save_csv
 
 
 class PhotobankUploader:
     """Main uploader class for photobank files."""
 
-    def __init__(self, credentials: Dict[str, Dict[str, str]]):
+    def __init__(
+        self,
+        credentials: Dict[str, Dict[str, str]],
+        connection_limits: Optional[Dict[str, int]] = None,
+        max_parallel_banks: int = DEFAULT_PARALLEL_BANKS,
+        ledger: Optional[UploadLedger] = None,
+        skip_uploaded: bool = True,
+        scheduler: Optional[UploadScheduler] = None
+    ):
         """
         Initialize uploader with credentials.
 
         Args:
             credentials: Dict with photobank names as keys and credential dicts as values
                         e.g., {"ShutterStock": {"username": "user", "password": "pass"}}
+            connection_limits: Simultaneous connections per photobank, overriding the
+                        "max_connections" value from PHOTOBANK_CONFIGS
+            max_parallel_banks: Number of photobanks uploaded to at the same time
+            ledger: Upload ledger that records successful uploads
+            skip_uploaded: Skip files the ledger already lists as uploaded to the photobank
+            scheduler: Queue order and bandwidth limits (default: smallest first, unlimited)
         """
         self.credentials = credentials
+        self.connection_limits = connection_limits or {}
+        self.max_parallel_banks = max(1, max_parallel_banks)
+        self.ledger = ledger
+        self.skip_uploaded = skip_uploaded
+        self.scheduler = scheduler or UploadScheduler()
         self.connection_manager = ConnectionManager()
         self.file_validator = FileValidator()
 
@@ -70,17 +96,68 @@ class PhotobankUploader:
             return {}
 
         results = {}
+        workers = min(self.max_parallel_banks, len(photobanks)) or 1
+        start_order = self.scheduler.order_banks(self._queued_bytes(media_files, photobanks))
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank") as executor:
+                futures = {
+                    photobank: executor.submit(
+                        self._upload_to_photobank, photobank, media_files, export_dir, dry_run, position
+                    )
+                    for position, photobank in enumerate(start_order)
+                }
+                for photobank in photobanks:
+                    future = futures[photobank]
+                    try:
+                        results[photobank] = future.result()
+                    except Exception as e:
+                        logging.error(f"Upload to {photobank} failed: {e}", exc_info=True)
+                        results[photobank] = {"error": 1}
+        finally:
+            # Disconnect all connections
+            self.connection_manager.disconnect_all()
+
+        for line in self.scheduler.summary():
+            logging.info(f"Throughput {line}")
 
+        return results
+
+    def _queued_bytes(self, media_files: List[str], photobanks: List[str]) -> Dict[str, int]:
+        """Total size of the compatible files per photobank (used to order the banks)."""
+        queued = {}
         for photobank in photobanks:
-            logging.info(f"Processing photobank: {photobank}")
-            results[photobank] = self._upload_to_photobank(
-                photobank, media_files, export_dir, dry_run
-            )
+            if photobank in PHOTOBANK_CONFIGS:
+                files = self._filter_files_for_photobank(media_files, photobank)
+                queued[photobank] = sum(os.path.getsize(path) for path in files)
+            else:
+                queued[photobank] = 0
+        return queued
 
-        # Disconnect all connections
-        self.connection_manager.disconnect_all()
+    def report_remaining(self, media_folder: str, photobanks: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Count files still to be sent per photobank using only the ledger (no network access).
 
-        return results
+        Returns:
+            Dict with "total", "uploaded" and "remaining" counts per photobank
+        """
+        media_files = self._scan_media_folder(media_folder)
+        report = {}
+        for photobank in photobanks:
+            if photobank not in PHOTOBANK_CONFIGS or PHOTOBANK_CONFIGS[photobank].get("discontinued", False):
+                continue
+            files = self._filter_files_for_photobank(media_files, photobank)
+            remaining = self.ledger.remaining(photobank, files) if self.ledger else files
+            report[photobank] = {
+                "total": len(files),
+                "uploaded": len(files) - len(remaining),
+                "remaining": len(remaining),
+            }
+        return report
+
+    def get_connection_limit(self, photobank: str) -> int:
+        """Get the number of simultaneous connections used for a photobank."""
+        return max(1, self.connection_limits.get(photobank) or get_max_connections(photobank))
 
     def _scan_media_folder(self, media_folder: str) -> List[str]:
         """Scan media folder for files to upload."""
@@ -115,9 +192,11 @@ class PhotobankUploader:
         photobank: str,
         media_files: List[str],
         export_dir: str,
-        dry_run: bool
+        dry_run: bool,
+        position: int = 0
     ) -> Dict[str, int]:
-        """Upload files to a specific photobank."""
+        """Upload files to a specific photobank over up to get_connection_limit() connections."""
+        logging.info(f"Processing photobank: {photobank}")
 
         if photobank not in PHOTOBANK_CONFIGS:
             logging.error(f"Unsupported photobank: {photobank}")
@@ -169,45 +248,108 @@ class PhotobankUploader:
 
         stats = {"success": 0, "failure": 0, "skipped": 0}
 
+        # Leave out files the ledger lists as already uploaded (before connecting)
+        if self.ledger and self.skip_uploaded:
+            remaining = self.ledger.remaining(photobank, uploadable_files)
+            stats["skipped"] = len(uploadable_files) - len(remaining)
+            if stats["skipped"]:
+                logging.info(f"Skipping {stats['skipped']} files already uploaded to {photobank}")
+            uploadable_files = remaining
+            if not uploadable_files:
+                logging.info(f"Upload to {photobank} completed: {stats}")
+                return stats
+
+        # Validate everything first and order the queue by the scheduling policy
+        # Note: CSV files are optional - upload all compatible files from media folder
+        jobs, rejected = self.scheduler.plan(photobank, uploadable_files, self.file_validator)
+        stats["failure"] += len(rejected)
+        if not jobs:
+            logging.info(f"Upload to {photobank} completed: {stats}")
+            return stats
+
         if dry_run:
             logging.info("DRY RUN MODE - No files will be uploaded")
-
-        # Get connection
-        if not dry_run:
-            connection = self.connection_manager.get_connection(photobank, self.credentials[photobank])
-            if not connection:
-                logging.error(f"Failed to connect to {photobank}")
-                return {"error": len(uploadable_files)}
-
-        # Process each file
-        for file_path in tqdm(uploadable_files, desc=f"Uploading to {photobank}"):
-            filename = os.path.basename(file_path)
-
-            # Note: CSV files are optional - upload all compatible files from media folder
-            logging.debug(f"Processing file: {filename}")
-
-            # Validate file
-            if not self.file_validator.validate_file_for_photobank(file_path, photobank):
-                logging.error(f"File validation failed for {filename}")
-                stats["failure"] += 1
-                continue
-
-            if dry_run:
-                logging.info(f"[DRY RUN] Would upload: {filename}")
-                stats["success"] += 1
-                continue
-
-            # Upload file
-            success = self._upload_single_file(connection, file_path, filename, photobank)
-
-            if success:
+            for job in jobs:
+                logging.info(f"[DRY RUN] Would upload: {job.filename} ({job.size:,} bytes)")
                 stats["success"] += 1
-                logging.info(f"Successfully uploaded {filename} to {photobank}")
-            else:
-                stats["failure"] += 1
-                logging.error(f"Failed to upload {filename} to {photobank}")
-
-        logging.info(f"Upload to {photobank} completed: {stats}")
+            logging.info(f"Upload to {photobank} completed: {stats}")
+            return stats
+
+        # Open the first connection up front so a bad login fails the bank early
+        pool = self.connection_manager.get_connection_pool(
+            photobank, self.credentials[photobank], self.get_connection_limit(photobank)
+        )
+        first_connection = pool.acquire()
+        if not first_connection:
+            logging.error(f"Failed to connect to {photobank}")
+            return {"error": len(uploadable_files)}
+        pool.release(first_connection)
+
+        pending: "queue.Queue[UploadJob]" = queue.Queue()
+        for job in jobs:
+            pending.put(job)
+        lock = threading.Lock()
+        meter = self.scheduler.start_bank(photobank, jobs)
+        # Byte-based bar: tqdm shows the live throughput and ETA of the bank
+        progress = tqdm(total=meter.total_bytes, desc=f"Uploading to {photobank}", position=position,
+                        unit="B", unit_scale=True, unit_divisor=1024)
+        files_done = 0
+
+        def advance(amount: int) -> None:
+            with lock:
+                progress.update(amount)
+
+        transfer_callback = self.scheduler.transfer_callback(photobank, advance)
+
+        def record(key: str) -> None:
+            nonlocal files_done
+            with lock:
+                stats[key] += 1
+                files_done += 1
+                progress.set_postfix_str(f"{files_done}/{len(jobs)} files", refresh=False)
+
+        def upload_worker() -> None:
+            with pool.connection() as connection:
+                if connection is None:
+                    return
+                while True:
+                    try:
+                        job = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    logging.debug(f"Processing file: {job.filename}")
+
+                    # Upload file
+                    if self._upload_single_file(connection, job.path, job.filename, photobank,
+                                                progress=transfer_callback):
+                        logging.info(f"Successfully uploaded {job.filename} to {photobank}")
+                        if self.ledger:
+                            self.ledger.record(photobank, job.path, job.filename)
+                        record("success")
+                    else:
+                        logging.error(f"Failed to upload {job.filename} to {photobank}")
+                        record("failure")
+
+        connection_count = min(pool.size, len(jobs))
+        logging.info(f"Uploading {len(jobs)} files to {photobank} over up to {connection_count} connection(s)")
+        threads = [
+            threading.Thread(target=upload_worker, name=f"{photobank}-upload-{index}", daemon=True)
+            for index in range(connection_count)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            progress.close()
+
+        # Files left behind when every connection was lost
+        while not pending.empty():
+            logging.error(f"No connection left to upload {pending.get_nowait().filename} to {photobank}")
+            stats["failure"] += 1
+
+        logging.info(f"Upload to {photobank} completed: {stats} ({meter.status()})")
         return stats
 
     def _filter_files_for_photobank(self, media_files: List[str], photobank: str) -> List[str]:
@@ -250,15 +392,16 @@ class PhotobankUploader:
         connection,
         local_path: str,
         filename: str,
-        photobank: str
+        photobank: str,
+        progress=None
     ) -> bool:
-        """Upload a single file to photobank."""
+        """Upload a single file to photobank; ``progress`` receives the size of every sent block."""
 
         config = PHOTOBANK_CONFIGS[photobank]
 
         # Special handling for 123RF with dynamic server switching
         if photobank == "123RF" and hasattr(connection, 'upload_file_with_switch'):
-            return connection.upload_file_with_switch(local_path, filename)
+            return connection.upload_file_with_switch(local_path, filename, progress)
 
         # Standard upload process for other photobanks
         # Determine target directory
@@ -271,7 +414,7 @@ class PhotobankUploader:
                 return False
 
         # Upload the file
-        return connection.upload_file(local_path, filename)
+        return connection.upload_file(local_path, filename, progress)
 
     def _get_target_directory(self, file_path: str, photobank: str) -> str:
         """Determine the target directory for upload based on file type and photobank rules."""